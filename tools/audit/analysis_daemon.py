@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Démon d'analyse TourCraft
+Garde en mémoire le corpus des sources, l'index des identifiants (jetons),
+le graphe des modules, l'index des variables CSS et les fiches des hooks, et
+les met à jour de façon incrémentale à chaque modification de src/ (même
+surveillance que le mode --watch des correcteurs CSS: inotify, sinon
+scrutation). Seuls les fichiers modifiés sont relus et relexés; le graphe
+n'est reconstruit que si des imports ou des exports ont changé.
+
+Les requêtes arrivent sur un socket Unix (une requête JSON par ligne) et,
+avec --http, sur http://127.0.0.1:PORT/<requête>?arg=... (GET pour les
+requêtes en lecture seule; refresh et stop exigent un POST JSON):
+- usages NOM        : occurrences d'un identifiant (et utilisation réelle d'un hook)
+- dependents FICHIER: fichiers qui importent FICHIER, directement et transitivement
+- css-var --NOM     : définitions (et nombre d'utilisations) d'une variable CSS
+- complexity HOOK   : score de complexité et métriques actuelles d'un hook
+- status, refresh, stop
+
+daemon_client.py interroge le démon en quelques millisecondes (éditeur,
+pre-commit). À l'arrêt, les caches disque des outils sont sauvegardés.
+
+Usage:
+    python tools/audit/analysis_daemon.py [--socket=chemin] [--http=8765] [--backend=auto|inotify|polling]
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import signal
+import socket
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from source_corpus import SourceCorpus
+from hook_cache import HookInfoCache
+from identifier_index import HOOKS_ROOT, IdentifierIndex
+from graph_engine import CompactGraph, load_graph
+from module_resolver import JS_SUFFIXES, ModuleResolver, build_module_graph
+from audit_hooks_dependencies import ANALYZER_VERSION, HookDependencyAnalyzer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "css"))
+from css_variable_index import CSSVariableIndex
+from file_watcher import FileWatcher
+
+DEFAULT_SOCKET_PATH = Path("tools") / "audit" / ".cache" / "analysis_daemon.sock"
+WATCHED_SUFFIXES = ('.js', '.jsx', '.css')
+MAX_REQUEST_BYTES = 65536
+# Requêtes qui modifient l'état du démon: refusées en GET sur le serveur HTTP
+MUTATING_QUERIES = ('refresh', 'stop')
+
+
+class QueryError(Exception):
+    """Requête invalide (nom inconnu, argument manquant)"""
+
+
+class AnalysisState:
+    """Index en mémoire et requêtes; toutes les méthodes sont protégées par un verrou"""
+
+    def __init__(self, project_root: str):
+        self.project_root = Path(project_root)
+        self.lock = threading.RLock()
+        self.started = time.time()
+        self.refreshes = 0
+        self.last_refresh = None
+
+        started = time.perf_counter()
+        self.corpus = SourceCorpus.open(project_root)
+        self.index = IdentifierIndex.open(project_root, self.corpus)
+        self.graph = load_graph(project_root, self.corpus)
+        self.css_index = CSSVariableIndex.open(project_root)
+        self.css_index.update()
+        self.hook_cache = HookInfoCache.open(project_root, ANALYZER_VERSION)
+        self.analyzer = HookDependencyAnalyzer(project_root, corpus=self.corpus, cache=self.hook_cache)
+        self.load_ms = (time.perf_counter() - started) * 1000
+
+        self.queries: Dict[str, Callable[[Optional[str]], Dict]] = {
+            'usages': self.usages,
+            'dependents': self.dependents,
+            'css-var': self.css_variable,
+            'complexity': self.complexity,
+            'status': self.status,
+            'refresh': self.refresh,
+        }
+
+    # Mise à jour incrémentale
+
+    def _js_snapshot(self) -> Dict:
+        return {source.relative: source for source in self.corpus.files('src', JS_SUFFIXES)}
+
+    def refresh(self, _arg: Optional[str] = None) -> Dict:
+        """Revalide le corpus contre le disque et met à jour les index touchés"""
+        with self.lock:
+            started = time.perf_counter()
+            before = self._js_snapshot()
+            self.corpus.refresh()
+            after = self._js_snapshot()
+            changed = self.index.refresh()
+
+            # Le graphe ne dépend que des imports et exports (barrels) des fichiers JS
+            rebuild = set(before) != set(after)
+            for relative, source in after.items():
+                if rebuild:
+                    break
+                previous = before[relative]
+                if previous is not source and previous.digest != source.digest:
+                    old, new = self.corpus.module(previous), self.corpus.module(source)
+                    rebuild = old.imports != new.imports or old.exports != new.exports
+            if rebuild:
+                module_graph = build_module_graph(self.corpus, ModuleResolver(str(self.project_root), self.corpus))
+                self.graph = CompactGraph.from_module_graph(module_graph)
+
+            self.css_index.update()
+            self.refreshes += 1
+            self.last_refresh = datetime.now().isoformat(timespec='seconds')
+            return {
+                'changed_files': changed,
+                'graph_rebuilt': rebuild,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+            }
+
+    def save(self):
+        """Sauvegarde les caches disque partagés avec les outils en ligne de commande"""
+        with self.lock:
+            self.corpus.save()
+            self.index.save()
+            self.css_index.save()
+            self.hook_cache.save()
+
+    # Requêtes
+
+    @staticmethod
+    def _require(arg: Optional[str], label: str) -> str:
+        if not arg:
+            raise QueryError(f"argument manquant: {label}")
+        return arg
+
+    def _hook_source(self, name: str):
+        """Fichier d'un hook, par chemin relatif ou par nom (useX)"""
+        name = name.strip()
+        source = self.corpus.get(name) if '/' in name else None
+        if source is not None and source.relative.startswith(HOOKS_ROOT + '/'):
+            return source
+        stem = Path(name).stem
+        matches = [source for source in self.corpus.files(HOOKS_ROOT, ('.js',))
+                   if source.path.stem == stem and not source.relative.endswith('/index.js')
+                   and '__tests__' not in source.relative]
+        if not matches:
+            raise QueryError(f"hook introuvable dans {HOOKS_ROOT}: {name}")
+        if len(matches) > 1:
+            raise QueryError(f"nom ambigu, préciser le chemin: {', '.join(m.relative for m in matches)}")
+        return matches[0]
+
+    def usages(self, name: Optional[str]) -> Dict:
+        name = self._require(name, "identifiant")
+        with self.lock:
+            occurrences = self.index.occurrences(name)
+            result = {
+                'name': name,
+                'files': self.index.files_using(name),
+                'occurrences': [{'file': file, 'line': line, 'role': role} for file, line, role in occurrences]
+            }
+            try:
+                result['real_usage'] = self.index.real_usage(self._hook_source(name).relative)
+            except QueryError:
+                pass
+            return result
+
+    def dependents(self, path: Optional[str]) -> Dict:
+        path = self._require(path, "fichier").strip()
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.project_root)
+        path = Path(path).as_posix()
+        with self.lock:
+            if path not in self.graph.index:
+                raise QueryError(f"fichier inconnu du graphe: {path}")
+            node = self.graph.index[path]
+            return {
+                'file': path,
+                'direct': sorted(self.graph.names[i] for i in self.graph.predecessors(node)),
+                'transitive': self.graph.dependents(path)
+            }
+
+    def css_variable(self, name: Optional[str]) -> Dict:
+        name = self._require(name, "variable CSS")
+        if not name.startswith('--'):
+            name = '--' + name
+        with self.lock:
+            definitions = self.css_index.definitions(name).get(name, [])
+            usages = self.css_index.usages(name).get(name, [])
+            return {'name': name, 'definitions': definitions, 'usage_count': len(usages),
+                    'used_in': sorted({site['file'] for site in usages})}
+
+    def complexity(self, name: Optional[str]) -> Dict:
+        name = self._require(name, "hook")
+        with self.lock:
+            source = self._hook_source(name)
+            hook_info = self.analyzer.hook_info(source)
+            metrics = hook_info['metrics']
+            return {
+                'file': source.relative,
+                'complexity_score': hook_info['complexity_score'],
+                'line_count': hook_info['line_count'],
+                'cyclomatic_max': metrics['cyclomatic_max'],
+                'most_complex_function': metrics['most_complex_function'],
+                'max_nesting': metrics['max_nesting'],
+                'effects_without_deps': metrics['effects_without_deps'],
+                'hook_calls': metrics['hook_calls'],
+                'is_wrapper': hook_info['is_wrapper']
+            }
+
+    def status(self, _arg: Optional[str] = None) -> Dict:
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'uptime_s': round(time.time() - self.started),
+                'load_ms': round(self.load_ms, 1),
+                'files': len(self.corpus.entries),
+                'identifiers': len(self.index.postings),
+                'graph_nodes': len(self.graph),
+                'graph_edges': self.graph.edge_count(),
+                'css_files': len(self.css_index.files),
+                'refreshes': self.refreshes,
+                'last_refresh': self.last_refresh
+            }
+
+    def answer(self, query: str, arg: Optional[str]) -> Dict:
+        """Réponse JSON à une requête: {'ok', 'result' | 'error', 'elapsed_ms'}"""
+        started = time.perf_counter()
+        handler = self.queries.get(query)
+        try:
+            if handler is None:
+                raise QueryError(f"requête inconnue: {query} (disponibles: {', '.join(self.queries)}, stop)")
+            response = {'ok': True, 'result': handler(arg)}
+        except QueryError as e:
+            response = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # Une requête qui échoue ne doit pas couper la connexion du client
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return response
+
+
+class AnalysisDaemon:
+    """Serveurs (socket Unix, HTTP local) et surveillance des fichiers autour d'un AnalysisState"""
+
+    def __init__(self, state: AnalysisState, socket_path: Optional[Path], http_port: Optional[int],
+                 backend: str = 'auto'):
+        self.state = state
+        self.socket_path = socket_path
+        self.http_port = http_port
+        self.backend = backend
+        self.servers: List[socketserver.BaseServer] = []
+        self.stopping = threading.Event()
+
+    def _dispatch(self, query: str, arg: Optional[str]) -> Dict:
+        if query == 'stop':
+            self.stop()
+            return {'ok': True, 'result': {'stopping': True}, 'elapsed_ms': 0.0}
+        return self.state.answer(query, arg)
+
+    def _unix_server(self) -> socketserver.BaseServer:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line[:MAX_REQUEST_BYTES])
+                        response = daemon._dispatch(request.get('query', ''), request.get('arg'))
+                    except (ValueError, AttributeError):
+                        response = {'ok': False, 'error': "requête JSON invalide"}
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        if self.socket_path.exists():
+            if _socket_alive(self.socket_path):
+                raise OSError(errno.EADDRINUSE, f"un démon écoute déjà sur {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        server.daemon_threads = True
+        return server
+
+    def _http_server(self) -> socketserver.BaseServer:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = url.path.strip('/')
+                if query in MUTATING_QUERIES:
+                    self._send({'ok': False, 'error': f"{query} exige une requête POST"}, 405)
+                    return
+                arg = parse_qs(url.query).get('arg', [None])[0]
+                self._send(daemon._dispatch(query, arg))
+
+            def do_POST(self):
+                # Corps JSON {"arg": ...}: un formulaire d'une autre origine ne peut pas
+                # envoyer application/json sans pré-vérification CORS (refusée ici)
+                if self.headers.get_content_type() != 'application/json':
+                    self._send({'ok': False, 'error': "corps application/json attendu"}, 415)
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    request = json.loads(self.rfile.read(min(length, MAX_REQUEST_BYTES)) or b'{}')
+                    arg = request.get('arg')
+                except (ValueError, AttributeError):
+                    self._send({'ok': False, 'error': "requête JSON invalide"}, 400)
+                    return
+                self._send(daemon._dispatch(urlparse(self.path).path.strip('/'), arg))
+
+            def _send(self, response: Dict, status: Optional[int] = None):
+                body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                self.send_response(status or (200 if response['ok'] else 400))
+                if status == 405:
+                    self.send_header('Allow', 'POST')
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', self.http_port), Handler)
+        server.daemon_threads = True
+        return server
+
+    def _watch(self):
+        """Met les index à jour après chaque rafale de modifications"""
+        watcher = FileWatcher(self.state.project_root / 'src', WATCHED_SUFFIXES, self.backend)
+        print(f"👀 Surveillance de src/ via {watcher.backend_name}")
+        try:
+            while not self.stopping.is_set():
+                batch = watcher.next_batch()
+                if self.stopping.is_set():
+                    break
+                summary = self.state.refresh()
+                print(f"🔄 {len(batch)} fichier(s) modifié(s), {len(summary['changed_files'])} fichier(s) JS réindexé(s)"
+                      f"{', graphe reconstruit' if summary['graph_rebuilt'] else ''} en {summary['elapsed_ms']} ms")
+        finally:
+            watcher.close()
+
+    def serve(self):
+        if self.socket_path is not None:
+            self.servers.append(self._unix_server())
+            print(f"🔌 Socket: {self.socket_path}")
+        if self.http_port is not None:
+            self.servers.append(self._http_server())
+            print(f"🌐 HTTP: http://127.0.0.1:{self.http_port}/status")
+
+        threading.Thread(target=self._watch, daemon=True).start()
+        threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in self.servers]
+        for thread in threads:
+            thread.start()
+        print("✅ Démon prêt (Ctrl+C ou `daemon_client.py stop` pour arrêter)")
+        try:
+            while not self.stopping.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+
+        # Arrêt depuis le thread principal: les réponses en cours sont terminées avant la sauvegarde
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        for thread in threads:
+            thread.join()
+        if self.socket_path is not None and self.socket_path.exists():
+            self.socket_path.unlink()
+        self.state.save()
+        print("👋 Démon arrêté, caches sauvegardés")
+
+    def stop(self):
+        """Demande l'arrêt (requête stop, SIGTERM)"""
+        self.stopping.set()
+
+
+def _socket_alive(socket_path: Path) -> bool:
+    """Vrai si un processus accepte les connexions sur le socket"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Démon d'analyse: index en mémoire interrogeables par socket")
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET_PATH), help=f'Socket Unix (défaut: {DEFAULT_SOCKET_PATH})')
+    parser.add_argument('--no-socket', action='store_true', help='Pas de socket Unix (HTTP seul)')
+    parser.add_argument('--http', type=int, metavar='PORT', help='Sert aussi les requêtes sur http://127.0.0.1:PORT')
+    parser.add_argument('--backend', choices=('auto', 'inotify', 'polling'), default='auto',
+                        help='Surveillance des fichiers (défaut: auto)')
+    args = parser.parse_args()
+    # Journal lisible au fil de l'eau quand la sortie est redirigée (--start du client)
+    sys.stdout.reconfigure(line_buffering=True)
+
+    socket_path = None if args.no_socket or not hasattr(socket, 'AF_UNIX') else Path(args.socket)
+    if socket_path is None and args.http is None:
+        print("❌ Ni socket Unix ni --http: aucun moyen d'interroger le démon")
+        return 1
+
+    print("🚀 Chargement des index...")
+    state = AnalysisState(os.getcwd())
+    status = state.status()
+    print(f"📚 {status['files']} fichiers, {status['identifiers']} identifiants, "
+          f"{status['graph_nodes']} modules, {status['css_files']} fichiers CSS/JS indexés en {status['load_ms']} ms")
+
+    daemon = AnalysisDaemon(state, socket_path, args.http, args.backend)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.serve()
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,36 +5,61 @@ Se base sur les données de l'audit des dépendances pour identifier
 les hooks spécifiques qui pourraient être généralisés.
 """
 
-import json
 import os
+import argparse
 from pathlib import Path
 from collections import defaultdict, Counter
+from typing import Optional
+
+from audit_store import DEFAULT_STORE_PATH, AuditStore
+from ndjson_stream import add_ndjson_argument, iter_hooks
+
+HOOKS_PREFIX = "src/hooks/"
+
+# Métriques par défaut d'une fiche antérieure à js_metrics.py (rapport JSON importé)
+NO_METRICS = {'cyclomatic_max': 0, 'most_complex_function': None, 'max_nesting': 0, 'effects_without_deps': 0}
 
 class GeneralizationCandidateAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, ndjson: Optional[str] = None):
         self.project_root = Path(project_root)
-        self.audit_data = None
+        self.store = None
+        # Flux NDJSON de l'audit (--ndjson): lu au fil de l'eau au lieu de la base
+        self.ndjson = ndjson
+        # Quasi-doublons de near_duplicates.py: fichier de hook -> paires qui le concernent
+        self.duplicates = defaultdict(list)
         
     def load_audit_data(self):
-        """Charge les données de l'audit précédent"""
-        audit_file = self.project_root / "tools" / "audit" / "rapport_dependances_hooks.json"
-        if not audit_file.exists():
-            raise FileNotFoundError(f"Fichier d'audit non trouvé: {audit_file}")
-        
-        with open(audit_file, 'r', encoding='utf-8') as f:
-            self.audit_data = json.load(f)
+        """Ouvre la base de l'audit précédent (importée du rapport JSON si besoin)"""
+        if self.store is None and self.ndjson is None:
+            self.store = AuditStore.open_audit(str(self.project_root))
+        self.load_duplicates()
+
+    def load_duplicates(self):
+        """Charge les paires de quasi-doublons entre hooks enregistrées par near_duplicates.py"""
+        if self.store is not None:
+            pairs = self.store.duplicate_pairs(HOOKS_PREFIX)
+        elif (self.project_root / DEFAULT_STORE_PATH).exists():
+            with AuditStore.open(str(self.project_root)) as store:
+                pairs = store.duplicate_pairs(HOOKS_PREFIX)
+        else:
+            pairs = []
+        self.duplicates.clear()
+        for pair in pairs:
+            self.duplicates[pair['a']].append(pair)
+            self.duplicates[pair['b']].append(pair)
     
     def identify_non_generic_hooks(self):
         """Identifie les hooks qui n'utilisent pas encore les génériques"""
-        non_generic = []
-        
-        for hook_key, hook_info in self.audit_data['hooks_inventory'].items():
-            if not hook_info['uses_generic'] and not hook_info['deprecated']:
-                # Exclut les hooks de base et utilitaires
-                if hook_info['domain'] not in ['common', 'root'] and 'index' not in hook_info['name'].lower():
-                    non_generic.append((hook_key, hook_info))
-        
-        return non_generic
+        if self.ndjson is not None:
+            # Seuls les hooks retenus sont gardés en mémoire
+            return [(hook_key, hook_info) for hook_key, hook_info in iter_hooks(self.ndjson)
+                    if not hook_info['uses_generic'] and not hook_info['deprecated']
+                    and hook_info['domain'] not in ['common', 'root']
+                    and 'index' not in hook_info['name'].lower()]
+        
+        # Exclut les hooks de base et utilitaires (requête sur les index de la base)
+        return list(self.store.hooks(uses_generic=False, deprecated=False,
+                                     exclude_domains=['common', 'root'], name_excludes='index'))
     
     def analyze_patterns_in_non_generic(self, non_generic_hooks):
         """Analyse les patterns dans les hooks non génériques"""
@@ -75,6 +100,7 @@ class GeneralizationCandidateAnalyzer:
             total_complexity = sum(h[1]['complexity_score'] for h in hooks)
             avg_complexity = total_complexity / total_hooks if total_hooks > 0 else 0
             total_lines = sum(h[1]['line_count'] for h in hooks)
+            metrics = [h[1].get('metrics', NO_METRICS) for h in hooks]
             
             # Analyse des domaines
             domains = Counter(h[1]['domain'] for h in hooks)
@@ -91,6 +117,10 @@ class GeneralizationCandidateAnalyzer:
             # Plus il y a de domaines différents, plus la généralisation est justifiée
             generalization_score += min(len(domains) * 15, 45)
             
+            # Code effectivement dupliqué (MinHash/LSH), et pas seulement des noms voisins
+            duplicated = [h for h in hooks if self.duplicates.get(HOOKS_PREFIX + h[1]['path'])]
+            generalization_score += min(len(duplicated) * 10, 30)
+            
             # Bonus pour les patterns déjà partiellement généralisés
             if pattern in ['form', 'details', 'search', 'list']:
                 generalization_score += 20
@@ -100,6 +130,9 @@ class GeneralizationCandidateAnalyzer:
                 'total_hooks': total_hooks,
                 'avg_complexity': round(avg_complexity, 1),
                 'total_lines': total_lines,
+                'max_cyclomatic': max(m['cyclomatic_max'] for m in metrics),
+                'effects_without_deps': sum(m['effects_without_deps'] for m in metrics),
+                'duplicated_hooks': len(duplicated),
                 'domains': dict(domains),
                 'generalization_score': generalization_score,
                 'priority': self._get_priority(generalization_score),
@@ -109,6 +142,41 @@ class GeneralizationCandidateAnalyzer:
         
         return evaluations
     
+    def evaluate_duplicate_clusters(self, hooks):
+        """Évalue chaque cluster de hooks quasi dupliqués comme candidat à la généralisation"""
+        infos = {HOOKS_PREFIX + hook_info['path']: hook_info for _, hook_info in hooks}
+        clusters = defaultdict(list)
+        for pairs in self.duplicates.values():
+            for pair in pairs:
+                if pair not in clusters[pair['cluster']]:
+                    clusters[pair['cluster']].append(pair)
+        
+        evaluations = []
+        for number, pairs in sorted(clusters.items()):
+            members = sorted({pair['a'] for pair in pairs} | {pair['b'] for pair in pairs})
+            known = [infos[member] for member in members if member in infos]
+            if len(known) < 2:
+                # Moins de deux hooks candidats (génériques, dépréciés ou communs exclus)
+                continue
+            similarity = sum(pair['similarity'] for pair in pairs) / len(pairs)
+            domains = Counter(info['domain'] for info in known)
+            total_lines = sum(info['line_count'] for info in known)
+            score = min(len(known) * 10, 50) + round(similarity * 50) + min(len(domains) * 15, 45)
+            evaluations.append({
+                'cluster': number,
+                'members': members,
+                'hooks': known,
+                'similarity': round(similarity, 2),
+                'pairs': pairs,
+                'domains': dict(domains),
+                'total_lines': total_lines,
+                'generalization_score': score,
+                'priority': self._get_priority(score),
+                'potential_savings': self._calculate_savings(total_lines, len(known))
+            })
+        evaluations.sort(key=lambda evaluation: -evaluation['generalization_score'])
+        return evaluations
+    
     def _get_priority(self, score):
         """Détermine la priorité basée sur le score"""
         if score >= 80:
@@ -152,9 +220,11 @@ class GeneralizationCandidateAnalyzer:
         interesting_hooks = []
         
         for hook_key, hook_info in non_generic_hooks:
+            metrics = hook_info.get('metrics', NO_METRICS)
             # Critères pour un hook intéressant
             is_interesting = (
                 hook_info['complexity_score'] > 40 or  # Complexité élevée
+                metrics['cyclomatic_max'] > 15 or      # Fonction très ramifiée
                 hook_info['line_count'] > 100 or       # Beaucoup de code
                 any(pattern in hook_info['name'].lower() 
                     for pattern in ['form', 'list', 'search', 'details'])  # Pattern générique
@@ -199,10 +269,11 @@ class GeneralizationCandidateAnalyzer:
         """Évalue la complexité de migration"""
         complexity = hook_info['complexity_score']
         lines = hook_info['line_count']
+        metrics = hook_info.get('metrics', NO_METRICS)
         
-        if complexity > 100 or lines > 400:
+        if complexity > 100 or lines > 400 or metrics['cyclomatic_max'] > 25 or metrics['max_nesting'] > 5:
             return "ÉLEVÉE - Nécessite analyse approfondie"
-        elif complexity > 50 or lines > 200:
+        elif complexity > 50 or lines > 200 or metrics['cyclomatic_max'] > 15 or metrics['effects_without_deps']:
             return "MODÉRÉE - Migration standard"
         else:
             return "FAIBLE - Migration simple"
@@ -228,6 +299,7 @@ class GeneralizationCandidateAnalyzer:
         patterns = self.analyze_patterns_in_non_generic(non_generic_hooks)
         evaluations = self.evaluate_generalization_potential(patterns)
         specific_analysis = self.analyze_specific_hooks(non_generic_hooks)
+        duplicate_clusters = self.evaluate_duplicate_clusters(non_generic_hooks)
         
         report = []
         report.append("# 🎯 ANALYSE DÉTAILLÉE DES CANDIDATS À LA GÉNÉRALISATION")
@@ -241,8 +313,30 @@ class GeneralizationCandidateAnalyzer:
         report.append(f"- **Hooks non génériques analysés**: {total_non_generic}")
         report.append(f"- **Patterns haute priorité**: {high_priority_patterns}")
         report.append(f"- **Hooks individuels intéressants**: {len(specific_analysis)}")
+        report.append(f"- **Clusters de code dupliqué**: {len(duplicate_clusters)}")
         report.append("")
         
+        # Doublons structurels mesurés (near_duplicates.py)
+        report.append("## 🧬 DOUBLONS STRUCTURELS (MinHash/LSH)")
+        if not self.duplicates:
+            report.append("*Aucune donnée: lancez `python tools/audit/near_duplicates.py`*")
+        elif not duplicate_clusters:
+            report.append("*Aucun cluster de hooks candidats*")
+        for evaluation in duplicate_clusters:
+            report.append(f"### Cluster {evaluation['cluster']} - Priorité {evaluation['priority']}")
+            report.append(f"- **Score de généralisation**: {evaluation['generalization_score']}")
+            report.append(f"- **Similarité moyenne**: {evaluation['similarity']}")
+            report.append(f"- **Domaines**: {', '.join(evaluation['domains'].keys())}")
+            report.append(f"- **Économies potentielles**: {evaluation['potential_savings']}")
+            for pair in evaluation['pairs'][:5]:
+                ranges_a = ", ".join(f"{start}-{end}" for start, end in pair['ranges_a'][:3])
+                ranges_b = ", ".join(f"{start}-{end}" for start, end in pair['ranges_b'][:3])
+                report.append(f"  - `{Path(pair['a']).name}` ↔ `{Path(pair['b']).name}`: {pair['similarity']:.2f} "
+                              f"(lignes {ranges_a} ↔ {ranges_b})")
+            report.append("")
+        if not duplicate_clusters:
+            report.append("")
+        
         # Analyse par patterns
         report.append("## 🔍 ANALYSE PAR PATTERNS")
         
@@ -260,6 +354,10 @@ class GeneralizationCandidateAnalyzer:
             report.append(f"- **Hooks concernés**: {eval_data['total_hooks']}")
             report.append(f"- **Complexité moyenne**: {eval_data['avg_complexity']}")
             report.append(f"- **Lignes totales**: {eval_data['total_lines']}")
+            report.append(f"- **Cyclomatique max**: {eval_data['max_cyclomatic']}")
+            report.append(f"- **Hooks avec un quasi-doublon**: {eval_data['duplicated_hooks']}")
+            if eval_data['effects_without_deps']:
+                report.append(f"- **Effets sans tableau de dépendances**: {eval_data['effects_without_deps']}")
             report.append(f"- **Domaines**: {', '.join(eval_data['domains'].keys())}")
             report.append(f"- **Effort estimé**: {eval_data['estimated_effort']}")
             report.append(f"- **Économies potentielles**: {eval_data['potential_savings']}")
@@ -284,6 +382,11 @@ class GeneralizationCandidateAnalyzer:
             report.append(f"### {hook_info['name']} ({hook_info['domain']})")
             report.append(f"- **Lignes**: {hook_info['line_count']}")
             report.append(f"- **Complexité**: {hook_info['complexity_score']}")
+            metrics = hook_info.get('metrics')
+            if metrics:
+                report.append(f"- **Cyclomatique max**: {metrics['cyclomatic_max']} ({metrics['most_complex_function']}), "
+                              f"imbrication {metrics['max_nesting']}, "
+                              f"{metrics['effects_without_deps']} effet(s) sans dépendances")
             report.append(f"- **Potentiel**: {analysis['generalization_potential']}")
             report.append(f"- **Complexité migration**: {analysis['migration_complexity']}")
             report.append(f"- **Impact métier**: {analysis['business_impact']}")
@@ -361,8 +464,12 @@ class GeneralizationCandidateAnalyzer:
 
 def main():
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description='Analyse des candidats à la généralisation des hooks')
+    add_ndjson_argument(parser, "Lit les hooks depuis le flux NDJSON de l'audit au lieu de la base")
+    args = parser.parse_args()
+
     project_root = os.getcwd()
-    analyzer = GeneralizationCandidateAnalyzer(project_root)
+    analyzer = GeneralizationCandidateAnalyzer(project_root, ndjson=args.ndjson)
     
     print("🚀 Analyse des candidats à la généralisation...")
     
@@ -6,16 +6,32 @@ les améliorations possibles pour documenter les dépendances.
 """
 
 import os
+import sys
+import argparse
 import re
-import json
 from pathlib import Path
 from collections import defaultdict, Counter
+from typing import Optional
+
+from source_corpus import SourceCorpus
+from audit_store import AuditStore
+from ndjson_stream import add_ndjson_argument, iter_hooks
+from graph_engine import expand_scope
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import GitScope, add_scope_arguments, resolve_scope
 
 class HookDocumentationAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 scope: Optional[GitScope] = None, ndjson: Optional[str] = None):
         self.project_root = Path(project_root)
         self.docs_dir = self.project_root / "docs"
         self.hooks_dir = self.project_root / "src" / "hooks"
+        self.corpus = corpus or SourceCorpus(project_root)
+        # Périmètre git (--since/--staged): seuls ces fichiers sont analysés
+        self.scope = scope
+        # Flux NDJSON de l'audit (--ndjson): lu au fil de l'eau au lieu de la base
+        self.ndjson = ndjson
         
         # Patterns pour analyser la documentation
         self.dependency_patterns = [
@@ -26,6 +42,16 @@ class HookDocumentationAnalyzer:
             r'connecté\s+(?:à|avec)',
             r'basé\s+sur'
         ]
+        # Mots qu'une mention de chaque motif contient forcément: le motif n'est
+        # recherché (sans tenir compte de la casse, donc lentement) que s'ils figurent tous
+        self.dependency_keywords = [
+            ('dépend',),
+            ('utilise', 'hook'),
+            ('import', 'from', 'hooks'),
+            ('relation',),
+            ('connecté',),
+            ('basé', 'sur')
+        ]
         
         self.documentation_quality_indicators = [
             r'@param',
@@ -48,26 +74,32 @@ class HookDocumentationAnalyzer:
         
         # Analyse des fichiers de documentation hooks
         hooks_docs_dir = self.docs_dir / "hooks"
-        if hooks_docs_dir.exists():
-            for doc_file in hooks_docs_dir.rglob("*.md"):
-                self._analyze_doc_file(doc_file, "hooks_docs")
+        doc_sources = self.corpus.files(hooks_docs_dir, ('.md',))
+        hook_sources = self.corpus.files(self.hooks_dir)
+        if self.scope is not None:
+            doc_sources = [source for source in doc_sources if self.scope.contains(source.path)]
+            hook_sources = [source for source in hook_sources if self.scope.contains(source.path)]
+        for doc_source in doc_sources:
+            self._analyze_doc_file(doc_source.path, "hooks_docs")
         
         # Analyse des fichiers README dans les dossiers hooks
-        for hook_dir in self.hooks_dir.iterdir():
-            if hook_dir.is_dir():
-                readme_file = hook_dir / "README.md"
-                if readme_file.exists():
-                    self._analyze_doc_file(readme_file, f"hook_readme_{hook_dir.name}")
+        for source in hook_sources:
+            relative_parts = source.path.relative_to(self.hooks_dir).parts
+            if len(relative_parts) == 2 and relative_parts[1] == "README.md":
+                self._analyze_doc_file(source.path, f"hook_readme_{relative_parts[0]}")
         
         # Analyse des commentaires dans les fichiers hooks
-        for hook_file in self.hooks_dir.rglob("*.js"):
+        for source in hook_sources:
+            hook_file = source.path
+            if hook_file.suffix != ".js":
+                continue
             if "__tests__" not in str(hook_file) and "index.js" not in hook_file.name:
                 self._analyze_hook_file_comments(hook_file)
     
     def _analyze_doc_file(self, file_path: Path, category: str):
         """Analyse un fichier de documentation"""
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = self._read_source(file_path)
             relative_path = file_path.relative_to(self.project_root)
             
             doc_info = {
@@ -90,16 +122,13 @@ class HookDocumentationAnalyzer:
     def _analyze_hook_file_comments(self, file_path: Path):
         """Analyse les commentaires dans un fichier hook"""
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = self._read_source(file_path)
             relative_path = file_path.relative_to(self.hooks_dir)
             
-            # Extrait les commentaires JSDoc
-            jsdoc_pattern = r'/\*\*(.*?)\*/'
-            jsdoc_comments = re.findall(jsdoc_pattern, content, re.DOTALL)
-            
-            # Extrait les commentaires inline
-            inline_pattern = r'//\s*(.*?)$'
-            inline_comments = re.findall(inline_pattern, content, re.MULTILINE)
+            # Commentaires JSDoc et inline, hors chaînes et URLs (lexer partagé)
+            module = self.corpus.module(file_path, comments=True)
+            jsdoc_comments = module.jsdoc_comments()
+            inline_comments = module.line_comments()
             
             hook_info = {
                 'path': str(relative_path),
@@ -119,10 +148,20 @@ class HookDocumentationAnalyzer:
         except Exception as e:
             print(f"⚠️ Erreur lors de l'analyse de {file_path}: {e}")
     
+    def _read_source(self, file_path: Path) -> str:
+        """Lit un fichier via le corpus partagé"""
+        source = self.corpus.get(file_path)
+        if source is None:
+            raise FileNotFoundError(f"Fichier illisible: {file_path}")
+        return source.content
+    
     def _find_dependency_mentions(self, content: str) -> list:
         """Trouve les mentions de dépendances dans le contenu"""
         mentions = []
-        for pattern in self.dependency_patterns:
+        folded = content.casefold()
+        for pattern, keywords in zip(self.dependency_patterns, self.dependency_keywords):
+            if not all(keyword in folded for keyword in keywords):
+                continue
             matches = re.finditer(pattern, content, re.IGNORECASE)
             for match in matches:
                 # Extrait le contexte autour de la mention
@@ -232,7 +271,7 @@ class HookDocumentationAnalyzer:
             stripped = line.strip()
             if not stripped:
                 continue
-            elif stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
+            elif stripped.startswith(('//', '/*', '*')):
                 comment_lines += 1
             else:
                 code_lines += 1
@@ -253,46 +292,65 @@ class HookDocumentationAnalyzer:
             'inconsistent_documentation': []
         }
         
-        # Charge les données d'audit des hooks
-        audit_file = self.project_root / "tools" / "audit" / "rapport_dependances_hooks.json"
-        if audit_file.exists():
-            with open(audit_file, 'r', encoding='utf-8') as f:
-                audit_data = json.load(f)
-            
-            # Analyse chaque hook
-            for hook_key, hook_info in audit_data['hooks_inventory'].items():
-                hook_doc_key = f"hook_file_{hook_info['path']}"
-                
-                # Vérifie si le hook a de la documentation
-                if hook_doc_key in self.documentation_inventory:
-                    doc_info = self.documentation_inventory[hook_doc_key]
-                    
-                    # Hook mal documenté
-                    if doc_info['documentation_ratio'] < 0.1:  # Moins de 10% de commentaires
-                        gaps['poorly_documented_hooks'].append({
-                            'hook': hook_key,
-                            'ratio': doc_info['documentation_ratio'],
-                            'reason': 'Ratio de documentation faible'
-                        })
-                    
-                    # Dépendances non documentées
-                    if hook_info.get('imports') and not doc_info['dependency_mentions']:
-                        gaps['undocumented_dependencies'].append({
-                            'hook': hook_key,
-                            'dependencies': hook_info['imports'],
-                            'reason': 'Dépendances non documentées'
-                        })
-                
+        if self.ndjson is not None:
+            # Flux NDJSON: chaque hook est classé dès sa lecture
+            # Un flux partiel n'est accepté que pour une analyse elle-même limitée
+            for hook_key, hook_info in iter_hooks(self.ndjson, allow_partial=self.scope is not None):
+                doc_info = self.documentation_inventory.get(f"hook_file_{hook_info['path']}")
+                if doc_info is None:
+                    self._record_documentation_gaps(gaps, hook_key, None, 0, hook_info['imports'])
                 else:
-                    # Hook sans documentation du tout
-                    gaps['poorly_documented_hooks'].append({
-                        'hook': hook_key,
-                        'ratio': 0.0,
-                        'reason': 'Aucune documentation trouvée'
-                    })
+                    self._record_documentation_gaps(gaps, hook_key, doc_info['documentation_ratio'],
+                                                    len(doc_info['dependency_mentions']), hook_info['imports'])
+            return gaps
+        
+        # Croise l'inventaire des hooks de l'audit avec les fiches de documentation
+        try:
+            store = AuditStore.open_audit(str(self.project_root))
+        except FileNotFoundError:
+            return gaps
+        
+        with store:
+            # Périmètre git: mise à jour partielle des fiches, les autres restent en base
+            store.write_doc_records(self.documentation_inventory, replace=self.scope is None)
+            
+            for row in store.hook_documentation():
+                self._record_documentation_gaps(
+                    gaps, row['key'], row['doc_ratio'] if row['documented'] else None, row['doc_mentions'],
+                    store.hook_imports(row['key']) if row['has_imports'] else []
+                )
         
         return gaps
     
+    def _record_documentation_gaps(self, gaps: dict, hook_key: str, doc_ratio: Optional[float],
+                                   doc_mentions: int, imports: list):
+        """Classe un hook selon sa fiche de commentaires (doc_ratio None: aucune fiche)"""
+        # Vérifie si le hook a de la documentation
+        if doc_ratio is not None:
+            # Hook mal documenté
+            if doc_ratio < 0.1:  # Moins de 10% de commentaires
+                gaps['poorly_documented_hooks'].append({
+                    'hook': hook_key,
+                    'ratio': doc_ratio,
+                    'reason': 'Ratio de documentation faible'
+                })
+            
+            # Dépendances non documentées
+            if imports and not doc_mentions:
+                gaps['undocumented_dependencies'].append({
+                    'hook': hook_key,
+                    'dependencies': imports,
+                    'reason': 'Dépendances non documentées'
+                })
+        
+        else:
+            # Hook sans documentation du tout
+            gaps['poorly_documented_hooks'].append({
+                'hook': hook_key,
+                'ratio': 0.0,
+                'reason': 'Aucune documentation trouvée'
+            })
+    
     def generate_documentation_improvement_plan(self):
         """Génère un plan d'amélioration de la documentation"""
         print("📋 Génération du plan d'amélioration...")
@@ -448,13 +506,29 @@ class HookDocumentationAnalyzer:
 
 def main():
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_scope_arguments(parser)
+    add_ndjson_argument(parser, "Lit les hooks depuis le flux NDJSON de l'audit au lieu de la base")
+    args = parser.parse_args()
+
     project_root = os.getcwd()
-    analyzer = HookDocumentationAnalyzer(project_root)
+    corpus = SourceCorpus.open(project_root)
+    scope = resolve_scope(project_root, args.since, args.staged)
+    if scope is not None:
+        expand_scope(scope, project_root, corpus)
+        print(scope.summary())
+    analyzer = HookDocumentationAnalyzer(project_root, corpus=corpus, scope=scope, ndjson=args.ndjson)
     
     print("🚀 Analyse de la documentation des hooks...")
     
     try:
         plan = analyzer.generate_documentation_improvement_plan()
+        corpus.save()
+        
+        if scope is not None:
+            # Plan partiel: affiché, sans remplacer le plan complet
+            print(plan)
+            return
         
         # Sauvegarde le plan
         output_file = Path(project_root) / "tools" / "audit" / "plan_amelioration_documentation.md"
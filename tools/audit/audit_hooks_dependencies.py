@@ -7,19 +7,57 @@ et documente les dépendances entre hooks.
 
 import os
 import re
+import sys
 import json
+import argparse
+from contextlib import redirect_stdout
 from pathlib import Path
 from collections import defaultdict, Counter
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from source_corpus import SourceCorpus, SourceFile
+from hook_cache import HookInfoCache
+from audit_store import AuditStore
+from ndjson_stream import STDIO, NdjsonWriter, add_ndjson_argument
+from js_lexer import LEXER_VERSION, ModuleInfo
+from js_metrics import METRICS_VERSION
+from module_resolver import ModuleResolver, build_module_graph
+from identifier_index import CONSUMER_ROOTS, IdentifierIndex
+from graph_engine import COMPONENTS_PREFIX, CompactGraph, expand_scope
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import GitScope, add_scope_arguments, resolve_scope, scope_description
+from phase_timer import PhaseTimer, add_profile_argument
+
+# Version de l'analyse par fichier: à incrémenter dès que le calcul d'une
+# fiche hook_info change. La clé du cache incrémental y ajoute les versions
+# du lexer (imports/exports) et des métriques, qui font partie de la fiche.
+HOOK_INFO_VERSION = "3"
+ANALYZER_VERSION = f"{HOOK_INFO_VERSION}:{LEXER_VERSION}:{METRICS_VERSION}"
+
+# Spécificateur d'import désignant un module de src/hooks
+HOOK_SPECIFIER = re.compile(r'^@?/?hooks/(.+)$')
 
 class HookDependencyAnalyzer:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 cache: Optional[HookInfoCache] = None, scope: Optional[GitScope] = None,
+                 timer: Optional[PhaseTimer] = None, stream: Optional[NdjsonWriter] = None):
         self.project_root = Path(project_root)
         self.hooks_dir = self.project_root / "src" / "hooks"
-        self.components_dir = self.project_root / "src" / "components"
+        self.corpus = corpus or SourceCorpus(project_root)
+        self.cache = cache
+        # Périmètre git (--since/--staged): seuls ces fichiers sont analysés
+        self.scope = scope
+        # Temps par phase de generate_report (et profils avec --profile)
+        self.timer = timer or PhaseTimer()
+        # Flux NDJSON (--ndjson): enregistrements écrits au fil de l'analyse, en plus de
+        # l'inventaire gardé en mémoire pour les rapports et la base d'audit
+        self.stream = stream
+        self.resolver = ModuleResolver(project_root, self.corpus)
+        # Index identifiant -> occurrences (identifier_index.py), construit à la demande
+        self.index = None
         
         # Patterns pour identifier les hooks
-        self.hook_import_pattern = re.compile(r'import\s+.*?from\s+[\'"]@?/?hooks/([^\'\"]+)[\'"]')
         self.hook_usage_pattern = re.compile(r'use[A-Z][a-zA-Z]*')
         self.generic_hooks = {
             'useGenericEntityDetails', 'useGenericEntityForm', 
@@ -29,6 +67,9 @@ class HookDependencyAnalyzer:
         
         # Résultats de l'analyse
         self.hooks_inventory = {}
+        self.hook_files = {}  # chemin relatif au projet -> clé domaine/nom
+        self.module_graph = None
+        self.graph_engine = None
         self.dependencies = defaultdict(set)
         self.usage_stats = defaultdict(int)
         self.generic_adoption = defaultdict(list)
@@ -38,66 +79,138 @@ class HookDependencyAnalyzer:
         """Scanne le répertoire hooks et inventorie tous les hooks"""
         print("🔍 Analyse du répertoire hooks...")
         
-        for hook_file in self.hooks_dir.rglob("*.js"):
+        seen_paths = []
+        for source in self.corpus.files(self.hooks_dir, ('.js',)):
+            hook_file = source.path
             if "__tests__" in str(hook_file) or "index.js" in hook_file.name:
                 continue
+            if self.scope is not None and not self.scope.contains(hook_file):
+                continue
                 
-            relative_path = hook_file.relative_to(self.hooks_dir)
-            domain = relative_path.parts[0] if len(relative_path.parts) > 1 else "root"
-            hook_name = hook_file.stem
-            
             # Analyse du contenu du fichier
-            content = self._read_file_safe(hook_file)
-            if not content:
+            if not source.content:
                 continue
-                
-            hook_info = {
-                'path': str(relative_path),
-                'domain': domain,
-                'name': hook_name,
-                'file_size': len(content),
-                'line_count': len(content.splitlines()),
-                'imports': self._extract_imports(content),
-                'exports': self._extract_exports(content),
-                'uses_generic': self._uses_generic_hooks(content),
-                'complexity_score': self._calculate_complexity(content),
-                'is_wrapper': self._is_wrapper_hook(content),
-                'deprecated': '@deprecated' in content or 'DEPRECATED' in content
-            }
+            
+            seen_paths.append(source.relative)
+            hook_info = self.hook_info(source)
+            domain, hook_name = hook_info['domain'], hook_info['name']
             
             self.hooks_inventory[f"{domain}/{hook_name}"] = hook_info
+            self.hook_files[source.relative] = f"{domain}/{hook_name}"
+            if self.stream:
+                self.stream.write('hook', key=f"{domain}/{hook_name}", **hook_info)
+        
+        if self.cache and self.scope is None:
+            self.cache.evict_missing(seen_paths)
+        if self.cache:
+            print(f"   ♻️ Cache: {self.cache.stats['hits']} réutilisés, "
+                  f"{self.cache.stats['misses']} analysés, {self.cache.stats['evicted']} évincés")
             
         return self.hooks_inventory
 
+    def hook_info(self, source: SourceFile) -> Dict:
+        """Fiche d'un hook de src/hooks, réutilisée du cache si son contenu n'a pas changé"""
+        hook_info = self.cache.get(source.relative, source.digest) if self.cache else None
+        if hook_info is None:
+            relative_path = source.path.relative_to(self.hooks_dir)
+            domain = relative_path.parts[0] if len(relative_path.parts) > 1 else "root"
+            # Lexé avec ses commentaires: les analyseurs de documentation relisent ce module sauvegardé
+            hook_info = self._analyze_hook(relative_path, domain, source.path.stem, source.content,
+                                           self.corpus.module(source, comments=True), self.corpus.metrics(source))
+            if self.cache:
+                self.cache.put(source.relative, source.digest, hook_info)
+        return hook_info
+
+    def _analyze_hook(self, relative_path: Path, domain: str, hook_name: str, content: str,
+                      module: ModuleInfo, metrics: Dict) -> Dict:
+        """Calcule la fiche d'un hook à partir de son contenu, de ses imports/exports et de ses métriques"""
+        line_count = len(content.splitlines())
+        uses_generic = self._uses_generic_hooks(content)
+        return {
+            'path': str(relative_path),
+            'domain': domain,
+            'name': hook_name,
+            'file_size': len(content),
+            'line_count': line_count,
+            'imports': self._extract_imports(module),
+            'exports': self._extract_exports(module),
+            'uses_generic': uses_generic,
+            'complexity_score': self._calculate_complexity(line_count, metrics),
+            'is_wrapper': self._is_wrapper_hook(uses_generic, line_count, metrics),
+            'deprecated': '@deprecated' in content or 'DEPRECATED' in content,
+            'metrics': metrics
+        }
+
     def analyze_dependencies(self):
         """Analyse les dépendances entre hooks"""
         print("🔗 Analyse des dépendances...")
         
-        for hook_key, hook_info in self.hooks_inventory.items():
-            for import_path in hook_info['imports']:
-                # Nettoie le chemin d'import
-                clean_path = import_path.replace('@/hooks/', '').replace('../', '')
-                if clean_path != hook_key:
-                    self.dependencies[hook_key].add(clean_path)
+        # Graphe des fichiers réels de src/ (alias, chemins relatifs, barrels index.js)
+        self.module_graph = build_module_graph(self.corpus, self.resolver)
+        unresolved = sum(len(specifiers) for specifiers in self.module_graph.unresolved.values())
+        print(f"   🧭 Graphe: {len(self.module_graph.nodes)} fichiers, "
+              f"{sum(len(targets) for targets in self.module_graph.edges.values())} imports résolus, "
+              f"{unresolved} non résolus")
+
+        self.graph_engine = CompactGraph.from_module_graph(self.module_graph)
+        if self.stream:
+            for source_file, targets in self.module_graph.edges.items():
+                for target in targets:
+                    self.stream.write('edge', source=source_file, target=target)
+
+        for hook_file, hook_key in self.hook_files.items():
+            for target in self.module_graph.edges.get(hook_file, ()):
+                target_key = self.hook_files.get(target)
+                if target_key is not None and target_key != hook_key:
+                    if self.stream and target_key not in self.dependencies[hook_key]:
+                        self.stream.write('dependency', source=hook_key, target=target_key)
+                    self.dependencies[hook_key].add(target_key)
+
+    def identifier_index(self) -> IdentifierIndex:
+        """Index inversé des consommateurs qui citent un hook générique (construit au premier appel)
+
+        Index partiel: seuls les fichiers de CONSUMER_ROOTS (du périmètre git
+        avec --since/--staged) dont le texte contient le nom d'un hook
+        générique sont indexés; les autres ne peuvent pas l'utiliser.
+        """
+        if self.index is None:
+            paths = [source.relative
+                     for root in CONSUMER_ROOTS for source in self.corpus.files(root, ('.js', '.jsx'))
+                     if (self.scope is None or self.scope.contains(source.path))
+                     and any(hook in source.content for hook in self.generic_hooks)]
+            self.index = IdentifierIndex.open(str(self.project_root), self.corpus, roots=CONSUMER_ROOTS,
+                                              paths=paths)
+        return self.index
 
     def analyze_usage_in_components(self):
-        """Analyse l'utilisation des hooks dans les composants"""
+        """Analyse l'utilisation des hooks dans les composants, pages, contextes et services"""
         print("📊 Analyse de l'utilisation dans les composants...")
         
-        for component_file in self.components_dir.rglob("*.js"):
-            content = self._read_file_safe(component_file)
-            if not content:
-                continue
-                
-            # Trouve les imports de hooks
-            imports = self.hook_import_pattern.findall(content)
-            for import_path in imports:
-                self.usage_stats[import_path] += 1
+        index = self.identifier_index()
+        for root in CONSUMER_ROOTS:
+            for source in self.corpus.files(root, ('.js',)):
+                if self.scope is not None and not self.scope.contains(source.path):
+                    continue
+                if not source.content:
+                    continue
+                    
+                # Trouve les imports de hooks
+                for import_path in self._extract_imports(self.corpus.module(source)):
+                    self.usage_stats[import_path] += 1
                 
-            # Analyse l'adoption des hooks génériques
-            for generic_hook in self.generic_hooks:
-                if generic_hook in content:
-                    self.generic_adoption[generic_hook].append(str(component_file.relative_to(self.project_root)))
+        # Adoption des hooks génériques: une recherche dans l'index par hook
+        for generic_hook in sorted(self.generic_hooks):
+            for component in index.files_using(generic_hook, roots=CONSUMER_ROOTS):
+                if self.scope is not None and not self.scope.contains(self.project_root / component):
+                    continue
+                self.generic_adoption[generic_hook].append(component)
+                if self.stream:
+                    self.stream.write('generic_adoption', generic_hook=generic_hook, component=component)
+        
+        # Les compteurs ne sont définitifs qu'une fois tous les composants parcourus
+        if self.stream:
+            for import_path, count in self.usage_stats.items():
+                self.stream.write('usage', import_path=import_path, count=count)
 
     def identify_generalization_candidates(self) -> Dict:
         """Identifie les hooks candidats à la généralisation"""
@@ -175,6 +288,7 @@ class HookDependencyAnalyzer:
             
             # Complexité moyenne
             avg_complexity = sum(h['complexity_score'] for _, h in domain_hooks) / total_hooks if total_hooks > 0 else 0
+            effects_without_deps = sum(h['metrics']['effects_without_deps'] for _, h in domain_hooks)
             
             # Patterns communs
             patterns = Counter()
@@ -193,6 +307,7 @@ class HookDependencyAnalyzer:
                 'deprecated_hooks': deprecated_hooks,
                 'wrapper_hooks': wrapper_hooks,
                 'avg_complexity': round(avg_complexity, 1),
+                'effects_without_deps': effects_without_deps,
                 'patterns': dict(patterns),
                 'hooks': [(key, info['name'], info['complexity_score'], info['uses_generic']) for key, info in domain_hooks]
             }
@@ -206,9 +321,14 @@ class HookDependencyAnalyzer:
         graph = {
             'nodes': [],
             'edges': [],
-            'clusters': defaultdict(list)
+            'clusters': defaultdict(list),
+            'cycles': []
         }
         
+        # Composants affectés transitivement (parcours inverse mémorisé par composante)
+        components_mask = self.graph_engine.mask(lambda name: name.startswith(COMPONENTS_PREFIX))
+        hook_paths = {hook_key: hook_file for hook_file, hook_key in self.hook_files.items()}
+        
         # Noeuds
         for hook_key, hook_info in self.hooks_inventory.items():
             node = {
@@ -216,9 +336,11 @@ class HookDependencyAnalyzer:
                 'label': hook_info['name'],
                 'domain': hook_info['domain'],
                 'complexity': hook_info['complexity_score'],
+                'cyclomatic_max': hook_info['metrics']['cyclomatic_max'],
                 'uses_generic': hook_info['uses_generic'],
                 'deprecated': hook_info['deprecated'],
-                'usage_count': self.usage_stats.get(hook_info['path'], 0)
+                'usage_count': self.usage_stats.get(hook_info['path'], 0),
+                'blast_radius': self.graph_engine.blast_radius(hook_paths[hook_key], components_mask)
             }
             graph['nodes'].append(node)
             graph['clusters'][hook_info['domain']].append(hook_key)
@@ -232,66 +354,57 @@ class HookDependencyAnalyzer:
                     'type': 'dependency'
                 })
         
+        # Cycles d'imports impliquant au moins un hook (composantes de Tarjan)
+        graph['cycles'] = [cycle for cycle in self.graph_engine.cycles()
+                           if any(path in self.hook_files for path in cycle)]
+        
         return graph
 
-    def _read_file_safe(self, file_path: Path) -> str:
-        """Lit un fichier de manière sécurisée"""
-        try:
-            return file_path.read_text(encoding='utf-8')
-        except Exception:
-            return ""
-
-    def _extract_imports(self, content: str) -> List[str]:
-        """Extrait les imports de hooks"""
+    def _extract_imports(self, module: ModuleInfo) -> List[str]:
+        """Extrait les imports de hooks (chemin relatif à src/hooks)"""
         imports = []
-        for match in self.hook_import_pattern.finditer(content):
-            imports.append(match.group(1))
+        for record in module.imports:
+            if record['kind'] not in ('static', 'reexport'):
+                continue
+            match = HOOK_SPECIFIER.match(record['source'])
+            if match:
+                imports.append(match.group(1))
         return imports
 
-    def _extract_exports(self, content: str) -> List[str]:
+    def _extract_exports(self, module: ModuleInfo) -> List[str]:
         """Extrait les exports"""
-        exports = []
-        export_patterns = [
-            r'export\s+(?:default\s+)?(?:const|function)\s+(\w+)',
-            r'export\s+\{\s*([^}]+)\s*\}',
-            r'export\s+default\s+(\w+)'
-        ]
-        
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content)
-            exports.extend(matches)
-        
-        return exports
+        return module.exported_names()
 
     def _uses_generic_hooks(self, content: str) -> bool:
         """Vérifie si le hook utilise des hooks génériques"""
         return any(generic in content for generic in self.generic_hooks)
 
-    def _calculate_complexity(self, content: str) -> int:
-        """Calcule un score de complexité approximatif"""
-        lines = content.splitlines()
+    def _calculate_complexity(self, line_count: int, metrics: Dict) -> int:
+        """Calcule un score de complexité approximatif (jetons hors commentaires et chaînes)"""
+        hook_calls = metrics['hook_calls']
+        statements = metrics['statements']
         score = 0
         
         # Facteurs de complexité
-        score += len(lines) // 10  # Longueur
-        score += content.count('useState') * 2
-        score += content.count('useEffect') * 3
-        score += content.count('useCallback') * 2
-        score += content.count('useMemo') * 2
-        score += content.count('if (') + content.count('if(')
-        score += content.count('for (') + content.count('for(')
-        score += content.count('while (') + content.count('while(')
-        score += content.count('try {') * 2
-        score += content.count('catch') * 2
+        score += line_count // 10  # Longueur
+        score += hook_calls['useState'] * 2
+        score += hook_calls['useEffect'] * 3
+        score += hook_calls['useCallback'] * 2
+        score += hook_calls['useMemo'] * 2
+        score += statements['if']
+        score += statements['for']
+        score += statements['while']
+        score += statements['try'] * 2
+        score += statements['catch'] * 2
         
         return score
 
-    def _is_wrapper_hook(self, content: str) -> bool:
+    def _is_wrapper_hook(self, uses_generic: bool, line_count: int, metrics: Dict) -> bool:
         """Détermine si c'est un hook wrapper"""
         return (
-            any(generic in content for generic in self.generic_hooks) and
-            content.count('return') <= 2 and
-            len(content.splitlines()) < 50
+            uses_generic and
+            metrics['statements']['return'] <= 2 and
+            line_count < 50
         )
 
     def generate_report(self) -> str:
@@ -299,14 +412,24 @@ class HookDependencyAnalyzer:
         print("📋 Génération du rapport...")
         
         # Exécute toutes les analyses
-        self.scan_hooks_directory()
-        self.analyze_dependencies()
-        self.analyze_usage_in_components()
-        candidates = self.identify_generalization_candidates()
-        domain_analysis = self.analyze_domain_specific_hooks()
-        dependency_graph = self.generate_dependency_graph()
-        
-        # Génère le rapport
+        with self.timer.phase('scan'):
+            self.scan_hooks_directory()
+        with self.timer.phase('dependencies'):
+            self.analyze_dependencies()
+        with self.timer.phase('usage'):
+            self.analyze_usage_in_components()
+        with self.timer.phase('candidates'):
+            candidates = self.identify_generalization_candidates()
+        with self.timer.phase('domains'):
+            domain_analysis = self.analyze_domain_specific_hooks()
+        with self.timer.phase('graph'):
+            dependency_graph = self.generate_dependency_graph()
+        
+        with self.timer.phase('report'):
+            return self._render_report(candidates, domain_analysis, dependency_graph)
+
+    def _render_report(self, candidates: Dict, domain_analysis: Dict, dependency_graph: Dict) -> str:
+        """Met en forme le rapport Markdown à partir des résultats d'analyse"""
         report = []
         report.append("# 🔍 AUDIT DES DÉPENDANCES ENTRE HOOKS TOURCRAFT")
         report.append(f"*Généré le: {self._get_current_date()}*\n")
@@ -329,6 +452,7 @@ class HookDependencyAnalyzer:
             report.append(f"- **Hooks dépréciés**: {analysis['deprecated_hooks']}")
             report.append(f"- **Hooks wrappers**: {analysis['wrapper_hooks']}")
             report.append(f"- **Complexité moyenne**: {analysis['avg_complexity']}")
+            report.append(f"- **Effets sans tableau de dépendances**: {analysis['effects_without_deps']}")
             
             if analysis['patterns']:
                 report.append("- **Patterns identifiés**:")
@@ -346,6 +470,10 @@ class HookDependencyAnalyzer:
                 report.append(f"- **{hook_info['name']}** ({hook_info['domain']})")
                 report.append(f"  - Pattern: {pattern}")
                 report.append(f"  - Complexité: {hook_info['complexity_score']}")
+                report.append(f"  - Cyclomatique max: {hook_info['metrics']['cyclomatic_max']} "
+                              f"({hook_info['metrics']['most_complex_function']}), "
+                              f"imbrication: {hook_info['metrics']['max_nesting']}, "
+                              f"effets sans dépendances: {hook_info['metrics']['effects_without_deps']}")
                 report.append(f"  - Utilisation: {usage} composants")
                 report.append(f"  - Lignes: {hook_info['line_count']}")
         else:
@@ -384,6 +512,19 @@ class HookDependencyAnalyzer:
             report.append("*Aucune dépendance critique identifiée*")
         report.append("")
         
+        # Rayon d'impact et cycles
+        report.append("## 💥 RAYON D'IMPACT")
+        impacted = sorted(dependency_graph['nodes'], key=lambda node: (-node['blast_radius'], node['id']))
+        for node in [node for node in impacted if node['blast_radius'] > 0][:10]:
+            report.append(f"- **{node['id']}**: {node['blast_radius']} composants affectés transitivement")
+        if dependency_graph['cycles']:
+            report.append(f"### 🔄 {len(dependency_graph['cycles'])} cycle(s) d'imports")
+            for cycle in dependency_graph['cycles']:
+                report.append(f"- {' ↔ '.join(cycle)}")
+        else:
+            report.append("*Aucun cycle d'imports entre hooks*")
+        report.append("")
+        
         # Recommandations
         report.append("## 💡 RECOMMANDATIONS")
         
@@ -438,15 +579,40 @@ class HookDependencyAnalyzer:
         from datetime import datetime
         return datetime.now().strftime("%d/%m/%Y à %H:%M")
 
-def main():
-    """Fonction principale"""
+def print_timings(timer: PhaseTimer):
+    """Affiche le temps par phase (et écrit les profils avec --profile)"""
+    print("\n" + timer.summary_table())
+    timer.write_profiles()
+
+def run_audit(args, stream: Optional[NdjsonWriter] = None):
+    """Exécute l'audit avec les options de la ligne de commande"""
     project_root = os.getcwd()
-    analyzer = HookDependencyAnalyzer(project_root)
+    corpus = SourceCorpus.open(project_root)
+    cache = HookInfoCache.open(project_root, ANALYZER_VERSION)
+    scope = resolve_scope(project_root, args.since, args.staged)
+    if scope is not None:
+        expand_scope(scope, project_root, corpus)
+        print(scope.summary())
+    timer = PhaseTimer(args.profile)
+    analyzer = HookDependencyAnalyzer(project_root, corpus=corpus, cache=cache, scope=scope, timer=timer,
+                                      stream=stream)
     
     print("🚀 Démarrage de l'audit des dépendances entre hooks...")
     
     try:
         report = analyzer.generate_report()
+        corpus.save()
+        cache.save()
+        if stream:
+            stream.close()
+            if stream.target != STDIO:
+                print(f"🌊 Flux NDJSON écrit: {stream.target}")
+        
+        if scope is not None:
+            # Rapport partiel: affiché, sans remplacer le rapport complet
+            print(report)
+            print_timings(timer)
+            return
         
         # Sauvegarde le rapport
         output_file = Path(project_root) / "tools" / "audit" / "rapport_dependances_hooks.md"
@@ -463,7 +629,8 @@ def main():
             'hooks_inventory': analyzer.hooks_inventory,
             'dependencies': {k: list(v) for k, v in analyzer.dependencies.items()},
             'usage_stats': dict(analyzer.usage_stats),
-            'generic_adoption': {k: list(v) for k, v in analyzer.generic_adoption.items()}
+            'generic_adoption': {k: list(v) for k, v in analyzer.generic_adoption.items()},
+            'module_graph': analyzer.module_graph.to_dict() if analyzer.module_graph else None
         }
         
         with open(json_file, 'w', encoding='utf-8') as f:
@@ -471,10 +638,36 @@ def main():
         
         print(f"📊 Données JSON sauvegardées: {json_file}")
         
+        # Base SQLite indexée, interrogée par les analyseurs suivants
+        with AuditStore.open(project_root) as store:
+            store.write_audit(analyzer.hooks_inventory, analyzer.dependencies, analyzer.usage_stats,
+                              analyzer.generic_adoption, json_data['module_graph'],
+                              generated_at=analyzer._get_current_date())
+            print(f"🗄️ Base d'audit mise à jour: {store.db_path}")
+        print_timings(timer)
+        
     except Exception as e:
         print(f"❌ Erreur lors de l'audit: {e}")
         import traceback
         traceback.print_exc()
 
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description='Audit des dépendances entre hooks')
+    add_scope_arguments(parser)
+    add_profile_argument(parser, Path("tools") / "audit" / ".cache" / "profile")
+    add_ndjson_argument(parser, "Écrit aussi les résultats en NDJSON au fil de l'analyse")
+    args = parser.parse_args()
+
+    # L'en-tête du flux signale un inventaire partiel (--since/--staged)
+    scope = scope_description(args.since, args.staged)
+    if args.ndjson == STDIO:
+        # La sortie standard porte le flux: les messages passent sur stderr
+        stream = NdjsonWriter(STDIO, scope=scope)
+        with redirect_stdout(sys.stderr):
+            run_audit(args, stream)
+    else:
+        run_audit(args, NdjsonWriter(args.ndjson, scope=scope) if args.ndjson else None)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Base SQLite des résultats d'audit des hooks
+audit_hooks_dependencies.py y enregistre son inventaire (hooks, fichiers et
+imports résolus, exports, dépendances entre hooks, utilisations) en une seule
+transaction, et analyze_hook_documentation.py y ajoute ses fiches de
+documentation. Les analyseurs suivants interrogent les tables indexées
+("hooks non génériques et non dépréciés du domaine X") au lieu de recharger
+et parcourir tout rapport_dependances_hooks.json.
+
+Si la base n'existe pas encore mais que le rapport JSON est présent, il est
+importé une fois (migration).
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from graph_engine import COMPONENTS_PREFIX, HOOKS_PREFIX
+
+SCHEMA_VERSION = 3
+DEFAULT_STORE_PATH = Path("tools") / "audit" / ".cache" / "audit.sqlite"
+AUDIT_JSON_PATH = Path("tools") / "audit" / "rapport_dependances_hooks.json"
+
+# Colonnes de la table hooks, dans l'ordre des fiches hook_info
+HOOK_COLUMNS = ('path', 'domain', 'name', 'file_size', 'line_count', 'uses_generic',
+                'complexity_score', 'is_wrapper', 'deprecated')
+BOOLEAN_COLUMNS = ('uses_generic', 'is_wrapper', 'deprecated')
+# Métriques de js_metrics.py copiées en colonnes (la fiche complète est gardée en JSON)
+METRIC_COLUMNS = ('cyclomatic_max', 'max_nesting', 'effects_without_deps')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_kind ON files(kind);
+
+-- Imports résolus entre fichiers (graphe de module_resolver)
+CREATE TABLE IF NOT EXISTS imports (
+    source_id INTEGER NOT NULL REFERENCES files(id),
+    target_id INTEGER NOT NULL REFERENCES files(id),
+    PRIMARY KEY (source_id, target_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS imports_target ON imports(target_id);
+
+CREATE TABLE IF NOT EXISTS hooks (
+    key TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file_size INTEGER,
+    line_count INTEGER,
+    uses_generic INTEGER NOT NULL,
+    complexity_score INTEGER,
+    is_wrapper INTEGER NOT NULL,
+    deprecated INTEGER NOT NULL,
+    cyclomatic_max INTEGER,
+    max_nesting INTEGER,
+    effects_without_deps INTEGER,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS hooks_domain ON hooks(domain, uses_generic, deprecated);
+CREATE INDEX IF NOT EXISTS hooks_generic ON hooks(uses_generic, deprecated);
+CREATE INDEX IF NOT EXISTS hooks_path ON hooks(path);
+
+-- Imports de hooks déclarés par chaque hook (chemins relatifs à src/hooks)
+CREATE TABLE IF NOT EXISTS hook_imports (
+    hook_key TEXT NOT NULL,
+    import_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hook_imports_hook ON hook_imports(hook_key);
+CREATE INDEX IF NOT EXISTS hook_imports_path ON hook_imports(import_path);
+
+CREATE TABLE IF NOT EXISTS exports (
+    hook_key TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exports_hook ON exports(hook_key);
+CREATE INDEX IF NOT EXISTS exports_name ON exports(name);
+
+CREATE TABLE IF NOT EXISTS dependencies (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (source, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dependencies_target ON dependencies(target);
+
+-- Utilisations dans les composants: imports de hooks et adoption des génériques
+CREATE TABLE IF NOT EXISTS usages (
+    import_path TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS generic_adoption (
+    generic_hook TEXT NOT NULL,
+    component TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS generic_adoption_hook ON generic_adoption(generic_hook);
+
+-- Quasi-doublons structurels (near_duplicates.py): chemins relatifs au projet
+CREATE TABLE IF NOT EXISTS duplicate_pairs (
+    a TEXT NOT NULL,
+    b TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    cluster INTEGER NOT NULL,
+    ranges TEXT NOT NULL,
+    PRIMARY KEY (a, b)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS duplicate_pairs_b ON duplicate_pairs(b);
+
+-- Fiches de documentation (analyze_hook_documentation.py)
+CREATE TABLE IF NOT EXISTS doc_records (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    category TEXT NOT NULL,
+    documentation_ratio REAL,
+    dependency_mentions INTEGER NOT NULL,
+    quality_score INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS doc_records_category ON doc_records(category);
+"""
+
+AUDIT_TABLES = ('imports', 'files', 'hook_imports', 'exports', 'dependencies', 'usages', 'generic_adoption', 'hooks')
+
+
+def _file_kind(path: str) -> str:
+    if path.startswith(HOOKS_PREFIX):
+        return 'hook'
+    if path.startswith(COMPONENTS_PREFIX):
+        return 'component'
+    return 'other'
+
+
+class AuditStore:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        # La base n'est qu'un cache, reconstruit par l'audit: pas de synchronisation disque à chaque transaction
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self._ensure_schema()
+
+    @classmethod
+    def open(cls, project_root: str, db_path: Optional[str] = None) -> "AuditStore":
+        return cls(db_path or Path(project_root) / DEFAULT_STORE_PATH)
+
+    @classmethod
+    def open_audit(cls, project_root: str, db_path: Optional[str] = None) -> "AuditStore":
+        """Ouvre la base en exigeant un audit (importé du rapport JSON s'il n'y est pas encore)"""
+        store = cls.open(project_root, db_path)
+        if not store.has_audit():
+            json_path = Path(project_root) / AUDIT_JSON_PATH
+            if not json_path.exists():
+                store.close()
+                raise FileNotFoundError(f"Aucun audit enregistré: lancez audit_hooks_dependencies.py ({json_path})")
+            store.import_json(json_path)
+        return store
+
+    def _ensure_schema(self):
+        row = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if row is not None and row[0] != str(SCHEMA_VERSION):
+            # Schéma d'une autre version: la base n'est qu'un cache, elle est reconstruite
+            tables = [r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            with self.conn:
+                for table in tables:
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                              (str(SCHEMA_VERSION),))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "AuditStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Écriture
+
+    def write_audit(self, hooks_inventory: Dict[str, Dict], dependencies: Dict[str, Iterable[str]],
+                    usage_stats: Dict[str, int], generic_adoption: Dict[str, Iterable[str]],
+                    module_graph: Optional[Dict] = None, generated_at: str = ""):
+        """Remplace l'audit enregistré, en une seule transaction"""
+        with self.conn:
+            for table in AUDIT_TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+
+            columns = ('key',) + HOOK_COLUMNS + METRIC_COLUMNS + ('metrics',)
+            self.conn.executemany(
+                f"INSERT INTO hooks ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                ((key, *(int(info[column]) if column in BOOLEAN_COLUMNS else info[column] for column in HOOK_COLUMNS),
+                  *self._metric_values(info.get('metrics')))
+                 for key, info in hooks_inventory.items())
+            )
+            self.conn.executemany("INSERT INTO hook_imports (hook_key, import_path) VALUES (?, ?)",
+                                  ((key, path) for key, info in hooks_inventory.items() for path in info['imports']))
+            self.conn.executemany("INSERT INTO exports (hook_key, name) VALUES (?, ?)",
+                                  ((key, name) for key, info in hooks_inventory.items() for name in info['exports']))
+            self.conn.executemany("INSERT OR IGNORE INTO dependencies (source, target) VALUES (?, ?)",
+                                  ((source, target) for source, targets in dependencies.items() for target in targets))
+            self.conn.executemany("INSERT INTO usages (import_path, count) VALUES (?, ?)", usage_stats.items())
+            self.conn.executemany("INSERT INTO generic_adoption (generic_hook, component) VALUES (?, ?)",
+                                  ((hook, component) for hook, components in generic_adoption.items()
+                                   for component in components))
+
+            if module_graph:
+                paths = set(module_graph['nodes']) | set(module_graph['edges'])
+                self.conn.executemany("INSERT INTO files (path, kind) VALUES (?, ?)",
+                                      ((path, _file_kind(path)) for path in sorted(paths)))
+                ids = dict(self.conn.execute("SELECT path, id FROM files"))
+                self.conn.executemany("INSERT OR IGNORE INTO imports (source_id, target_id) VALUES (?, ?)",
+                                      ((ids[source], ids[target]) for source, targets in module_graph['edges'].items()
+                                       for target in targets))
+
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('audit_generated_at', ?)",
+                              (generated_at,))
+
+    @staticmethod
+    def _metric_values(metrics: Optional[Dict]) -> Tuple:
+        """Colonnes de métriques d'une fiche (NULL pour un rapport antérieur aux métriques)"""
+        if metrics is None:
+            return (None,) * (len(METRIC_COLUMNS) + 1)
+        return (*(metrics[column] for column in METRIC_COLUMNS), json.dumps(metrics, ensure_ascii=False))
+
+    def import_json(self, json_path):
+        """Importe un rapport rapport_dependances_hooks.json existant"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.write_audit(data['hooks_inventory'], data.get('dependencies', {}), data.get('usage_stats', {}),
+                         data.get('generic_adoption', {}), data.get('module_graph'), generated_at=str(json_path))
+
+    def write_doc_records(self, records: Dict[str, Dict], replace: bool = True):
+        """Enregistre les fiches de documentation (replace=False: mise à jour partielle)"""
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM doc_records")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO doc_records (key, path, category, documentation_ratio, "
+                "dependency_mentions, quality_score, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((key, record['path'], record['category'], record.get('documentation_ratio'),
+                  len(record.get('dependency_mentions', ())), record.get('quality_score'),
+                  json.dumps(record, ensure_ascii=False))
+                 for key, record in records.items())
+            )
+
+    def write_duplicates(self, pairs: Iterable[Dict]):
+        """Remplace les paires de quasi-doublons (clés a, b, similarity, cluster, ranges_a, ranges_b)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM duplicate_pairs")
+            self.conn.executemany(
+                "INSERT INTO duplicate_pairs (a, b, similarity, cluster, ranges) VALUES (?, ?, ?, ?, ?)",
+                ((pair['a'], pair['b'], pair['similarity'], pair['cluster'],
+                  json.dumps([pair['ranges_a'], pair['ranges_b']]))
+                 for pair in pairs)
+            )
+
+    # Requêtes
+
+    def has_audit(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'audit_generated_at'").fetchone() is not None
+
+    @staticmethod
+    def _hook_info(row: sqlite3.Row) -> Dict:
+        info = {column: row[column] for column in HOOK_COLUMNS}
+        for column in BOOLEAN_COLUMNS:
+            info[column] = bool(info[column])
+        if row['metrics'] is not None:
+            info['metrics'] = json.loads(row['metrics'])
+        return info
+
+    def hooks(self, domain: Optional[str] = None, uses_generic: Optional[bool] = None,
+              deprecated: Optional[bool] = None, exclude_domains: Iterable[str] = (),
+              name_excludes: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """Fiches (clé, hook_info) filtrées par index, dans l'ordre de l'inventaire"""
+        clauses, params = [], []
+        if domain is not None:
+            clauses.append("domain = ?")
+            params.append(domain)
+        if uses_generic is not None:
+            clauses.append("uses_generic = ?")
+            params.append(int(uses_generic))
+        if deprecated is not None:
+            clauses.append("deprecated = ?")
+            params.append(int(deprecated))
+        exclude_domains = list(exclude_domains)
+        if exclude_domains:
+            clauses.append(f"domain NOT IN ({', '.join('?' * len(exclude_domains))})")
+            params.extend(exclude_domains)
+        if name_excludes:
+            clauses.append("instr(lower(name), ?) = 0")
+            params.append(name_excludes.lower())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        for row in self.conn.execute(f"SELECT * FROM hooks{where} ORDER BY rowid", params):
+            yield row['key'], self._hook_info(row)
+
+    def duplicate_pairs(self, path_prefix: str = '') -> List[Dict]:
+        """Paires de quasi-doublons dont les deux fichiers commencent par path_prefix"""
+        rows = self.conn.execute(
+            "SELECT * FROM duplicate_pairs WHERE a LIKE ? || '%' AND b LIKE ? || '%' ORDER BY similarity DESC, a, b",
+            (path_prefix, path_prefix))
+        pairs = []
+        for row in rows:
+            ranges_a, ranges_b = json.loads(row['ranges'])
+            pairs.append({'a': row['a'], 'b': row['b'], 'similarity': row['similarity'], 'cluster': row['cluster'],
+                          'ranges_a': ranges_a, 'ranges_b': ranges_b})
+        return pairs
+
+    def hook_imports(self, hook_key: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT import_path FROM hook_imports WHERE hook_key = ? ORDER BY rowid", (hook_key,))]
+
+    def hook_documentation(self) -> Iterator[sqlite3.Row]:
+        """Chaque hook avec sa fiche de commentaires (colonnes doc_* NULL si absente)"""
+        return self.conn.execute(
+            """
+            SELECT h.key, h.path,
+                   d.key IS NOT NULL AS documented,
+                   d.documentation_ratio AS doc_ratio,
+                   d.dependency_mentions AS doc_mentions,
+                   EXISTS (SELECT 1 FROM hook_imports i WHERE i.hook_key = h.key) AS has_imports
+            FROM hooks h
+            LEFT JOIN doc_records d ON d.key = 'hook_file_' || h.path
+            ORDER BY h.rowid
+            """
+        )
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark du lexer JavaScript (js_lexer.scan_module)
+Compare, sur un corpus d'au moins 100 000 lignes construit à partir des
+fichiers de src/, les regex ad hoc historiques au scan structuré:
+- imports/exports seuls: hook_import_pattern + trois patterns d'export
+  (HookDependencyAnalyzer) contre scan_module sans commentaires;
+- jeu complet remplacé: les mêmes plus, sur les seuls hooks (src/hooks)
+  comme dans les outils, les regex JSDoc et inline de l'analyseur de
+  documentation et la regex JSDoc du validateur, contre scan_module avec
+  commentaires sur les hooks et sans sur les autres fichiers (les
+  commentaires ne sont relevés que là où ils sont lus).
+
+Usage: python tools/audit/benchmark_js_lexer.py [--lines=100000] [--runs=5]
+"""
+
+import os
+import re
+import time
+import argparse
+import statistics
+
+from source_corpus import SourceCorpus
+from js_lexer import scan_module
+
+LEGACY_IMPORT_PATTERN = re.compile(r'import\s+.*?from\s+[\'"]@?/?hooks/([^\'\"]+)[\'"]')
+LEGACY_EXPORT_PATTERNS = [
+    r'export\s+(?:default\s+)?(?:const|function)\s+(\w+)',
+    r'export\s+\{\s*([^}]+)\s*\}',
+    r'export\s+default\s+(\w+)'
+]
+LEGACY_COMMENT_PATTERNS = [
+    re.compile(r'/\*\*(.*?)\*/', re.DOTALL),
+    re.compile(r'//\s*(.*?)$', re.MULTILINE)
+]
+
+
+def build_corpus(project_root: str, min_lines: int):
+    """Répète les fichiers JS de src/ jusqu'à atteindre min_lines lignes
+
+    Retourne des couples (contenu, hook), hook indiquant un fichier de src/hooks.
+    """
+    sources = [(f.content, f.relative.startswith('src/hooks/'))
+               for f in SourceCorpus(project_root).files('src', ('.js', '.jsx')) if f.content]
+    if not sources:
+        raise SystemExit("❌ Aucun fichier JS dans src/ (lancer depuis la racine du projet)")
+    documents = []
+    total_lines = 0
+    while total_lines < min_lines:
+        for document in sources:
+            documents.append(document)
+            total_lines += document[0].count('\n') + 1
+            if total_lines >= min_lines:
+                break
+    return documents, total_lines
+
+
+def legacy_scan(documents, with_comments):
+    for content, hook in documents:
+        LEGACY_IMPORT_PATTERN.findall(content)
+        for pattern in LEGACY_EXPORT_PATTERNS:
+            re.findall(pattern, content)
+        if with_comments and hook:
+            for pattern in LEGACY_COMMENT_PATTERNS:
+                pattern.findall(content)
+            # Le validateur relisait les blocs JSDoc de son côté
+            LEGACY_COMMENT_PATTERNS[0].findall(content)
+
+
+def lexer_scan(documents, with_comments):
+    for content, hook in documents:
+        scan_module(content, with_comments=with_comments and hook)
+
+
+def median_time(function, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du lexer JavaScript')
+    parser.add_argument('--lines', type=int, default=100000, help='Taille minimale du corpus en lignes')
+    parser.add_argument('--runs', type=int, default=5, help='Nombre de répétitions')
+    args = parser.parse_args()
+
+    documents, total_lines = build_corpus(os.getcwd(), args.lines)
+    size = sum(len(content) for content, _ in documents)
+    hooks = sum(1 for _, hook in documents if hook)
+    print(f"📄 Corpus: {len(documents)} fichiers ({hooks} hooks), {total_lines} lignes, {size / 1e6:.1f} Mo")
+
+    legacy = median_time(lambda: legacy_scan(documents, False), args.runs)
+    legacy_comments = median_time(lambda: legacy_scan(documents, True), args.runs)
+    lexer = median_time(lambda: lexer_scan(documents, False), args.runs)
+    lexer_comments = median_time(lambda: lexer_scan(documents, True), args.runs)
+
+    print("Imports/exports:")
+    print(f"  🐢 Regex historiques : {legacy * 1000:8.1f} ms")
+    print(f"  ⚡ scan_module       : {lexer * 1000:8.1f} ms ({legacy / lexer:.2f}x)")
+    print("Imports/exports + commentaires des hooks:")
+    print(f"  🐢 Regex historiques : {legacy_comments * 1000:8.1f} ms")
+    print(f"  ⚡ scan_module       : {lexer_comments * 1000:8.1f} ms ({legacy_comments / lexer_comments:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
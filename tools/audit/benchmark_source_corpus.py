@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark du corpus partagé des sources
+Compare une session d'audit complète (dépendances, documentation, validation)
+selon trois modes :
+- separate  : chaque analyseur parcourt et relit src/ pour son propre compte
+- shared    : un seul parcours de src/ partagé entre les analyseurs
+- persisted : le corpus est rechargé depuis sa sauvegarde disque
+
+Avec --baseline=REV, mesure aussi l'audit à froid de bout en bout: les trois
+scripts lancés chacun dans un processus neuf, caches vidés, avec les outils
+de la révision git REV puis avec ceux de l'arbre de travail (copiés dans un
+répertoire temporaire, src/, docs/ et jsconfig.json partagés), et compare
+le gain à l'objectif de 3x.
+
+Usage: python tools/audit/benchmark_source_corpus.py [--runs=5] [--json=fichier] [--baseline=REV]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import tarfile
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+
+from source_corpus import SourceCorpus
+from audit_hooks_dependencies import HookDependencyAnalyzer
+from analyze_hook_documentation import HookDocumentationAnalyzer
+from validate_hook_documentation import HookDocumentationValidator
+
+SESSION_SCRIPTS = ('audit_hooks_dependencies.py', 'analyze_hook_documentation.py',
+                   'validate_hook_documentation.py')
+COLD_AUDIT_TARGET = 3.0
+# Entrées du projet reliées dans les arbres mesurés à froid
+TREE_LINKS = ('src', 'docs', 'jsconfig.json')
+
+
+def run_session(project_root: str, corpus_factory):
+    """Exécute une session d'audit et retourne les octets lus"""
+    corpora = []
+
+    def make_corpus():
+        corpus = corpus_factory()
+        if corpus not in corpora:
+            corpora.append(corpus)
+        return corpus
+
+    with redirect_stdout(io.StringIO()):
+        HookDependencyAnalyzer(project_root, corpus=make_corpus()).generate_report()
+        HookDocumentationAnalyzer(project_root, corpus=make_corpus()).scan_documentation()
+        HookDocumentationValidator(project_root, corpus=make_corpus()).validate_all_priority_hooks()
+
+    return sum(corpus.stats['bytes_read'] for corpus in corpora)
+
+
+def measure(label: str, runs: int, session):
+    """Mesure une session plusieurs fois et retourne la médiane"""
+    timings = []
+    bytes_read = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        bytes_read = session()
+        timings.append(time.perf_counter() - start)
+    return {
+        'mode': label,
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'bytes_read': bytes_read
+    }
+
+
+def prepare_tree(project_root: str, target: Path, revision: str = None) -> Path:
+    """Outils de la révision git (ou de l'arbre de travail) dans target, src/, docs/ et jsconfig.json reliés au projet"""
+    target.mkdir(parents=True)
+    if revision is None:
+        shutil.copytree(Path(project_root) / "tools", target / "tools",
+                        ignore=shutil.ignore_patterns('.cache', '__pycache__'))
+    else:
+        archive = subprocess.run(['git', 'archive', revision, 'tools'], cwd=project_root,
+                                 capture_output=True, check=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(target)
+    # docs/ (analyse de la documentation) et jsconfig.json (alias du graphe des modules):
+    # sans eux, les deux arbres mesureraient une session qui ne trouve rien
+    for name in TREE_LINKS:
+        if (Path(project_root) / name).exists():
+            (target / name).symlink_to(Path(project_root) / name)
+    return target
+
+
+def cold_audit(tree: Path) -> float:
+    """Durée de la session complète, chaque script dans un processus neuf, caches vidés"""
+    shutil.rmtree(tree / "tools" / "audit" / ".cache", ignore_errors=True)
+    # Les .pyc doivent pouvoir être écrits, sinon chaque processus recompile les outils
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    start = time.perf_counter()
+    for script in SESSION_SCRIPTS:
+        subprocess.run([sys.executable, str(Path("tools") / "audit" / script)], cwd=tree, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def compare_cold_audit(project_root: str, revision: str, runs: int, work_dir: Path):
+    """Audit à froid de la révision de référence et de l'arbre de travail"""
+    results = []
+    for label, tree in (('baseline', prepare_tree(project_root, work_dir / "baseline", revision)),
+                        ('current', prepare_tree(project_root, work_dir / "current"))):
+        # Première exécution non mesurée: compilation des .pyc
+        cold_audit(tree)
+        timings = [cold_audit(tree) for _ in range(runs)]
+        results.append({'mode': f'cold-{label}', 'median_s': statistics.median(timings), 'min_s': min(timings)})
+
+    speedup = results[0]['median_s'] / results[1]['median_s']
+    print(f"\n🧊 AUDIT À FROID ({' + '.join(SESSION_SCRIPTS)})")
+    print(f"{'Arbre':<12}{'Médiane':>12}{'Min':>12}")
+    for label, result in zip((revision, 'courant'), results):
+        print(f"{label[:11]:<12}{result['median_s'] * 1000:>10.1f}ms{result['min_s'] * 1000:>10.1f}ms")
+    if speedup >= COLD_AUDIT_TARGET:
+        print(f"✅ Gain {speedup:.2f}x (objectif {COLD_AUDIT_TARGET:.0f}x atteint)")
+    else:
+        print(f"⚠️ Gain {speedup:.2f}x: objectif {COLD_AUDIT_TARGET:.0f}x NON atteint")
+    results[1]['speedup'] = round(speedup, 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du corpus partagé des sources')
+    parser.add_argument('--runs', type=int, default=5, help='Nombre de répétitions par mode')
+    parser.add_argument('--json', help='Fichier de sortie JSON des résultats')
+    parser.add_argument('--baseline', metavar='REV',
+                        help="Compare aussi l'audit à froid à celui de la révision git REV")
+    args = parser.parse_args()
+
+    project_root = os.getcwd()
+    cache_dir = tempfile.TemporaryDirectory()
+    cache_path = Path(cache_dir.name) / "source_corpus.pickle"
+    SourceCorpus(project_root, cache_path=cache_path).load().save()
+
+    results = [
+        measure('separate', args.runs,
+                lambda: run_session(project_root, lambda: SourceCorpus(project_root))),
+    ]
+
+    def shared_session():
+        corpus = SourceCorpus(project_root)
+        return run_session(project_root, lambda: corpus)
+
+    def persisted_session():
+        corpus = SourceCorpus.open(project_root, cache_path=cache_path)
+        return run_session(project_root, lambda: corpus)
+
+    results.append(measure('shared', args.runs, shared_session))
+    results.append(measure('persisted', args.runs, persisted_session))
+
+    baseline = results[0]['median_s']
+    print("📊 SESSION D'AUDIT (médiane sur {} exécutions)".format(args.runs))
+    print(f"{'Mode':<12}{'Médiane':>12}{'Min':>12}{'Octets lus':>14}{'Gain':>8}")
+    for result in results:
+        result['speedup'] = round(baseline / result['median_s'], 2) if result['median_s'] else 0
+        print(f"{result['mode']:<12}{result['median_s'] * 1000:>10.1f}ms{result['min_s'] * 1000:>10.1f}ms"
+              f"{result['bytes_read']:>14}{result['speedup']:>7}x")
+
+    if args.baseline:
+        results.extend(compare_cold_audit(project_root, args.baseline, args.runs, Path(cache_dir.name) / "trees"))
+
+    cache_dir.cleanup()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Résultats sauvegardés: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Client du démon d'analyse (analysis_daemon.py)
+N'importe que la bibliothèque standard: la réponse arrive en quelques
+millisecondes, ce qui permet de l'appeler depuis un éditeur ou un hook
+pre-commit. --start lance le démon en arrière-plan s'il ne répond pas.
+
+Usage:
+    python tools/audit/daemon_client.py usages useGenericEntityList
+    python tools/audit/daemon_client.py dependents src/hooks/common/useCache.js
+    python tools/audit/daemon_client.py css-var --tc-color-primary
+    python tools/audit/daemon_client.py complexity useLieuDetails [--json]
+    python tools/audit/daemon_client.py status | refresh | stop
+    python tools/audit/daemon_client.py --http=8765 usages useCache
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_SOCKET_PATH = Path("tools") / "audit" / ".cache" / "analysis_daemon.sock"
+QUERIES = ('usages', 'dependents', 'css-var', 'complexity', 'status', 'refresh', 'stop')
+MUTATING_QUERIES = ('refresh', 'stop')
+START_TIMEOUT = 60.0
+CLIENT_OPTIONS = ('--socket', '--http', '--start', '--json', '--help', '-h')
+
+
+class DaemonUnavailable(Exception):
+    """Aucun démon ne répond"""
+
+
+def query_socket(socket_path: Path, query: str, arg: Optional[str]) -> Dict:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError as e:
+        client.close()
+        raise DaemonUnavailable(f"{socket_path}: {e.strerror or e}")
+    with client, client.makefile('rwb') as stream:
+        stream.write(json.dumps({'query': query, 'arg': arg}).encode('utf-8') + b'\n')
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise DaemonUnavailable("connexion fermée par le démon")
+    return json.loads(line)
+
+
+def query_http(port: int, query: str, arg: Optional[str]) -> Dict:
+    # Importés ici: urllib.request allonge le démarrage du client par socket
+    from urllib.error import URLError
+    from urllib.parse import quote
+    from urllib.request import Request, urlopen
+
+    if query in MUTATING_QUERIES:
+        # refresh et stop modifient l'état du démon: POST uniquement
+        request = Request(f"http://127.0.0.1:{port}/{query}", method='POST',
+                          data=json.dumps({'arg': arg}).encode('utf-8'),
+                          headers={'Content-Type': 'application/json'})
+    else:
+        request = Request(f"http://127.0.0.1:{port}/{query}" + (f"?arg={quote(arg)}" if arg else ""))
+    try:
+        with urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+    except URLError as e:
+        body = getattr(e, 'read', None)
+        if body is not None:
+            # Erreur HTTP 400/405/415: le corps contient la réponse JSON du démon
+            return json.loads(body())
+        raise DaemonUnavailable(f"127.0.0.1:{port}: {e.reason}")
+
+
+def start_daemon(socket_path: Path, http_port: Optional[int]):
+    """Lance le démon détaché et attend qu'il réponde"""
+    import subprocess
+
+    command = [sys.executable, str(Path(__file__).resolve().parent / "analysis_daemon.py"), f"--socket={socket_path}"]
+    if http_port is not None:
+        command.append(f"--http={http_port}")
+    log_path = socket_path.with_suffix('.log')
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                         start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        try:
+            return send(socket_path, http_port, 'status', None)
+        except DaemonUnavailable:
+            continue
+    raise DaemonUnavailable(f"le démon n'a pas démarré (voir {log_path})")
+
+
+def send(socket_path: Path, http_port: Optional[int], query: str, arg: Optional[str]) -> Dict:
+    if http_port is not None:
+        return query_http(http_port, query, arg)
+    return query_socket(socket_path, query, arg)
+
+
+def print_result(query: str, result: Dict):
+    """Affichage lisible de chaque type de réponse"""
+    if query == 'usages':
+        print(f"🔎 {result['name']}: {len(result['occurrences'])} occurrence(s) dans {len(result['files'])} fichier(s)")
+        for occurrence in result['occurrences']:
+            print(f"  [{occurrence['role']:<6}] {occurrence['file']}:{occurrence['line']}")
+        usage = result.get('real_usage')
+        if usage is not None:
+            print(f"  📊 Utilisation réelle: {usage['total']} (index.js {usage['exports_in_index']}, "
+                  f"imports {usage['direct_imports']}, code {usage['code_usage']}, tests {usage['test_usage']})")
+    elif query == 'dependents':
+        print(f"⬆️ {result['file']}: {len(result['direct'])} importeur(s) direct(s), "
+              f"{len(result['transitive'])} dépendant(s) transitif(s)")
+        direct = set(result['direct'])
+        for name in result['transitive']:
+            print(f"  {'→' if name in direct else ' '} {name}")
+    elif query == 'css-var':
+        print(f"🎨 {result['name']}: {len(result['definitions'])} définition(s), "
+              f"{result['usage_count']} utilisation(s) dans {len(result['used_in'])} fichier(s)")
+        for site in result['definitions']:
+            context = f" [{site['context']}]" if site.get('context') else ""
+            print(f"  {site['file']}:{site['line']}  {site['selector']}{context}")
+    elif query == 'complexity':
+        print(f"🧮 {result['file']}")
+        print(f"  Score de complexité: {result['complexity_score']} ({result['line_count']} lignes)")
+        print(f"  Cyclomatique max: {result['cyclomatic_max']} ({result['most_complex_function']})")
+        print(f"  Imbrication max: {result['max_nesting']}, effets sans dépendances: {result['effects_without_deps']}")
+        calls = ', '.join(f"{name} {count}" for name, count in result['hook_calls'].items() if count)
+        print(f"  Appels de hooks: {calls or 'aucun'}")
+    else:
+        for key, value in result.items():
+            print(f"  {key}: {value if not isinstance(value, list) else len(value)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interroge le démon d'analyse")
+    parser.add_argument('query', choices=QUERIES, help='Requête')
+    parser.add_argument('arg', nargs='?', help='Identifiant, fichier, variable CSS ou hook')
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET_PATH), help=f'Socket Unix (défaut: {DEFAULT_SOCKET_PATH})')
+    parser.add_argument('--http', type=int, metavar='PORT', help='Interroge http://127.0.0.1:PORT au lieu du socket')
+    parser.add_argument('--start', action='store_true', help="Lance le démon s'il ne répond pas")
+    parser.add_argument('--json', action='store_true', help='Affiche la réponse JSON brute')
+    # "css-var --tc-x": le nom de la variable ressemble à une option (le démon rajoute le --)
+    argv = sys.argv[1:]
+    if 'css-var' in argv:
+        position = argv.index('css-var') + 1
+        if position < len(argv) and argv[position].startswith('--') \
+                and argv[position].split('=')[0] not in CLIENT_OPTIONS:
+            argv[position] = argv[position][2:]
+    args = parser.parse_args(argv)
+
+    socket_path = Path(args.socket)
+    if not socket_path.is_absolute():
+        socket_path = Path(os.getcwd()) / socket_path
+    try:
+        try:
+            response = send(socket_path, args.http, args.query, args.arg)
+        except DaemonUnavailable:
+            if not args.start or args.query == 'stop':
+                raise
+            print("🚀 Démarrage du démon d'analyse...", file=sys.stderr)
+            start_daemon(socket_path, args.http)
+            response = send(socket_path, args.http, args.query, args.arg)
+    except DaemonUnavailable as e:
+        print(f"❌ Démon d'analyse injoignable ({e})", file=sys.stderr)
+        print("   Lancer: python tools/audit/analysis_daemon.py &  (ou --start)", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+    elif not response['ok']:
+        print(f"❌ {response['error']}", file=sys.stderr)
+    else:
+        print_result(args.query, response['result'])
+    return 0 if response['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
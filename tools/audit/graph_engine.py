@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Moteur de requêtes sur le graphe des modules TourCraft
+Compacte le graphe de module_resolver en tableaux d'entiers (adjacence CSR
+directe et inverse), détecte les cycles d'imports (composantes fortement
+connexes de Tarjan) et répond aux requêtes de fermeture transitive ("A
+dépend-il de B ?", dépendants d'un fichier, rayon d'impact d'un hook: nombre
+de composants qui en dépendent transitivement) par un parcours en largeur sur
+les tableaux CSR, mémorisé par composante: seules les composantes
+interrogées sont parcourues, sans matrice de fermeture en O(n²).
+
+Le graphe compacté est mis en cache, indexé par l'empreinte des sources:
+les requêtes restent instantanées depuis un éditeur ou un hook pre-commit.
+
+Usage:
+    python tools/audit/graph_engine.py --cycles
+    python tools/audit/graph_engine.py --dependents src/hooks/common/useCache.js
+    python tools/audit/graph_engine.py --dependencies src/hooks/common/useCache.js
+    python tools/audit/graph_engine.py --blast-radius [--top=20]
+"""
+
+import os
+import sys
+import pickle
+import hashlib
+import argparse
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from source_corpus import SourceCorpus
+from js_lexer import LEXER_VERSION
+from module_resolver import JS_SUFFIXES, ModuleGraph, ModuleResolver, build_module_graph
+
+GRAPH_VERSION = 2
+DEFAULT_CACHE_PATH = Path("tools") / "audit" / ".cache" / "dependency_graph.pickle"
+COMPONENTS_PREFIX = "src/components/"
+HOOKS_PREFIX = "src/hooks/"
+
+
+class CompactGraph:
+    """Graphe orienté à sommets entiers, adjacences CSR directe et inverse"""
+
+    def __init__(self, names: List[str], edges: Dict[str, Iterable[str]]):
+        self.names = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        size = len(self.names)
+
+        forward = [[] for _ in range(size)]
+        backward = [[] for _ in range(size)]
+        for source, targets in edges.items():
+            s = self.index[source]
+            for target in targets:
+                t = self.index[target]
+                forward[s].append(t)
+                backward[t].append(s)
+
+        self.offsets, self.targets = self._to_csr(forward)
+        self.reverse_offsets, self.reverse_targets = self._to_csr(backward)
+
+        # Calculés à la demande puis conservés (et sauvegardés avec le graphe)
+        self.component_of: Optional[array] = None
+        self.components: Optional[List[List[int]]] = None
+        # Sommets atteignables, par composante interrogée (non sauvegardés)
+        self._descendants: Dict[int, FrozenSet[int]] = {}
+        self._ancestors: Dict[int, FrozenSet[int]] = {}
+
+    @classmethod
+    def from_module_graph(cls, graph: ModuleGraph) -> "CompactGraph":
+        return cls(sorted(graph.nodes), graph.edges)
+
+    @staticmethod
+    def _to_csr(adjacency: List[List[int]]):
+        offsets = array('i', [0])
+        targets = array('i')
+        for neighbours in adjacency:
+            targets.extend(sorted(set(neighbours)))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def successors(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        return self.reverse_targets[self.reverse_offsets[node]:self.reverse_offsets[node + 1]]
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan itératif; les composantes sortent en ordre topologique inverse"""
+        if self.components is not None:
+            return self.components
+
+        size = len(self.names)
+        offsets, targets = self.offsets, self.targets
+        order = [-1] * size
+        low = [0] * size
+        on_stack = [False] * size
+        stack: List[int] = []
+        components: List[List[int]] = []
+        component_of = array('i', [-1]) * size
+        counter = 0
+
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            # Pile d'appels explicite: (sommet, prochain voisin à visiter)
+            work = [(root, offsets[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    child = targets[edge]
+                    if order[child] == -1:
+                        order[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        work.append((child, offsets[child]))
+                    elif on_stack[child] and order[child] < low[node]:
+                        low[node] = order[child]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        self.components = components
+        self.component_of = component_of
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Cycles d'imports: composantes de plus d'un fichier (ou fichier qui s'importe)"""
+        cycles = []
+        for component in self.strongly_connected_components():
+            if len(component) > 1 or component[0] in self.successors(component[0]):
+                cycles.append(sorted(self.names[node] for node in component))
+        return sorted(cycles, key=lambda cycle: (-len(cycle), cycle))
+
+    def _reach(self, node: int, reverse: bool) -> FrozenSet[int]:
+        """Sommets atteignables depuis node (sommet inclus), dans le sens inverse si reverse
+
+        Parcours en largeur sur l'adjacence CSR; tous les sommets d'une
+        composante fortement connexe ont la même réponse, mémorisée par
+        composante. Une composante déjà résolue croisée en chemin est ajoutée
+        d'un bloc sans être reparcourue.
+        """
+        self.strongly_connected_components()
+        memo = self._ancestors if reverse else self._descendants
+        component_of = self.component_of
+        start = component_of[node]
+        reached = memo.get(start)
+        if reached is not None:
+            return reached
+
+        offsets, targets = (self.reverse_offsets, self.reverse_targets) if reverse else (self.offsets, self.targets)
+        seen = set(self.components[start])
+        queue = list(seen)
+        for current in queue:
+            for edge in range(offsets[current], offsets[current + 1]):
+                other = targets[edge]
+                if other in seen:
+                    continue
+                known = memo.get(component_of[other])
+                if known is not None:
+                    seen.update(known)
+                else:
+                    seen.add(other)
+                    queue.append(other)
+        reached = memo[start] = frozenset(seen)
+        return reached
+
+    def depends_on(self, source: str, target: str) -> bool:
+        """source importe-t-il target, directement ou transitivement ?"""
+        return source != target and self.index[target] in self._reach(self.index[source], reverse=False)
+
+    def _names_of(self, nodes: FrozenSet[int], exclude: int) -> List[str]:
+        return [self.names[node] for node in sorted(nodes) if node != exclude]
+
+    def dependencies(self, name: str) -> List[str]:
+        """Fichiers dont name dépend transitivement"""
+        node = self.index[name]
+        return self._names_of(self._reach(node, reverse=False), node)
+
+    def dependents(self, name: str) -> List[str]:
+        """Fichiers qui dépendent transitivement de name"""
+        node = self.index[name]
+        return self._names_of(self._reach(node, reverse=True), node)
+
+    def mask(self, predicate: Callable[[str], bool]) -> FrozenSet[int]:
+        """Sommets dont le nom satisfait predicate"""
+        return frozenset(node for node, name in enumerate(self.names) if predicate(name))
+
+    def blast_radius(self, name: str, within: FrozenSet[int]) -> int:
+        """Nombre de sommets de within (voir mask) affectés transitivement par name"""
+        node = self.index[name]
+        return len(self._reach(node, reverse=True) & within) - (node in within)
+
+    def to_state(self) -> Dict:
+        """État sérialisable (types natifs uniquement) pour le cache disque"""
+        self.precompute()
+        return {
+            'names': self.names,
+            'offsets': self.offsets, 'targets': self.targets,
+            'reverse_offsets': self.reverse_offsets, 'reverse_targets': self.reverse_targets,
+            'components': self.components, 'component_of': self.component_of
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "CompactGraph":
+        graph = cls.__new__(cls)
+        graph.names = state['names']
+        graph.index = {name: i for i, name in enumerate(graph.names)}
+        graph.offsets, graph.targets = state['offsets'], state['targets']
+        graph.reverse_offsets, graph.reverse_targets = state['reverse_offsets'], state['reverse_targets']
+        graph.components, graph.component_of = state['components'], state['component_of']
+        graph._descendants, graph._ancestors = {}, {}
+        return graph
+
+    def precompute(self) -> "CompactGraph":
+        """Calcule les composantes fortement connexes (avant sauvegarde)"""
+        self.strongly_connected_components()
+        return self
+
+
+def corpus_fingerprint(corpus: SourceCorpus, subdir: str = "src") -> str:
+    """Empreinte des sources JS (chemins + contenus) qui déterminent le graphe"""
+    digest = hashlib.sha1(f"{GRAPH_VERSION}:{LEXER_VERSION}".encode())
+    for source in corpus.files(subdir, JS_SUFFIXES):
+        digest.update(f"{source.relative}\0{source.digest}\n".encode())
+    return digest.hexdigest()
+
+
+def load_graph(project_root: str, corpus: SourceCorpus, cache_path: Optional[str] = None) -> CompactGraph:
+    """Retourne le graphe compacté, depuis le cache si les sources n'ont pas changé"""
+    cache_file = Path(cache_path) if cache_path else Path(project_root) / DEFAULT_CACHE_PATH
+    fingerprint = corpus_fingerprint(corpus)
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('fingerprint') == fingerprint:
+                return CompactGraph.from_state(data['graph'])
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            pass
+
+    module_graph = build_module_graph(corpus, ModuleResolver(project_root, corpus))
+    graph = CompactGraph.from_module_graph(module_graph)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_file.with_name(cache_file.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'fingerprint': fingerprint, 'graph': graph.to_state()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_file)
+    return graph
+
+
+def expand_scope(scope, project_root: str, corpus: SourceCorpus):
+    """Ajoute à un périmètre git (tools/common/git_scope.py) les fichiers qui dépendent des fichiers modifiés"""
+    return scope.expand(load_graph(project_root, corpus).dependents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Requêtes sur le graphe des modules')
+    parser.add_argument('--cycles', action='store_true', help='Liste les cycles d\'imports')
+    parser.add_argument('--dependents', metavar='FICHIER', help='Fichiers qui dépendent (transitivement) de FICHIER')
+    parser.add_argument('--dependencies', metavar='FICHIER', help='Fichiers dont FICHIER dépend (transitivement)')
+    parser.add_argument('--blast-radius', action='store_true', help='Hooks classés par nombre de composants affectés')
+    parser.add_argument('--top', type=int, default=20, help='Nombre de hooks affichés avec --blast-radius')
+    args = parser.parse_args()
+
+    project_root = os.getcwd()
+    corpus = SourceCorpus.open(project_root)
+    graph = load_graph(project_root, corpus)
+    corpus.save()
+    print(f"🧭 Graphe: {len(graph)} fichiers, {graph.edge_count()} arêtes")
+
+    for option in (args.dependents, args.dependencies):
+        if option and option not in graph.index:
+            print(f"❌ Fichier inconnu du graphe: {option}")
+            sys.exit(1)
+
+    if args.cycles:
+        cycles = graph.cycles()
+        print(f"🔄 {len(cycles)} cycle(s) d'imports")
+        for cycle in cycles:
+            print("  - " + " ↔ ".join(cycle))
+
+    if args.dependents:
+        dependents = graph.dependents(args.dependents)
+        print(f"⬆️ {len(dependents)} fichier(s) dépendent de {args.dependents}")
+        for name in dependents:
+            print(f"  - {name}")
+
+    if args.dependencies:
+        dependencies = graph.dependencies(args.dependencies)
+        print(f"⬇️ {args.dependencies} dépend de {len(dependencies)} fichier(s)")
+        for name in dependencies:
+            print(f"  - {name}")
+
+    if args.blast_radius:
+        components = graph.mask(lambda name: name.startswith(COMPONENTS_PREFIX))
+        hooks = [name for name in graph.names if name.startswith(HOOKS_PREFIX)]
+        ranking = sorted(((graph.blast_radius(name, components), name) for name in hooks), reverse=True)
+        print(f"💥 Rayon d'impact (composants affectés transitivement), top {args.top}")
+        for radius, name in ranking[:args.top]:
+            print(f"  {radius:5d}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Cache incrémental de l'inventaire des hooks
+Conserve chaque fiche hook_info calculée par HookDependencyAnalyzer, indexée
+par chemin et validée par l'empreinte du contenu et la version de l'analyseur.
+Seuls les fichiers nouveaux ou modifiés sont réanalysés, les fichiers
+supprimés sont évincés.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DEFAULT_CACHE_PATH = Path("tools") / "audit" / ".cache" / "hooks_inventory.json"
+
+
+class HookInfoCache:
+    def __init__(self, cache_path, analyzer_version: str):
+        self.cache_path = Path(cache_path)
+        self.analyzer_version = analyzer_version
+        self.records: Dict[str, Dict] = {}
+        self.dirty = False
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+    @classmethod
+    def open(cls, project_root: str, analyzer_version: str, cache_path: Optional[str] = None) -> "HookInfoCache":
+        """Charge le cache depuis le disque (vide si absent ou d'une autre version)"""
+        cache = cls(cache_path or Path(project_root) / DEFAULT_CACHE_PATH, analyzer_version)
+        cache.load()
+        return cache
+
+    def load(self):
+        """Charge les fiches sauvegardées"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('analyzer_version') == self.analyzer_version:
+            self.records = data.get('records', {})
+
+    def get(self, relative_path: str, digest: str) -> Optional[Dict]:
+        """Retourne la fiche en cache si le contenu n'a pas changé"""
+        entry = self.records.get(relative_path)
+        if entry is not None and entry['digest'] == digest:
+            self.stats['hits'] += 1
+            return entry['hook_info']
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, relative_path: str, digest: str, hook_info: Dict):
+        """Enregistre la fiche calculée pour un fichier"""
+        self.records[relative_path] = {'digest': digest, 'hook_info': hook_info}
+        self.dirty = True
+
+    def evict_missing(self, seen_paths: Iterable[str]):
+        """Évince les fichiers qui n'existent plus"""
+        seen = set(seen_paths)
+        for relative_path in [path for path in self.records if path not in seen]:
+            del self.records[relative_path]
+            self.stats['evicted'] += 1
+            self.dirty = True
+
+    def save(self):
+        """Sauvegarde le cache s'il a été modifié"""
+        if not self.dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'analyzer_version': self.analyzer_version, 'records': self.records}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Index inversé des identifiants JavaScript de src/
+Un seul parcours de la vue de code (js_lexer.code_view, partagée par
+SourceCorpus.code(): commentaires et chaînes exclus) de src/components, src/pages, src/context, src/services, src/hooks
+et des répertoires de tests associe chaque identifiant à ses occurrences
+(fichier, ligne, rôle). Le rôle distingue les noms d'une instruction import,
+ceux d'un export (clause export { ... } ou nom déclaré par export const/
+function/default) et le reste du code. Le nom de fichier d'un module importé
+(import ... from, import() et require()) est indexé avec le rôle module, et
+celui d'un export ... from comme un export: les imports par chemin sont
+retrouvés sans rechercher dans les chaînes.
+
+Les questions "qui utilise useGenericEntityList ?" ou "ce hook est-il
+vraiment utilisé ?" deviennent des recherches dans un dictionnaire au lieu
+d'un `in content` par fichier et par hook (HookDependencyAnalyzer) ou de
+plusieurs grep sur src/ par hook (analyze_hooks_real_usage.sh, qui délègue
+désormais à ce script). Les occurrences de chaque fichier sont mises en
+cache par empreinte de contenu: seuls les fichiers modifiés sont relexés.
+
+Usage:
+    python tools/audit/identifier_index.py --usages useGenericEntityList [useCache ...]
+    python tools/audit/identifier_index.py --real-usage [--all]
+"""
+
+import os
+import re
+import sys
+import pickle
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source_corpus import SourceCorpus
+from js_lexer import JS_KEYWORDS, LineCounter, code_view, tokenize
+
+# Version des occurrences: à incrémenter dès que l'indexation change
+INDEX_VERSION = 2
+DEFAULT_CACHE_PATH = Path("tools") / "audit" / ".cache" / "identifier_index.pickle"
+INDEX_ROOTS = ("src/components", "src/pages", "src/context", "src/services", "src/hooks",
+               "src/__tests__", "src/tests")
+# Répertoires des consommateurs de hooks (hors définitions de src/hooks)
+CONSUMER_ROOTS = ("src/components", "src/pages", "src/context", "src/services")
+HOOKS_ROOT = "src/hooks"
+
+ROLES = ('import', 'export', 'module', 'code')
+_EXPORT_PREFIXES = frozenset({'default', 'const', 'let', 'var', 'function', 'class', 'async'})
+_MODULE_LOADERS = frozenset({'import', 'require'})
+_TEST_FILE = re.compile(r'(?:^|/)__tests__/|\.(?:test|spec)\.jsx?$')
+# Hooks à versions multiples examinés par défaut (--real-usage sans --all)
+VERSIONED_HOOK = re.compile(r'(?:Migrated|Optimized|Complete)\.js$')
+
+
+def _module_name(literal: str) -> str:
+    """Nom de fichier sans extension d'un spécificateur ('./hooks/useX.js' -> useX)"""
+    name = literal[1:-1].rstrip('/').rsplit('/', 1)[-1]
+    return name.rsplit('.', 1)[0] if name.endswith(('.js', '.jsx')) else name
+
+
+def _string_pattern(p: str) -> str:
+    """Chaîne '...' ou "..." (jamais sur plusieurs lignes, fermée ou non)"""
+    return rf"""'[^'\\\n]*{p}(?:\\.[^'\\\n]*{p})*{p}'?|"[^"\\\n]*{p}(?:\\.[^"\\\n]*{p})*{p}"?"""
+
+
+try:
+    # Quantificateurs possessifs (Python >= 3.11): pas de retour arrière
+    _STRINGS = re.compile(_string_pattern('+'))
+    _LINE_WORDS = re.compile(rf"""{_string_pattern('+')}|\.?\d[\w.]*+|([A-Za-z_$][\w$]*+)""")
+except re.error:
+    _STRINGS = re.compile(_string_pattern(''))
+    _LINE_WORDS = re.compile(rf"""{_string_pattern('')}|\.?\d[\w.]*|([A-Za-z_$][\w$]*)""")
+# Mots d'un morceau non ASCII (les nombres sont écartés)
+_RUN_WORDS = re.compile(r'\d[\w.]*|([A-Za-z_$][\w$]*)')
+_WORD_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$')
+# Octets ASCII hors mots remplacés par un espace, fin de ligne marquée par '#'
+_WORD_CHARS = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+_WORD_TABLE = bytes(c if c in _WORD_CHARS or c >= 128 else (ord('#') if c == 10 else 32) for c in range(256))
+_STATEMENT_WORDS = frozenset({'import', 'export', 'require'})
+
+
+def index_identifiers(content: str, code: Optional[str] = None) -> List[Tuple[str, int, str]]:
+    """Occurrences (identifiant, ligne, rôle) d'un fichier, une par ligne et par rôle, dans l'ordre du texte
+
+    code: vue js_lexer.code_view() du fichier si déjà calculée. Les lignes
+    sans import, export ni require sont découpées en mots sans lexer (chaînes
+    retirées, puis un seul translate); seules les instructions import/export
+    passent par les jetons de tokenize.
+    """
+    if code is None:
+        code = code_view(content)
+    text = _STRINGS.sub(' ', code).encode('utf-8').translate(_WORD_TABLE).decode('utf-8')
+    # Dictionnaire ordonné: dédoublonne en gardant l'ordre du texte
+    occurrences: Dict[Tuple[str, int, str], None] = {}
+    lines = LineCounter(code)
+    line_starts = None
+    number = 1
+    resume = 0
+    for run in text.replace('#', ' # ').split():
+        if run == '#':
+            number += 1
+            continue
+        if number < resume:
+            # Ligne déjà indexée avec l'instruction qui la précède
+            continue
+        if run.isascii():
+            if run[0] not in _WORD_START:
+                continue
+            words = (run,)
+        else:
+            words = [word for word in _RUN_WORDS.findall(run) if word]
+        for word in words:
+            if word in _STATEMENT_WORDS:
+                if line_starts is None:
+                    line_starts = [0]
+                    for line in code.split('\n'):
+                        line_starts.append(line_starts[-1] + len(line) + 1)
+                resume = _index_statements(code, line_starts, number, lines, occurrences) + 1
+                break
+            if word not in JS_KEYWORDS:
+                occurrences[(word, number, 'code')] = None
+    return list(occurrences)
+
+
+def _index_statements(code: str, line_starts: List[int], number: int, lines: LineCounter,
+                      occurrences: Dict[Tuple[str, int, str], None]) -> int:
+    """Indexe la ligne number et les instructions import/export/require qui s'y trouvent
+
+    Retourne la dernière ligne indexée (une instruction peut continuer sur
+    les lignes suivantes).
+    """
+    position = line_starts[number - 1]
+    for match in _LINE_WORDS.finditer(code, position, line_starts[number] - 1):
+        word = match.group(1)
+        if word in _STATEMENT_WORDS:
+            position = match.start()
+            break
+        if word and word not in JS_KEYWORDS:
+            occurrences[(word, number, 'code')] = None
+
+    # None, 'import', 'export' (après le mot-clé), 'clause' (export { ... } / export *),
+    # 'clause_end' (après l'accolade: "from 'x'" éventuel)
+    state = None
+    prev = prev2 = None
+    before = position - 1
+    while before >= 0 and code[before] in ' \t\r\n':
+        before -= 1
+    if before >= 0 and code[before] == '.' and code[before - 1:before] not in ('.', '?'):
+        # obj.import / obj.export: propriété et non instruction
+        prev = '.'
+
+    for kind, value, start in tokenize(code, position):
+        if state is None and prev not in _MODULE_LOADERS and not (prev == '(' and prev2 in _MODULE_LOADERS):
+            line = lines.at(start)
+            if line > number:
+                return line - 1
+        if state == 'clause_end':
+            state = 'clause' if kind == 'word' and value == 'from' else None
+            if state is None:
+                line = lines.at(start)
+                if line > number:
+                    return line - 1
+        if state == 'import' and prev == 'import' and kind == 'punct' and value in '(.':
+            # import('x') dynamique ou import.meta: pas une instruction
+            state = None
+        elif state in ('import', 'clause') and (kind == 'str' or value == ';'):
+            if kind == 'str':
+                # export ... from './x': le module réexporté compte comme un export
+                role = 'module' if state == 'import' else 'export'
+                occurrences[(_module_name(value), lines.at(start), role)] = None
+            state = None
+            prev2, prev = prev, value
+            number = max(number, lines.at(start))
+            continue
+
+        if kind == 'word':
+            if value in JS_KEYWORDS:
+                if state is None and prev != '.' and value in ('import', 'export'):
+                    state = value
+                elif state == 'export' and value not in _EXPORT_PREFIXES:
+                    state = None
+            elif state == 'import':
+                if value != 'as':
+                    occurrences[(value, lines.at(start), 'import')] = None
+            elif state == 'export':
+                # Nom déclaré par export const/function/class/default
+                occurrences[(value, lines.at(start), 'export')] = None
+                state = None
+            elif state == 'clause':
+                if value != 'as':
+                    occurrences[(value, lines.at(start), 'export')] = None
+            else:
+                occurrences[(value, lines.at(start), 'code')] = None
+
+        elif kind == 'str' and prev == '(' and prev2 in _MODULE_LOADERS:
+            # import('./x') dynamique ou require('./x')
+            occurrences[(_module_name(value), lines.at(start), 'module')] = None
+        elif state == 'export':
+            # export { ... } / export * from 'x'; export default {...} ou (...) est du code
+            state = 'clause' if value in ('{', '*') and prev != 'default' else None
+        elif state == 'clause' and value == '}':
+            state = 'clause_end'
+        # Un gabarit peut finir sur une ligne suivante
+        number = max(number, lines.at(start + len(value) if kind == 'template' else start))
+        prev2, prev = prev, value
+    return len(line_starts)
+
+
+def is_test_file(relative: str) -> bool:
+    return _TEST_FILE.search(relative) is not None
+
+
+class IdentifierIndex:
+    """Identifiant -> occurrences (fichier, ligne, rôle) sur les racines indexées"""
+
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 roots: Iterable[str] = INDEX_ROOTS, cache_path: Optional[str] = None,
+                 paths: Optional[Iterable[str]] = None):
+        self.project_root = Path(project_root)
+        self.corpus = corpus or SourceCorpus(project_root)
+        self.roots = tuple(roots)
+        # Index partiel: seuls ces fichiers (chemins relatifs) sont indexés,
+        # sans relire ni remplacer la sauvegarde de l'index complet
+        self.paths = frozenset(paths) if paths is not None else None
+        self.cache_path = Path(cache_path) if cache_path else self.project_root / DEFAULT_CACHE_PATH
+        self.postings: Dict[str, List[Tuple[str, int, str]]] = {}
+        # fichier -> (empreinte du contenu, occurrences)
+        self.files: Dict[str, Tuple[str, List[Tuple[str, int, str]]]] = {}
+        self.stats = {'files': 0, 'cached': 0, 'occurrences': 0}
+        self.built = False
+
+    @classmethod
+    def open(cls, project_root: str, corpus: Optional[SourceCorpus] = None, **kwargs) -> "IdentifierIndex":
+        """Construit l'index en reprenant du cache les fichiers inchangés"""
+        index = cls(project_root, corpus, **kwargs)
+        index.build()
+        return index
+
+    def _load_cache(self) -> Dict[str, Tuple[str, List]]:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return {}
+        return data.get('files', {}) if data.get('version') == INDEX_VERSION else {}
+
+    def save(self):
+        """Sauvegarde les occurrences par fichier (reprises à la construction suivante)"""
+        if self.paths is not None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'files': self.files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def build(self) -> "IdentifierIndex":
+        self.files = {}
+        self.postings = {}
+        self.refresh(self._load_cache() if self.paths is None else {})
+        self.built = True
+        return self
+
+    def refresh(self, cached: Optional[Dict[str, Tuple[str, List]]] = None) -> List[str]:
+        """Met l'index à jour depuis le corpus (après SourceCorpus.refresh())
+
+        Seuls les fichiers dont l'empreinte a changé sont relexés et leurs
+        occurrences remplacées; les fichiers disparus sont évincés.
+        Retourne les fichiers modifiés, ajoutés ou supprimés.
+        """
+        cached = cached or {}
+        current: Dict[str, Tuple[str, List[Tuple[str, int, str]]]] = {}
+        changed = []
+        for root in self.roots:
+            for source in self.corpus.files(root, ('.js', '.jsx')):
+                if self.paths is not None and source.relative not in self.paths:
+                    continue
+                entry = self.files.get(source.relative)
+                if entry is None or entry[0] != source.digest:
+                    entry = cached.get(source.relative)
+                    if entry is not None and entry[0] == source.digest:
+                        self.stats['cached'] += 1
+                    else:
+                        entry = (source.digest, index_identifiers(source.content, self.corpus.code(source))
+                                 if source.content else [])
+                    changed.append(source.relative)
+                current[source.relative] = entry
+        changed.extend(relative for relative in self.files if relative not in current)
+
+        for relative in changed:
+            previous = self.files.get(relative)
+            if previous is not None:
+                for name in {occurrence[0] for occurrence in previous[1]}:
+                    bucket = [occurrence for occurrence in self.postings[name] if occurrence[0] != relative]
+                    if bucket:
+                        self.postings[name] = bucket
+                    else:
+                        del self.postings[name]
+            if relative in current:
+                for name, line, role in current[relative][1]:
+                    bucket = self.postings.get(name)
+                    if bucket is None:
+                        self.postings[name] = bucket = []
+                    bucket.append((relative, line, role))
+
+        self.files = current
+        self.stats['files'] = len(current)
+        self.stats['occurrences'] = sum(len(entry[1]) for entry in current.values())
+        return changed
+
+    # Requêtes
+
+    def occurrences(self, name: str, roles: Optional[Iterable[str]] = None,
+                    roots: Optional[Iterable[str]] = None) -> List[Tuple[str, int, str]]:
+        """Occurrences d'un identifiant, filtrées par rôle et par répertoire"""
+        found = self.postings.get(name, [])
+        if roles is not None:
+            roles = tuple(roles)
+            found = [occurrence for occurrence in found if occurrence[2] in roles]
+        if roots is not None:
+            prefixes = tuple(root.rstrip('/') + '/' for root in roots)
+            found = [occurrence for occurrence in found if occurrence[0].startswith(prefixes)]
+        return found
+
+    def files_using(self, name: str, roles: Optional[Iterable[str]] = None,
+                    roots: Optional[Iterable[str]] = None) -> List[str]:
+        """Fichiers (triés) où l'identifiant apparaît"""
+        return sorted({occurrence[0] for occurrence in self.occurrences(name, roles, roots)})
+
+    def real_usage(self, hook_relative: str) -> Dict[str, int]:
+        """Références à un hook hors de son fichier (équivalent des grep de analyze_hooks_real_usage.sh)
+
+        exports_in_index: exports dans src/hooks/*/index.js; direct_imports et
+        code_usage: imports (par nom ou par chemin) et autres occurrences hors
+        index.js et hors tests;
+        test_usage: occurrences dans les fichiers de test.
+        """
+        name = Path(hook_relative).stem
+        counts = Counter()
+        for relative, _, role in self.postings.get(name, ()):
+            if relative == hook_relative:
+                continue
+            if is_test_file(relative):
+                counts['test_usage'] += 1
+            elif relative.endswith('/index.js'):
+                if role == 'export' and relative.startswith(HOOKS_ROOT + '/') and relative.count('/') == 3:
+                    counts['exports_in_index'] += 1
+            elif role in ('import', 'module'):
+                counts['direct_imports'] += 1
+            elif role == 'code':
+                counts['code_usage'] += 1
+        usage = {key: counts[key] for key in ('exports_in_index', 'direct_imports', 'code_usage', 'test_usage')}
+        usage['total'] = sum(usage.values())
+        return usage
+
+
+def real_usage_report(index: IdentifierIndex, hook_files: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Lignes du rapport détaillé, hooks inutilisés et hooks utilisés"""
+    lines = [f"📋 Rapport généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}", "=" * 50]
+    unused, used = [], []
+    for hook_file in hook_files:
+        usage = index.real_usage(hook_file)
+        lines.append(f"🔍 Analyse: {Path(hook_file).stem}")
+        lines.append(f"  📄 Fichier: {hook_file}")
+        lines.append(f"  📤 Exports dans index.js: {usage['exports_in_index']}")
+        lines.append(f"  📥 Imports directs: {usage['direct_imports']}")
+        lines.append(f"  💻 Utilisation dans le code: {usage['code_usage']}")
+        lines.append(f"  🧪 Utilisation dans les tests: {usage['test_usage']}")
+        lines.append(f"  📊 TOTAL D'UTILISATION: {usage['total']}")
+        if usage['total'] == 0:
+            lines.append("  ❌ VRAIMENT INUTILISÉ - CANDIDAT POUR SUPPRESSION")
+            print(f"❌ {Path(hook_file).stem} - VRAIMENT INUTILISÉ")
+            unused.append(hook_file)
+        else:
+            lines.append("  ✅ UTILISÉ QUELQUE PART - À CONSERVER")
+            print(f"✅ {Path(hook_file).stem} - UTILISÉ ({usage['total']} références)")
+            used.append(hook_file)
+        lines.append("")
+    return lines, unused, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index inversé des identifiants de src/')
+    parser.add_argument('--usages', nargs='+', metavar='IDENTIFIANT', help='Occurrences des identifiants')
+    parser.add_argument('--real-usage', action='store_true',
+                        help='Utilisation réelle des hooks à versions multiples (Migrated/Optimized/Complete)')
+    parser.add_argument('--all', action='store_true', help='Avec --real-usage: tous les hooks de src/hooks')
+    parser.add_argument('--report', default='real_hook_usage_analysis.txt',
+                        help='Rapport détaillé de --real-usage (défaut: real_hook_usage_analysis.txt)')
+    args = parser.parse_args()
+
+    project_root = os.getcwd()
+    corpus = SourceCorpus.open(project_root)
+    index = IdentifierIndex.open(project_root, corpus)
+    corpus.save()
+    index.save()
+    print(f"🗂️ Index: {index.stats['files']} fichiers ({index.stats['cached']} en cache), "
+          f"{len(index.postings)} identifiants, {index.stats['occurrences']} occurrences")
+
+    if args.usages:
+        for name in args.usages:
+            found = index.occurrences(name)
+            print(f"\n🔎 {name}: {len(found)} occurrence(s) dans {len(index.files_using(name))} fichier(s)")
+            for role in ROLES:
+                for relative, line, _ in (o for o in found if o[2] == role):
+                    print(f"  [{role:<6}] {relative}:{line}")
+
+    if args.real_usage:
+        hook_files = [source.relative for source in corpus.files(HOOKS_ROOT, ('.js',))
+                      if not is_test_file(source.relative) and not source.relative.endswith('/index.js')
+                      and (args.all or VERSIONED_HOOK.search(source.relative))]
+        print("\n🔍 ANALYSE CORRIGÉE DES HOOKS - UTILISATION RÉELLE")
+        print("=" * 50)
+        lines, unused, used = real_usage_report(index, hook_files)
+
+        print("\n📊 RÉSULTATS DE L'ANALYSE CORRIGÉE:")
+        if unused:
+            print(f"🗑️ {len(unused)} hooks vraiment inutilisés trouvés")
+        else:
+            print("✅ BONNE NOUVELLE: Aucun hook vraiment inutilisé !")
+        lines.append("=" * 36)
+        lines.append("🗑️ HOOKS VRAIMENT INUTILISÉS (suppression sûre):")
+        lines.extend(f"  🗑️ {hook}" for hook in unused)
+        if not unused:
+            lines.append("  ✅ Aucun hook vraiment inutilisé trouvé !")
+        lines.append("")
+        lines.append("✅ HOOKS UTILISÉS (à conserver):")
+        lines.extend(f"  ✅ {hook}" for hook in used)
+        Path(args.report).write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+        print("\n🎯 CONCLUSION:")
+        print(f"  📁 Total hooks analysés: {len(hook_files)}")
+        print(f"  🗑️ Vraiment inutilisés: {len(unused)}")
+        print(f"  ✅ En utilisation: {len(used)}")
+        print(f"\n📋 Rapport détaillé sauvegardé dans: {args.report}")
+        if unused:
+            print(f"\n⚠️ Il y a {len(unused)} hooks qui peuvent être supprimés en sécurité.")
+            print("   Examinez le rapport détaillé avant de procéder.")
+        else:
+            print("\n🎉 Excellente nouvelle ! Tous les hooks alternatifs sont utilisés.")
+            print("   Aucune suppression automatique recommandée pour l'instant.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1060 @@
+#!/usr/bin/env python3
+"""
+Petit lexer JavaScript pour les outils d'audit TourCraft
+Comprend les commentaires, chaînes, littéraux de gabarit (avec expressions
+${...} imbriquées) et littéraux d'expressions régulières, et produit en une
+seule passe linéaire les enregistrements structurés d'import/export d'un
+module ainsi que ses commentaires.
+
+Les mots-clés import/export/require, les '`' et les débuts de commentaire
+sont localisés par recherche littérale; seules les lignes qui en contiennent
+sont lexées (chaînes et code sans intérêt sautés par une seule expression
+compilée), les autres sont franchies d'un bloc. Les gabarits simples et les
+commentaires sont consommés d'un coup, les instructions import/export
+courantes reconnues par une expression dédiée. Le résultat est mémorisé par
+SourceCorpus.module(): chaque fichier n'est lexé qu'une fois pour tous les
+analyseurs, et plus du tout tant qu'il ne change pas.
+
+tokenize() expose le même découpage sous forme de jetons (mots, nombres,
+ponctuation, chaînes, gabarits, expressions régulières; commentaires omis).
+code_view() en donne une version texte, de même longueur et aux mêmes
+lignes que le module, où commentaires, texte des gabarits et corps des
+expressions régulières sont effacés: identifier_index.py y cherche ses
+motifs par expressions compilées, sans repasser jeton par jeton. Seuls les
+'/' et les '`' sont examinés un à un; la vue est mémorisée par
+SourceCorpus.code(). code_tokens() découpe cette vue en jetons d'un seul
+findall (js_metrics.py), sans objet Match par jeton.
+"""
+
+import re
+from typing import Dict, Iterator, List, Tuple
+
+# Version du format des enregistrements: à incrémenter dès que scan_module
+# produit des résultats différents (invalide les ModuleInfo mis en cache)
+LEXER_VERSION = 2
+
+# Chaînes simples: ne franchissent jamais une fin de ligne (borne les erreurs
+# sur le texte JSX contenant des apostrophes)
+_SQ_STRING = r"'(?:[^'\\\n]|\\.)*'?"
+_DQ_STRING = r'"(?:[^"\\\n]|\\.)*"?'
+
+
+def _skip_pattern(stops: str, possessive: str) -> str:
+    """Code sans intérêt, chaînes comprises; s'arrête sur '/', '`' et les caractères stops.
+
+    Une chaîne n'est consommée que fermée (ou en fin de ligne): borné par
+    endpos, le saut s'arrête sur le guillemet d'une chaîne qui chevauche la
+    borne. '</' et '/>' (balises JSX) ne sont pas des événements.
+    """
+    p = possessive
+    return (
+        rf"""(?:[^'"`/{stops}]+{p}"""
+        rf"""|'[^'\\\n]*{p}(?:\\.[^'\\\n]*{p})*{p}(?:'|(?=\n))"""
+        rf"""|"[^"\\\n]*{p}(?:\\.[^"\\\n]*{p})*{p}(?:"|(?=\n))"""
+        rf"""|(?<=<)/|/(?=>))*{p}"""
+    )
+
+
+def _simple_template_pattern(possessive: str) -> str:
+    """Gabarit entier dont les expressions ${...} ne contiennent que du code sans
+    accolade, gabarit ni '/', et des chaînes fermées sur la ligne"""
+    p = possessive
+    return (
+        rf"""`(?:[^`\\$]+{p}|\\.|\$(?!\{{)"""
+        rf"""|\$\{{(?:[^{{}}'"`/\\\n]+{p}|'(?:[^'\\\n]|\\.)*{p}'|"(?:[^"\\\n]|\\.)*{p}")*{p}\}})*{p}`"""
+    )
+
+
+def _literal_text_pattern(possessive: str) -> str:
+    """Texte d'un groupe entre crochets sans gabarit ni '/' hors chaîne et commentaire;
+    les groupes imbriqués sur deux niveaux, sans commentaire, sont consommés d'un bloc"""
+    p = possessive
+    text = (
+        rf"""[^'"`/()\[\]{{}}]+{p}"""
+        rf"""|'(?:[^'\\\n]|\\.)*{p}'|"(?:[^"\\\n]|\\.)*{p}\""""
+    )
+
+    def group(inner: str) -> str:
+        return rf"""\((?:{inner})*{p}\)|\[(?:{inner})*{p}\]|\{{(?:{inner})*{p}\}}"""
+
+    return rf"""(?:{text}|//[^\n]*|/\*.*?\*/|{group(f'{text}|{group(text)}')})*{p}"""
+
+
+try:
+    # Quantificateurs possessifs (Python >= 3.11): pas de retour arrière
+    _SKIP_TOP = re.compile(_skip_pattern('', '+'))
+    _SKIP_EXPR = re.compile(_skip_pattern('{}', '+'))
+    _SIMPLE_TEMPLATE = re.compile(_simple_template_pattern('+'), re.DOTALL)
+    _LITERAL_TEXT = re.compile(_literal_text_pattern('+'), re.DOTALL)
+except re.error:
+    _SKIP_TOP = re.compile(_skip_pattern('', ''))
+    _SKIP_EXPR = re.compile(_skip_pattern('{}', ''))
+    _SIMPLE_TEMPLATE = re.compile(_simple_template_pattern(''), re.DOTALL)
+    _LITERAL_TEXT = re.compile(_literal_text_pattern(''), re.DOTALL)
+_STRING = re.compile(rf"{_SQ_STRING}|{_DQ_STRING}")
+_NEXT_LINE_COMMENT = re.compile(r'\n[ \t]*//')
+_TEMPLATE_CHUNK = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.DOTALL)
+_REGEX_BODY = re.compile(r'(?:[^\\/\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])*/[A-Za-z]*')
+_WORD_BEFORE = re.compile(r'[A-Za-z_$][\w$]*$')
+# Début de ligne hors chaîne: s'arrête sur le guillemet d'une chaîne ouverte
+_OUTSIDE_STRINGS = re.compile(r"""(?:[^'"\n]+|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")*""")
+# Caractères à examiner dans une expression ${...} de gabarit
+_EXPRESSION_HAZARD = re.compile(r"""[/`'"{}]""")
+
+# Jetons d'une instruction import/export (après le mot-clé)
+_STATEMENT_TOKEN = re.compile(
+    rf"""\s+|//[^\n]*|/\*.*?\*/|(?P<str>{_SQ_STRING}|{_DQ_STRING})|(?P<word>[A-Za-z_$][\w$]*)|(?P<punct>\S)""",
+    re.DOTALL
+)
+# Forme courante d'un import statique, sans commentaire ni chaîne dans les
+# accolades: import A, { b, c as d } from 'x' / import * as ns from 'x'
+_SIMPLE_IMPORT = re.compile(
+    r"""\s+(?:(?P<default>[A-Za-z_$][\w$]*)\s*(?:,\s*)?)?"""
+    r"""(?:\{(?P<named>[^}'"/`]*)\}\s*|\*\s*as\s+(?P<namespace>[A-Za-z_$][\w$]*)\s+)?"""
+    r"""from\s*(?:'(?P<sq>[^'\\\n]*)'|"(?P<dq>[^"\\\n]*)")"""
+)
+# Formes courantes d'un export nommé par un identifiant:
+# export default X / export default [async] function F / export default class C
+# export function|class X / export async function F
+# export const|let|var X (déclarateurs suivants lus par _declared_names)
+_SIMPLE_EXPORT = re.compile(
+    r"""\s+(?:(?P<default>default\s+(?:(?:async\s+)?function\b\s*|class\s+)?)"""
+    r"""|(?P<variable>const|let|var)\s+|(?:class|function)\s+|async\s+function\s+)(?P<name>[A-Za-z_$][\w$]*)"""
+)
+# Déclarateur dont l'initialiseur se passe du lexer: fonction (fléchée à corps
+# entre accolades ou expression function), après laquelle la liste ne se
+# poursuit pas, ou littéral objet/tableau dont les crochets sont appariés
+_NAMED_DECLARATOR = re.compile(
+    r"""\s*([A-Za-z_$][\w$]*)\s*=\s*(?:(?P<function>(?:async\s*)?"""
+    r"""(?:\((?:[^()'"`/]|'[^'\\\n]*'|"[^"\\\n]*")*\)|[A-Za-z_$][\w$]*)\s*=>\s*\{|(?:async\s+)?function\b)"""
+    r"""|(?P<literal>[\[{]))"""
+)
+_NEXT_DECLARATOR = re.compile(r'\s*,')
+
+_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+_REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await'
+})
+# Jetons de tokenize(): blancs et commentaires sont consommés en préfixe du jeton
+_TOKEN = re.compile(
+    rf"""(?:\s+|//[^\n]*|/\*.*?(?:\*/|\Z))*(?:"""
+    rf"""(?P<word>[A-Za-z_$][\w$]*)"""
+    rf"""|(?P<str>{_SQ_STRING}|{_DQ_STRING})"""
+    rf"""|(?P<num>\.?\d[\w.]*)"""
+    rf"""|(?P<punct>=>|\.\.\.|\?\?=?|\?\.|&&=?|\|\|=?|[=!]==?|\*\*=?|<<=?|>>>?=?|[-+*%&|^<>]=|\+\+|--|[^\s'"/`])"""
+    rf"""|(?P<slash>/)|(?P<template>`))?""",
+    re.DOTALL
+)
+# Jetons de la vue de code (code_tokens): chaînes, segments de gabarit effacés,
+# mots, nombres, opérateurs et fins de ligne (suivies des blancs qui les suivent).
+# Les blancs d'une ligne sont absorbés avant le jeton (groupe capturé) et les
+# jetons les plus fréquents sont essayés en premier
+_VIEW_TOKEN = re.compile(
+    rf"""[ \t]*([A-Za-z_$][\w$]*|[(),;{{}}\[\]]|\n\s*|=>|{_SQ_STRING}|{_DQ_STRING}|`[^`]*`|\.?\d[\w.]*"""
+    rf"""|\.\.\.|\?\?=?|\?\.|&&=?|\|\|=?|[=!]==?|\*\*=?|<<=?|>>>?=?|[-+*%&|^<>/]=|\+\+|--|\S)""",
+    re.DOTALL
+)
+# Mots réservés et littéraux usuels (jamais des identifiants de l'application)
+JS_KEYWORDS = frozenset({
+    'const', 'let', 'var', 'function', 'return', 'if', 'else', 'for', 'while', 'do', 'switch', 'case',
+    'default', 'break', 'continue', 'try', 'catch', 'finally', 'throw', 'new', 'delete', 'typeof',
+    'instanceof', 'in', 'of', 'async', 'await', 'import', 'export', 'from', 'class', 'extends', 'this',
+    'null', 'undefined', 'true', 'false'
+})
+_DECLARATION_KEYWORDS = frozenset({'const', 'let', 'var', 'function', 'class', 'async'})
+# Mots qui, hors parenthèses, commencent l'instruction suivante (fin d'un
+# initialiseur sans point-virgule)
+_STATEMENT_KEYWORDS = frozenset({
+    'import', 'export', 'const', 'let', 'var', 'if', 'for', 'while', 'do', 'switch', 'try', 'return', 'throw'
+})
+_MAX_STATEMENT_TOKENS = 400
+
+
+class ModuleInfo:
+    """Imports, exports et commentaires d'un module JavaScript"""
+
+    __slots__ = ("imports", "exports", "comments", "with_comments")
+
+    def __init__(self, with_comments: bool = True):
+        self.imports: List[Dict] = []
+        self.exports: List[Dict] = []
+        self.comments: List[Dict] = []
+        # Faux si les commentaires n'ont pas été relevés (scan_module(..., with_comments=False))
+        self.with_comments = with_comments
+
+    def to_dict(self) -> Dict:
+        return {'imports': self.imports, 'exports': self.exports, 'comments': self.comments,
+                'with_comments': self.with_comments}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ModuleInfo":
+        info = cls(data['with_comments'])
+        info.imports = data['imports']
+        info.exports = data['exports']
+        info.comments = data['comments']
+        return info
+
+    def import_sources(self) -> List[str]:
+        """Sources de tous les imports statiques, dynamiques, require et ré-exports"""
+        return [record['source'] for record in self.imports if record['source'] is not None]
+
+    def exported_names(self) -> List[str]:
+        """Noms exportés (le nom local pour un export par défaut nommé)"""
+        names = []
+        for record in self.exports:
+            if record['kind'] == 'reexport_all':
+                continue
+            names.append(record['local'] if record['name'] == 'default' and record['local'] else record['name'])
+        return names
+
+    def jsdoc_comments(self) -> List[str]:
+        """Contenu des blocs /** ... */"""
+        return [c['text'][3:-2] for c in self.comments if c['kind'] == 'block' and c['text'].startswith('/**')]
+
+    def line_comments(self) -> List[str]:
+        """Contenu des commentaires // (sans le préfixe)"""
+        return [c['text'][2:].strip() for c in self.comments if c['kind'] == 'line']
+
+
+class LineCounter:
+    """Convertit des positions en numéros de ligne: linéaire tant que les positions croissent,
+    recomptage depuis le début sinon"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.position = 0
+        self.line = 1
+
+    def at(self, position: int) -> int:
+        if position < self.position:
+            return self.content.count('\n', 0, position) + 1
+        self.line += self.content.count('\n', self.position, position)
+        self.position = position
+        return self.line
+
+
+def _unquote(literal: str) -> str:
+    """Retire les guillemets d'un littéral de chaîne"""
+    if len(literal) >= 2 and literal[-1] == literal[0]:
+        return literal[1:-1]
+    return literal[1:]
+
+
+def _regex_allowed(content: str, position: int) -> bool:
+    """Indique si un '/' à cette position ouvre un littéral d'expression régulière"""
+    j = position - 1
+    while j >= 0 and content[j] in ' \t\r\n':
+        j -= 1
+    if j < 0:
+        return True
+    previous = content[j]
+    if previous in _IDENT_CHARS:
+        word = _WORD_BEFORE.search(content, max(0, j - 15), j + 1)
+        return word is not None and word.group(0) in _REGEX_KEYWORDS
+    # ')' ']' '}' et fin de chaîne: division; '<' : balise JSX fermante
+    return previous not in ')]}\'"`<'
+
+
+def _statement_tokens(content: str, position: int):
+    """Itère sur les jetons significatifs (type, valeur, fin) d'une instruction"""
+    count = 0
+    length = len(content)
+    while position < length and count < _MAX_STATEMENT_TOKENS:
+        match = _STATEMENT_TOKEN.match(content, position)
+        if match is None:
+            return
+        position = match.end()
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        count += 1
+        yield kind, match.group(kind), position
+
+
+def _parse_import(content: str, start: int, line: int):
+    """Analyse une instruction import (statique ou dynamique); retourne (enregistrement, fin)"""
+    simple = _SIMPLE_IMPORT.match(content, start)
+    if simple is not None:
+        default, named, namespace, source, dq_source = simple.groups()
+        if default != 'from':
+            specifiers = []
+            if named:
+                for specifier in named.split(','):
+                    names = specifier.split()
+                    if len(names) == 1:
+                        specifiers.append([names[0], names[0]])
+                    elif len(names) == 3 and names[1] == 'as':
+                        specifiers.append([names[0], names[2]])
+            record = {'source': source if source is not None else dq_source, 'kind': 'static',
+                      'default': default, 'namespace': namespace, 'named': specifiers, 'line': line}
+            return record, simple.end()
+
+    record = {'source': None, 'kind': 'static', 'default': None, 'namespace': None, 'named': [], 'line': line}
+    tokens = _statement_tokens(content, start)
+
+    first = next(tokens, None)
+    if first is None:
+        return None, start
+    kind, value, end = first
+
+    if kind == 'punct' and value == '(':
+        # import('module') dynamique
+        record['kind'] = 'dynamic'
+        argument = next(tokens, None)
+        if argument is not None and argument[0] == 'str':
+            record['source'] = _unquote(argument[1])
+            return record, argument[2]
+        return record, end
+    if kind == 'punct' and value == '.':
+        # import.meta
+        return None, end
+    if kind == 'str':
+        record['kind'] = 'side_effect'
+        record['source'] = _unquote(value)
+        return record, end
+    if kind == 'punct' and value not in '{*':
+        # Pas une instruction import (clé d'objet, identifiant...)
+        return None, start
+
+    in_braces = False
+    pending = None
+    expect_alias = False
+    expect_namespace = False
+    token = first
+    while token is not None:
+        kind, value, end = token
+        if kind == 'str':
+            record['source'] = _unquote(value)
+            return record, end
+        if kind == 'punct':
+            if value == '{':
+                in_braces = True
+            elif value == '}':
+                if pending:
+                    record['named'].append(pending)
+                pending = None
+                in_braces = False
+            elif value == ',' and in_braces:
+                if pending:
+                    record['named'].append(pending)
+                pending = None
+            elif value == '*':
+                expect_namespace = True
+            elif value != ',':
+                return None, end
+        elif kind == 'word':
+            if value == 'as':
+                expect_alias = True
+            elif expect_alias and expect_namespace:
+                record['namespace'] = value
+                expect_alias = expect_namespace = False
+            elif expect_alias and pending:
+                pending = [pending[0], value]
+                expect_alias = False
+            elif in_braces:
+                pending = [value, value]
+            elif value == 'from':
+                pass
+            elif record['default'] is None:
+                record['default'] = value
+        token = next(tokens, None)
+    return None, start
+
+
+def _pattern_names(tokens: List[Tuple[str, str, int]], index: int, names: List[str]) -> int:
+    """Ajoute les noms liés par le motif de déstructuration qui commence à tokens[index]
+    ('{' ou '['); retourne l'indice qui suit le motif"""
+    in_object = tokens[index][1] == '{'
+    closing = '}' if in_object else ']'
+    count = len(tokens)
+    index += 1
+    while index < count:
+        kind, value, _ = tokens[index]
+        if kind == 'punct' and value in ',...':
+            index += 1
+            continue
+        if kind == 'punct' and value == closing:
+            return index + 1
+        if in_object:
+            # Clé suivie de ':' (la cible suit), éventuellement calculée: [expr]
+            if kind == 'punct' and value == '[':
+                index = _skip_balanced(tokens, index)
+                index += 1
+            elif index + 1 < count and tokens[index + 1][1] == ':':
+                index += 2
+            if index >= count:
+                break
+            kind, value, _ = tokens[index]
+        if kind == 'punct' and value in '{[':
+            index = _pattern_names(tokens, index, names)
+        else:
+            if kind == 'word':
+                names.append(value)
+            index += 1
+        # Valeur par défaut: sautée jusqu'à l'élément suivant
+        if index < count and tokens[index][1] == '=':
+            while index < count and tokens[index][1] not in (',', closing):
+                if tokens[index][1] in '([{':
+                    index = _skip_balanced(tokens, index)
+                else:
+                    index += 1
+    return index
+
+
+def _skip_balanced(tokens: List[Tuple[str, str, int]], index: int) -> int:
+    """Indice qui suit le groupe (...), [...] ou {...} ouvert à tokens[index]"""
+    depth = 0
+    for position in range(index, len(tokens)):
+        kind, value, _ = tokens[position]
+        if kind != 'punct':
+            continue
+        if value in '([{':
+            depth += 1
+        elif value in ')]}':
+            depth -= 1
+            if depth == 0:
+                return position + 1
+    return len(tokens)
+
+
+def _outside_templates(tokens: Iterator[Tuple[str, str, int]]) -> Iterator[Tuple[str, str, int]]:
+    """Jetons hors des expressions ${...}: un gabarit se réduit à son premier segment"""
+    depth = 0
+    for token in tokens:
+        if token[0] == 'template':
+            value = token[1]
+            if depth == 0:
+                yield token
+            if value[0] == '}':
+                depth -= 1
+            if value.endswith('${'):
+                depth += 1
+        elif depth == 0:
+            yield token
+
+
+def _literal_end(content: str, position: int) -> int:
+    """Fin du groupe (...), [...] ou {...} ouvert à position, -1 s'il contient un
+    gabarit, un '/' hors commentaire ou une chaîne non fermée (laissés au lexer)"""
+    depth = 0
+    length = len(content)
+    match_text = _LITERAL_TEXT.match
+    while position < length:
+        char = content[position]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        else:
+            return -1
+        position = match_text(content, position + 1).end()
+    return -1
+
+
+def _declared_names(content: str, position: int) -> List[str]:
+    """Noms déclarés par une liste const/let/var commençant à position (après le mot-clé)
+
+    Chaque déclarateur est un identifiant ou un motif de déstructuration; son
+    initialiseur est parcouru jusqu'à la ',' de profondeur nulle qui introduit
+    le suivant. Le parcours s'arrête au ';', au début de l'instruction
+    suivante, au corps d'une fonction (une liste ne se poursuit pas après) et
+    au-delà de _MAX_STATEMENT_TOKENS jetons. Les initialiseurs courants
+    (fonction, littéral objet ou tableau) sont franchis sans lexer.
+    """
+    names: List[str] = []
+    count = 0
+    while True:
+        declarator = _NAMED_DECLARATOR.match(content, position)
+        if declarator is not None:
+            name, function, literal = declarator.groups()
+            if function is not None:
+                names.append(name)
+                return names
+            if literal is not None:
+                end = _literal_end(content, declarator.end() - 1)
+                if end > 0:
+                    names.append(name)
+                    following = _NEXT_DECLARATOR.match(content, end)
+                    if following is None:
+                        return names
+                    position = following.end()
+                    continue
+
+        tokens = _outside_templates(tokenize(content, position))
+        target = next(tokens, None)
+        if target is None:
+            return names
+        kind, value, _ = target
+        if kind == 'word':
+            names.append(value)
+        elif kind == 'punct' and value in '{[':
+            pattern = [target]
+            depth = 1
+            for token in tokens:
+                pattern.append(token)
+                if token[0] == 'punct':
+                    if token[1] in '([{':
+                        depth += 1
+                    elif token[1] in ')]}':
+                        depth -= 1
+                        if depth == 0:
+                            break
+            count += len(pattern)
+            _pattern_names(pattern, 0, names)
+        else:
+            return names
+        # Initialiseur
+        depth = 0
+        previous = None
+        for kind, value, start in tokens:
+            count += 1
+            if count > _MAX_STATEMENT_TOKENS:
+                return names
+            if kind == 'punct':
+                if value in '([{':
+                    if value == '{' and previous == '=>':
+                        return names
+                    depth += 1
+                elif value in ')]}':
+                    depth -= 1
+                    if depth < 0:
+                        return names
+                elif depth == 0 and value == ',':
+                    position = start + 1
+                    break
+                elif depth == 0 and value == ';':
+                    return names
+            elif kind == 'word':
+                if value == 'function' or value == 'class':
+                    return names
+                if depth == 0 and value in _STATEMENT_KEYWORDS:
+                    return names
+            previous = value
+        else:
+            return names
+
+
+def _declaration_exports(names: List[str], line: int) -> List[Dict]:
+    return [{'name': name, 'local': name, 'kind': 'declaration', 'source': None, 'line': line} for name in names]
+
+
+def _parse_export(content: str, start: int, line: int):
+    """Analyse une instruction export; retourne (exports, import de ré-export éventuel, fin)"""
+    simple = _SIMPLE_EXPORT.match(content, start)
+    if simple is not None:
+        default, variable, name = simple.groups()
+        if default is not None:
+            if name not in ('function', 'class', 'async'):
+                return [{'name': 'default', 'local': name, 'kind': 'default', 'source': None, 'line': line}], \
+                    None, simple.end()
+        elif name not in _DECLARATION_KEYWORDS:
+            if variable is not None:
+                return _declaration_exports(_declared_names(content, simple.start('name')), line), \
+                    None, simple.end()
+            return _declaration_exports([name], line), None, simple.end()
+
+    tokens = _statement_tokens(content, start)
+    first = next(tokens, None)
+    if first is None:
+        return [], None, start
+    kind, value, end = first
+
+    if kind == 'word' and value == 'default':
+        following = next(tokens, None)
+        local = None
+        position = end
+        if following is not None:
+            position = following[2]
+            if following[0] == 'word' and following[1] in ('function', 'class', 'async'):
+                for token in tokens:
+                    position = token[2]
+                    if token[0] == 'word' and token[1] != 'function':
+                        local = token[1]
+                        break
+                    if token[0] == 'punct' and token[1] != '*':
+                        break
+            elif following[0] == 'word':
+                local = following[1]
+        return [{'name': 'default', 'local': local, 'kind': 'default', 'source': None, 'line': line}], None, position
+
+    if kind == 'word' and value in ('const', 'let', 'var'):
+        # export const { a, b: c } = ... / export let [x, y] = ...
+        return _declaration_exports(_declared_names(content, end), line), None, end
+
+    if kind == 'word' and value in _DECLARATION_KEYWORDS:
+        for token in tokens:
+            if token[0] == 'word' and token[1] not in _DECLARATION_KEYWORDS:
+                return [{'name': token[1], 'local': token[1], 'kind': 'declaration',
+                         'source': None, 'line': line}], None, token[2]
+            if token[0] == 'punct' and token[1] not in '*{[':
+                return [], None, token[2]
+        return [], None, end
+
+    if kind == 'punct' and value == '*':
+        # export * from 'x' / export * as ns from 'x'
+        namespace = None
+        expect_alias = False
+        for token in tokens:
+            if token[0] == 'word' and token[1] == 'as':
+                expect_alias = True
+            elif token[0] == 'word' and expect_alias:
+                namespace = token[1]
+                expect_alias = False
+            elif token[0] == 'str':
+                source = _unquote(token[1])
+                exports = [{'name': namespace or '*', 'local': None,
+                            'kind': 'reexport' if namespace else 'reexport_all', 'source': source, 'line': line}]
+                reexport = {'source': source, 'kind': 'reexport', 'default': None, 'namespace': namespace or '*',
+                            'named': [], 'line': line}
+                return exports, reexport, token[2]
+            elif token[0] == 'punct' and token[1] == ';':
+                return [], None, token[2]
+        return [], None, end
+
+    if kind == 'punct' and value == '{':
+        specifiers = []
+        pending = None
+        expect_alias = False
+        position = end
+        closed = False
+        for token in tokens:
+            position = token[2]
+            if not closed:
+                if token[0] == 'word':
+                    if token[1] == 'as':
+                        expect_alias = True
+                    elif expect_alias and pending:
+                        pending = [pending[0], token[1]]
+                        expect_alias = False
+                    else:
+                        pending = [token[1], token[1]]
+                elif token[0] == 'punct' and token[1] in ',}':
+                    if pending:
+                        specifiers.append(pending)
+                    pending = None
+                    closed = token[1] == '}'
+                continue
+            # Après l'accolade fermante: éventuel "from 'source'"
+            if token[0] == 'word' and token[1] == 'from':
+                continue
+            if token[0] == 'str':
+                source = _unquote(token[1])
+                exports = [{'name': exported, 'local': local, 'kind': 'reexport', 'source': source, 'line': line}
+                           for local, exported in specifiers]
+                reexport = {'source': source, 'kind': 'reexport', 'default': None, 'namespace': None,
+                            'named': [[local, exported] for local, exported in specifiers], 'line': line}
+                return exports, reexport, position
+            break
+        exports = [{'name': exported, 'local': local, 'kind': 'named', 'source': None, 'line': line}
+                   for local, exported in specifiers]
+        return exports, None, position
+
+    return [], None, end
+
+
+def _parse_require(content: str, start: int, line: int):
+    """Analyse un appel require('module'); retourne (enregistrement, fin)"""
+    tokens = _statement_tokens(content, start)
+    opening = next(tokens, None)
+    if opening is None or opening[0] != 'punct' or opening[1] != '(':
+        return None, start
+    argument = next(tokens, None)
+    if argument is None or argument[0] != 'str':
+        return None, opening[2]
+    record = {'source': _unquote(argument[1]), 'kind': 'require', 'default': None,
+              'namespace': None, 'named': [], 'line': line}
+    return record, argument[2]
+
+
+def _keyword_positions(content: str) -> List[int]:
+    """Positions (triées) des mots entiers import/export/require, hors propriété (x.import)"""
+    positions = []
+    # import et export partagent leur suffixe: une seule recherche pour les deux
+    found = content.find('port', 2)
+    while found >= 0:
+        start = found - 2
+        prefix = content[start:found]
+        if prefix == 'im' or prefix == 'ex':
+            before = content[start - 1] if start else ' '
+            after = content[found + 4:found + 5]
+            if before not in _IDENT_CHARS and before != '.' and (not after or after not in _IDENT_CHARS):
+                positions.append(start)
+        found = content.find('port', found + 4)
+    found = content.find('require')
+    if found >= 0:
+        while found >= 0:
+            before = content[found - 1] if found else ' '
+            after = content[found + 7:found + 8]
+            if before not in _IDENT_CHARS and before != '.' and (not after or after not in _IDENT_CHARS):
+                positions.append(found)
+            found = content.find('require', found + 7)
+        positions.sort()
+    return positions
+
+
+def scan_module(content: str, with_comments: bool = True) -> ModuleInfo:
+    """Analyse un module en une passe et retourne ses imports, exports et commentaires
+
+    Sans with_comments, seuls les commentaires qui masquent un mot-clé candidat
+    ou un gabarit sont franchis, aucun n'est relevé: c'est le mode des
+    analyses qui ne lisent que le graphe d'imports et les exports.
+    """
+    info = ModuleInfo(with_comments)
+    line_at = LineCounter(content).at
+    length = len(content)
+    position = 0
+    # Profondeur d'accolades de chaque expression ${...} ouverte
+    template_stack: List[int] = []
+    # Les mots-clés sont localisés d'avance par recherche littérale; le saut est
+    # borné par le prochain candidat, qui n'est retenu que s'il est atteint hors
+    # chaîne, commentaire, gabarit ou expression régulière
+    candidates = _keyword_positions(content)
+    candidates.append(length)
+    next_index = 0
+    # Prochaines positions des seules constructions qui franchissent une fin de
+    # ligne (gabarits, commentaires de bloc) et des commentaires // recherchés
+    next_template = next_block = -1
+    next_line = -1 if with_comments else length
+    # Sans commentaires à relever: après le dernier '`' et le dernier '*/', aucun
+    # gabarit ni commentaire de bloc ne reste ouvert, un candidat s'y valide sur
+    # sa seule ligne (la fin du module, souvent un export default, n'est pas lexée)
+    tail = length + 1
+    if not with_comments:
+        tail = max(content.rfind('`') + 1, content.rfind('*/') + 2)
+    match_template = _SIMPLE_TEMPLATE.match
+    match_top = _SKIP_TOP.match
+    match_next_comment = _NEXT_LINE_COMMENT.match
+    comments = info.comments
+
+    while position < length:
+        while candidates[next_index] < position:
+            next_index += 1
+        candidate = candidates[next_index]
+        if template_stack:
+            position = _SKIP_EXPR.match(content, position, candidate).end()
+        else:
+            if candidate == length and not with_comments:
+                # Plus aucun mot-clé à valider: le reste du module est sans intérêt
+                break
+            if candidate >= tail:
+                line_start = content.rfind('\n', position, candidate) + 1
+                if line_start >= tail:
+                    position = line_start
+            # Chaînes, expressions régulières et commentaires // s'arrêtent en fin
+            # de ligne: hors gabarit, les lignes sans aucune de ces constructions
+            # ni mot-clé candidat sont sautées d'un bloc, le lexage reprend au
+            # début de la ligne du prochain événement
+            if next_template < position:
+                next_template = content.find('`', position)
+                if next_template < 0:
+                    next_template = length
+            if next_block < position:
+                next_block = content.find('/*', position)
+                if next_block < 0:
+                    next_block = length
+            if next_line < position:
+                next_line = content.find('//', position)
+                if next_line < 0:
+                    next_line = length
+            bound = candidate
+            if next_template < bound:
+                bound = next_template
+            if next_block < bound:
+                bound = next_block
+            if next_line < bound:
+                bound = next_line
+            line_start = content.rfind('\n', position, bound) + 1
+            if line_start > position:
+                position = line_start
+            position = match_top(content, position, bound).end()
+            if position == bound < candidate:
+                # Commentaire ou gabarit atteint hors chaîne: traité ici sans
+                # repasser par l'aiguillage caractère par caractère
+                if position == next_line:
+                    # Commentaire //, puis ceux des lignes suivantes qui n'ont que cela
+                    while True:
+                        end = content.find('\n', position)
+                        end = length if end < 0 else end
+                        comments.append({'kind': 'line', 'text': content[position:end], 'line': line_at(position)})
+                        following = match_next_comment(content, end)
+                        if following is None:
+                            break
+                        position = following.end() - 2
+                    position = end
+                    continue
+                if position == next_block:
+                    end = content.find('*/', position + 2)
+                    end = length if end < 0 else end + 2
+                    if with_comments:
+                        comments.append({'kind': 'block', 'text': content[position:end], 'line': line_at(position)})
+                    position = end
+                    continue
+                # Gabarit sans expression complexe, entièrement avant le candidat:
+                # consommé d'un bloc
+                match = match_template(content, position, candidate)
+                if match is not None:
+                    position = match.end()
+                    continue
+        if position >= length:
+            break
+        if position == candidate:
+            keyword = content[position:position + 6]
+            if keyword == 'requir':
+                keyword = 'require'
+            end = position + len(keyword)
+            line = line_at(position)
+            if keyword == 'import':
+                record, end = _parse_import(content, end, line)
+                if record is not None:
+                    info.imports.append(record)
+            elif keyword == 'export':
+                exports, reexport, end = _parse_export(content, end, line)
+                info.exports.extend(exports)
+                if reexport is not None:
+                    info.imports.append(reexport)
+            else:
+                record, end = _parse_require(content, end, line)
+                if record is not None:
+                    info.imports.append(record)
+            position = max(end, position + len(keyword))
+            continue
+
+        char = content[position]
+        if char == "'" or char == '"':
+            # Chaîne qui chevauche le prochain candidat
+            position = _STRING.match(content, position).end()
+
+        elif char == '/':
+            following = content[position + 1:position + 2]
+            if following == '/':
+                end = content.find('\n', position)
+                end = length if end < 0 else end
+                if with_comments:
+                    info.comments.append({'kind': 'line', 'text': content[position:end], 'line': line_at(position)})
+                position = end
+            elif following == '*':
+                end = content.find('*/', position + 2)
+                end = length if end < 0 else end + 2
+                if with_comments:
+                    info.comments.append({'kind': 'block', 'text': content[position:end], 'line': line_at(position)})
+                position = end
+            elif _regex_allowed(content, position):
+                match = _REGEX_BODY.match(content, position + 1)
+                position = match.end() if match else position + 1
+            else:
+                position += 1
+
+        elif char == '`':
+            position = _skip_template(content, position + 1, template_stack)
+
+        elif char == '{':
+            template_stack[-1] += 1
+            position += 1
+
+        else:
+            if template_stack[-1] == 0:
+                # Fin de l'expression ${...}: reprise du gabarit englobant
+                template_stack.pop()
+                position = _skip_template(content, position + 1, template_stack)
+            else:
+                template_stack[-1] -= 1
+                position += 1
+
+    return info
+
+
+def _skip_template(content: str, position: int, template_stack: List[int]) -> int:
+    """Saute le texte d'un gabarit; ouvre une expression sur '${' ou s'arrête après '`'"""
+    position = _TEMPLATE_CHUNK.match(content, position).end()
+    if position >= len(content):
+        return position
+    if content[position] == '`':
+        return position + 1
+    # '${': on entre dans une expression imbriquée
+    template_stack.append(0)
+    return position + 2
+
+
+def tokenize(content: str, position: int = 0) -> Iterator[Tuple[str, str, int]]:
+    """Itère sur les jetons (type, valeur, position) du code, hors blancs et commentaires
+
+    Types: 'word', 'num', 'punct', 'str', 'regex' et 'template' (un jeton par
+    segment de texte d'un gabarit; les expressions ${...} sont découpées comme
+    le reste du code). Un '/' ouvre une expression régulière selon le jeton
+    significatif précédent. position doit être hors chaîne, commentaire et
+    gabarit (le début d'un jeton de code).
+    """
+    length = len(content)
+    previous_kind = previous = None
+    # Profondeur d'accolades de chaque expression ${...} ouverte
+    template_stack: List[int] = []
+    match_token = _TOKEN.match
+
+    while position < length:
+        match = match_token(content, position)
+        kind = match.lastgroup
+        if kind is None:
+            # Blancs ou commentaires jusqu'à la fin du texte
+            return
+        start = match.start(kind)
+        position = match.end()
+        value = match.group(kind)
+
+        if kind == 'slash':
+            if previous_kind is None or (previous_kind == 'punct' and previous not in ')]}<') \
+                    or (previous_kind == 'word' and previous in _REGEX_KEYWORDS):
+                body = _REGEX_BODY.match(content, position)
+                if body is not None:
+                    position = body.end()
+                    kind, value = 'regex', content[start:position]
+                else:
+                    kind = 'punct'
+            else:
+                kind = 'punct'
+                if content.startswith('=', position):
+                    position += 1
+                    value = '/='
+
+        elif kind == 'template':
+            position = _skip_template(content, position, template_stack)
+            value = content[start:position]
+
+        elif kind == 'punct' and template_stack:
+            if value == '{':
+                template_stack[-1] += 1
+            elif value == '}':
+                if template_stack[-1] == 0:
+                    # Fin de l'expression ${...}: reprise du gabarit englobant
+                    template_stack.pop()
+                    position = _skip_template(content, position, template_stack)
+                    kind, value = 'template', content[start:position]
+                else:
+                    template_stack[-1] -= 1
+
+        previous_kind, previous = kind, value
+        yield kind, value, start
+
+
+def _blank(text: str) -> str:
+    """Remplace le texte par des espaces en gardant ses fins de ligne"""
+    if '\n' not in text:
+        return ' ' * len(text)
+    return '\n'.join([' ' * len(part) for part in text.split('\n')])
+
+
+def _template_segment(content: str, start: int, end: int) -> str:
+    """Segment de gabarit effacé, borné par deux '`' (séparent les jetons voisins)"""
+    return '`' + _blank(content[start + 1:end - 1]) + '`'
+
+
+def code_view(content: str) -> str:
+    """Code du module sans commentaires, texte de gabarit ni corps d'expression régulière
+
+    La vue a la longueur et les fins de ligne du module: une position y
+    désigne le même caractère. Commentaires effacés (espaces), chaque segment
+    de texte d'un gabarit réduit à '`' + espaces + '`', le corps d'une
+    expression régulière effacé après son '/' initial; les chaînes et le code
+    des expressions ${...} sont conservés tels quels.
+    """
+    length = len(content)
+    pieces: List[str] = []
+    emitted = position = 0
+    # Profondeur d'accolades de chaque expression ${...} ouverte
+    template_stack: List[int] = []
+    next_slash = next_template = -1
+    find = content.find
+
+    while True:
+        if template_stack:
+            match = _EXPRESSION_HAZARD.search(content, position)
+            if match is None:
+                break
+            hazard = match.start()
+            char = content[hazard]
+            if char == "'" or char == '"':
+                position = _STRING.match(content, hazard).end()
+                continue
+            if char == '{':
+                template_stack[-1] += 1
+                position = hazard + 1
+                continue
+            if char == '}':
+                if template_stack[-1]:
+                    template_stack[-1] -= 1
+                    position = hazard + 1
+                    continue
+                # Fin de l'expression ${...}: reprise du gabarit englobant
+                template_stack.pop()
+                end = _skip_template(content, hazard + 1, template_stack)
+                pieces.append(content[emitted:hazard])
+                pieces.append(_template_segment(content, hazard, end))
+                emitted = position = end
+                continue
+        else:
+            # Hors gabarit, seuls '/' et '`' changent la vue: recherche littérale
+            if next_slash < position:
+                next_slash = find('/', position)
+                if next_slash < 0:
+                    next_slash = length
+            if next_template < position:
+                next_template = find('`', position)
+                if next_template < 0:
+                    next_template = length
+            hazard = next_slash if next_slash < next_template else next_template
+            if hazard == length:
+                break
+            if content[hazard - 1:hazard] == '<':
+                # '</' d'une balise JSX fermante
+                position = hazard + 1
+                continue
+            # Caractère dans une chaîne de la même ligne: la chaîne est sautée
+            line_start = content.rfind('\n', position, hazard) + 1
+            outside = _OUTSIDE_STRINGS.match(content, max(line_start, position), hazard).end()
+            if outside < hazard:
+                position = _STRING.match(content, outside).end()
+                continue
+            char = content[hazard]
+
+        if char == '`':
+            end = _skip_template(content, hazard + 1, template_stack)
+            pieces.append(content[emitted:hazard])
+            pieces.append(_template_segment(content, hazard, end))
+            emitted = position = end
+            continue
+
+        following = content[hazard + 1:hazard + 2]
+        if following == '/':
+            end = find('\n', hazard)
+            end = length if end < 0 else end
+        elif following == '*':
+            end = find('*/', hazard + 2)
+            end = length if end < 0 else end + 2
+        else:
+            match = _REGEX_BODY.match(content, hazard + 1) if _regex_allowed(content, hazard) else None
+            if match is None:
+                # Division
+                position = hazard + 1
+                continue
+            hazard += 1
+            end = match.end()
+        pieces.append(content[emitted:hazard])
+        pieces.append(_blank(content[hazard:end]))
+        emitted = position = end
+
+    pieces.append(content[emitted:])
+    return ''.join(pieces)
+
+
+def code_tokens(content: str) -> List[str]:
+    """Jetons du module (mots, nombres, ponctuation, chaînes, gabarits), dans l'ordre
+
+    Même découpage que tokenize(), relevé d'un seul findall sur code_view():
+    un gabarit y est un jeton par segment de texte, effacé ('`' + blancs +
+    '`'), une expression régulière un '/' seul. Chaque fin de ligne hors
+    chaîne est un jeton ('\\n' suivi des blancs suivants) qui permet de
+    compter les lignes sans position.
+    """
+    return _VIEW_TOKEN.findall(code_view(content))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Métriques de complexité d'un module JavaScript en une passe de jetons
+Remplace les comptages de sous-chaînes (content.count('if ('), 'catch'...)
+qui comptaient aussi le texte des commentaires et des chaînes, et les mots
+qui contiennent le motif (catchError, useStateMachine). Les jetons de
+js_lexer.code_tokens() (le découpage de tokenize(), relevé d'un seul findall
+sur la vue de code) sont parcourus une seule fois, avec une pile des
+groupes (), [] et {} ouverts, pour calculer:
+- la complexité cyclomatique de chaque fonction (1 + if, for, while, case,
+  catch, &&, ||, ??, ternaires), les fonctions imbriquées ayant la leur;
+- les appels de hooks (useState, useEffect, useCallback, useMemo, autres
+  hooks React et hooks personnalisés): un nom suivi de '(', sauf après
+  'function' (déclaration) et en tête de méthode (useThing() { ... });
+- la profondeur maximale d'imbrication des blocs de contrôle;
+- le nombre d'effets (useEffect/useLayoutEffect) sans tableau de dépendances;
+- les instructions if/for/while/try/catch/return, pour le score historique.
+
+Les fonctions reconnues: déclarations function, fonctions fléchées à corps
+entre accolades et méthodes (objet ou classe). Le corps d'une fléchée sans
+accolades est compté dans la fonction englobante. Le résultat est mémorisé
+et sauvegardé par SourceCorpus.metrics() tant que le fichier ne change pas.
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+from js_lexer import code_tokens
+
+# Version des métriques: à incrémenter dès que compute_metrics produit des
+# résultats différents (invalide les métriques sauvegardées avec le corpus)
+METRICS_VERSION = 2
+
+# Hooks suivis individuellement; les autres hooks React sont regroupés
+TRACKED_HOOKS = ('useState', 'useEffect', 'useCallback', 'useMemo')
+REACT_HOOKS = frozenset({
+    'useState', 'useEffect', 'useCallback', 'useMemo', 'useRef', 'useContext', 'useReducer',
+    'useLayoutEffect', 'useImperativeHandle', 'useDebugValue', 'useTransition',
+    'useDeferredValue', 'useId', 'useSyncExternalStore', 'useInsertionEffect'
+})
+EFFECT_HOOKS = frozenset({'useEffect', 'useLayoutEffect', 'useInsertionEffect'})
+
+# Mots suivis de '(' qui ouvrent une condition (et non un appel ou une méthode)
+_CONTROL_PARENS = frozenset({'if', 'for', 'while', 'switch', 'catch', 'with'})
+# Mots suivis directement d'un bloc de contrôle (catch sans paramètre)
+_CONTROL_BLOCKS = frozenset({'else', 'try', 'do', 'finally', 'catch'})
+# Mots suivis de '(' qui ne sont pas des noms de méthode
+_NOT_METHODS = _CONTROL_PARENS | frozenset({'function', 'return', 'typeof', 'await', 'new', 'in', 'of'})
+_COUNTED_STATEMENTS = frozenset({'if', 'for', 'while', 'catch'})
+_CASE_AFTER = frozenset({'{', '}', ';', ':'})
+_DECISION_OPERATORS = frozenset({'&&', '||', '??', '?'})
+
+ANONYMOUS = '(anonyme)'
+
+# Type d'un jeton de code_tokens() d'après son premier caractère ('.5' excepté)
+_TOKEN_KINDS = dict.fromkeys('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$', 'word')
+_TOKEN_KINDS.update(dict.fromkeys('0123456789', 'num'))
+_TOKEN_KINDS.update(dict.fromkeys('\'"`', 'str'))
+_TOKEN_KINDS['\n'] = 'newline'
+
+
+def _hook_bucket(name: str) -> str:
+    if name in TRACKED_HOOKS:
+        return name
+    return 'react_other' if name in REACT_HOOKS else 'custom'
+
+
+def compute_metrics(content: str) -> Dict:
+    """Calcule les métriques d'un module en un seul parcours de ses jetons"""
+    line = 1
+    statements = Counter()
+    hook_calls = Counter({name: 0 for name in TRACKED_HOOKS + ('react_other', 'custom')})
+    effects_without_deps = 0
+
+    module = {'name': '(module)', 'line': 1, 'complexity': 1}
+    functions: List[Dict] = []
+    function_stack = [module]
+    # Groupes ouverts: [ouvrant, ouvre une fonction, bloc de contrôle, hook appelé, virgules, mot avant]
+    groups: List[list] = []
+    nesting = max_nesting = 0
+    pending_name = None        # nom de la prochaine fonction (x = ..., x: ...)
+    pending_function = None    # [nom, ligne, profondeur] après 'function' ou '=>'
+    pending_block = False      # le jeton précédent (else, try, do...) annonce un bloc de contrôle
+    closed_paren = None        # groupe '(' refermé par le jeton précédent
+    prev_kind = prev = prev2 = prev3 = None
+
+    def count_hook(group: list):
+        nonlocal effects_without_deps
+        hook_calls[_hook_bucket(group[3])] += 1
+        if group[3] in EFFECT_HOOKS and group[4] == 0:
+            effects_without_deps += 1
+
+    for value in code_tokens(content):
+        kind = _TOKEN_KINDS.get(value[0], 'punct')
+        if kind != 'word' and kind != 'punct':
+            if kind == 'newline':
+                line += value.count('\n')
+                continue
+            if kind == 'str':
+                # Ligne du jeton suivant: chaînes continuées et gabarits sur plusieurs lignes
+                line += value.count('\n')
+        elif kind == 'punct' and value[0] == '.' and value[1:2].isdigit():
+            kind = 'num'
+        if closed_paren is not None and closed_paren[3] is not None and value != '{':
+            # useX(...) non suivi d'un corps: un appel, et non une tête de méthode
+            count_hook(closed_paren)
+        block_word = False
+        last_paren = None
+        if kind == 'word':
+            if value == 'return':
+                statements['return'] += 1
+            elif value == 'case' and (prev is None or (prev_kind == 'punct' and prev in _CASE_AFTER)):
+                function_stack[-1]['complexity'] += 1
+            elif value == 'function':
+                pending_function = [pending_name or ANONYMOUS, line, len(groups)]
+            elif prev == 'function' and pending_function is not None:
+                pending_function[0] = value
+            block_word = value in _CONTROL_BLOCKS
+        elif kind == 'punct':
+            if value in _DECISION_OPERATORS:
+                function_stack[-1]['complexity'] += 1
+            elif value == '(':
+                control = prev_kind == 'word' and prev in _CONTROL_PARENS
+                if control and prev in _COUNTED_STATEMENTS:
+                    statements[prev] += 1
+                    function_stack[-1]['complexity'] += 1
+                hook = None
+                if prev_kind == 'word' and prev[:3] == 'use' and prev[3:4].isupper() \
+                        and prev2 != 'function' and (prev2 != '.' or prev3 == 'React'):
+                    # Compté à la fermeture, une fois écartée la tête de méthode
+                    hook = prev
+                groups.append(['(', False, control, hook, 0, prev if prev_kind == 'word' else None])
+            elif value == '[':
+                groups.append(['[', False, False, None, 0, None])
+            elif value == '{':
+                function = None
+                control = pending_block or (closed_paren is not None and closed_paren[2])
+                if prev == 'try':
+                    statements['try'] += 1
+                elif prev == 'catch':
+                    # catch sans paramètre
+                    statements['catch'] += 1
+                    function_stack[-1]['complexity'] += 1
+                if pending_function is not None and pending_function[2] == len(groups):
+                    function = pending_function
+                elif closed_paren is not None and not control and closed_paren[5] is not None \
+                        and closed_paren[5] not in _NOT_METHODS:
+                    # Méthode d'objet ou de classe: nom(...) { ... }
+                    function = [closed_paren[5], line, len(groups)]
+                if function is not None:
+                    record = {'name': function[0], 'line': function[1], 'complexity': 1}
+                    functions.append(record)
+                    function_stack.append(record)
+                    pending_function = pending_name = None
+                if control:
+                    nesting += 1
+                    max_nesting = max(max_nesting, nesting)
+                groups.append(['{', function is not None, control, None, 0, None])
+            elif value in ')]}':
+                if groups:
+                    group = groups.pop()
+                    if group[1]:
+                        function_stack.pop()
+                    if group[2] and group[0] == '{':
+                        nesting -= 1
+                    if group[0] == '(':
+                        last_paren = group
+            elif value == ',':
+                if groups:
+                    groups[-1][4] += 1
+            elif value == '=>':
+                pending_function = [pending_name or ANONYMOUS, line, len(groups)]
+            elif value in ('=', ':') and prev_kind == 'word':
+                pending_name = prev
+            elif value == ';':
+                pending_name = None
+        if prev == '=>' and value != '{':
+            # Fléchée sans accolades: son corps reste dans la fonction englobante
+            pending_function = None
+        pending_block = block_word
+        closed_paren = last_paren
+        prev3, prev2 = prev2, prev
+        prev_kind, prev = kind, value
+
+    if closed_paren is not None and closed_paren[3] is not None:
+        count_hook(closed_paren)
+
+    most_complex = max(functions, key=lambda record: record['complexity'], default=module)
+    return {
+        'functions': [[record['name'], record['line'], record['complexity']] for record in functions],
+        'function_count': len(functions),
+        'cyclomatic_max': most_complex['complexity'],
+        'cyclomatic_total': module['complexity'] + sum(record['complexity'] - 1 for record in functions),
+        'most_complex_function': most_complex['name'],
+        'hook_calls': dict(hook_calls),
+        'max_nesting': max_nesting,
+        'effects_without_deps': effects_without_deps,
+        'statements': {name: statements[name] for name in ('if', 'for', 'while', 'try', 'catch', 'return')},
+    }
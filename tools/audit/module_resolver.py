@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Résolution des imports JavaScript TourCraft vers des fichiers réels
+Applique les mêmes règles que le build (jsconfig.json + babel module-resolver
+de craco.config.js): chemins relatifs, alias "paths" de jsconfig.json,
+baseUrl et racine src/, extensions implicites (.js, .jsx, .json) et fichiers
+index.js des répertoires. Les ré-exports des barrels (src/hooks/*/index.js)
+sont suivis jusqu'au fichier qui définit réellement chaque nom importé.
+
+Chaque résolution est mémorisée par couple (répertoire importeur,
+spécificateur): le graphe complet de src/ se construit en une fraction de
+seconde à partir du corpus partagé.
+"""
+
+import os
+import json
+import posixpath
+from pathlib import Path
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from source_corpus import SourceCorpus
+
+# Extensions essayées pour un spécificateur sans extension, dans l'ordre du build
+RESOLVE_EXTENSIONS = ('.js', '.jsx', '.json')
+# Racines de module-resolver (craco.config.js): 'hooks/x' désigne src/hooks/x
+DEFAULT_MODULE_ROOTS = ('src',)
+JS_SUFFIXES = ('.js', '.jsx')
+
+
+class ModuleResolver:
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 module_roots: Tuple[str, ...] = DEFAULT_MODULE_ROOTS):
+        self.project_root = Path(project_root)
+        self.corpus = corpus or SourceCorpus(project_root)
+        self.module_roots = module_roots
+        self.base_url, self.path_aliases = self._load_jsconfig()
+
+        # Mémoïsation: (répertoire importeur, spécificateur) -> fichier ou None
+        self._resolved: Dict[Tuple[str, str], Optional[str]] = {}
+        # (fichier, nom exporté) -> fichiers qui définissent ce nom
+        self._bindings: Dict[Tuple[str, str], Optional[List[str]]] = {}
+        # Répertoire -> noms de ses fichiers (un seul listage par répertoire)
+        self._listings: Dict[str, Set[str]] = {}
+        self.stats = {'lookups': 0, 'resolved': 0, 'memo_hits': 0}
+
+    def _load_jsconfig(self) -> Tuple[str, List[Tuple[str, List[str]]]]:
+        """Lit baseUrl et paths de jsconfig.json (alias les plus spécifiques d'abord)"""
+        config_path = self.project_root / "jsconfig.json"
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                options = json.load(f).get('compilerOptions', {})
+        except (OSError, ValueError):
+            options = {}
+
+        base_url = posixpath.normpath(options.get('baseUrl', '.'))
+        aliases = []
+        for pattern, targets in options.get('paths', {}).items():
+            aliases.append((pattern, [posixpath.normpath(posixpath.join(base_url, t)) for t in targets]))
+        # Le préfixe le plus long l'emporte ('@hooks/*' avant '@/*')
+        aliases.sort(key=lambda alias: -len(alias[0].split('*')[0]))
+        return base_url, aliases
+
+    def _is_file(self, relative: str) -> bool:
+        """Teste l'existence d'un fichier dans le listage mis en cache de son répertoire"""
+        directory, name = posixpath.split(relative)
+        listing = self._listings.get(directory)
+        if listing is None:
+            try:
+                with os.scandir(os.path.join(self.project_root, directory)) as entries:
+                    listing = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                listing = set()
+            self._listings[directory] = listing
+        return name in listing
+
+    def _resolve_path(self, relative: str) -> Optional[str]:
+        """Fichier exact, puis extensions implicites, puis index du répertoire"""
+        if relative.startswith('..'):
+            return None
+        if self._is_file(relative):
+            return relative
+        for extension in RESOLVE_EXTENSIONS:
+            if self._is_file(relative + extension):
+                return relative + extension
+        for extension in RESOLVE_EXTENSIONS:
+            index = posixpath.join(relative, 'index' + extension)
+            if self._is_file(index):
+                return index
+        return None
+
+    def _candidates(self, directory: str, specifier: str) -> List[str]:
+        """Chemins (relatifs au projet) à essayer pour un spécificateur"""
+        if specifier.startswith('./') or specifier.startswith('../') or specifier in ('.', '..'):
+            return [posixpath.normpath(posixpath.join(directory, specifier))]
+
+        for pattern, targets in self.path_aliases:
+            prefix, star, suffix = pattern.partition('*')
+            if not star:
+                if specifier == pattern:
+                    return targets
+                continue
+            if specifier.startswith(prefix) and specifier.endswith(suffix) and len(specifier) >= len(prefix) + len(suffix):
+                matched = specifier[len(prefix):len(specifier) - len(suffix)]
+                return [target.replace('*', matched) for target in targets]
+
+        # Spécificateur nu: baseUrl puis racines de module-resolver (sinon paquet npm)
+        candidates = [posixpath.normpath(posixpath.join(self.base_url, specifier))]
+        candidates.extend(posixpath.join(root, specifier) for root in self.module_roots)
+        return candidates
+
+    def is_package(self, specifier: str) -> bool:
+        """Vrai pour un spécificateur ni relatif ni aliasé (paquet npm)"""
+        if specifier.startswith('.') or specifier.startswith('/'):
+            return False
+        return not any(specifier.startswith(pattern.split('*')[0]) for pattern, _ in self.path_aliases)
+
+    def resolve(self, importer: str, specifier: str) -> Optional[str]:
+        """Résout un spécificateur importé par importer (chemin relatif au projet)"""
+        directory = posixpath.dirname(importer)
+        key = (directory, specifier)
+        self.stats['lookups'] += 1
+        if key in self._resolved:
+            self.stats['memo_hits'] += 1
+            return self._resolved[key]
+
+        resolved = None
+        for candidate in self._candidates(directory, specifier):
+            resolved = self._resolve_path(candidate)
+            if resolved is not None:
+                break
+        if resolved is not None:
+            self.stats['resolved'] += 1
+        self._resolved[key] = resolved
+        return resolved
+
+    def resolve_binding(self, module_path: str, name: str, _visiting: Optional[Set] = None) -> Optional[List[str]]:
+        """Suit les ré-exports d'un module jusqu'aux fichiers qui définissent name"""
+        key = (module_path, name)
+        if key in self._bindings:
+            return self._bindings[key]
+        visiting = _visiting if _visiting is not None else set()
+        if key in visiting or not module_path.endswith(JS_SUFFIXES):
+            return None
+        visiting.add(key)
+
+        module = self.corpus.module(module_path)
+        result = None
+        star_sources = []
+        for record in module.exports:
+            kind = record['kind']
+            if kind == 'reexport_all':
+                star_sources.append(record['source'])
+                continue
+            if record['name'] != name:
+                continue
+            if kind != 'reexport':
+                result = [module_path]
+                break
+            target = self.resolve(module_path, record['source'])
+            if target is None:
+                break
+            if record['local'] is None:
+                # export * as ns from './x': le nom désigne le module entier
+                result = [target]
+            else:
+                result = self.resolve_binding(target, record['local'], visiting) or [target]
+            break
+
+        if result is None and name != 'default':
+            # export * from './x': le nom peut venir de n'importe quelle cible
+            for source in star_sources:
+                target = self.resolve(module_path, source)
+                if target is not None:
+                    found = self.resolve_binding(target, name, visiting)
+                    if found:
+                        result = found
+                        break
+
+        visiting.discard(key)
+        self._bindings[key] = result
+        return result
+
+    def resolve_import(self, importer: str, record: Dict) -> Tuple[Optional[str], List[str]]:
+        """Retourne (module importé, fichiers réellement utilisés) pour un enregistrement d'import"""
+        target = self.resolve(importer, record['source'])
+        if target is None:
+            return None, []
+
+        names = [imported for imported, _ in record['named']]
+        if record['default']:
+            names.append('default')
+        if not names or record['namespace']:
+            return target, [target]
+
+        files = []
+        for name in names:
+            for definer in self.resolve_binding(target, name) or [target]:
+                if definer not in files:
+                    files.append(definer)
+        return target, files
+
+
+class ModuleGraph:
+    """Graphe des fichiers réels de src/ reliés par leurs imports résolus"""
+
+    def __init__(self):
+        self.nodes: Set[str] = set()
+        self.edges: Dict[str, Set[str]] = defaultdict(set)
+        # Imports relatifs ou aliasés introuvables, par fichier importeur
+        self.unresolved: Dict[str, List[str]] = defaultdict(list)
+        # Paquets npm importés (nombre d'imports)
+        self.external = Counter()
+
+    def add_edge(self, source: str, target: str):
+        if source != target:
+            self.nodes.add(target)
+            self.edges[source].add(target)
+
+    def to_dict(self) -> Dict:
+        return {
+            'nodes': sorted(self.nodes),
+            'edges': {source: sorted(targets) for source, targets in sorted(self.edges.items())},
+            'unresolved': {source: specs for source, specs in sorted(self.unresolved.items())},
+            'external': dict(self.external.most_common())
+        }
+
+
+def build_module_graph(corpus: SourceCorpus, resolver: ModuleResolver, subdir: str = "src") -> ModuleGraph:
+    """Construit le graphe des fichiers JS de subdir (les barrels sont traversés)"""
+    graph = ModuleGraph()
+    for source in corpus.files(subdir, JS_SUFFIXES):
+        importer = source.relative
+        graph.nodes.add(importer)
+        for record in corpus.module(source).imports:
+            if record['source'] is None:
+                continue
+            target, files = resolver.resolve_import(importer, record)
+            if target is None:
+                if resolver.is_package(record['source']):
+                    graph.external[record['source']] += 1
+                else:
+                    graph.unresolved[importer].append(record['source'])
+                continue
+            for file in files:
+                graph.add_edge(importer, file)
+    return graph
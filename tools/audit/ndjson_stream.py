@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Flux NDJSON de l'audit des hooks
+audit_hooks_dependencies.py --ndjson écrit un enregistrement JSON par ligne
+au fil de l'analyse (un par hook pendant le scan, puis un par import résolu,
+dépendance entre hooks et utilisation), au lieu d'un seul document JSON
+construit en fin d'audit. Les analyseurs lisent ce flux ligne à ligne et ne
+gardent que les hooks qu'ils retiennent; via un tube (--ndjson -), les premiers
+hooks sont traités avant la fin du scan. Le producteur, lui, garde tout
+l'inventaire en mémoire: le rapport Markdown, le rapport JSON et la base
+d'audit en ont besoin en fin d'analyse.
+
+Types d'enregistrements:
+- header           : {"type": "header", "version": 2, "scope": null}
+                     (scope: périmètre git --since/--staged d'un inventaire partiel)
+- hook             : {"type": "hook", "key": "domaine/nom", ...fiche hook_info}
+- edge             : {"type": "edge", "source": "src/...", "target": "src/..."}
+- dependency       : {"type": "dependency", "source": "domaine/nom", "target": "domaine/nom"}
+- usage            : {"type": "usage", "import_path": "...", "count": N}
+- generic_adoption : {"type": "generic_adoption", "generic_hook": "...", "component": "src/..."}
+- end              : {"type": "end", "counts": {type: N}} (flux complet)
+
+Un flux produit avec --since/--staged ne contient que les hooks du
+périmètre: read_records le refuse, sauf pour un lecteur lui-même limité à un
+périmètre (allow_partial=True).
+"""
+
+import sys
+import json
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Iterator, Optional, Tuple
+
+NDJSON_VERSION = 2
+DEFAULT_NDJSON_PATH = Path("tools") / "audit" / ".cache" / "rapport_dependances_hooks.ndjson"
+STDIO = '-'
+
+
+class NdjsonWriter:
+    """Écrit les enregistrements au fil de l'eau (fichier ou '-' pour la sortie standard)"""
+
+    def __init__(self, target, scope: Optional[str] = None):
+        self.target = str(target)
+        # Description du périmètre git (None: inventaire complet)
+        self.scope = scope
+        if self.target == STDIO:
+            self._file, self._owned = sys.stdout, False
+        else:
+            path = Path(self.target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file, self._owned = open(path, 'w', encoding='utf-8'), True
+        self.counts = Counter()
+        self.write('header', version=NDJSON_VERSION, scope=scope)
+
+    def write(self, record_type: str, **fields):
+        record = {'type': record_type}
+        record.update(fields)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Chaque ligne est disponible immédiatement pour un lecteur en aval
+        self._file.flush()
+        if record_type != 'header':
+            self.counts[record_type] += 1
+
+    def close(self):
+        """Termine le flux par l'enregistrement end (absent si l'audit a échoué)"""
+        self.write('end', counts=dict(self.counts))
+        if self._owned:
+            self._file.close()
+
+
+def read_records(source, allow_partial: bool = False) -> Iterator[Dict]:
+    """Lit un flux NDJSON ligne à ligne (fichier ou '-' pour l'entrée standard)
+
+    Un flux partiel (audit limité par --since/--staged) lève ValueError dès
+    l'en-tête, sauf avec allow_partial.
+    """
+    owned = str(source) != STDIO
+    stream = open(source, 'r', encoding='utf-8') if owned else sys.stdin
+    try:
+        complete = False
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{source}:{line_number}: ligne NDJSON invalide ({e.msg})")
+            if record.get('type') == 'header':
+                if record.get('version') != NDJSON_VERSION:
+                    raise ValueError(f"{source}: version de flux {record.get('version')} non supportée")
+                if record.get('scope') and not allow_partial:
+                    raise ValueError(f"{source}: flux partiel (périmètre git: {record['scope']}), "
+                                     f"relancer l'audit sans --since/--staged")
+                continue
+            if record.get('type') == 'end':
+                complete = True
+                break
+            yield record
+        if not complete:
+            raise ValueError(f"{source}: flux NDJSON incomplet (audit interrompu ?)")
+    finally:
+        if owned:
+            stream.close()
+
+
+def iter_hooks(source, allow_partial: bool = False) -> Iterator[Tuple[str, Dict]]:
+    """Fiches (clé, hook_info) du flux, dans l'ordre du scan"""
+    for record in read_records(source, allow_partial):
+        if record['type'] == 'hook':
+            key = record.pop('key')
+            del record['type']
+            yield key, record
+
+
+def add_ndjson_argument(parser, help_text: str, default: Optional[Path] = DEFAULT_NDJSON_PATH):
+    """Ajoute --ndjson [PATH] à un parseur argparse ('-' pour stdin/stdout)"""
+    parser.add_argument('--ndjson', nargs='?', const=str(default), metavar='PATH',
+                        help=f"{help_text} ('-' pour un tube, défaut: {default})")
+    return parser
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Détection des quasi-doublons structurels entre hooks et composants
+Chaque fichier est réduit à un flux de jetons normalisés (js_lexer.tokenize:
+commentaires exclus, chaînes et nombres anonymisés, noms d'entités métier
+— artiste, lieu, structure... — remplacés par un même marqueur), découpé en
+bardeaux de SHINGLE_SIZE jetons consécutifs. Une signature MinHash (une seule
+permutation, NUM_PERM compartiments densifiés) résume l'ensemble de bardeaux;
+le hachage localement sensible (LSH, bandes de lignes choisies d'après le
+seuil de similarité) ne propose que les paires qui partagent au moins une bande, au lieu de comparer toutes
+les paires de fichiers. Les paires candidates sont vérifiées par leur indice
+de Jaccard exact, regroupées en clusters (union-find), et les plages de lignes
+communes sont retrouvées à partir des bardeaux partagés.
+
+Les empreintes sont mises en cache par empreinte de contenu; les paires sont
+enregistrées dans la base d'audit (table duplicate_pairs) où
+analyze_generalization_candidates.py les lit.
+
+Usage:
+    python tools/audit/near_duplicates.py [--path=src/hooks,src/components] [--threshold=0.5]
+        [--json FICHIER] [--no-store] [--top=20]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import pickle
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from source_corpus import SourceCorpus
+from audit_store import AuditStore
+from js_lexer import JS_KEYWORDS, LineCounter, tokenize
+
+# Version des empreintes: à incrémenter dès que la normalisation ou le hachage change
+FINGERPRINT_VERSION = 1
+DEFAULT_CACHE_PATH = Path("tools") / "audit" / ".cache" / "near_duplicates.pickle"
+DEFAULT_PATHS = ("src/hooks", "src/components")
+
+SHINGLE_SIZE = 8
+NUM_PERM = 128
+DEFAULT_THRESHOLD = 0.5
+# Le seuil de détection des bandes, ~(1/bandes)^(1/lignes), doit rester en
+# dessous du seuil demandé avec cette marge pour ne pas manquer de paires
+LSH_MARGIN = 0.85
+# Un fichier trop court ne produit que des bardeaux banals (barrels, constantes)
+MIN_SHINGLES = 40
+# Au-delà, un compartiment LSH regroupe du code générique... ou une famille de
+# copies: ses paires ne sont pas toutes candidates mais vérifiées par Jaccard exact
+MAX_BUCKET = 50
+# Plages communes plus courtes ignorées dans le rapport
+MIN_RANGE_LINES = 3
+
+# Noms d'entités métier: useArtisteForm et useLieuForm deviennent identiques
+ENTITY_WORDS = re.compile(
+    r'artiste|concert|contrat|lieu|programmateur|structure|contact|date|facture|festival|tache|entreprise'
+    r'|organisation|collaborateur'
+)
+_MASK = (1 << 32) - 1
+_BIN_SHIFT = NUM_PERM.bit_length() - 1
+_EMPTY = _MASK + 1
+
+
+def normalize_tokens(content: str) -> Tuple[List[str], List[int]]:
+    """Jetons normalisés du fichier et numéro de ligne de chacun"""
+    lines = LineCounter(content)
+    tokens, token_lines = [], []
+    for kind, value, start in tokenize(content):
+        if kind == 'word':
+            if value not in JS_KEYWORDS:
+                value = ENTITY_WORDS.sub('§', value.lower())
+        elif kind == 'str' or kind == 'template':
+            value = '"'
+        elif kind == 'num':
+            value = '0'
+        elif kind == 'regex':
+            value = '/'
+        tokens.append(value)
+        token_lines.append(lines.at(start))
+    return tokens, token_lines
+
+
+class Fingerprint:
+    """Bardeaux (dans l'ordre, avec leurs lignes) et signature MinHash d'un fichier"""
+
+    __slots__ = ("shingles", "spans", "signature")
+
+    def __init__(self, shingles: List[int], spans: List[Tuple[int, int]], signature: Tuple[int, ...]):
+        self.shingles = shingles
+        self.spans = spans
+        self.signature = signature
+
+    @classmethod
+    def from_content(cls, content: str) -> "Fingerprint":
+        tokens, token_lines = normalize_tokens(content)
+        shingles, spans = [], []
+        for index in range(len(tokens) - SHINGLE_SIZE + 1):
+            window = "\x1f".join(tokens[index:index + SHINGLE_SIZE])
+            shingles.append(zlib.crc32(window.encode('utf-8')))
+            spans.append((token_lines[index], token_lines[index + SHINGLE_SIZE - 1]))
+        return cls(shingles, spans, minhash_signature(set(shingles)))
+
+    @property
+    def shingle_set(self) -> frozenset:
+        return frozenset(self.shingles)
+
+
+def minhash_signature(shingles: Iterable[int]) -> Tuple[int, ...]:
+    """Signature MinHash à une permutation: minimum par compartiment, puis densification
+
+    Le hachage est réparti en NUM_PERM compartiments (bits de poids faible);
+    un compartiment vide reprend la valeur du suivant non vide (circulairement),
+    décalée de la distance, ce qui garde la signature comparable position par
+    position (densification par rotation).
+    """
+    bins = [_EMPTY] * NUM_PERM
+    for value in shingles:
+        slot = value & (NUM_PERM - 1)
+        rest = value >> _BIN_SHIFT
+        if rest < bins[slot]:
+            bins[slot] = rest
+    if all(value == _EMPTY for value in bins):
+        return tuple(bins)
+    for slot in range(NUM_PERM):
+        if bins[slot] == _EMPTY:
+            distance = 1
+            while bins[(slot + distance) % NUM_PERM] == _EMPTY:
+                distance += 1
+            bins[slot] = bins[(slot + distance) % NUM_PERM] + distance * _EMPTY
+    return tuple(bins)
+
+
+def lsh_parameters(threshold: float) -> Tuple[int, int]:
+    """(bandes, lignes) le plus sélectif dont le seuil de détection reste sous threshold"""
+    bands, rows = NUM_PERM, 1
+    candidate = 1
+    while candidate * 2 <= NUM_PERM:
+        candidate *= 2
+        if (1 / (NUM_PERM // candidate)) ** (1 / candidate) > threshold * LSH_MARGIN:
+            break
+        bands, rows = NUM_PERM // candidate, candidate
+    return bands, rows
+
+
+def estimate_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimation de l'indice de Jaccard par la proportion de compartiments égaux"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERM
+
+
+def _line_ranges(fingerprint: Fingerprint, common: frozenset) -> List[List[int]]:
+    """Plages de lignes [début, fin] couvertes par les bardeaux communs (fusionnées)"""
+    ranges: List[List[int]] = []
+    start = end = None
+    for shingle, (first, last) in zip(fingerprint.shingles, fingerprint.spans):
+        if shingle not in common:
+            continue
+        if end is not None and first <= end + 1:
+            if last > end:
+                end = last
+            continue
+        if end is not None and end - start + 1 >= MIN_RANGE_LINES:
+            ranges.append([start, end])
+        start, end = first, last
+    if end is not None and end - start + 1 >= MIN_RANGE_LINES:
+        ranges.append([start, end])
+    return ranges
+
+
+class NearDuplicateFinder:
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 threshold: float = DEFAULT_THRESHOLD, cache_path: Optional[str] = None):
+        self.project_root = Path(project_root)
+        self.corpus = corpus or SourceCorpus(project_root)
+        self.threshold = threshold
+        self.bands, self.rows = lsh_parameters(threshold)
+        self.cache_path = Path(cache_path) if cache_path else self.project_root / DEFAULT_CACHE_PATH
+        self.fingerprints: Dict[str, Fingerprint] = {}
+        self.stats = {'files': 0, 'skipped': 0, 'cached': 0, 'candidates': 0, 'pairs': 0,
+                      'oversized_buckets': 0, 'oversized_members': 0, 'oversized_pairs': 0}
+        # chemin -> (empreinte du contenu, Fingerprint), fichiers trop courts compris
+        self._cache: Dict[str, Tuple[str, Fingerprint]] = {}
+        self._computed: Dict[str, Tuple[str, Fingerprint]] = {}
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return
+        if data.get('version') == (FINGERPRINT_VERSION, SHINGLE_SIZE, NUM_PERM):
+            self._cache = {relative: (digest, Fingerprint(*fields))
+                           for relative, (digest, *fields) in data['records'].items()}
+
+    def _save_cache(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        records = {relative: (digest, fingerprint.shingles, fingerprint.spans, fingerprint.signature)
+                   for relative, (digest, fingerprint) in self._computed.items()}
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump({'version': (FINGERPRINT_VERSION, SHINGLE_SIZE, NUM_PERM), 'records': records}, f)
+
+    def fingerprint_files(self, directories: Iterable[str] = DEFAULT_PATHS):
+        """Calcule (ou reprend du cache) l'empreinte de chaque fichier JS des répertoires"""
+        self._load_cache()
+        for directory in directories:
+            for source in self.corpus.files(directory, ('.js', '.jsx')):
+                if "__tests__" in source.relative or source.path.name == "index.js" or not source.content:
+                    continue
+                self.stats['files'] += 1
+                cached = self._cache.get(source.relative)
+                if cached is not None and cached[0] == source.digest:
+                    fingerprint = cached[1]
+                    self.stats['cached'] += 1
+                else:
+                    fingerprint = Fingerprint.from_content(source.content)
+                self._computed[source.relative] = (source.digest, fingerprint)
+                if len(fingerprint.shingles) < MIN_SHINGLES:
+                    self.stats['skipped'] += 1
+                    continue
+                self.fingerprints[source.relative] = fingerprint
+        self._save_cache()
+        return self.fingerprints
+
+    def candidate_pairs(self) -> List[Tuple[str, str]]:
+        """Paires qui partagent au moins une bande de signature (LSH)"""
+        buckets = defaultdict(list)
+        rows = self.rows
+        for relative, fingerprint in self.fingerprints.items():
+            signature = fingerprint.signature
+            for band in range(self.bands):
+                buckets[(band, signature[band * rows:(band + 1) * rows])].append(relative)
+        pairs = set()
+        oversized = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > MAX_BUCKET:
+                oversized.add(frozenset(members))
+                continue
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    pairs.add((first, second) if first < second else (second, first))
+        if oversized:
+            pairs |= self._oversized_pairs(oversized, pairs)
+        self.stats['candidates'] = len(pairs)
+        return sorted(pairs)
+
+    def _oversized_pairs(self, buckets: Iterable[frozenset], known: set) -> set:
+        """Paires des compartiments surpeuplés dont l'indice de Jaccard exact atteint le seuil"""
+        shingle_sets = {}
+        found = set()
+        members_seen = set()
+        for members in buckets:
+            self.stats['oversized_buckets'] += 1
+            members_seen.update(members)
+            ordered = sorted(members)
+            for name in ordered:
+                if name not in shingle_sets:
+                    shingle_sets[name] = self.fingerprints[name].shingle_set
+            for i, first in enumerate(ordered):
+                a = shingle_sets[first]
+                for second in ordered[i + 1:]:
+                    if (first, second) in known or (first, second) in found:
+                        continue
+                    b = shingle_sets[second]
+                    # Borne exacte: Jaccard <= petite taille / grande taille
+                    if min(len(a), len(b)) < self.threshold * max(len(a), len(b)):
+                        continue
+                    if len(a & b) >= self.threshold * len(a | b):
+                        found.add((first, second))
+        self.stats['oversized_members'] = len(members_seen)
+        self.stats['oversized_pairs'] = len(found)
+        return found
+
+    def find_pairs(self) -> List[Dict]:
+        """Paires candidates dont l'indice de Jaccard exact atteint le seuil"""
+        shingle_sets = {}
+        results = []
+        for first, second in self.candidate_pairs():
+            a = shingle_sets.get(first) or shingle_sets.setdefault(first, self.fingerprints[first].shingle_set)
+            b = shingle_sets.get(second) or shingle_sets.setdefault(second, self.fingerprints[second].shingle_set)
+            common = a & b
+            similarity = len(common) / len(a | b)
+            if similarity < self.threshold:
+                continue
+            results.append({
+                'a': first,
+                'b': second,
+                'similarity': round(similarity, 3),
+                'estimate': round(estimate_similarity(self.fingerprints[first].signature,
+                                                      self.fingerprints[second].signature), 3),
+                'ranges_a': _line_ranges(self.fingerprints[first], common),
+                'ranges_b': _line_ranges(self.fingerprints[second], common),
+            })
+        results.sort(key=lambda pair: (-pair['similarity'], pair['a'], pair['b']))
+        self.stats['pairs'] = len(results)
+        return results
+
+    @staticmethod
+    def clusters(pairs: List[Dict]) -> List[Dict]:
+        """Regroupe les paires en clusters (union-find); numérote les paires par cluster"""
+        parent: Dict[str, str] = {}
+
+        def find(name: str) -> str:
+            parent.setdefault(name, name)
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for pair in pairs:
+            root_a, root_b = find(pair['a']), find(pair['b'])
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        grouped = defaultdict(lambda: {'members': set(), 'pairs': []})
+        for pair in pairs:
+            group = grouped[find(pair['a'])]
+            group['members'].update((pair['a'], pair['b']))
+            group['pairs'].append(pair)
+        clusters = []
+        for group in grouped.values():
+            similarities = [pair['similarity'] for pair in group['pairs']]
+            clusters.append({
+                'members': sorted(group['members']),
+                'similarity': round(sum(similarities) / len(similarities), 3),
+                'max_similarity': max(similarities),
+                'pairs': group['pairs'],
+            })
+        clusters.sort(key=lambda cluster: (-len(cluster['members']), -cluster['similarity'], cluster['members']))
+        for number, cluster in enumerate(clusters, 1):
+            cluster['id'] = number
+            for pair in cluster['pairs']:
+                pair['cluster'] = number
+        return clusters
+
+
+def _format_ranges(ranges: List[List[int]], limit: int = 3) -> str:
+    shown = ", ".join(f"{start}-{end}" for start, end in ranges[:limit])
+    return shown + (f" (+{len(ranges) - limit})" if len(ranges) > limit else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quasi-doublons structurels (MinHash/LSH) entre hooks et composants')
+    parser.add_argument('--path', default=",".join(DEFAULT_PATHS),
+                        help=f"Répertoires analysés, séparés par des virgules (défaut: {','.join(DEFAULT_PATHS)})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Indice de Jaccard minimal d'une paire (défaut: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--top', type=int, default=20, help='Nombre de clusters affichés')
+    parser.add_argument('--json', metavar='FICHIER', help='Écrit aussi les clusters en JSON')
+    parser.add_argument('--no-store', action='store_true', help="N'enregistre pas les paires dans la base d'audit")
+    args = parser.parse_args()
+
+    project_root = os.getcwd()
+    corpus = SourceCorpus.open(project_root)
+    finder = NearDuplicateFinder(project_root, corpus, threshold=args.threshold)
+
+    print("🧬 Recherche de quasi-doublons structurels (MinHash/LSH)...")
+    start = time.perf_counter()
+    finder.fingerprint_files([path.strip() for path in args.path.split(',') if path.strip()])
+    pairs = finder.find_pairs()
+    clusters = finder.clusters(pairs)
+    elapsed = time.perf_counter() - start
+    corpus.save()
+
+    stats = finder.stats
+    compared = len(finder.fingerprints) * (len(finder.fingerprints) - 1) // 2
+    print(f"📄 {stats['files']} fichiers ({stats['cached']} empreintes en cache, {stats['skipped']} trop courts)")
+    print(f"🪣 {stats['candidates']} paires candidates (LSH {finder.bands}×{finder.rows}) sur {compared} possibles, "
+          f"{stats['pairs']} au-dessus du seuil {args.threshold}")
+    if stats['oversized_buckets']:
+        print(f"🪣 {stats['oversized_buckets']} compartiment(s) LSH de plus de {MAX_BUCKET} fichiers "
+              f"({stats['oversized_members']} fichiers) vérifiés par Jaccard exact: {stats['oversized_pairs']} paire(s)")
+    print(f"🧩 {len(clusters)} cluster(s) en {elapsed * 1000:.0f} ms\n")
+
+    for cluster in clusters[:args.top]:
+        print(f"### Cluster {cluster['id']} — {len(cluster['members'])} fichiers, "
+              f"similarité moyenne {cluster['similarity']:.2f}")
+        for member in cluster['members']:
+            print(f"  - {member}")
+        for pair in cluster['pairs'][:5]:
+            print(f"    {Path(pair['a']).name} ↔ {Path(pair['b']).name}: {pair['similarity']:.2f} "
+                  f"(lignes {_format_ranges(pair['ranges_a'])} ↔ {_format_ranges(pair['ranges_b'])})")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'threshold': args.threshold, 'clusters': clusters}, f, indent=2, ensure_ascii=False)
+        print(f"📊 Clusters sauvegardés: {args.json}")
+
+    if not args.no_store:
+        with AuditStore.open(project_root) as store:
+            store.write_duplicates(pairs)
+            print(f"🗄️ Paires enregistrées: {store.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
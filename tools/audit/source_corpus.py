@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Corpus partagé des sources TourCraft
+Garde en mémoire le contenu, la taille, la date de modification et
+l'empreinte de chaque fichier de src/. Tous les analyseurs de tools/audit
+consomment ce corpus au lieu de relire le disque, et le corpus peut être
+sauvegardé (cache local, format pickle) pour être réutilisé par l'outil
+suivant. Rien n'est parcouru d'avance: un répertoire l'est à la première
+demande qui le couvre, et une entrée rechargée de la sauvegarde n'est
+décodée et comparée au disque qu'à son premier accès.
+
+Les fichiers JavaScript peuvent aussi être analysés une seule fois par le
+lexer (imports, exports, commentaires): le résultat est conservé avec
+l'entrée et sauvegardé avec le corpus tant que le fichier ne change pas.
+La vue de code (js_lexer.code_view) de l'index d'identifiants est gardée en
+mémoire; les métriques (js_metrics) sont sauvegardées avec le corpus, par
+empreinte.
+"""
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from js_lexer import LEXER_VERSION, ModuleInfo, code_view, scan_module
+from js_metrics import METRICS_VERSION, compute_metrics
+
+CORPUS_VERSION = 4
+DEFAULT_ROOTS = ("src",)
+DEFAULT_SUFFIXES = (".js", ".jsx", ".css", ".md")
+EXCLUDED_DIRS = {"node_modules", ".git", "build", "dist", "coverage", "__pycache__"}
+DEFAULT_CACHE_PATH = Path("tools") / "audit" / ".cache" / "source_corpus.pickle"
+
+
+class SourceFile:
+    """Un fichier du corpus et ses métadonnées
+
+    Une entrée rechargée de la sauvegarde garde son contenu, ses imports et
+    ses métriques sérialisés (payload) jusqu'au premier accès: ouvrir le
+    corpus ne décode que les métadonnées, et une entrée jamais décodée est
+    sauvegardée telle quelle.
+    """
+
+    __slots__ = ("root", "relative", "size", "mtime", "digest", "code",
+                 "_content", "_module", "_metrics", "_payload", "_path")
+
+    def __init__(self, root: Path, relative: str, content: Optional[str], size: int, mtime: float, digest: str,
+                 module: Optional[ModuleInfo] = None, metrics: Optional[Dict] = None,
+                 payload: Optional[bytes] = None):
+        self.root = root
+        self.relative = relative
+        self.size = size
+        self.mtime = mtime
+        self.digest = digest
+        # Vue de code (js_lexer.code_view), en mémoire seulement
+        self.code = None
+        self._content = content
+        # Résultat de js_lexer.scan_module, calculé à la demande
+        self._module = module
+        # Résultat de js_metrics.compute_metrics, calculé à la demande
+        self._metrics = metrics
+        # Forme sérialisée de (contenu, module, métriques), décodée au premier accès
+        self._payload = payload
+        self._path = None
+
+    @property
+    def path(self) -> Path:
+        """Chemin absolu (construit au premier accès)"""
+        if self._path is None:
+            self._path = self.root / self.relative
+        return self._path
+
+    def _unpack(self):
+        if self._content is None and self._payload is not None:
+            content, module, metrics = pickle.loads(self._payload)
+            self._content = content
+            self._module = ModuleInfo.from_dict(module) if module else None
+            self._metrics = metrics
+
+    @property
+    def content(self) -> str:
+        self._unpack()
+        return self._content
+
+    @property
+    def module(self) -> Optional[ModuleInfo]:
+        self._unpack()
+        return self._module
+
+    @module.setter
+    def module(self, module: ModuleInfo):
+        self._unpack()
+        self._module = module
+        self._payload = None
+
+    @property
+    def metrics(self) -> Optional[Dict]:
+        self._unpack()
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: Dict):
+        self._unpack()
+        self._metrics = metrics
+        self._payload = None
+
+    def payload(self) -> bytes:
+        """(contenu, module, métriques) sérialisés, réutilisés tant que l'entrée n'a pas changé"""
+        if self._payload is None:
+            module = self._module.to_dict() if self._module is not None else None
+            self._payload = pickle.dumps((self._content, module, self._metrics), protocol=pickle.HIGHEST_PROTOCOL)
+        return self._payload
+
+
+class SourceCorpus:
+    def __init__(self, project_root: str, roots: Iterable[str] = DEFAULT_ROOTS,
+                 suffixes: Iterable[str] = DEFAULT_SUFFIXES, cache_path: Optional[str] = None):
+        self.project_root = Path(project_root)
+        self.roots = tuple(roots)
+        self.suffixes = tuple(suffixes)
+        self.cache_path = Path(cache_path) if cache_path else self.project_root / DEFAULT_CACHE_PATH
+        self._root = str(self.project_root)
+
+        # Contenu du corpus, indexé par chemin relatif à la racine du projet
+        self.entries: Dict[str, SourceFile] = {}
+        # Répertoires parcourus, sauvegardés avec le corpus (racines et répertoires demandés en plus)
+        self.walked_dirs: List[str] = []
+        self.loaded = False
+        # Fichiers revalidés et répertoires parcourus par ce processus: une entrée
+        # sauvegardée n'est comparée au disque qu'à son premier accès
+        self.fresh_paths: Set[str] = set()
+        self.fresh_dirs: Set[str] = set()
+
+        # Statistiques de lecture
+        self.stats = {
+            'files_read': 0,
+            'files_reused': 0,
+            'files_evicted': 0,
+            'bytes_read': 0,
+            'modules_scanned': 0,
+            'code_views': 0,
+            'metrics_computed': 0
+        }
+        # Signature des changements au dernier chargement ou à la dernière sauvegarde
+        self.saved_changes = None
+
+    @classmethod
+    def open(cls, project_root: str, cache_path: Optional[str] = None, **kwargs) -> "SourceCorpus":
+        """Ouvre le corpus en réutilisant la sauvegarde disque si elle existe
+
+        Rien n'est parcouru à l'ouverture: un répertoire l'est à la première
+        demande de files() qui le couvre, un fichier sauvegardé est revalidé
+        (taille et date) à son premier accès.
+        """
+        corpus = cls(project_root, cache_path=cache_path, **kwargs)
+        corpus.load_cache()
+        return corpus
+
+    def load(self) -> "SourceCorpus":
+        """Parcourt toutes les racines une seule fois (les fichiers inchangés sont réutilisés)"""
+        if self.loaded:
+            return self
+
+        for directory in list(self.roots) + [d for d in self.walked_dirs if d not in self.roots]:
+            self._ensure_walked(directory)
+        self.loaded = True
+        return self
+
+    def refresh(self) -> "SourceCorpus":
+        """Revalide le corpus contre le disque (seuls les fichiers modifiés sont relus)"""
+        self.loaded = False
+        self.fresh_paths.clear()
+        self.fresh_dirs.clear()
+        return self.load()
+
+    def _ensure_walked(self, directory: str):
+        """Parcourt un répertoire, sauf s'il l'a déjà été (lui ou un parent) par ce processus"""
+        if any(directory == walked or directory.startswith(walked + '/') for walked in self.fresh_dirs):
+            return
+        self._walk(directory)
+
+    def _walk(self, directory: str):
+        """Parcourt un répertoire: ajoute ses fichiers au corpus, évince ceux qui ont disparu"""
+        if not any(directory == walked or directory.startswith(walked + '/') for walked in self.walked_dirs):
+            self.walked_dirs.append(directory)
+        self.fresh_dirs.add(directory)
+
+        seen = set()
+        base = os.path.join(self._root, directory)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+            relative_dir = dirpath[len(self._root) + 1:].replace(os.sep, '/')
+            for filename in sorted(filenames):
+                if filename.endswith(self.suffixes) and self._fresh_entry(f"{relative_dir}/{filename}") is not None:
+                    seen.add(f"{relative_dir}/{filename}")
+
+        prefix = directory + '/'
+        for relative in [relative for relative in self.entries
+                         if relative.startswith(prefix) and relative not in seen and relative.endswith(self.suffixes)]:
+            self._evict(relative)
+
+    def _evict(self, relative: str):
+        if self.entries.pop(relative, None) is not None:
+            self.stats['files_evicted'] += 1
+        self.fresh_paths.discard(relative)
+
+    def _fresh_entry(self, relative: str) -> Optional[SourceFile]:
+        """Entrée revalidée contre le disque (une fois par processus): réutilisée si taille et
+        date sont identiques, relue sinon"""
+        entry = self.entries.get(relative)
+        if relative in self.fresh_paths:
+            return entry
+        try:
+            stat = os.stat(os.path.join(self._root, relative))
+        except OSError:
+            self._evict(relative)
+            return None
+
+        if entry is not None and entry.size == stat.st_size and entry.mtime == stat.st_mtime:
+            self.stats['files_reused'] += 1
+        else:
+            entry = self._read_entry(relative, stat)
+            if entry is None:
+                self._evict(relative)
+                return None
+            self.entries[relative] = entry
+        self.fresh_paths.add(relative)
+        return entry
+
+    def _read_entry(self, relative: str, stat) -> Optional[SourceFile]:
+        """Lit un fichier depuis le disque"""
+        try:
+            with open(os.path.join(self._root, relative), 'rb') as f:
+                raw = f.read()
+            content = raw.decode('utf-8')
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        self.stats['files_read'] += 1
+        self.stats['bytes_read'] += len(raw)
+        return SourceFile(
+            root=self.project_root,
+            relative=relative,
+            content=content,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            digest=hashlib.sha1(raw).hexdigest()
+        )
+
+    def _relative_key(self, path) -> str:
+        """Convertit un chemin (absolu ou relatif au projet) en clé du corpus"""
+        if isinstance(path, str) and not os.path.isabs(path) and os.sep == '/':
+            # Chemin relatif déjà au format du corpus (le cas courant, sans objet Path)
+            return path
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_root)
+            except ValueError:
+                return path.as_posix()
+        return path.as_posix()
+
+    def files(self, subdir: Optional[str] = None, suffixes: Optional[Iterable[str]] = None) -> List[SourceFile]:
+        """Retourne les fichiers du corpus, filtrés par sous-répertoire et extension
+
+        Seul le sous-répertoire demandé est parcouru (une fois par processus),
+        toutes les racines si subdir est None.
+        """
+        prefix = None
+        if subdir is None:
+            self.load()
+        else:
+            directory = self._relative_key(subdir).rstrip('/')
+            self._ensure_walked(directory)
+            prefix = directory + '/'
+
+        suffixes = tuple(suffixes) if suffixes else None
+        selected = []
+        for relative in list(self.entries):
+            if prefix is not None and not relative.startswith(prefix):
+                continue
+            if suffixes is not None and not relative.endswith(suffixes):
+                continue
+            entry = self._fresh_entry(relative)
+            if entry is not None:
+                selected.append(entry)
+        return sorted(selected, key=lambda entry: entry.relative)
+
+    def get(self, path) -> Optional[SourceFile]:
+        """Retourne l'entrée d'un fichier, revalidée ou lue à la demande"""
+        return self._fresh_entry(self._relative_key(path))
+
+    def read(self, path) -> str:
+        """Retourne le contenu d'un fichier ('' s'il est illisible)"""
+        entry = self.get(path)
+        return entry.content if entry is not None else ""
+
+    def module(self, path, comments: bool = False) -> ModuleInfo:
+        """Retourne les imports et exports d'un fichier JS (lexé une seule fois)
+
+        Les commentaires ne sont relevés que si comments est vrai: seuls les
+        analyseurs de documentation les lisent, sur les hooks (que l'audit lexe
+        donc avec eux); un module lexé sans eux est relexé à la première
+        demande qui les réclame.
+        """
+        entry = path if isinstance(path, SourceFile) else self.get(path)
+        if entry is None:
+            return ModuleInfo()
+        if entry.module is None or (comments and not entry.module.with_comments):
+            entry.module = scan_module(entry.content, with_comments=comments)
+            self.stats['modules_scanned'] += 1
+        return entry.module
+
+    def code(self, path) -> str:
+        """Retourne la vue de code d'un fichier JS (commentaires et textes blanchis, calculée une seule fois)"""
+        entry = path if isinstance(path, SourceFile) else self.get(path)
+        if entry is None:
+            return ""
+        if entry.code is None:
+            entry.code = code_view(entry.content)
+            self.stats['code_views'] += 1
+        return entry.code
+
+    def metrics(self, path) -> Dict:
+        """Retourne les métriques de complexité d'un fichier JS (calculées une seule fois par empreinte)"""
+        entry = path if isinstance(path, SourceFile) else self.get(path)
+        if entry is None:
+            return compute_metrics("")
+        if entry.metrics is None:
+            entry.metrics = compute_metrics(entry.content)
+            self.stats['metrics_computed'] += 1
+        return entry.metrics
+
+    def exists(self, path) -> bool:
+        """Vérifie l'existence d'un fichier sans relire le disque s'il est connu"""
+        return self.get(path) is not None
+
+    def load_cache(self) -> bool:
+        """Charge la sauvegarde disque du corpus"""
+        if not self.cache_path.exists():
+            return False
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            return False
+
+        if data.get('version') != CORPUS_VERSION or data.get('suffixes') != list(self.suffixes):
+            return False
+
+        self.walked_dirs = data.get('directories', [])
+        self.entries = {
+            relative: SourceFile(self.project_root, relative, None, size, mtime, digest, payload=payload)
+            for relative, size, mtime, digest, payload in data.get('files', [])
+        }
+        if data.get('lexer_version') != LEXER_VERSION or data.get('metrics_version') != METRICS_VERSION:
+            # Imports ou métriques d'une autre version: recalculés à la demande
+            keep_modules = data.get('lexer_version') == LEXER_VERSION
+            for entry in self.entries.values():
+                module = entry.module if keep_modules else None
+                entry.metrics = None
+                entry.module = module
+        self.loaded = False
+        self.saved_changes = self._changes()
+        return True
+
+    def _changes(self) -> tuple:
+        """Compteurs qui bougent dès que le contenu à sauvegarder change"""
+        return (self.stats['files_read'], self.stats['files_evicted'], self.stats['modules_scanned'],
+                self.stats['metrics_computed'], len(self.walked_dirs))
+
+    def save(self, cache_path: Optional[str] = None) -> Path:
+        """Sauvegarde le corpus sur disque pour les invocations suivantes (sauf s'il n'a pas changé)
+
+        Les entrées que ce processus n'a pas revalidées sont sauvegardées telles
+        quelles: elles le seront au premier accès de l'invocation suivante.
+        """
+        target = Path(cache_path) if cache_path else self.cache_path
+        if target == self.cache_path and self.saved_changes == self._changes() and target.exists():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            'version': CORPUS_VERSION,
+            'suffixes': list(self.suffixes),
+            'lexer_version': LEXER_VERSION,
+            'metrics_version': METRICS_VERSION,
+            'directories': self.walked_dirs,
+            'files': [(entry.relative, entry.size, entry.mtime, entry.digest, entry.payload())
+                      for entry in sorted(self.entries.values(), key=lambda e: e.relative)]
+        }
+        tmp_path = target.with_name(target.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, target)
+        if target == self.cache_path:
+            self.saved_changes = self._changes()
+        return target
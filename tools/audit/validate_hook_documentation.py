@@ -5,14 +5,25 @@ Vérifie la qualité de la documentation JSDoc et propose des améliorations.
 """
 
 import os
-import re
+import sys
+import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from source_corpus import SourceCorpus
+from graph_engine import expand_scope
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import GitScope, add_scope_arguments, resolve_scope
 
 class HookDocumentationValidator:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, corpus: Optional[SourceCorpus] = None,
+                 scope: Optional[GitScope] = None):
         self.project_root = Path(project_root)
         self.hooks_dir = self.project_root / "src" / "hooks"
+        self.corpus = corpus or SourceCorpus(project_root)
+        # Périmètre git (--since/--staged): seuls ces fichiers sont analysés
+        self.scope = scope
         
         # Hooks prioritaires identifiés dans l'audit
         self.priority_hooks = [
@@ -23,6 +34,9 @@ class HookDocumentationValidator:
             "programmateurs/useAdresseValidation.js",
             "contrats/useContratGenerator.js"
         ]
+        if self.scope is not None:
+            self.priority_hooks = [hook for hook in self.priority_hooks
+                                   if self.scope.contains(self.hooks_dir / hook)]
         
         # Éléments requis pour une documentation complète
         self.required_elements = {
@@ -38,19 +52,19 @@ class HookDocumentationValidator:
     def analyze_hook_documentation(self, hook_path: str) -> Dict:
         """Analyse la documentation d'un hook spécifique"""
         full_path = self.hooks_dir / hook_path
+        source = self.corpus.get(full_path)
         
-        if not full_path.exists():
+        if source is None:
             return {
                 'exists': False,
                 'error': f"Fichier non trouvé: {hook_path}"
             }
         
         try:
-            content = full_path.read_text(encoding='utf-8')
+            content = source.content
             
-            # Extrait le bloc JSDoc principal
-            jsdoc_pattern = r'/\*\*(.*?)\*/'
-            jsdoc_matches = re.findall(jsdoc_pattern, content, re.DOTALL)
+            # Extrait les blocs JSDoc (lexer partagé: ignore les '/**' dans les chaînes)
+            jsdoc_matches = self.corpus.module(source, comments=True).jsdoc_comments()
             
             analysis = {
                 'exists': True,
@@ -323,14 +337,29 @@ class HookDocumentationValidator:
 
 def main():
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_scope_arguments(parser)
+    args = parser.parse_args()
+
     project_root = os.getcwd()
-    validator = HookDocumentationValidator(project_root)
+    corpus = SourceCorpus.open(project_root)
+    scope = resolve_scope(project_root, args.since, args.staged)
+    if scope is not None:
+        expand_scope(scope, project_root, corpus)
+        print(scope.summary())
+    validator = HookDocumentationValidator(project_root, corpus=corpus, scope=scope)
     
     print("🚀 Validation de la documentation des hooks prioritaires...")
     
     try:
         results = validator.validate_all_priority_hooks()
         report = validator.generate_improvement_report(results)
+        corpus.save()
+        
+        if scope is not None:
+            # Rapport partiel: affiché, sans remplacer le rapport complet
+            print(report)
+            return
         
         # Sauvegarde le rapport
         output_file = Path(project_root) / "tools" / "audit" / "validation_documentation_hooks.md"
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Générateur de corpus synthétique à la forme de TourCraft
+Produit un arbre src/ de N fichiers (1k, 10k, 100k...) qui reproduit la
+structure réelle: hooks par domaine (src/hooks/<domaine>/useX.js et leur
+barrel index.js), composants qui importent ces hooks (alias @/, @hooks/,
+chemins relatifs), feuilles *.module.css avec variables --tc-, couleurs
+hexadécimales et media queries, plus un jsconfig.json identique au projet.
+
+Le contenu est déterministe pour une taille et une graine données: deux
+exécutions produisent le même arbre, les résultats de benchmark restent
+comparables d'un commit à l'autre.
+
+Usage: python tools/benchmark/generate_corpus.py <répertoire> [--files=10000] [--seed=42]
+"""
+
+import os
+import json
+import random
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+DOMAINS = [
+    'artistes', 'concerts', 'contrats', 'lieux', 'programmateurs', 'structures',
+    'contacts', 'dates', 'forms', 'lists', 'search', 'common', 'parametres', 'taches'
+]
+HOOK_VERBS = ['Details', 'Form', 'Search', 'List', 'Filters', 'Validation', 'Delete', 'Query', 'Data', 'Status']
+GENERIC_HOOKS = ['useGenericEntityDetails', 'useGenericEntityForm', 'useGenericEntitySearch',
+                 'useGenericEntityList', 'useGenericEntityDelete']
+COMPONENT_KINDS = ['List', 'Form', 'Details', 'View', 'Card', 'Table', 'Modal', 'Header', 'Section', 'Filters']
+
+# Valeurs reconnues par les correcteurs CSS (COLOR_MAPPINGS, VARIABLE_MAPPINGS, points de rupture)
+HEX_COLORS = ['#ffffff', '#fff', '#000', '#f8f9fa', '#6c757d', '#212529', '#e9ecef', '#dee2e6',
+              '#333', '#666', '#eee', '#ddd', '#555', '#0d6efd', '#dc3545', '#198754']
+LEGACY_VARIABLES = ['--tc-color-primary', '--tc-color-secondary', '--tc-color-white',
+                    '--tc-color-gray-600', '--tc-color-success', '--tc-color-danger']
+UNPREFIXED_VARIABLES = ['--primary-color', '--secondary-color', '--border-color', '--text-muted']
+STANDARD_VARIABLES = ['--tc-spacing-2', '--tc-spacing-3', '--tc-spacing-4', '--tc-radius-sm',
+                      '--tc-font-size-sm', '--tc-shadow-sm', '--tc-primary-color', '--tc-bg-light']
+BREAKPOINTS = ['576px', '600px', '768px', '800px', '992px', '1200px']
+PROPERTIES = ['color', 'background-color', 'border-color', 'padding', 'margin', 'border-radius',
+              'font-size', 'box-shadow', 'gap']
+
+# Répartition des fichiers (proche de src/: ~2 JS pour 1 CSS)
+HOOK_SHARE = 0.2
+CSS_SHARE = 0.35
+
+JSCONFIG = {
+    "compilerOptions": {
+        "baseUrl": ".",
+        "paths": {
+            "@components/*": ["src/components/*"],
+            "@hooks/*": ["src/hooks/*"],
+            "@/*": ["src/*"]
+        }
+    }
+}
+
+
+def _hook_name(rng: random.Random, domain: str, index: int) -> str:
+    return f"use{domain.capitalize()}{rng.choice(HOOK_VERBS)}{index}"
+
+
+def render_hook(rng: random.Random, domain: str, name: str, siblings: List[str]) -> str:
+    """Hook React: JSDoc, imports (react, hooks génériques, autres hooks), état et effets"""
+    lines = ["import { useState, useEffect, useCallback, useMemo } from 'react';"]
+    uses_generic = rng.random() < 0.35
+    generic = rng.choice(GENERIC_HOOKS)
+    if uses_generic:
+        lines.append(f"import {generic} from '@/hooks/generics/{generic}';")
+    for dependency in rng.sample(siblings, min(len(siblings), rng.randint(0, 2))):
+        lines.append(f"import {{ {dependency} }} from './{dependency}';")
+    lines.append("")
+    lines.append("/**")
+    lines.append(f" * {name} - gestion des {domain}")
+    if rng.random() < 0.6:
+        lines.append(" * @param {Object} options - Options du hook")
+        lines.append(" * @returns {Object} État et actions")
+    if rng.random() < 0.1:
+        lines.append(" * @deprecated Utiliser le hook générique")
+    lines.append(" */")
+    lines.append(f"export const {name} = (options = {{}}) => {{")
+    if uses_generic:
+        lines.append(f"  const generic = {generic}({{ entityType: '{domain}' }});")
+    for state in range(rng.randint(2, 6)):
+        lines.append(f"  const [value{state}, setValue{state}] = useState(null);")
+    for effect in range(rng.randint(1, 4)):
+        lines.append("  useEffect(() => {")
+        lines.append(f"    if (options.enabled && value{effect % 2}) {{")
+        lines.append(f"      setValue{effect % 2}(options.initial || null);")
+        lines.append("    } else if (!options.enabled) {")
+        lines.append("      return;")
+        lines.append("    }")
+        lines.append(f"  }}, [options.enabled, value{effect % 2}]);")
+    lines.append("  const refresh = useCallback(async () => {")
+    lines.append("    try {")
+    lines.append(f"      const response = await fetch(`/api/{domain}/${{options.id}}`);")
+    lines.append("      return response.ok ? response.json() : null;")
+    lines.append("    } catch (error) {")
+    lines.append("      console.error(error);")
+    lines.append("      return null;")
+    lines.append("    }")
+    lines.append("  }, [options.id]);")
+    lines.append("  const summary = useMemo(() => ({ value0, value1 }), [value0, value1]);")
+    lines.append("  return { summary, refresh, setValue0, setValue1 };")
+    lines.append("};")
+    lines.append("")
+    lines.append(f"export default {name};")
+    return "\n".join(lines) + "\n"
+
+
+def render_barrel(hooks: List[str]) -> str:
+    return "".join(f"export {{ {name} }} from './{name}';\n" for name in hooks)
+
+
+def render_component(rng: random.Random, name: str, hooks: Dict[str, List[str]], has_style: bool) -> str:
+    """Composant React: imports de hooks (barrel, alias, chemin direct), styles, styles inline"""
+    lines = ["import React from 'react';"]
+    used = []
+    for _ in range(rng.randint(1, 3)):
+        domain = rng.choice(list(hooks))
+        hook = rng.choice(hooks[domain])
+        style = rng.random()
+        if style < 0.5:
+            lines.append(f"import {{ {hook} }} from '@/hooks/{domain}';")
+        elif style < 0.8:
+            lines.append(f"import {hook} from '@hooks/{domain}/{hook}';")
+        else:
+            lines.append(f"import {{ {hook} }} from 'hooks/{domain}/{hook}';")
+        used.append(hook)
+    if rng.random() < 0.2:
+        lines.append(f"import {{ {rng.choice(GENERIC_HOOKS)} }} from '@/hooks/generics';")
+    if has_style:
+        lines.append(f"import styles from './{name}.module.css';")
+    lines.append("")
+    lines.append(f"const {name} = ({{ id, onClose }}) => {{")
+    for hook in dict.fromkeys(used):
+        lines.append(f"  const {hook[3].lower()}{hook[4:]} = {hook}({{ id }});")
+    lines.append("  return (")
+    class_name = "styles.container" if has_style else "'container'"
+    lines.append(f"    <div className={{{class_name}}}>")
+    if rng.random() < 0.3:
+        lines.append(f"      <span style={{{{ color: '{rng.choice(HEX_COLORS)}', padding: '8px' }}}}>{name}</span>")
+    for row in range(rng.randint(2, 8)):
+        lines.append(f"      <p className=\"row-{row}\">{{id}}</p>")
+    lines.append("      <button onClick={onClose}>Fermer</button>")
+    lines.append("    </div>")
+    lines.append("  );")
+    lines.append("};")
+    lines.append("")
+    lines.append(f"export default {name};")
+    return "\n".join(lines) + "\n"
+
+
+def _css_value(rng: random.Random, prop: str) -> str:
+    roll = rng.random()
+    if prop.endswith('color') or prop == 'color':
+        if roll < 0.35:
+            return rng.choice(HEX_COLORS)
+        if roll < 0.55:
+            return f"var({rng.choice(LEGACY_VARIABLES)})"
+        if roll < 0.7:
+            return f"var({rng.choice(UNPREFIXED_VARIABLES)})"
+        return f"var(--tc-primary-color, {rng.choice(HEX_COLORS)})"
+    if roll < 0.6:
+        return f"var({rng.choice(STANDARD_VARIABLES)})"
+    return f"{rng.randint(1, 32)}px"
+
+
+def render_css(rng: random.Random, name: str) -> str:
+    """Feuille *.module.css: variables --tc-, couleurs codées en dur, media queries"""
+    lines = ["/*", f" * Styles pour {name}", " */", ""]
+    for rule in range(rng.randint(3, 9)):
+        selector = '.container' if rule == 0 else f".{rng.choice(['row', 'title', 'item', 'action', 'header'])}{rule}"
+        lines.append(f"{selector} {{")
+        for prop in rng.sample(PROPERTIES, rng.randint(2, 5)):
+            lines.append(f"  {prop}: {_css_value(rng, prop)};")
+        lines.append("}")
+        lines.append("")
+    for _ in range(rng.randint(0, 2)):
+        bound = rng.choice(['max-width', 'min-width'])
+        lines.append(f"@media ({bound}: {rng.choice(BREAKPOINTS)}) {{")
+        lines.append("  .container {")
+        lines.append(f"    padding: {_css_value(rng, 'padding')};")
+        lines.append(f"    color: {_css_value(rng, 'color')};")
+        lines.append("  }")
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(root, file_count: int = 10000, seed: int = 42) -> Dict:
+    """Écrit un arbre synthétique de file_count fichiers sous root et retourne ses statistiques"""
+    root = Path(root)
+    rng = random.Random(seed)
+    hooks_dir = root / "src" / "hooks"
+    components_dir = root / "src" / "components"
+
+    # Barrels des domaines, hooks génériques et leur barrel, barrel racine
+    barrel_count = len(DOMAINS) + len(GENERIC_HOOKS) + 2
+    css_count = int(file_count * CSS_SHARE)
+    hook_count = max(len(DOMAINS), int(file_count * HOOK_SHARE) - barrel_count)
+    component_count = max(1, file_count - css_count - hook_count - barrel_count)
+    css_count = min(css_count, component_count)
+
+    files: Dict[Path, str] = {root / "jsconfig.json": json.dumps(JSCONFIG, indent=2) + "\n"}
+
+    # Hooks par domaine, chaque domaine avec son barrel index.js
+    hooks: Dict[str, List[str]] = {domain: [] for domain in DOMAINS}
+    for index in range(hook_count):
+        domain = DOMAINS[index % len(DOMAINS)]
+        name = _hook_name(rng, domain, index)
+        # Un hook ne dépend que de hooks déjà créés: peu de cycles, comme dans src/
+        siblings = hooks[domain][-8:]
+        files[hooks_dir / domain / f"{name}.js"] = render_hook(rng, domain, name, siblings)
+        hooks[domain].append(name)
+    for domain, names in hooks.items():
+        files[hooks_dir / domain / "index.js"] = render_barrel(names)
+    for name in GENERIC_HOOKS:
+        files[hooks_dir / "generics" / f"{name}.js"] = render_hook(rng, 'generics', name, [])
+    files[hooks_dir / "generics" / "index.js"] = render_barrel(GENERIC_HOOKS)
+    files[hooks_dir / "index.js"] = "".join(f"export * from './{domain}';\n" for domain in DOMAINS)
+
+    # Composants regroupés par domaine et sous-répertoire, avec leur feuille de style
+    for index in range(component_count):
+        domain = DOMAINS[index % len(DOMAINS)]
+        subdir = components_dir / domain / f"group{index // 50}"
+        if index % 7 == 0:
+            subdir = subdir / rng.choice(['mobile', 'desktop'])
+        name = f"{domain.capitalize()}{rng.choice(COMPONENT_KINDS)}{index}"
+        has_style = index < css_count
+        files[subdir / f"{name}.js"] = render_component(rng, name, hooks, has_style)
+        if has_style:
+            files[subdir / f"{name}.module.css"] = render_css(rng, name)
+
+    total_bytes = 0
+    for path, content in files.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
+        total_bytes += len(data)
+
+    return {
+        'root': str(root),
+        'seed': seed,
+        'files': len(files) - 1,
+        'hooks': hook_count,
+        'components': component_count,
+        'css': css_count,
+        'bytes': total_bytes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Génère un corpus synthétique à la forme de TourCraft')
+    parser.add_argument('root', help='Répertoire de destination (créé si besoin)')
+    parser.add_argument('--files', type=int, default=10000, help='Nombre de fichiers sous src/ (défaut: 10000)')
+    parser.add_argument('--seed', type=int, default=42, help='Graine du générateur (défaut: 42)')
+    args = parser.parse_args()
+
+    if os.path.isdir(os.path.join(args.root, 'src')):
+        print(f"❌ {args.root}/src existe déjà: choisissez un répertoire vide")
+        return 1
+
+    stats = generate_corpus(args.root, args.files, args.seed)
+    print(f"✅ Corpus généré dans {stats['root']}: {stats['files']} fichiers "
+          f"({stats['hooks']} hooks, {stats['components']} composants, {stats['css']} CSS), "
+          f"{stats['bytes'] / 1e6:.1f} Mo")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
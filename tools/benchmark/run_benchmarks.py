@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai des outils audit/CSS sur des corpus synthétiques
+Génère (une fois, puis réutilise) des arbres de 1k, 10k et 100k fichiers
+avec generate_corpus.py et mesure, pour chaque taille:
+- hook_audit             : HookDependencyAnalyzer.generate_report (corpus froid)
+- css_inconsistencies    : CSSInconsistencyFixer.run (dry-run)
+- fix_css_file           : fix_css_file sur chaque feuille CSS (dry-run)
+- standardize_breakpoints: standardize_breakpoints sur chaque feuille CSS
+- prefix_css_vars        : prefix_css_vars_enhanced sur une copie des feuilles CSS
+- css_pipeline           : CSSPipeline, toutes les étapes par défaut en une passe (dry-run)
+- hard_coded_values      : HardCodedValueScanner (tables des correcteurs) sur les CSS/JS/JSX
+- near_duplicates        : NearDuplicateFinder, empreintes MinHash et paires LSH (cache froid)
+- identifier_index       : IdentifierIndex (cache froid) et adoption des hooks génériques
+
+Chaque mesure tourne dans un processus neuf: le pic de mémoire (RSS) est
+celui de l'outil seul. Les résultats (médiane, débit en fichiers/s et Mo/s,
+pic RSS) sont écrits en JSON avec le commit courant, et --compare affiche
+l'écart avec un fichier de résultats précédent.
+
+Usage:
+    python tools/benchmark/run_benchmarks.py [--sizes=1000,10000,100000] [--runs=3]
+        [--only=hook_audit,fix_css_file] [--output=fichier.json] [--compare=ancien.json]
+"""
+
+import io
+import sys
+import json
+import atexit
+import time
+import shutil
+import platform
+import resource
+import argparse
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+from datetime import datetime
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Tuple
+
+from generate_corpus import generate_corpus
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_SEED = 42
+BENCHMARKS = ('hook_audit', 'css_inconsistencies', 'fix_css_file', 'standardize_breakpoints', 'prefix_css_vars',
+              'css_pipeline', 'hard_coded_values', 'near_duplicates',
+              'identifier_index')
+
+
+def _load_script(name: str, path: Path):
+    """Importe un script de tools/ (les noms avec tirets ne sont pas importables directement)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _css_files(root: Path) -> List[Path]:
+    return sorted((root / "src").rglob("*.css"))
+
+
+def _js_files(root: Path) -> List[Path]:
+    return sorted(p for p in (root / "src").rglob("*") if p.suffix in ('.js', '.jsx'))
+
+
+def _total_bytes(paths: List[Path]) -> int:
+    return sum(path.stat().st_size for path in paths)
+
+
+def _prepare(name: str, root: Path) -> Tuple[Callable[[], None], Callable[[], None], int, int]:
+    """Retourne (préparation non mesurée, exécution mesurée, fichiers, octets) d'un benchmark"""
+    sys.path.insert(0, str(TOOLS_DIR / "audit"))
+    sys.path.insert(0, str(TOOLS_DIR / "css"))
+
+    if name == 'hook_audit':
+        from source_corpus import SourceCorpus
+        from audit_hooks_dependencies import HookDependencyAnalyzer
+        files = _js_files(root)
+
+        def run():
+            HookDependencyAnalyzer(str(root), corpus=SourceCorpus(str(root))).generate_report()
+        return (lambda: None), run, len(files), _total_bytes(files)
+
+    if name == 'css_inconsistencies':
+        module = _load_script("fix_css_inconsistencies", TOOLS_DIR / "css" / "fix-css-inconsistencies.py")
+        files = [p for p in _css_files(root) + _js_files(root) if 'test' not in str(p)]
+
+        def run():
+            module.CSSInconsistencyFixer(str(root / "src"), dry_run=True).run()
+        return (lambda: None), run, len(files), _total_bytes(files)
+
+    if name == 'css_pipeline':
+        from css_pipeline import CSSPipeline, DEFAULT_STAGES, select_stages
+        stages = select_stages(DEFAULT_STAGES)
+        files = _css_files(root) + _js_files(root)
+
+        def run():
+            pipeline = CSSPipeline(stages, dry_run=True)
+            pipeline.run(pipeline.collect_files(root / "src"))
+        return (lambda: None), run, len(files), _total_bytes(files)
+
+    if name == 'hard_coded_values':
+        from hard_coded_values import HardCodedValueScanner
+        files = _css_files(root) + _js_files(root)
+
+        def run():
+            scanner = HardCodedValueScanner()
+            scanner.add_fixer_tables()
+            for _ in scanner.scan(str(root / "src")):
+                pass
+        return (lambda: None), run, len(files), _total_bytes(files)
+
+    if name == 'near_duplicates':
+        from source_corpus import SourceCorpus
+        from near_duplicates import NearDuplicateFinder
+        files = _js_files(root)
+        workdir = Path(tempfile.mkdtemp(prefix="bench-duplicates-"))
+        atexit.register(shutil.rmtree, workdir, True)
+        cache_path = workdir / "near_duplicates.pickle"
+
+        def setup():
+            # Empreintes recalculées à chaque répétition (cache à froid)
+            cache_path.unlink(missing_ok=True)
+
+        def run():
+            finder = NearDuplicateFinder(str(root), SourceCorpus(str(root)), cache_path=str(cache_path))
+            finder.fingerprint_files(['src'])
+            finder.clusters(finder.find_pairs())
+        return setup, run, len(files), _total_bytes(files)
+
+    if name == 'identifier_index':
+        from source_corpus import SourceCorpus
+        from identifier_index import CONSUMER_ROOTS, IdentifierIndex
+        files = _js_files(root)
+        workdir = Path(tempfile.mkdtemp(prefix="bench-identifiers-"))
+        atexit.register(shutil.rmtree, workdir, True)
+        cache_path = workdir / "identifier_index.pickle"
+
+        def run():
+            index = IdentifierIndex.open(str(root), SourceCorpus(str(root)), cache_path=str(cache_path))
+            for generic_hook in ('useGenericEntityList', 'useGenericEntityForm', 'useGenericEntityDetails'):
+                index.files_using(generic_hook, roots=CONSUMER_ROOTS)
+        return (lambda: None), run, len(files), _total_bytes(files)
+
+    files = _css_files(root)
+    size = _total_bytes(files)
+
+    if name == 'fix_css_file':
+        module = _load_script("fix_css_variables", TOOLS_DIR / "css" / "fix-css-variables.py")
+
+        def run():
+            for path in files:
+                module.fix_css_file(str(path), dry_run=True)
+        return (lambda: None), run, len(files), size
+
+    if name == 'standardize_breakpoints':
+        from standardize_breakpoints import standardize_breakpoints
+        contents = [path.read_text(encoding='utf-8') for path in files]
+
+        def run():
+            for content in contents:
+                standardize_breakpoints(content)
+        return (lambda: None), run, len(files), size
+
+    if name == 'prefix_css_vars':
+        from prefix_css_vars import prefix_css_vars_enhanced
+        from write_journal import WriteJournal
+        workdir = Path(tempfile.mkdtemp(prefix="bench-prefix-"))
+        atexit.register(shutil.rmtree, workdir, True)
+        copies = [workdir / f"{index}-{path.name}" for index, path in enumerate(files)]
+        # Journal dans le dossier temporaire: tools/.cache/journal reste intact
+        journal = WriteJournal('prefix_css_vars', journal_dir=workdir / ".journal")
+
+        def setup():
+            # Fichiers d'origine à chaque répétition (la fonction réécrit en place)
+            for source, copy in zip(files, copies):
+                shutil.copyfile(source, copy)
+
+        def run():
+            for copy in copies:
+                prefix_css_vars_enhanced(str(copy), journal)
+        return setup, run, len(files), size
+
+    raise ValueError(f"Benchmark inconnu: {name}")
+
+
+def run_child(name: str, root: Path, runs: int) -> Dict:
+    """Exécute un benchmark dans le processus courant et retourne ses mesures"""
+    setup, run, files, size = _prepare(name, root)
+    walls, cpus = [], []
+    for _ in range(runs):
+        setup()
+        with redirect_stdout(io.StringIO()):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            run()
+            walls.append(time.perf_counter() - wall_start)
+            cpus.append(time.process_time() - cpu_start)
+
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    median = statistics.median(walls)
+    return {
+        'benchmark': name,
+        'files': files,
+        'bytes': size,
+        'wall_s_median': round(median, 4),
+        'wall_s_min': round(min(walls), 4),
+        'cpu_s_median': round(statistics.median(cpus), 4),
+        'files_per_s': round(files / median, 1) if median else None,
+        'mb_per_s': round(size / 1e6 / median, 2) if median else None,
+        'peak_rss_mb': round(peak_mb, 1)
+    }
+
+
+def ensure_corpus(size: int, seed: int) -> Tuple[Path, Dict]:
+    """Génère le corpus d'une taille donnée, ou réutilise celui déjà généré"""
+    root = CACHE_DIR / f"corpus-{size}-{seed}"
+    marker = root / "corpus.json"
+    if marker.exists():
+        return root, json.loads(marker.read_text(encoding='utf-8'))
+    if root.exists():
+        shutil.rmtree(root)
+    print(f"🏗️  Génération du corpus de {size} fichiers...")
+    started = time.perf_counter()
+    stats = generate_corpus(root, size, seed)
+    stats['generation_s'] = round(time.perf_counter() - started, 2)
+    marker.write_text(json.dumps(stats, indent=2), encoding='utf-8')
+    return root, stats
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=TOOLS_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: List[Dict], previous_path: str):
+    """Affiche l'écart de médiane et de pic RSS avec un fichier de résultats précédent"""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {(r['size'], r['benchmark']): r for r in previous.get('results', [])}
+    print(f"\n🔁 Comparaison avec {previous_path} (commit {previous.get('commit', '?')[:10]})")
+    print(f"{'Taille':>8}  {'Benchmark':<24}{'Avant':>10}{'Après':>10}{'Écart':>9}{'RSS':>12}")
+    for result in results:
+        old = before.get((result['size'], result['benchmark']))
+        if old is None or 'error' in result or 'error' in old:
+            continue
+        delta = (result['wall_s_median'] / old['wall_s_median'] - 1) * 100 if old['wall_s_median'] else 0
+        print(f"{result['size']:>8}  {result['benchmark']:<24}{old['wall_s_median']:>9.3f}s"
+              f"{result['wall_s_median']:>9.3f}s{delta:>+8.1f}%"
+              f"{old['peak_rss_mb']:>6.0f}→{result['peak_rss_mb']:<5.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Banc d\'essai des outils sur corpus synthétiques')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Tailles de corpus, en fichiers (défaut: 1000,10000,100000)')
+    parser.add_argument('--runs', type=int, default=3, help='Répétitions par mesure (médiane)')
+    parser.add_argument('--only', help='Benchmarks à exécuter, séparés par des virgules')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Graine du générateur')
+    parser.add_argument('--output', help='Fichier JSON des résultats (défaut: .cache/results/<commit>.json)')
+    parser.add_argument('--compare', help='Fichier de résultats précédent à comparer')
+    parser.add_argument('--child', nargs=2, metavar=('BENCHMARK', 'CORPUS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], Path(args.child[1]), args.runs)))
+        return 0
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Benchmark(s) inconnu(s): {', '.join(unknown)} (disponibles: {', '.join(BENCHMARKS)})")
+        return 1
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    commit = _git_commit()
+    report = {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        'corpora': {},
+        'results': []
+    }
+
+    print(f"🚀 Benchmarks sur {', '.join(map(str, sizes))} fichiers ({args.runs} répétitions)")
+    print(f"{'Taille':>8}  {'Benchmark':<24}{'Médiane':>10}{'Fichiers/s':>12}{'Mo/s':>8}{'RSS Mo':>9}")
+    for size in sizes:
+        root, stats = ensure_corpus(size, args.seed)
+        report['corpora'][str(size)] = stats
+        for name in names:
+            child = subprocess.run(
+                [sys.executable, __file__, '--child', name, str(root), f'--runs={args.runs}'],
+                capture_output=True, text=True
+            )
+            if child.returncode != 0:
+                result = {'benchmark': name, 'error': child.stderr.strip().splitlines()[-1:] or ['?']}
+                print(f"{size:>8}  {name:<24}❌ {result['error'][0]}")
+            else:
+                result = json.loads(child.stdout.strip().splitlines()[-1])
+                print(f"{size:>8}  {name:<24}{result['wall_s_median']:>9.3f}s{result['files_per_s']:>12.0f}"
+                      f"{result['mb_per_s']:>8.2f}{result['peak_rss_mb']:>9.1f}")
+            result['size'] = size
+            report['results'].append(result)
+
+    output = Path(args.output) if args.output else CACHE_DIR / "results" / f"{commit[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"📊 Résultats sauvegardés: {output}")
+
+    if args.compare:
+        compare(report['results'], args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
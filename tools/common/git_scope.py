@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Limitation des outils aux fichiers modifiés selon git
+Option commune --since <ref> / --staged: les scripts de tools/css et
+tools/audit ne traitent que les fichiers changés (et, quand le graphe des
+modules est disponible, les fichiers qui en dépendent) au lieu de parcourir
+tout l'arbre. Pensé pour les hooks pre-commit.
+
+Les scripts importent ce module en ajoutant tools/common au sys.path.
+"""
+
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+
+class GitScopeError(RuntimeError):
+    """git absent, hors dépôt ou référence inconnue"""
+
+
+def _git(project_root, *args: str) -> str:
+    # Importé ici: sans --since/--staged, git n'est jamais lancé
+    import subprocess
+    try:
+        result = subprocess.run(['git', *args], cwd=project_root, capture_output=True, text=True, check=False)
+    except OSError as e:
+        raise GitScopeError(f"git indisponible: {e}")
+    if result.returncode != 0:
+        raise GitScopeError(result.stderr.strip() or f"git {' '.join(args)} a échoué")
+    return result.stdout
+
+
+def git_changed_paths(project_root, since: Optional[str] = None, staged: bool = False) -> List[Path]:
+    """Chemins absolus des fichiers ajoutés/modifiés/renommés (supprimés exclus)
+
+    --staged: index contre HEAD. --since REF: arbre de travail contre REF,
+    fichiers non suivis (hors .gitignore) compris.
+    """
+    top_level = Path(_git(project_root, 'rev-parse', '--show-toplevel').strip())
+    if staged:
+        output = _git(project_root, 'diff', '--cached', '--name-only', '--diff-filter=ACMR', '-z')
+    else:
+        output = _git(project_root, 'diff', '--name-only', '--diff-filter=ACMR', '-z', since, '--')
+        output += _git(project_root, 'ls-files', '--others', '--exclude-standard', '-z')
+    return sorted({top_level / name for name in output.split('\0') if name})
+
+
+def add_scope_arguments(parser):
+    """Ajoute --since/--staged à un parseur argparse"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--since', metavar='REF',
+                       help='Ne traite que les fichiers modifiés depuis REF (ex: origin/main)')
+    group.add_argument('--staged', action='store_true',
+                       help='Ne traite que les fichiers indexés (pre-commit)')
+    return parser
+
+
+def split_scope_argv(argv: List[str]) -> Tuple[Optional[str], bool, List[str]]:
+    """Extrait --since REF / --since=REF / --staged d'une liste d'arguments (scripts sans argparse)"""
+    since = None
+    staged = False
+    remaining = []
+    iterator = iter(argv)
+    for arg in iterator:
+        if arg == '--staged':
+            staged = True
+        elif arg == '--since':
+            since = next(iterator, None)
+        elif arg.startswith('--since='):
+            since = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    return since, staged, remaining
+
+
+def scope_description(since: Optional[str] = None, staged: bool = False) -> Optional[str]:
+    """Description du périmètre demandé par les options (None: arbre complet)"""
+    if not since and not staged:
+        return None
+    return 'fichiers indexés' if staged else f'modifiés depuis {since}'
+
+
+class GitScope:
+    """Ensemble de fichiers à traiter, issu de git"""
+
+    def __init__(self, project_root, paths: Iterable[Path], description: str):
+        self.project_root = Path(project_root).resolve()
+        self.paths: Set[Path] = {Path(path).resolve() for path in paths}
+        self.changed_count = len(self.paths)
+        self.description = description
+
+    @classmethod
+    def from_options(cls, project_root, since: Optional[str] = None, staged: bool = False) -> Optional["GitScope"]:
+        """Retourne None si aucune option n'est donnée (arbre complet)"""
+        description = scope_description(since, staged)
+        if description is None:
+            return None
+        return cls(project_root, git_changed_paths(project_root, since, staged), description)
+
+    @classmethod
+    def from_args(cls, args, project_root) -> Optional["GitScope"]:
+        return cls.from_options(project_root, getattr(args, 'since', None), getattr(args, 'staged', False))
+
+    def contains(self, path) -> bool:
+        return Path(path).resolve() in self.paths
+
+    def filter(self, paths: Iterable) -> list:
+        """Garde les chemins du périmètre, dans leur ordre d'origine"""
+        return [path for path in paths if self.contains(path)]
+
+    def files_under(self, base, suffixes: Iterable[str]) -> List[Path]:
+        """Fichiers du périmètre situés sous base, filtrés par extension (sans parcourir l'arbre)"""
+        base = Path(base).resolve()
+        suffixes = tuple(suffixes)
+        return sorted(path for path in self.paths
+                      if path.name.endswith(suffixes) and (path == base or base in path.parents) and path.is_file())
+
+    def relative_paths(self) -> Set[str]:
+        """Chemins relatifs à la racine du projet (format du corpus et du graphe)"""
+        relative = set()
+        for path in self.paths:
+            try:
+                relative.add(path.relative_to(self.project_root).as_posix())
+            except ValueError:
+                continue
+        return relative
+
+    def expand(self, dependents: Callable[[str], Iterable[str]]) -> "GitScope":
+        """Ajoute les fichiers qui dépendent (transitivement) des fichiers modifiés"""
+        for relative in self.relative_paths():
+            try:
+                found = dependents(relative)
+            except KeyError:
+                # Fichier hors graphe (CSS non importé, fichier hors src/...)
+                continue
+            self.paths.update((self.project_root / name).resolve() for name in found)
+        return self
+
+    def summary(self) -> str:
+        extra = len(self.paths) - self.changed_count
+        suffix = f" + {extra} dépendant(s)" if extra > 0 else ""
+        return f"🎯 Périmètre git ({self.description}): {self.changed_count} fichier(s){suffix}"
+
+
+def resolve_scope(project_root, since: Optional[str] = None, staged: bool = False) -> Optional[GitScope]:
+    """Comme GitScope.from_options, mais affiche l'erreur git et quitte (usage en script)"""
+    try:
+        return GitScope.from_options(project_root, since, staged)
+    except GitScopeError as e:
+        print(f"❌ Périmètre git impossible à déterminer: {e}")
+        raise SystemExit(2)
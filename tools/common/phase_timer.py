@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Chronométrage par phase des outils audit/CSS
+Chaque phase (scan, dépendances, étape d'un correcteur...) est enveloppée
+dans timer.phase(nom): temps mur et temps CPU sont cumulés par phase et
+résumés dans un tableau en fin d'exécution.
+
+Avec --profile, chaque phase est aussi profilée par cProfile (un fichier
+<phase>.pstats par phase) et un échantillonneur (ITIMER_PROF) enregistre les
+piles d'appels au format "collapsed" (phase;fichier:fonction;... N), lisible
+par flamegraph.pl ou speedscope.
+
+Les scripts importent ce module en ajoutant tools/common au sys.path.
+cProfile et pstats ne sont importés qu'avec --profile.
+"""
+
+import re
+import time
+import signal
+from pathlib import Path
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+SAMPLE_INTERVAL = 0.001
+TOP_FUNCTIONS = 15
+
+
+def add_profile_argument(parser, default_dir):
+    """Ajoute --profile [DIR] à un parseur argparse"""
+    parser.add_argument('--profile', nargs='?', const=str(default_dir), metavar='DIR',
+                        help=f'Profile chaque phase (cProfile + piles collapsed) dans DIR (défaut: {default_dir})')
+    return parser
+
+
+class PhaseTimer:
+    """Temps mur/CPU cumulés par phase, avec profilage optionnel"""
+
+    def __init__(self, profile_dir=None):
+        # nom de phase -> {'calls', 'wall', 'cpu'}, dans l'ordre de première exécution
+        self.phases: Dict[str, Dict] = {}
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self._profiles: Dict[str, "cProfile.Profile"] = {}
+        self._active: List[str] = []
+        self._samples = Counter()
+        self._sampling = False
+
+    @property
+    def profiling(self) -> bool:
+        return self.profile_dir is not None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Chronomètre (et profile si demandé) le bloc sous le nom donné"""
+        profile = None
+        # cProfile n'accepte qu'un profileur actif: une phase imbriquée reste dans celui de la phase englobante
+        if self.profile_dir is not None and not self._active:
+            profile = self._profiles.get(name)
+            if profile is None:
+                import cProfile
+                profile = self._profiles[name] = cProfile.Profile()
+            if not self._sampling:
+                self._start_sampling()
+        self._active.append(name)
+        if profile is not None:
+            profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+            self._active.pop()
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+            stats['calls'] += 1
+            stats['wall'] += wall
+            stats['cpu'] += cpu
+
+    def to_dict(self) -> Dict:
+        return {name: dict(stats) for name, stats in self.phases.items()}
+
+    def merge(self, phases: Dict):
+        """Ajoute les temps d'un autre chronomètre (processus de travail)"""
+        for name, other in phases.items():
+            stats = self.phases.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+            for key in ('calls', 'wall', 'cpu'):
+                stats[key] += other[key]
+
+    def summary_table(self, title: str = "TEMPS PAR PHASE") -> str:
+        """Tableau des phases: appels, temps mur et CPU, part du total"""
+        total_wall = sum(stats['wall'] for stats in self.phases.values())
+        lines = [f"⏱️  {title}",
+                 f"{'Phase':<20}{'Appels':>8}{'Mur (ms)':>12}{'CPU (ms)':>12}{'%':>8}"]
+        for name, stats in self.phases.items():
+            share = stats['wall'] / total_wall * 100 if total_wall else 0
+            lines.append(f"{name:<20}{stats['calls']:>8}{stats['wall'] * 1000:>12.1f}"
+                         f"{stats['cpu'] * 1000:>12.1f}{share:>7.1f}%")
+        total_cpu = sum(stats['cpu'] for stats in self.phases.values())
+        lines.append(f"{'Total':<20}{'':>8}{total_wall * 1000:>12.1f}{total_cpu * 1000:>12.1f}")
+        return "\n".join(lines)
+
+    def _start_sampling(self):
+        if not hasattr(signal, 'setitimer'):
+            return
+        try:
+            signal.signal(signal.SIGPROF, self._sample)
+        except ValueError:
+            # Hors du thread principal: pas de piles collapsed, cProfile reste actif
+            return
+        signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+        self._sampling = True
+
+    def _stop_sampling(self):
+        if self._sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+            self._sampling = False
+
+    def _sample(self, signum, frame):
+        """Gestionnaire SIGPROF: enregistre la pile Python courante sous la phase active"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+            frame = frame.f_back
+        phase = self._active[-1] if self._active else "(hors phase)"
+        stack.append(phase)
+        self._samples[";".join(reversed(stack))] += 1
+
+    def write_profiles(self, top: int = TOP_FUNCTIONS) -> List[Path]:
+        """Écrit les .pstats par phase et les piles collapsed, affiche les fonctions les plus coûteuses"""
+        if self.profile_dir is None:
+            return []
+        self._stop_sampling()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+
+        import pstats
+        written = []
+        merged: Optional[pstats.Stats] = None
+        for name, profile in self._profiles.items():
+            path = self.profile_dir / (re.sub(r'[^\w.-]+', '_', name) + ".pstats")
+            profile.dump_stats(str(path))
+            written.append(path)
+            if merged is None:
+                merged = pstats.Stats(str(path))
+            else:
+                merged.add(str(path))
+
+        if self._samples:
+            collapsed = self.profile_dir / "collapsed.txt"
+            with open(collapsed, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write(f"{stack} {count}\n")
+            written.append(collapsed)
+
+        if merged is not None:
+            print("🔥 Fonctions les plus coûteuses (temps propre, toutes phases)")
+            merged.strip_dirs().sort_stats('tottime').print_stats(top)
+        print(f"📁 Profils écrits dans {self.profile_dir}: " + ", ".join(path.name for path in written))
+        return written
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Écritures atomiques et journalisées des correcteurs CSS
+Remplace les copies .bak systématiques: un fichier n'est réécrit que si son
+contenu change, via un fichier temporaire du même dossier puis os.replace
+(jamais de fichier à moitié écrit). Chaque exécution tient un journal
+compact (runs/<run-id>.jsonl: chemin, empreinte avant, empreinte après) et
+le contenu d'origine n'est stocké qu'une fois, adressé par son empreinte
+(blobs/<sha[:2]>/<sha>). Un fichier inchangé ne coûte aucune écriture, et
+une exécution sans modification ne crée aucun journal.
+
+--rollback <run-id> restaure les fichiers d'une exécution (dans l'ordre
+inverse des écritures), en ignorant ceux modifiés depuis.
+
+Le journal vit dans tools/.cache/journal (ignoré par git). Plusieurs
+processus peuvent partager un même run-id: chaque entrée est ajoutée en une
+seule écriture O_APPEND.
+
+Les scripts importent ce module en ajoutant tools/common au sys.path.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import secrets
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+JOURNAL_DIR = Path(__file__).resolve().parent.parent / ".cache" / "journal"
+# Format de new_run_id: seul un identifiant de cette forme est joint à un chemin
+RUN_ID = re.compile(r'\d{8}-\d{6}-[A-Za-z0-9_-]+-[0-9a-f]{4}')
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def new_run_id(tool: str) -> str:
+    """Identifiant d'exécution triable: 20250505-143012-<outil>-<4 hex>"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{tool}-{secrets.token_hex(2)}"
+
+
+def check_run_id(run_id: str) -> str:
+    """Retourne run_id s'il a le format de new_run_id, sinon lève ValueError (--rollback ../../x)"""
+    if not isinstance(run_id, str) or not RUN_ID.fullmatch(run_id):
+        raise ValueError(f"identifiant d'exécution invalide: {run_id!r} (attendu: 20250505-143012-<outil>-<4 hex>)")
+    return run_id
+
+
+def _replace_atomically(path: Path, data: bytes):
+    """Écrit data dans path via un temporaire du même dossier et os.replace"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class WriteJournal:
+    """Couche d'écriture d'une exécution d'outil"""
+
+    def __init__(self, tool: str, run_id: Optional[str] = None, journal_dir=JOURNAL_DIR):
+        self.tool = tool
+        self.run_id = check_run_id(run_id) if run_id else new_run_id(tool)
+        self.journal_dir = Path(journal_dir)
+        self.written = 0
+
+    @property
+    def run_path(self) -> Path:
+        return self.journal_dir / "runs" / f"{self.run_id}.jsonl"
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.journal_dir / "blobs" / sha[:2] / sha
+
+    def _store_blob(self, data: bytes) -> str:
+        sha = _sha(data)
+        blob = self._blob_path(sha)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            _replace_atomically(blob, data)
+        return sha
+
+    def _append(self, entry: Dict):
+        self.run_path.parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        fd = os.open(self.run_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def write(self, path, content: str, original: Optional[str] = None) -> bool:
+        """Écrit content dans path s'il diffère du contenu actuel
+
+        original: contenu déjà lu par l'appelant (évite une relecture quand
+        rien ne change). Retourne True si le fichier a été réécrit.
+        """
+        path = Path(path).resolve()
+        if original is None and path.exists():
+            original = path.read_text(encoding='utf-8')
+        if content == original:
+            return False
+
+        data = content.encode('utf-8')
+        # Octets réels sur disque (fins de ligne comprises) pour une restauration exacte
+        before = self._store_blob(path.read_bytes()) if path.exists() else None
+        # L'entrée précède l'écriture: une interruption laisse au pire une entrée sans effet
+        self._append({'path': str(path), 'before': before, 'after': _sha(data),
+                      'tool': self.tool, 'time': datetime.now().isoformat(timespec='seconds')})
+        _replace_atomically(path, data)
+        self.written += 1
+        return True
+
+    def entries(self) -> List[Dict]:
+        """Entrées de l'exécution (tous processus confondus)"""
+        return read_run(self.run_id, self.journal_dir)
+
+    def summary(self) -> Optional[str]:
+        """Ligne de fin d'exécution, ou None si aucun fichier n'a été écrit"""
+        count = len({entry['path'] for entry in self.entries()})
+        if not count:
+            return None
+        return f"🗂️  Journal {self.run_id}: {count} fichier(s) réécrit(s) — annuler avec --rollback {self.run_id}"
+
+
+def read_run(run_id: str, journal_dir=JOURNAL_DIR) -> List[Dict]:
+    """Entrées d'un journal (liste vide s'il n'existe pas; ValueError si run_id est invalide)"""
+    run_path = Path(journal_dir) / "runs" / f"{check_run_id(run_id)}.jsonl"
+    if not run_path.exists():
+        return []
+    with open(run_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def list_runs(journal_dir=JOURNAL_DIR) -> List[Dict]:
+    """Exécutions journalisées, de la plus récente à la plus ancienne"""
+    runs_dir = Path(journal_dir) / "runs"
+    runs = []
+    run_paths = sorted(runs_dir.glob("*.jsonl"), key=lambda path: path.stat().st_mtime_ns, reverse=True) if runs_dir.exists() else []
+    for run_path in run_paths:
+        run_id = run_path.stem
+        entries = read_run(run_id, journal_dir)
+        runs.append({
+            'run_id': run_id,
+            'tool': entries[0]['tool'] if entries else '?',
+            'time': entries[0]['time'] if entries else '',
+            'files': len({entry['path'] for entry in entries}),
+            'rolled_back': (runs_dir / f"{run_id}.rolledback").exists(),
+        })
+    return runs
+
+
+def rollback(run_id: str, journal_dir=JOURNAL_DIR) -> Tuple[List[str], List[str]]:
+    """Restaure les fichiers d'une exécution et retourne (restaurés, ignorés)
+
+    Les entrées sont rejouées à l'envers; un fichier dont le contenu ne
+    correspond plus à l'empreinte "après" (modifié depuis) est ignoré. Un
+    fichier créé par l'exécution est supprimé. L'exécution n'est marquée
+    annulée que si aucun fichier n'a été ignoré: après avoir annulé les
+    exécutions plus récentes, on peut relancer le rollback (les fichiers déjà
+    restaurés sont sautés). Lève ValueError si le journal n'existe pas ou a
+    déjà été entièrement annulé, ou si run_id n'a pas le format de new_run_id.
+    """
+    journal_dir = Path(journal_dir)
+    marker = journal_dir / "runs" / f"{check_run_id(run_id)}.rolledback"
+    entries = read_run(run_id, journal_dir)
+    if not entries:
+        raise ValueError(f"journal inconnu: {run_id}")
+    if marker.exists():
+        raise ValueError(f"journal déjà annulé: {run_id}")
+
+    restored, skipped = [], []
+    for entry in reversed(entries):
+        path = Path(entry['path'])
+        current = _sha(path.read_bytes()) if path.exists() else None
+        if current == entry['before']:
+            continue  # écriture jamais appliquée (interruption) ou déjà restaurée
+        if current != entry['after']:
+            skipped.append(entry['path'])
+            continue
+        if entry['before'] is None:
+            path.unlink()
+        else:
+            blob = journal_dir / "blobs" / entry['before'][:2] / entry['before']
+            _replace_atomically(path, blob.read_bytes())
+        restored.append(entry['path'])
+
+    if not skipped:
+        marker.write_text(json.dumps({'time': datetime.now().isoformat(timespec='seconds'),
+                                      'restored': len(restored)}) + "\n", encoding='utf-8')
+    return restored, skipped
+
+
+def add_journal_arguments(parser):
+    """Ajoute --rollback RUN_ID à un parseur argparse"""
+    parser.add_argument('--rollback', metavar='RUN_ID',
+                        help="Annule les écritures d'une exécution précédente (voir write_journal.py --list)")
+    return parser
+
+
+def split_rollback_argv(argv: List[str]) -> Tuple[Optional[str], List[str]]:
+    """Extrait --rollback RUN_ID / --rollback=RUN_ID d'une liste d'arguments (scripts sans argparse)"""
+    run_id = None
+    remaining = []
+    iterator = iter(argv)
+    for arg in iterator:
+        if arg == '--rollback':
+            run_id = next(iterator, None)
+        elif arg.startswith('--rollback='):
+            run_id = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    return run_id, remaining
+
+
+def run_rollback(run_id: str, journal_dir=JOURNAL_DIR) -> int:
+    """Annule une exécution en affichant le détail; retourne un code de sortie"""
+    try:
+        restored, skipped = rollback(run_id, journal_dir)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    for path in restored:
+        print(f"↩️  Restauré: {os.path.relpath(path)}")
+    for path in skipped:
+        print(f"⚠️  Modifié depuis l'exécution, ignoré: {os.path.relpath(path)}")
+    print(f"✅ {run_id}: {len(restored)} fichier(s) restauré(s), {len(skipped)} ignoré(s)")
+    return 0 if not skipped else 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Journal des écritures des correcteurs CSS")
+    parser.add_argument('--list', action='store_true', help='Liste les exécutions journalisées')
+    add_journal_arguments(parser)
+    args = parser.parse_args()
+
+    if args.rollback:
+        return run_rollback(args.rollback)
+
+    runs = list_runs()
+    if not runs:
+        print("Aucune exécution journalisée")
+        return 0
+    for run in runs:
+        state = " (annulée)" if run['rolled_back'] else ""
+        print(f"{run['run_id']}  {run['time']}  {run['tool']}  {run['files']} fichier(s){state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Automate d'Aho–Corasick pour la recherche simultanée de littéraux
+Tous les littéraux sont compilés dans un seul trie muni de liens d'échec et
+de liens de sortie ("dictionary suffix links"). Le texte est parcouru une
+fois, caractère par caractère: le coût est linéaire en taille du texte plus
+nombre d'occurrences, quel que soit le nombre de littéraux (contrairement à
+une alternance regex, réessayée à chaque position).
+
+À la racine, les caractères qui ne commencent aucun littéral sont sautés
+d'un bloc (recherche d'une classe de caractères), ce qui compense le coût
+d'une boucle Python sur les longs passages sans candidat.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    def __init__(self, literals: Iterable[str]):
+        self.literals: List[str] = [literal for literal in dict.fromkeys(literals) if literal]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[int] = [-1]      # indice du littéral qui se termine sur ce nœud (-1 sinon)
+        self._output: List[int] = [0]    # nœud suivant (par liens d'échec) qui termine un littéral
+
+        for index, literal in enumerate(self.literals):
+            node = 0
+            for char in literal:
+                following = self._goto[node].get(char)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto[node][char] = following
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._own.append(-1)
+                    self._output.append(0)
+                node = following
+            self._own[node] = index
+
+        # Liens d'échec en largeur: plus long suffixe propre qui est aussi un préfixe du trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                link = self._fail[child]
+                self._output[child] = link if self._own[link] >= 0 else self._output[link]
+
+        starters = "".join(sorted(self._goto[0]))
+        self._starter = re.compile(f"[{re.escape(starters)}]") if starters else None
+
+    def __len__(self) -> int:
+        return len(self.literals)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Itère sur (début, fin, indice du littéral), dans l'ordre des positions de fin"""
+        if self._starter is None:
+            return
+        goto, fail, own, output = self._goto, self._fail, self._own, self._output
+        literals = self.literals
+        starter = self._starter
+        node = 0
+        position = 0
+        length = len(text)
+        while position < length:
+            if node == 0:
+                found = starter.search(text, position)
+                if found is None:
+                    return
+                position = found.start()
+            char = text[position]
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            position += 1
+            hit = node if own[node] >= 0 else output[node]
+            while hit:
+                index = own[hit]
+                yield position - len(literals[index]), position, index
+                hit = output[hit]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la correction des VARIABLE_MAPPINGS
+Compare l'ancienne boucle (deux patterns findall + sub par entrée de la table)
+à l'alternance compilée de fix_css_content, sur une feuille de style réaliste
+générée de ~2 000 lignes.
+
+Usage: python tools/css/benchmark_variable_mappings.py [--lines=2000] [--runs=20]
+"""
+
+import re
+import random
+import argparse
+import importlib.util
+import statistics
+import time
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location(
+    "fix_css_variables", Path(__file__).resolve().parent / "fix-css-variables.py"
+)
+fix_css_variables = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fix_css_variables)
+
+VARIABLE_MAPPINGS = fix_css_variables.VARIABLE_MAPPINGS
+
+PROPERTIES = ['color', 'background-color', 'border-color', 'fill', 'outline-color']
+STANDARD_VARS = ['--tc-spacing-2', '--tc-spacing-3', '--tc-radius-sm', '--tc-font-size-sm', '--tc-shadow-sm']
+
+
+def legacy_fix_variables(content):
+    """Ancienne implémentation: 2 patterns × findall + sub par entrée de la table"""
+    changes_made = []
+    for old_var, new_var in VARIABLE_MAPPINGS.items():
+        patterns = [
+            f'var\\({re.escape(old_var)}\\)',
+            re.escape(old_var)
+        ]
+        for pattern in patterns:
+            matches = re.findall(pattern, content)
+            if matches:
+                replacement = f'var({new_var})' if pattern.startswith('var\\(') else new_var
+                content = re.sub(pattern, replacement, content)
+                changes_made.append(f"{old_var} → {new_var}: {len(matches)} occurrences")
+    return content, changes_made
+
+
+def compiled_fix_variables(content):
+    """Nouvelle implémentation: une seule alternance compilée"""
+    content, counts = fix_css_variables.VARIABLE_MATCHER.sub(content)
+    return content, [f"{old} → {new}: {counts[old]} occurrences"
+                     for old, new in VARIABLE_MAPPINGS.items() if counts[old]]
+
+
+def generate_stylesheet(line_count, seed=42):
+    """Génère une feuille de style de type *.module.css d'environ line_count lignes"""
+    rng = random.Random(seed)
+    legacy_vars = list(VARIABLE_MAPPINGS)
+    lines = []
+    rule = 0
+    while len(lines) < line_count:
+        rule += 1
+        if rule % 25 == 0:
+            lines.append("@media (max-width: 768px) {")
+        lines.append(f".block{rule}__element{rule % 7} {{")
+        for _ in range(rng.randint(3, 8)):
+            prop = rng.choice(PROPERTIES)
+            if rng.random() < 0.25:
+                lines.append(f"  {prop}: var({rng.choice(legacy_vars)});")
+            elif rng.random() < 0.5:
+                lines.append(f"  padding: var({rng.choice(STANDARD_VARS)});")
+            else:
+                lines.append(f"  {prop}: #{rng.randrange(0x1000000):06x};")
+        lines.append("}")
+        if rule % 25 == 0:
+            lines.append("}")
+        lines.append("")
+    return "\n".join(lines[:line_count]) + "\n"
+
+
+def time_function(function, content, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark des VARIABLE_MAPPINGS')
+    parser.add_argument('--lines', type=int, default=2000, help='Nombre de lignes CSS générées')
+    parser.add_argument('--runs', type=int, default=20, help='Nombre de répétitions')
+    args = parser.parse_args()
+
+    content = generate_stylesheet(args.lines)
+    _, legacy_changes = legacy_fix_variables(content)
+    _, compiled_changes = compiled_fix_variables(content)
+
+    legacy_time = time_function(legacy_fix_variables, content, args.runs)
+    compiled_time = time_function(compiled_fix_variables, content, args.runs)
+
+    print(f"📄 Feuille générée: {args.lines} lignes, {len(content)} octets, "
+          f"{len(VARIABLE_MAPPINGS)} entrées dans VARIABLE_MAPPINGS")
+    print(f"🐢 Boucle historique : {legacy_time * 1000:8.2f} ms ({len(legacy_changes)} lignes de changements)")
+    print(f"⚡ Alternance compilée: {compiled_time * 1000:8.2f} ms ({len(compiled_changes)} lignes de changements)")
+    print(f"📈 Gain: {legacy_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Pipeline de normalisation CSS: une lecture, une écriture par fichier
+Enchaîner fix-css-variables.py, fix-css-inconsistencies.py,
+prefix_css_vars.py et standardize_breakpoints.py relit, réécrit et reparcourt
+tout l'arbre à chaque script. Ici l'arbre est parcouru une fois, chaque
+fichier est lu une fois, passe par les étapes demandées dans l'ordre et n'est
+réécrit (via le journal d'écriture, annulable avec --rollback) que si le
+résultat final diffère.
+
+Les étapes sont déclarées par les scripts eux-mêmes (liste PIPELINE_STAGES:
+nom, extensions, transformation(contenu, chemin) -> (contenu, Counter),
+filtre de chemin optionnel, déclencheurs du préfiltre) et chargées à
+l'exécution. Une étape dont aucun déclencheur n'apparaît dans le fichier est
+sautée sans passe regex (rule_prefilter.py). Chaque étape a ses statistiques
+(fichiers touchés, remplacements, détail) et son temps (PhaseTimer).
+
+Usage:
+    python tools/css/css_pipeline.py [--path=./src] [--stages=breakpoints,variables,...] [--dry-run]
+        [--watch] [--since REF | --staged] [--profile [DIR]] [--rollback RUN_ID] [--list-stages]
+"""
+
+import os
+import sys
+import argparse
+import importlib.util
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from file_watcher import EXCLUDED_DIRS, watch
+from rule_prefilter import RulePrefilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import add_scope_arguments, resolve_scope
+from phase_timer import PhaseTimer, add_profile_argument
+from write_journal import WriteJournal, add_journal_arguments, run_rollback
+
+CSS_DIR = Path(__file__).resolve().parent
+
+# Scripts qui déclarent des étapes (PIPELINE_STAGES)
+STAGE_SCRIPTS = ('standardize_breakpoints.py', 'prefix_css_vars.py', 'fix-css-variables.py', 'fix-css-inconsistencies.py')
+
+# Ordre par défaut d'une passe de normalisation complète
+DEFAULT_STAGES = ('breakpoints', 'variables', 'variable-names', 'colors', 'malformed', 'rgba-shadow', 'inline')
+
+
+def _load_script(path: Path):
+    """Importe un script de tools/css (les noms avec tirets ne sont pas importables directement)"""
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_stages() -> Dict[str, Dict]:
+    """Étapes déclarées par les scripts, par nom"""
+    stages = {}
+    for script in STAGE_SCRIPTS:
+        module = _load_script(CSS_DIR / script)
+        for stage in module.PIPELINE_STAGES:
+            if stage['name'] in stages:
+                raise ValueError(f"Étape déclarée deux fois: {stage['name']} ({script})")
+            stages[stage['name']] = dict(stage, script=script)
+    return stages
+
+
+def select_stages(names: Iterable[str], available: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """Étapes demandées, dans l'ordre donné (ValueError si un nom est inconnu)"""
+    available = available if available is not None else load_stages()
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Étape(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(available)})")
+    return [available[name] for name in names]
+
+
+class CSSPipeline:
+    """Applique une suite d'étapes à chaque fichier avec une lecture et au plus une écriture"""
+
+    def __init__(self, stages: List[Dict], dry_run=False, journal=None, timer=None):
+        self.stages = stages
+        self.dry_run = dry_run
+        self.journal = journal or WriteJournal('css_pipeline')
+        self.timer = timer or PhaseTimer()
+        # Les étapes qui déclarent des déclencheurs sont aussi des familles du préfiltre
+        self.prefilter = RulePrefilter({stage['name']: stage for stage in stages})
+        self.suffixes = tuple(sorted({suffix for stage in stages for suffix in stage['suffixes']}))
+        self.stats = {
+            'files_processed': 0,
+            'files_modified': 0,
+            'errors': 0,
+        }
+        # nom d'étape -> {'files', 'replacements', 'details'}
+        self.stage_stats: Dict[str, Dict] = {
+            stage['name']: {'files': 0, 'replacements': 0, 'details': Counter()} for stage in stages
+        }
+
+    def _applies(self, stage: Dict, path) -> bool:
+        path_filter = stage.get('path_filter')
+        return str(path).endswith(stage['suffixes']) and (path_filter is None or path_filter(path))
+
+    def transform(self, content: str, path) -> Tuple[str, Dict[str, Counter]]:
+        """Passe le contenu dans les étapes applicables; retourne (contenu, remplacements par étape)"""
+        changes = {}
+        for stage in self.stages:
+            if not self._applies(stage, path) or not self.prefilter.may_fire(stage['name'], content):
+                continue
+            with self.timer.phase(stage['name']):
+                content, counts = stage['transform'](content, path)
+            if counts:
+                changes[stage['name']] = counts
+        return content, changes
+
+    def process_file(self, path) -> bool:
+        """Lit, transforme et réécrit (si nécessaire) un fichier; retourne True s'il change"""
+        try:
+            with self.timer.phase('read'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    original = f.read()
+            content, changes = self.transform(original, path)
+            changed = content != original
+            if changed and not self.dry_run:
+                with self.timer.phase('write'):
+                    self.journal.write(path, content, original=original)
+        except Exception as e:
+            print(f"❌ Erreur lors du traitement de {path}: {e}")
+            self.stats['errors'] += 1
+            return False
+
+        self.stats['files_processed'] += 1
+        for name, counts in changes.items():
+            stage_stats = self.stage_stats[name]
+            stage_stats['files'] += 1
+            stage_stats['replacements'] += sum(counts.values())
+            stage_stats['details'].update(counts)
+        if changed:
+            self.stats['files_modified'] += 1
+            print(f"✅ {os.path.relpath(path)} ({', '.join(changes)})")
+        return changed
+
+    def collect_files(self, base_path, scope=None) -> List[Path]:
+        """Fichiers concernés par au moins une étape, en un seul parcours de l'arbre"""
+        if scope is not None:
+            return sorted(scope.files_under(base_path, self.suffixes))
+        files = []
+        for dirpath, dirnames, filenames in os.walk(base_path):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            files.extend(Path(dirpath) / name for name in filenames if name.endswith(self.suffixes))
+        return sorted(files)
+
+    def run(self, files: List[Path]):
+        for path in files:
+            self.process_file(path)
+
+    def report(self, top: int = 3) -> str:
+        """Tableau des statistiques par étape"""
+        lines = [f"{'Étape':<16}{'Fichiers':>10}{'Remplacements':>16}  Principaux"]
+        for stage in self.stages:
+            stage_stats = self.stage_stats[stage['name']]
+            main = ", ".join(f"{key} ×{count}" for key, count in stage_stats['details'].most_common(top))
+            lines.append(f"{stage['name']:<16}{stage_stats['files']:>10}{stage_stats['replacements']:>16}  {main}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalisation CSS en une passe (une lecture, une écriture par fichier)')
+    parser.add_argument('--path', default='./src', help='Chemin de base à traiter (défaut: ./src)')
+    parser.add_argument('--stages', default=",".join(DEFAULT_STAGES),
+                        help=f"Étapes, dans l'ordre (défaut: {','.join(DEFAULT_STAGES)})")
+    parser.add_argument('--list-stages', action='store_true', help='Liste les étapes disponibles')
+    parser.add_argument('--dry-run', action='store_true', help='Mode simulation (aucune modification)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Surveille les fichiers et applique les étapes à chaque fichier sauvegardé')
+    add_scope_arguments(parser)
+    add_profile_argument(parser, Path("tools") / "css" / ".cache" / "profile" / "css_pipeline")
+    add_journal_arguments(parser)
+
+    args = parser.parse_args()
+
+    if args.rollback:
+        return run_rollback(args.rollback)
+
+    available = load_stages()
+    if args.list_stages:
+        for name, stage in available.items():
+            default = " (défaut)" if name in DEFAULT_STAGES else ""
+            print(f"{name:<16}{' '.join(stage['suffixes']):<20}{stage['script']:<30}{stage.get('description', '')}{default}")
+        return 0
+
+    try:
+        stages = select_stages([name.strip() for name in args.stages.split(',') if name.strip()], available)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not os.path.exists(args.path):
+        print(f"Erreur: Le chemin {args.path} n'existe pas")
+        return 1
+
+    pipeline = CSSPipeline(stages, args.dry_run, WriteJournal('css_pipeline'), PhaseTimer(args.profile))
+    if args.watch:
+        watch(args.path, pipeline.suffixes, lambda content, path: pipeline.transform(content, path)[0],
+              'Normalisation CSS', pipeline.journal, args.dry_run)
+        return 0
+
+    print("🔧 Normalisation CSS en une passe")
+    print(f"📁 Répertoire: {args.path}")
+    print(f"🧩 Étapes: {' → '.join(stage['name'] for stage in stages)}")
+    print(f"🔍 Mode: {'Simulation' if args.dry_run else 'Correction'}")
+    print("-" * 50)
+
+    scope = resolve_scope(os.getcwd(), args.since, args.staged)
+    if scope is not None:
+        print(scope.summary())
+    files = pipeline.collect_files(args.path, scope)
+    print(f"📄 {len(files)} fichiers à traiter\n")
+    pipeline.run(files)
+
+    print("\n" + "=" * 50)
+    print("📊 RÉSULTATS")
+    print("=" * 50)
+    print(f"Fichiers traités: {pipeline.stats['files_processed']}")
+    print(f"Fichiers modifiés: {pipeline.stats['files_modified']}")
+    if pipeline.stats['errors']:
+        print(f"Erreurs: {pipeline.stats['errors']}")
+    print("\n" + pipeline.report())
+    print("\n" + pipeline.prefilter.summary_table())
+    print("\n" + pipeline.timer.summary_table("TEMPS PAR ÉTAPE (cumulé sur les fichiers)"))
+    pipeline.timer.write_profiles()
+
+    if args.dry_run:
+        print("\n⚠️  Mode simulation - Aucun fichier n'a été modifié")
+    else:
+        summary = pipeline.journal.summary()
+        if summary:
+            print("\n" + summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
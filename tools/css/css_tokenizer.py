@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tokenizer CSS et réécriture des propriétés personnalisées en une passe
+Découpe une feuille de style au fil de la lecture en jetons: commentaires,
+chaînes, url(), appels var(), propriétés personnalisées (--xxx), et entre
+eux des jetons 'text' (ou 'whitespace') qui regroupent tout le reste
+(sélecteurs, noms de propriétés, valeurs, délimiteurs). Le nombre de jetons
+reste proportionnel aux éléments utiles, pas à la taille du fichier, et le
+découpage tient en une passe de l'expression régulière. La concaténation des
+jetons redonne exactement le texte d'origine.
+
+rename_custom_properties() applique tous les renommages en un seul parcours
+des jetons: seuls les identifiants de déclaration (--x: ...) et de référence
+(var(--x)) sont modifiés, jamais le texte des commentaires, des chaînes ou
+des url(), et tout le reste du fichier est recopié à l'octet près.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+# Rôles d'une propriété personnalisée
+DEFINITION = 'definition'
+REFERENCE = 'reference'
+
+# Le lookahead écarte d'emblée les positions qui ne peuvent ouvrir aucun jeton
+TOKEN_PATTERN = re.compile(r'''
+    (?=[/"'uUvV-])(?:
+    (?P<comment>/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\.)*(?:"|(?=\n)|\Z)|'(?:[^'\\\n]|\\.)*(?:'|(?=\n)|\Z))
+  | (?P<url>(?<![\w-])url\(\s*(?:[^)"'\\\s]|\\.)*\s*\))
+  | (?P<function>(?<![\w-])var\()
+  | (?P<ident>(?<![\w-])--(?:[\w-]|\\.)*)
+    )
+''', re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+# Jetons sans incidence sur la structure (ignorés pour trouver le jeton significatif suivant)
+TRIVIA = ('comment', 'whitespace')
+# Délimiteurs après lesquels peut commencer une déclaration (ou une règle)
+DECLARATION_STARTS = ('{', ';', '}')
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Itère sur les jetons du texte, dans l'ordre, sans perte"""
+    pos = 0
+    for found in TOKEN_PATTERN.finditer(text):
+        start = found.start()
+        if start > pos:
+            gap = text[pos:start]
+            yield Token('whitespace' if gap.isspace() else 'text', gap, pos)
+        yield Token(found.lastgroup, found.group(), start)
+        pos = found.end()
+    if pos < len(text):
+        gap = text[pos:]
+        yield Token('whitespace' if gap.isspace() else 'text', gap, pos)
+
+
+def custom_properties(tokens: Iterable[Token]) -> Iterator[Tuple[Token, Optional[str]]]:
+    """Associe à chaque jeton son rôle: DEFINITION, REFERENCE ou None
+
+    Une propriété personnalisée est une définition en début de déclaration
+    (après '{', ';', '}' ou en début de fichier, hors parenthèses, suivie de
+    ':'), une référence en premier argument de var(). Le rôle d'une définition
+    n'est connu qu'au jeton significatif suivant: le jeton est retenu
+    jusque-là, les autres passent immédiatement.
+    """
+    depth = 0               # parenthèses ouvertes (hors chaînes et commentaires)
+    var_argument = False    # prochain jeton significatif = premier argument de var()
+    declaration_start = True
+    pending = None          # définition candidate, en attente du ':'
+    held = []               # jetons de trivia suivant la candidate
+
+    for token in tokens:
+        if pending is not None:
+            if token.kind in TRIVIA:
+                held.append(token)
+                continue
+            is_definition = token.kind == 'text' and token.text.lstrip().startswith(':')
+            yield pending, (DEFINITION if is_definition else None)
+            yield from ((trivia, None) for trivia in held)
+            pending, held = None, []
+
+        if token.kind in TRIVIA:
+            yield token, None
+            continue
+
+        role = None
+        if var_argument:
+            if token.kind == 'ident':
+                role = REFERENCE
+        elif token.kind == 'ident' and declaration_start and depth == 0:
+            declaration_start = False
+            pending = token
+            continue
+
+        var_argument = token.kind == 'function'
+        if token.kind == 'function':
+            depth += 1
+            declaration_start = False
+        elif token.kind == 'text':
+            depth = max(depth + token.text.count('(') - token.text.count(')'), 0)
+            declaration_start = token.text.rstrip()[-1:] in DECLARATION_STARTS
+        else:
+            declaration_start = False
+        yield token, role
+
+    if pending is not None:
+        yield pending, None
+        yield from ((trivia, None) for trivia in held)
+
+
+def rename_custom_properties(text: str, rename: Callable[[str], Optional[str]],
+                             roles: Iterable[str] = (DEFINITION, REFERENCE)) -> Tuple[str, Counter]:
+    """Renomme les propriétés personnalisées en une passe
+
+    rename reçoit le nom ('--x') et retourne le nouveau nom, ou None pour le
+    garder. Retourne (texte réécrit, nombre de renommages par rôle).
+    """
+    roles = set(roles)
+    counts = Counter()
+    if '--' not in text:
+        return text, counts
+    pieces = []
+    for token, role in custom_properties(tokenize(text)):
+        if role in roles:
+            renamed = rename(token.text)
+            if renamed is not None and renamed != token.text:
+                pieces.append(renamed)
+                counts[role] += 1
+                continue
+        pieces.append(token.text)
+    return "".join(pieces), counts
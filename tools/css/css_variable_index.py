@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Index des propriétés personnalisées CSS (--tc-*) du projet
+Parcourt en une passe les feuilles CSS et les fichiers JS/JSX de src/ et
+associe à chaque propriété ses sites de définition (fichier, ligne,
+sélecteur, contexte @media/@supports) et ses sites d'utilisation. Remplace
+les listes audit/variables_*.txt produites par grep, et signale:
+- les définitions inutilisées (y compris celles seulement référencées par
+  d'autres définitions inutilisées),
+- les utilisations sans définition,
+- les redéfinitions masquées (même sélecteur et même contexte).
+
+L'index est sauvegardé dans tools/css/.cache et mis à jour de façon
+incrémentale: seuls les fichiers nouveaux ou modifiés (date, taille) sont
+relus, les fichiers supprimés sont évincés.
+
+Usage:
+    python tools/css/css_variable_index.py [--root=src] [--prefix=--tc-] [--show=--tc-color-primary]
+        [--json=rapport.json] [--export-audit]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from css_tokenizer import DEFINITION, REFERENCE, custom_properties, tokenize
+
+# Version de l'extraction par fichier: à incrémenter dès que le contenu d'une fiche change
+INDEX_VERSION = 2
+DEFAULT_INDEX_PATH = Path("tools") / "css" / ".cache" / "css_variables_index.json"
+CSS_SUFFIXES = ('.css',)
+JS_SUFFIXES = ('.js', '.jsx')
+EXCLUDED_DIRS = {"node_modules", ".git", "build", "dist", "coverage", "__pycache__"}
+
+# Délimiteurs de blocs et de déclarations dans les jetons de texte
+STRUCTURE = re.compile(r'[{};]')
+
+# JS: style={{'--x': ...}} et el.style.setProperty('--x', ...) définissent la propriété
+JS_DEFINITION = re.compile(r'''(?:setProperty\(\s*|[{,]\s*)(['"])(--[\w-]+)\1\s*[,:]''')
+# JS: var(--x) dans les chaînes de style et getPropertyValue('--x')
+JS_REFERENCE = re.compile(r'''var\(\s*(--[\w-]+)|getPropertyValue\(\s*['"](--[\w-]+)''')
+JS_SELECTOR = '(style JS)'
+
+
+def _block_context(blocks: List[str]) -> Dict:
+    """Sélecteur (blocs imbriqués) et contexte @media/@supports des blocs ouverts"""
+    selectors = [prelude for prelude in blocks if not prelude.startswith('@')]
+    at_rules = [prelude for prelude in blocks if prelude.startswith('@')]
+    return {'selector': ' '.join(selectors), 'context': ' / '.join(at_rules)}
+
+
+def _declaration_value(parts: List[str]) -> str:
+    """Valeur d'une déclaration à partir du texte qui suit le nom ('': ...')"""
+    value = ''.join(parts).strip()
+    if value.startswith(':'):
+        value = value[1:]
+    value = ' '.join(value.split())
+    if value.lower().endswith('!important'):
+        value = value[:-len('!important')].rstrip()
+    return value
+
+
+def extract_css(content: str) -> Tuple[List[Dict], List[Dict]]:
+    """Définitions (avec leur valeur) et utilisations d'une feuille CSS, en un parcours des jetons"""
+    definitions, usages = [], []
+    if '--' not in content:
+        return definitions, usages
+
+    blocks = []         # préludes des blocs ouverts (sélecteurs, @media...)
+    prelude = []        # texte depuis le dernier '{', '}' ou ';'
+    declaration = None  # propriété en cours de définition (ses var() en dépendent)
+    value = None        # texte de la valeur en cours de définition
+    line = 1
+    for token, role in custom_properties(tokenize(content)):
+        text = token.text
+        if role == DEFINITION:
+            declaration = text
+            value = []
+            definitions.append({'name': text, 'line': line, **_block_context(blocks)})
+            continue
+        elif role == REFERENCE:
+            usages.append({'name': text, 'line': line, 'within': declaration})
+
+        if token.kind in ('text', 'whitespace'):
+            pos = 0
+            for mark in STRUCTURE.finditer(text):
+                if value is not None:
+                    value.append(text[pos:mark.start()])
+                    definitions[-1]['value'] = _declaration_value(value)
+                    value = None
+                if mark.group() == '{':
+                    prelude.append(text[pos:mark.start()])
+                    blocks.append(' '.join(''.join(prelude).split()))
+                elif mark.group() == '}' and blocks:
+                    blocks.pop()
+                prelude = []
+                declaration = None
+                pos = mark.end()
+            prelude.append(text[pos:])
+            if value is not None:
+                value.append(text[pos:])
+        elif token.kind != 'comment':
+            prelude.append(text)
+            if value is not None:
+                value.append(text)
+        line += text.count('\n')
+
+    if value is not None:
+        definitions[-1]['value'] = _declaration_value(value)
+    return definitions, usages
+
+
+def extract_js(content: str) -> Tuple[List[Dict], List[Dict]]:
+    """Définitions (style inline, setProperty) et utilisations d'un fichier JS"""
+    definitions, usages = [], []
+    if '--' not in content:
+        return definitions, usages
+
+    matches = [(match.start(2), 'definition', match.group(2)) for match in JS_DEFINITION.finditer(content)]
+    matches += [(match.start(), 'usage', match.group(1) or match.group(2)) for match in JS_REFERENCE.finditer(content)]
+    line, pos = 1, 0
+    for start, kind, name in sorted(matches):
+        line += content.count('\n', pos, start)
+        pos = start
+        if kind == 'definition':
+            definitions.append({'name': name, 'line': line, 'selector': JS_SELECTOR, 'context': ''})
+        else:
+            usages.append({'name': name, 'line': line, 'within': None})
+    return definitions, usages
+
+
+class CSSVariableIndex:
+    def __init__(self, project_root: str, index_path: Optional[str] = None):
+        self.project_root = Path(project_root)
+        self.index_path = Path(index_path) if index_path else self.project_root / DEFAULT_INDEX_PATH
+        # chemin relatif -> {'mtime', 'size', 'definitions', 'usages'}
+        self.files: Dict[str, Dict] = {}
+        self.dirty = False
+        self.stats = {'files_read': 0, 'files_reused': 0, 'files_evicted': 0}
+
+    @classmethod
+    def open(cls, project_root: str, index_path: Optional[str] = None) -> "CSSVariableIndex":
+        """Charge l'index sauvegardé (vide si absent ou d'une autre version)"""
+        index = cls(project_root, index_path)
+        if index.index_path.exists():
+            try:
+                with open(index.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('version') == INDEX_VERSION:
+                index.files = data.get('files', {})
+        return index
+
+    def _walk(self, roots: Iterable[str]) -> Iterable[Path]:
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(self.project_root / root):
+                dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+                for filename in sorted(filenames):
+                    if filename.endswith(CSS_SUFFIXES + JS_SUFFIXES):
+                        yield Path(dirpath) / filename
+
+    def update(self, roots: Iterable[str] = ("src",)):
+        """Relit les fichiers nouveaux ou modifiés et évince les fichiers supprimés"""
+        seen = set()
+        for path in self._walk(roots):
+            relative = path.relative_to(self.project_root).as_posix()
+            seen.add(relative)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            record = self.files.get(relative)
+            if record is not None and record['mtime'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+                self.stats['files_reused'] += 1
+                continue
+
+            try:
+                content = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            extract = extract_css if relative.endswith(CSS_SUFFIXES) else extract_js
+            definitions, usages = extract(content)
+            self.files[relative] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size,
+                                    'definitions': definitions, 'usages': usages}
+            self.stats['files_read'] += 1
+            self.dirty = True
+
+        for relative in [relative for relative in self.files if relative not in seen]:
+            del self.files[relative]
+            self.stats['files_evicted'] += 1
+            self.dirty = True
+
+    def save(self):
+        """Sauvegarde l'index s'il a été modifié"""
+        if not self.dirty:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    # Requêtes
+
+    def definitions(self, prefix: str = '--') -> Dict[str, List[Dict]]:
+        """Propriété -> sites de définition (avec le fichier)"""
+        result = defaultdict(list)
+        for relative, record in sorted(self.files.items()):
+            for site in record['definitions']:
+                if site['name'].startswith(prefix):
+                    result[site['name']].append(dict(site, file=relative))
+        return result
+
+    def usages(self, prefix: str = '--') -> Dict[str, List[Dict]]:
+        """Propriété -> sites d'utilisation (avec le fichier)"""
+        result = defaultdict(list)
+        for relative, record in sorted(self.files.items()):
+            for site in record['usages']:
+                if site['name'].startswith(prefix):
+                    result[site['name']].append(dict(site, file=relative))
+        return result
+
+    def live(self) -> set:
+        """Propriétés réellement utilisées: référencées hors définition, puis par transitivité"""
+        referenced_by = defaultdict(set)   # définition -> propriétés qu'elle référence
+        pending = []
+        for record in self.files.values():
+            for site in record['usages']:
+                if site['within'] is None:
+                    pending.append(site['name'])
+                else:
+                    referenced_by[site['within']].add(site['name'])
+        live = set()
+        while pending:
+            name = pending.pop()
+            if name not in live:
+                live.add(name)
+                pending.extend(referenced_by.get(name, ()))
+        return live
+
+    def unused(self, prefix: str = '--') -> Dict[str, List[Dict]]:
+        """Définitions qu'aucune utilisation vivante n'atteint"""
+        live = self.live()
+        return {name: sites for name, sites in self.definitions(prefix).items() if name not in live}
+
+    def undefined(self, prefix: str = '--') -> Dict[str, List[Dict]]:
+        """Utilisations de propriétés définies nulle part"""
+        defined = set(self.definitions(prefix))
+        return {name: sites for name, sites in self.usages(prefix).items() if name not in defined}
+
+    def shadowed(self, prefix: str = '--') -> Dict[str, List[List[Dict]]]:
+        """Redéfinitions d'une propriété pour le même sélecteur et le même contexte"""
+        result = {}
+        for name, sites in self.definitions(prefix).items():
+            groups = defaultdict(list)
+            for site in sites:
+                if site['selector'] != JS_SELECTOR:
+                    groups[(site['selector'], site['context'])].append(site)
+            duplicated = [group for group in groups.values() if len(group) > 1]
+            if duplicated:
+                result[name] = duplicated
+        return result
+
+
+def _site(site: Dict) -> str:
+    where = f"{site['file']}:{site['line']}"
+    if site.get('selector'):
+        where += f" ({site['selector']}" + (f" @ {site['context']}" if site['context'] else "") + ")"
+    return where
+
+
+def export_audit(index: CSSVariableIndex, prefix: str, audit_dir: Path):
+    """Réécrit audit/variables_{defined,used,unused,missing}.txt à partir de l'index"""
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    lists = {
+        'variables_defined.txt': index.definitions(prefix),
+        'variables_used.txt': index.usages(prefix),
+        'variables_unused.txt': index.unused(prefix),
+        'variables_missing.txt': index.undefined(prefix)
+    }
+    for filename, names in lists.items():
+        (audit_dir / filename).write_text("".join(f"{name}\n" for name in sorted(names)), encoding='utf-8')
+    print(f"📝 Listes exportées dans {audit_dir}: {', '.join(lists)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index des propriétés personnalisées CSS du projet')
+    parser.add_argument('--root', action='append', help='Répertoire à indexer (défaut: src, répétable)')
+    parser.add_argument('--prefix', default='--tc-', help='Préfixe des propriétés à rapporter (défaut: --tc-)')
+    parser.add_argument('--show', metavar='PROPRIÉTÉ', help='Affiche les sites de définition et d\'utilisation')
+    parser.add_argument('--json', metavar='FICHIER', help='Écrit le rapport complet en JSON')
+    parser.add_argument('--export-audit', action='store_true',
+                        help='Réécrit audit/variables_*.txt à partir de l\'index')
+    parser.add_argument('--limit', type=int, default=20, help='Entrées affichées par catégorie')
+    args = parser.parse_args()
+
+    project_root = os.getcwd()
+    index = CSSVariableIndex.open(project_root)
+    index.update(args.root or ["src"])
+    index.save()
+    print(f"🗂️ Index: {len(index.files)} fichiers ({index.stats['files_read']} relus, "
+          f"{index.stats['files_reused']} réutilisés, {index.stats['files_evicted']} évincés)")
+
+    if args.show:
+        print(f"\n🔎 {args.show}")
+        for site in index.definitions(args.show).get(args.show, []):
+            print(f"   définie   {_site(site)}")
+        for site in index.usages(args.show).get(args.show, []):
+            print(f"   utilisée  {site['file']}:{site['line']}"
+                  + (f" (dans {site['within']})" if site['within'] else ""))
+        return 0
+
+    definitions = index.definitions(args.prefix)
+    usages = index.usages(args.prefix)
+    unused = index.unused(args.prefix)
+    undefined = index.undefined(args.prefix)
+    shadowed = index.shadowed(args.prefix)
+
+    print(f"📊 {len(definitions)} propriétés {args.prefix}* définies, {len(usages)} utilisées")
+    print(f"\n🗑️ Définitions inutilisées: {len(unused)}")
+    for name, sites in sorted(unused.items())[:args.limit]:
+        print(f"   {name}: {', '.join(_site(site) for site in sites)}")
+    print(f"\n❓ Utilisations sans définition: {len(undefined)}")
+    for name, sites in sorted(undefined.items(), key=lambda item: (-len(item[1]), item[0]))[:args.limit]:
+        print(f"   {name}: {len(sites)} utilisation(s), ex. {sites[0]['file']}:{sites[0]['line']}")
+    print(f"\n🪞 Redéfinitions masquées: {len(shadowed)}")
+    for name, groups in sorted(shadowed.items())[:args.limit]:
+        for group in groups:
+            print(f"   {name}: {' → '.join(_site(site) for site in group)}")
+
+    if args.json:
+        report = {
+            'prefix': args.prefix,
+            'definitions': definitions,
+            'usages': usages,
+            'unused': sorted(unused),
+            'undefined': sorted(undefined),
+            'shadowed': shadowed
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📊 Rapport JSON sauvegardé: {args.json}")
+    if args.export_audit:
+        export_audit(index, args.prefix, Path(project_root) / "audit")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
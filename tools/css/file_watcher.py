@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Mode --watch commun aux correcteurs CSS
+Surveille une arborescence (inotify via ctypes sous Linux, scrutation des
+dates de modification ailleurs), regroupe les rafales de sauvegardes
+(anti-rebond) et ne réapplique la transformation qu'aux fichiers modifiés,
+en affichant le diff de chaque correction en temps réel.
+
+Au repos, le processus est bloqué dans select() (inotify): aucune
+consommation CPU. Les corrections passent par le journal d'écriture de
+l'outil (write_journal.py: écriture atomique, annulable avec --rollback);
+les écritures faites par le correcteur lui-même sont reconnues à leur
+empreinte et ignorées.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import difflib
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+EXCLUDED_DIRS = {'node_modules', '.git', 'dist', 'build', 'coverage', '__pycache__'}
+
+# Anti-rebond: une rafale est close après DEBOUNCE secondes sans événement,
+# et au plus tard MAX_BATCH_DELAY secondes après son premier événement
+DEBOUNCE = 0.05
+MAX_BATCH_DELAY = 0.15
+POLL_INTERVAL = 0.15
+MAX_DIFF_LINES = 40
+
+# Constantes inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+# Les suppressions (et déplacements hors d'un répertoire) sont signalées aussi:
+# watch() ignore les fichiers illisibles, le démon d'analyse les évince
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_excluded(path: Path) -> bool:
+    return any(part in EXCLUDED_DIRS for part in path.parts)
+
+
+class _InotifyBackend:
+    """Surveillance par inotify (Linux): une montre par répertoire"""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify indisponible")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self.directories: Dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, directory: Path):
+        for dirpath, dirnames, _ in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd >= 0:
+                self.directories[wd] = Path(dirpath)
+
+    def wait(self, timeout: Optional[float]) -> List[Path]:
+        """Bloque jusqu'aux prochains événements (ou timeout) et retourne les chemins touchés"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_DELETE_SELF:
+                del self.directories[wd]
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and path.name not in EXCLUDED_DIRS:
+                    # Nouveau répertoire: surveillé, et ses fichiers déjà présents traités
+                    self._add_tree(path)
+                    paths.extend(p for p in path.rglob('*') if p.is_file())
+                continue
+            paths.append(path)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Repli portable: compare taille et date de modification à intervalle régulier"""
+
+    def __init__(self, root: Path, suffixes: Tuple[str, ...], interval: float = POLL_INTERVAL):
+        self.root = root
+        self.suffixes = suffixes
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, float]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for filename in filenames:
+                if filename.endswith(self.suffixes):
+                    path = Path(dirpath) / filename
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> List[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._scan()
+        changed = [path for path, signature in current.items() if self.snapshot.get(path) != signature]
+        changed.extend(path for path in self.snapshot if path not in current)
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """Regroupe les événements de fichiers en lots anti-rebond"""
+
+    def __init__(self, root, suffixes: Iterable[str], backend: str = 'auto',
+                 path_filter: Optional[Callable[[Path], bool]] = None):
+        self.root = Path(root)
+        self.suffixes = tuple(suffixes)
+        self.path_filter = path_filter
+        self.backend = None
+        if backend in ('auto', 'inotify'):
+            try:
+                self.backend = _InotifyBackend(self.root)
+                self.backend_name = 'inotify'
+            except (OSError, AttributeError):
+                if backend == 'inotify':
+                    raise
+        if self.backend is None:
+            self.backend = _PollingBackend(self.root, self.suffixes)
+            self.backend_name = 'polling'
+
+    def _accept(self, path: Path) -> bool:
+        if not path.name.endswith(self.suffixes) or _is_excluded(path):
+            return False
+        return self.path_filter(path) if self.path_filter else True
+
+    def next_batch(self) -> Set[Path]:
+        """Attend une rafale de modifications et retourne les fichiers concernés"""
+        batch: Set[Path] = set()
+        while not batch:
+            batch.update(p for p in self.backend.wait(None) if self._accept(p))
+
+        first_event = time.monotonic()
+        while True:
+            remaining = MAX_BATCH_DELAY - (time.monotonic() - first_event)
+            if remaining <= 0:
+                break
+            more = self.backend.wait(min(DEBOUNCE, remaining))
+            if not more:
+                break
+            batch.update(p for p in more if self._accept(p))
+        return batch
+
+    def close(self):
+        self.backend.close()
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def print_diff(path: Path, before: str, after: str):
+    """Affiche le diff unifié d'une correction (tronqué au-delà de MAX_DIFF_LINES)"""
+    lines = list(difflib.unified_diff(
+        before.splitlines(keepends=True), after.splitlines(keepends=True),
+        fromfile=f"{path} (avant)", tofile=f"{path} (après)", n=1
+    ))
+    for line in lines[:MAX_DIFF_LINES]:
+        print(line, end='' if line.endswith('\n') else '\n')
+    if len(lines) > MAX_DIFF_LINES:
+        print(f"... {len(lines) - MAX_DIFF_LINES} lignes de diff supplémentaires")
+
+
+def watch(root, suffixes: Iterable[str], transform: Callable[[str, Path], str], label: str,
+          journal: "WriteJournal", dry_run: bool = False, backend: str = 'auto',
+          path_filter: Optional[Callable[[Path], bool]] = None):
+    """Réapplique transform(contenu, chemin) -> contenu à chaque fichier modifié, jusqu'à Ctrl+C
+
+    Les corrections sont écrites par journal (write_journal.WriteJournal de l'outil).
+    """
+    watcher = FileWatcher(root, suffixes, backend, path_filter)
+    # Empreinte du dernier contenu écrit par nous: l'événement qu'il déclenche est ignoré
+    own_writes: Dict[Path, str] = {}
+
+    print(f"👀 {label}: surveillance de {root} ({', '.join(watcher.suffixes)}) via {watcher.backend_name}")
+    if dry_run:
+        print("🧪 Mode DRY-RUN - les corrections sont affichées sans être écrites")
+    print("   Ctrl+C pour arrêter")
+
+    try:
+        while True:
+            batch = watcher.next_batch()
+            started = time.perf_counter()
+            changed = corrected = 0
+            for path in sorted(batch):
+                try:
+                    content = path.read_text(encoding='utf-8')
+                except (OSError, UnicodeDecodeError):
+                    continue
+                digest = _digest(content)
+                if own_writes.pop(path, None) == digest:
+                    continue
+                changed += 1
+
+                try:
+                    fixed = transform(content, path)
+                except Exception as e:
+                    print(f"❌ {path}: {e}")
+                    continue
+                if fixed == content:
+                    continue
+
+                corrected += 1
+                print_diff(path, content, fixed)
+                if not dry_run and journal.write(path, fixed, original=content):
+                    own_writes[path] = _digest(fixed)
+
+            if changed:
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"⏱️  {changed} fichier(s) modifié(s), {corrected} corrigé(s) en {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Surveillance arrêtée")
+        summary = journal.summary()
+        if summary:
+            print(summary)
+    finally:
+        watcher.close()
@@ -10,14 +10,28 @@ Ce script corrige :
 4. Les styles inline dans les fichiers React
 5. Les incohérences de nommage
 
-Usage: python fix-css-inconsistencies.py [--dry-run] [--path=./src]
+Usage: python fix-css-inconsistencies.py [--dry-run] [--path=./src] [--jobs=N] [--watch] [--since REF | --staged] [--profile [DIR]]
 """
 
+import io
 import os
 import re
+import sys
 import glob
 import argparse
 from pathlib import Path
+from collections import Counter
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+from literal_matcher import LiteralMatcher
+from file_watcher import watch
+from rule_prefilter import RulePrefilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import add_scope_arguments, resolve_scope
+from phase_timer import PhaseTimer, add_profile_argument
+from write_journal import WriteJournal, add_journal_arguments, run_rollback
 
 # Mappings de correction
 COLOR_MAPPINGS = {
@@ -40,6 +54,9 @@ COLOR_MAPPINGS = {
     '#f5f5f5': 'var(--tc-gray-100)',
 }
 
+# Table compilée une seule fois: une passe par fichier, plus long littéral d'abord
+COLOR_MATCHER = LiteralMatcher(COLOR_MAPPINGS)
+
 # Variables non conformes à corriger
 VARIABLE_MAPPINGS = {
     '--tc-color-white': '--tc-white',
@@ -75,10 +92,106 @@ INLINE_STYLE_PATTERNS = [
     (r'style=\{\{\s*minWidth:\s*[\'"]85px[\'"]\s*\}\}', 'className="tc-min-w-85"'),
 ]
 
+# Familles de règles du préfiltre: littéraux dont l'un est nécessaire à chaque règle de la famille
+PREFILTER_FAMILIES = {
+    'colors': {'triggers': ('#',), 'rules': 1},
+    'variable-names': {
+        'triggers': tuple(sorted({'var(--tc-color-' if old_var.startswith('--tc-color-') else f'var({old_var})'
+                                  for old_var in VARIABLE_MAPPINGS})),
+        'rules': len(VARIABLE_MAPPINGS),
+    },
+    'rgba-shadow': {'triggers': ('var(--tc-color-rgba(', 'var(--tc-box-shadow-lg))'), 'rules': 2},
+    'inline': {'triggers': ('style={{',), 'rules': len(INLINE_STYLE_PATTERNS)},
+}
+
+def _outside_tests(path):
+    """Les fichiers de test ne sont jamais corrigés"""
+    return 'test' not in str(path)
+
+def replace_hardcoded_colors(content, path=None):
+    """Remplace les couleurs hexadécimales codées en dur; retourne (contenu, occurrences par couleur)"""
+    return COLOR_MATCHER.sub(content)
+
+def replace_variable_names(content, path=None):
+    """Corrige les var(--x) non conformes; retourne (contenu, occurrences par variable)"""
+    counts = Counter()
+    for old_var, new_var in VARIABLE_MAPPINGS.items():
+        pattern = f'var\\({re.escape(old_var)}\\)'
+        replacement = f'var({new_var})'
+        content, replaced = re.subn(pattern, replacement, content)
+        if replaced:
+            counts[old_var] += replaced
+    return content, counts
+
+def replace_malformed_variables(content, path=None):
+    """Corrige les variables rgba et box-shadow malformées; retourne (contenu, corrections par motif)"""
+    counts = Counter()
+    
+    # Corrige les variables rgba malformées
+    rgba_pattern = r'var\(--tc-color-rgba\(\d+\), (rgba\([^)]+\))\)'
+    matches = re.findall(rgba_pattern, content)
+    for match in matches:
+        # Remplace par la valeur rgba directement
+        old_pattern = f'var(--tc-color-rgba(\\d+), {re.escape(match)})'
+        content = re.sub(old_pattern, match, content)
+        counts['rgba'] += 1
+
+    # Corrige les doubles parenthèses dans box-shadow
+    box_shadow_pattern = r'var\(--tc-box-shadow-lg\)\)'
+    if re.search(box_shadow_pattern, content):
+        content = re.sub(box_shadow_pattern, 'var(--tc-shadow-lg)', content)
+        counts['box-shadow-lg'] += 1
+
+    return content, counts
+
+def replace_inline_styles(content, path=None):
+    """Convertit les styles inline courants en classes CSS; retourne (contenu, occurrences par motif)"""
+    counts = Counter()
+    for pattern, replacement in INLINE_STYLE_PATTERNS:
+        content, replaced = re.subn(pattern, replacement, content)
+        if replaced:
+            counts[pattern] += replaced
+    return content, counts
+
+# Étapes exposées au pipeline (css_pipeline.py)
+PIPELINE_STAGES = [
+    dict(PREFILTER_FAMILIES['colors'], name='colors', suffixes=('.css', '.js', '.jsx'),
+         transform=replace_hardcoded_colors, path_filter=_outside_tests,
+         description='Couleurs hexadécimales -> var(--tc-*)'),
+    dict(PREFILTER_FAMILIES['variable-names'], name='variable-names', suffixes=('.css', '.js', '.jsx'),
+         transform=replace_variable_names, path_filter=_outside_tests,
+         description='var(--x) non conformes -> var(--tc-*)'),
+    dict(PREFILTER_FAMILIES['rgba-shadow'], name='rgba-shadow', suffixes=('.css', '.js', '.jsx'),
+         transform=replace_malformed_variables, path_filter=_outside_tests,
+         description='rgba et box-shadow malformés'),
+    dict(PREFILTER_FAMILIES['inline'], name='inline', suffixes=('.js', '.jsx'),
+         transform=replace_inline_styles, path_filter=_outside_tests,
+         description='Styles inline -> classes tc-*'),
+]
+
+def _process_file_isolated(task):
+    """Traite un fichier dans un processus de travail et retourne ses statistiques et sa sortie"""
+    base_path, dry_run, run_id, file_path = task
+    # Même run-id que le processus principal: un seul journal pour toute l'exécution
+    fixer = CSSInconsistencyFixer(base_path, dry_run, journal=WriteJournal('fix-css-inconsistencies', run_id))
+    output = io.StringIO()
+    with redirect_stdout(output):
+        fixer.process_file(file_path)
+    return fixer.stats, fixer.color_counts, output.getvalue(), fixer.timer.to_dict(), fixer.prefilter.to_dict()
+
 class CSSInconsistencyFixer:
-    def __init__(self, base_path="./src", dry_run=False):
+    def __init__(self, base_path="./src", dry_run=False, jobs=1, scope=None, timer=None, journal=None):
         self.base_path = Path(base_path)
         self.dry_run = dry_run
+        # Périmètre git (--since/--staged): seuls ces fichiers sont traités
+        self.scope = scope
+        # Temps par étape de correction (et profils avec --profile)
+        self.timer = timer or PhaseTimer()
+        # Écritures atomiques, seulement si le contenu change (annulables avec --rollback)
+        self.journal = journal or WriteJournal('fix-css-inconsistencies')
+        # Familles de règles sautées quand aucun de leurs déclencheurs n'est présent
+        self.prefilter = RulePrefilter(PREFILTER_FAMILIES)
+        self.jobs = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
         self.stats = {
             'files_processed': 0,
             'files_modified': 0,
@@ -86,88 +199,70 @@ class CSSInconsistencyFixer:
             'variables_fixed': 0,
             'inline_styles_fixed': 0,
         }
+        self.color_counts = Counter()
 
     def fix_hardcoded_colors(self, content):
         """Remplace les couleurs hexadécimales codées en dur par des variables CSS"""
-        modified = False
-        for hex_color, css_var in COLOR_MAPPINGS.items():
-            if hex_color in content:
-                content = content.replace(hex_color, css_var)
-                self.stats['hardcoded_colors_fixed'] += 1
-                modified = True
-        return content, modified
+        content, counts = replace_hardcoded_colors(content)
+        occurrences = sum(counts.values())
+        self.stats['hardcoded_colors_fixed'] += occurrences
+        self.color_counts.update(counts)
+        return content, occurrences > 0
 
     def fix_variable_names(self, content):
         """Corrige les noms de variables CSS non conformes"""
-        modified = False
-        for old_var, new_var in VARIABLE_MAPPINGS.items():
-            pattern = f'var\\({re.escape(old_var)}\\)'
-            replacement = f'var({new_var})'
-            if re.search(pattern, content):
-                content = re.sub(pattern, replacement, content)
-                self.stats['variables_fixed'] += 1
-                modified = True
-        return content, modified
+        content, counts = replace_variable_names(content)
+        self.stats['variables_fixed'] += len(counts)
+        return content, bool(counts)
 
     def fix_inline_styles(self, content):
         """Convertit les styles inline courants en classes CSS"""
-        modified = False
-        for pattern, replacement in INLINE_STYLE_PATTERNS:
-            if re.search(pattern, content):
-                content = re.sub(pattern, replacement, content)
-                self.stats['inline_styles_fixed'] += 1
-                modified = True
-        return content, modified
+        content, counts = replace_inline_styles(content)
+        self.stats['inline_styles_fixed'] += len(counts)
+        return content, bool(counts)
 
     def fix_malformed_variables(self, content):
         """Corrige les variables CSS malformées"""
-        modified = False
+        content, counts = replace_malformed_variables(content)
+        self.stats['variables_fixed'] += sum(counts.values())
+        return content, bool(counts)
+
+    def fix_content(self, content, suffix):
+        """Applique toutes les corrections à un contenu et retourne (contenu, modifié)"""
+        file_modified = colors_modified = vars_modified = malformed_modified = False
+
+        if self.prefilter.may_fire('colors', content):
+            with self.timer.phase('colors'):
+                content, colors_modified = self.fix_hardcoded_colors(content)
+        if self.prefilter.may_fire('variable-names', content):
+            with self.timer.phase('variables'):
+                content, vars_modified = self.fix_variable_names(content)
+        if self.prefilter.may_fire('rgba-shadow', content):
+            with self.timer.phase('malformed'):
+                content, malformed_modified = self.fix_malformed_variables(content)
         
-        # Corrige les variables rgba malformées
-        rgba_pattern = r'var\(--tc-color-rgba\(\d+\), (rgba\([^)]+\))\)'
-        matches = re.findall(rgba_pattern, content)
-        if matches:
-            for match in matches:
-                # Remplace par la valeur rgba directement
-                old_pattern = f'var(--tc-color-rgba(\\d+), {re.escape(match)})'
-                content = re.sub(old_pattern, match, content)
-                modified = True
-                self.stats['variables_fixed'] += 1
-
-        # Corrige les doubles parenthèses dans box-shadow
-        box_shadow_pattern = r'var\(--tc-box-shadow-lg\)\)'
-        if re.search(box_shadow_pattern, content):
-            content = re.sub(box_shadow_pattern, 'var(--tc-shadow-lg)', content)
-            modified = True
-            self.stats['variables_fixed'] += 1
-
-        return content, modified
+        # Styles inline seulement pour les fichiers JS/JSX
+        if suffix in ['.js', '.jsx'] and self.prefilter.may_fire('inline', content):
+            with self.timer.phase('inline'):
+                content, inline_modified = self.fix_inline_styles(content)
+            file_modified = file_modified or inline_modified
+
+        return content, file_modified or colors_modified or vars_modified or malformed_modified
 
     def process_file(self, file_path):
         """Traite un fichier individuel"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
+            with self.timer.phase('read'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    original_content = f.read()
             
-            content = original_content
-            file_modified = False
-
-            # Applique toutes les corrections
-            content, colors_modified = self.fix_hardcoded_colors(content)
-            content, vars_modified = self.fix_variable_names(content)
-            content, malformed_modified = self.fix_malformed_variables(content)
-            
-            # Styles inline seulement pour les fichiers JS/JSX
-            if file_path.suffix in ['.js', '.jsx']:
-                content, inline_modified = self.fix_inline_styles(content)
-                file_modified = file_modified or inline_modified
-
-            file_modified = file_modified or colors_modified or vars_modified or malformed_modified
+            content, file_modified = self.fix_content(original_content, file_path.suffix)
 
             if file_modified and not self.dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                self.stats['files_modified'] += 1
+                with self.timer.phase('write'):
+                    written = self.journal.write(file_path, content, original=original_content)
+                if written:
+                    self.stats['files_modified'] += 1
 
             self.stats['files_processed'] += 1
             
@@ -180,27 +275,61 @@ class CSSInconsistencyFixer:
             print(f"❌ Erreur lors du traitement de {file_path}: {e}")
             return False
 
+    def run_parallel(self, all_files):
+        """Répartit les fichiers sur un pool de processus
+        
+        Les résultats sont consommés dans l'ordre des fichiers: les sorties
+        "✅ Corrigé" et la fusion des compteurs sont donc déterministes.
+        """
+        tasks = [(str(self.base_path), self.dry_run, self.journal.run_id, file_path) for file_path in all_files]
+        chunksize = max(1, len(tasks) // (self.jobs * 8))
+        
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            for stats, color_counts, output, phases, prefilter in executor.map(_process_file_isolated, tasks, chunksize=chunksize):
+                for key, value in stats.items():
+                    self.stats[key] += value
+                self.color_counts.update(color_counts)
+                self.timer.merge(phases)
+                self.prefilter.merge(prefilter)
+                if output:
+                    print(output, end='')
+
+    def watch(self):
+        """Mode surveillance: corrige chaque fichier CSS/JS/JSX dès sa sauvegarde"""
+        watch(self.base_path, ('.css', '.js', '.jsx'),
+              lambda content, path: self.fix_content(content, path.suffix)[0],
+              'Correction des incohérences CSS', self.journal, self.dry_run,
+              path_filter=lambda path: 'test' not in str(path))
+
     def run(self):
         """Lance le processus de correction"""
         print("🔧 Correction des incohérences CSS TourCraft")
         print(f"📁 Répertoire: {self.base_path}")
         print(f"🔍 Mode: {'Simulation' if self.dry_run else 'Correction'}")
+        if self.jobs > 1:
+            print(f"⚙️  Processus: {self.jobs}")
         print("-" * 50)
 
-        # Trouve tous les fichiers CSS et JS/JSX
-        css_files = list(self.base_path.rglob("*.css"))
-        js_files = list(self.base_path.rglob("*.js")) + list(self.base_path.rglob("*.jsx"))
-        
-        all_files = css_files + js_files
+        # Trouve tous les fichiers CSS et JS/JSX (ou seulement ceux du périmètre git)
+        if self.scope is not None:
+            print(self.scope.summary())
+            all_files = self.scope.files_under(self.base_path, ('.css', '.js', '.jsx'))
+        else:
+            css_files = list(self.base_path.rglob("*.css"))
+            js_files = list(self.base_path.rglob("*.js")) + list(self.base_path.rglob("*.jsx"))
+            all_files = css_files + js_files
         
         # Exclut les fichiers de test et node_modules
-        all_files = [f for f in all_files if 'node_modules' not in str(f) and 'test' not in str(f)]
+        all_files = sorted(f for f in all_files if 'node_modules' not in str(f) and 'test' not in str(f))
 
         print(f"📄 {len(all_files)} fichiers à traiter")
         print()
 
-        for file_path in all_files:
-            self.process_file(file_path)
+        if self.jobs > 1 and len(all_files) > 1:
+            self.run_parallel(all_files)
+        else:
+            for file_path in all_files:
+                self.process_file(file_path)
 
         # Affiche les statistiques
         print("\n" + "=" * 50)
@@ -209,22 +338,51 @@ class CSSInconsistencyFixer:
         print(f"Fichiers traités: {self.stats['files_processed']}")
         print(f"Fichiers modifiés: {self.stats['files_modified']}")
         print(f"Couleurs codées en dur corrigées: {self.stats['hardcoded_colors_fixed']}")
+        for hex_color, count in sorted(self.color_counts.items(), key=lambda item: (-item[1], item[0])):
+            print(f"   • {hex_color} → {COLOR_MAPPINGS[hex_color]}: {count}")
         print(f"Variables CSS corrigées: {self.stats['variables_fixed']}")
         print(f"Styles inline corrigés: {self.stats['inline_styles_fixed']}")
         
+        print("\n" + self.prefilter.summary_table())
+        print("\n" + self.timer.summary_table("TEMPS PAR ÉTAPE (cumulé sur les fichiers)"))
+        self.timer.write_profiles()
+        
         if self.dry_run:
             print("\n⚠️  Mode simulation - Aucun fichier n'a été modifié")
             print("   Relancez sans --dry-run pour appliquer les corrections")
+        else:
+            summary = self.journal.summary()
+            if summary:
+                print("\n" + summary)
 
 def main():
     parser = argparse.ArgumentParser(description='Corrige les incohérences CSS TourCraft')
     parser.add_argument('--dry-run', action='store_true', help='Mode simulation (aucune modification)')
     parser.add_argument('--path', default='./src', help='Chemin de base à traiter')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Nombre de processus (0 = un par cœur, défaut: 1)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Surveille les fichiers et corrige chaque fichier sauvegardé')
+    add_scope_arguments(parser)
+    add_profile_argument(parser, Path("tools") / "css" / ".cache" / "profile" / "fix-css-inconsistencies")
+    add_journal_arguments(parser)
     
     args = parser.parse_args()
     
-    fixer = CSSInconsistencyFixer(args.path, args.dry_run)
-    fixer.run()
+    if args.rollback:
+        return run_rollback(args.rollback)
+    
+    if args.profile and args.jobs != 1:
+        # cProfile ne suit pas les processus de travail
+        print("ℹ️  --profile: traitement séquentiel (--jobs ignoré)")
+        args.jobs = 1
+    
+    scope = resolve_scope(os.getcwd(), args.since, args.staged)
+    fixer = CSSInconsistencyFixer(args.path, args.dry_run, args.jobs, scope, PhaseTimer(args.profile))
+    if args.watch:
+        fixer.watch()
+    else:
+        fixer.run()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -8,14 +8,25 @@ Ce script corrige automatiquement :
 2. Les variables malformées avec syntaxe incorrecte
 3. Les variables rgba malformées
 
-Usage: python fix-css-variables.py [--dry-run] [--path=./src]
+Usage: python fix-css-variables.py [--dry-run] [--path=./src] [--watch] [--since REF | --staged] [--profile [DIR]]
 """
 
 import os
 import re
+import sys
 import glob
 import argparse
 from pathlib import Path
+from collections import Counter
+
+from literal_matcher import LiteralMatcher
+from file_watcher import watch
+from rule_prefilter import RulePrefilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import add_scope_arguments, resolve_scope
+from phase_timer import PhaseTimer, add_profile_argument
+from write_journal import WriteJournal, add_journal_arguments, run_rollback
 
 # Mappings de correction pour les variables CSS
 VARIABLE_MAPPINGS = {
@@ -145,6 +156,10 @@ VARIABLE_MAPPINGS = {
     '--tc-color-f9f9f9': '--tc-gray-50',
 }
 
+# Table compilée une seule fois en une alternance unique (plus long nom d'abord,
+# bornes de jeton): var(--x) et --x sont réécrits en un seul parcours du fichier
+VARIABLE_MATCHER = LiteralMatcher(VARIABLE_MAPPINGS)
+
 # Patterns pour les variables malformées
 MALFORMED_PATTERNS = [
     # Variables avec syntaxe incorrecte
@@ -159,46 +174,77 @@ MALFORMED_PATTERNS = [
     (r'var\(--tc-box-shadow\)\)', 'var(--tc-shadow)'),
 ]
 
-def fix_css_file(file_path, dry_run=False):
+# Familles de règles du préfiltre: littéraux dont l'un est nécessaire à chaque règle de la famille
+PREFILTER_FAMILIES = {
+    'malformed': {'triggers': ('var(--tc-color-000000)', 'var(--tc-color-rgba(', 'var(--tc-color-error-light))',
+                               'var(--tc-box-shadow'),
+                  'rules': len(MALFORMED_PATTERNS)},
+    'variables': {'triggers': ('--tc-color-',), 'rules': 1},
+}
+
+def fix_malformed_variables(content, path=None):
+    """Corrige les variables malformées et retourne (contenu, occurrences par motif)"""
+    counts = Counter()
+    for pattern, replacement in MALFORMED_PATTERNS:
+        content, replaced = re.subn(pattern, replacement, content)
+        if replaced:
+            counts[pattern] += replaced
+    return content, counts
+
+def replace_color_variables(content, path=None):
+    """Remplace les variables --tc-color-* (var(--x) et --x) en une seule passe"""
+    return VARIABLE_MATCHER.sub(content)
+
+# Étapes exposées au pipeline (css_pipeline.py)
+PIPELINE_STAGES = [
+    dict(PREFILTER_FAMILIES['variables'], name='variables', suffixes=('.css',),
+         transform=replace_color_variables, description='--tc-color-* -> variables standard'),
+    dict(PREFILTER_FAMILIES['malformed'], name='malformed', suffixes=('.css',),
+         transform=fix_malformed_variables, description='Variables malformées (syntaxe, doubles parenthèses)'),
+]
+
+def fix_css_content(content, timer=None, prefilter=None):
+    """Corrige les variables CSS d'un contenu et retourne (contenu, changements)"""
+    timer = timer or PhaseTimer()
+    prefilter = prefilter or RulePrefilter(PREFILTER_FAMILIES)
+    changes_made = []
+    
+    # 1. Corriger les variables malformées en premier (familles sans déclencheur sautées)
+    if prefilter.may_fire('malformed', content):
+        with timer.phase('malformed'):
+            content, malformed = fix_malformed_variables(content)
+        for pattern, _ in MALFORMED_PATTERNS:
+            if malformed[pattern]:
+                changes_made.append(f"Variables malformées: {malformed[pattern]} occurrences")
+    
+    # 2. Corriger les variables --tc-color-* (var(--x) et --x) en une seule passe
+    counts = Counter()
+    if prefilter.may_fire('variables', content):
+        with timer.phase('variables'):
+            content, counts = replace_color_variables(content)
+    for old_var, new_var in VARIABLE_MAPPINGS.items():
+        if counts[old_var]:
+            changes_made.append(f"{old_var} → {new_var}: {counts[old_var]} occurrences")
+    
+    return content, changes_made
+
+def fix_css_file(file_path, dry_run=False, timer=None, journal=None, prefilter=None):
     """Corrige les variables CSS dans un fichier donné"""
+    timer = timer or PhaseTimer()
+    journal = journal or WriteJournal('fix-css-variables')
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with timer.phase('read'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
         original_content = content
-        changes_made = []
-        
-        # 1. Corriger les variables malformées en premier
-        for pattern, replacement in MALFORMED_PATTERNS:
-            matches = re.findall(pattern, content)
-            if matches:
-                content = re.sub(pattern, replacement, content)
-                changes_made.append(f"Variables malformées: {len(matches)} occurrences")
-        
-        # 2. Corriger les variables --tc-color-*
-        for old_var, new_var in VARIABLE_MAPPINGS.items():
-            # Pattern pour capturer var(--tc-color-xxx) et --tc-color-xxx
-            patterns = [
-                f'var\\({re.escape(old_var)}\\)',
-                re.escape(old_var)
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches:
-                    if pattern.startswith('var\\('):
-                        replacement = f'var({new_var})'
-                    else:
-                        replacement = new_var
-                    
-                    content = re.sub(pattern, replacement, content)
-                    changes_made.append(f"{old_var} → {new_var}: {len(matches)} occurrences")
+        content, changes_made = fix_css_content(content, timer, prefilter)
         
         # 3. Écrire le fichier si des changements ont été effectués
         if content != original_content:
             if not dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                with timer.phase('write'):
+                    journal.write(file_path, content, original=original_content)
             
             return True, changes_made
         
@@ -225,7 +271,8 @@ def find_css_files(base_path):
     excluded_dirs = ['node_modules', '.git', 'dist', 'build', 'coverage']
     css_files = [f for f in css_files if not any(excluded in f for excluded in excluded_dirs)]
     
-    return sorted(css_files)
+    # '**/*.css' couvre déjà '**/*.module.css': dédoublonne
+    return sorted(set(css_files))
 
 def main():
     parser = argparse.ArgumentParser(description='Corriger les variables CSS non conformes')
@@ -235,16 +282,34 @@ def main():
                        help='Chemin de base pour la recherche (défaut: ./src)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Affichage détaillé')
+    parser.add_argument('--watch', action='store_true',
+                       help='Surveille les fichiers CSS et corrige chaque fichier sauvegardé')
+    add_scope_arguments(parser)
+    add_profile_argument(parser, Path("tools") / "css" / ".cache" / "profile" / "fix-css-variables")
+    add_journal_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.rollback:
+        return run_rollback(args.rollback)
+    
     # Vérifier que le chemin existe
     if not os.path.exists(args.path):
         print(f"Erreur: Le chemin {args.path} n'existe pas")
         return 1
     
-    print(f"🔍 Recherche des fichiers CSS dans {args.path}...")
-    css_files = find_css_files(args.path)
+    if args.watch:
+        watch(args.path, ('.css',), lambda content, path: fix_css_content(content)[0],
+              'Correction des variables CSS', WriteJournal('fix-css-variables'), args.dry_run)
+        return 0
+    
+    scope = resolve_scope(os.getcwd(), args.since, args.staged)
+    if scope is not None:
+        print(scope.summary())
+        css_files = [str(path) for path in scope.files_under(args.path, ('.css',))]
+    else:
+        print(f"🔍 Recherche des fichiers CSS dans {args.path}...")
+        css_files = find_css_files(args.path)
     
     if not css_files:
         print("Aucun fichier CSS trouvé")
@@ -259,10 +324,13 @@ def main():
     
     total_files_changed = 0
     total_changes = 0
+    timer = PhaseTimer(args.profile)
+    journal = WriteJournal('fix-css-variables')
+    prefilter = RulePrefilter(PREFILTER_FAMILIES)
     
     for file_path in css_files:
         rel_path = os.path.relpath(file_path)
-        changed, changes = fix_css_file(file_path, args.dry_run)
+        changed, changes = fix_css_file(file_path, args.dry_run, timer, journal, prefilter)
         
         if changed:
             total_files_changed += 1
@@ -281,11 +349,17 @@ def main():
     print(f"   • Fichiers traités: {len(css_files)}")
     print(f"   • Fichiers modifiés: {total_files_changed}")
     print(f"   • Total corrections: {total_changes}")
+    print("\n" + prefilter.summary_table())
+    print("\n" + timer.summary_table("TEMPS PAR ÉTAPE (cumulé sur les fichiers)"))
+    timer.write_profiles()
     
     if args.dry_run and total_files_changed > 0:
         print(f"\n💡 Pour appliquer les corrections, relancez sans --dry-run")
     elif total_files_changed > 0:
         print(f"\n🎉 Corrections appliquées avec succès!")
+        summary = journal.summary()
+        if summary:
+            print(summary)
     else:
         print(f"\n✨ Aucune correction nécessaire - Tous les fichiers sont conformes!")
     
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Détection des valeurs codées en dur (remplace maintenance/detect_hard_coded_values.sh)
+Le script shell relançait grep une fois par motif sur tout l'arbre. Ici tous
+les littéraux connus sont compilés dans un seul automate d'Aho–Corasick et
+chaque fichier CSS/JS/JSX de src/ est lu et parcouru une seule fois: le coût
+reste linéaire en taille du corpus, quel que soit le nombre de littéraux.
+
+Littéraux connus, avec le token --tc- suggéré:
+- les tables des correcteurs (COLOR_MAPPINGS de fix-css-inconsistencies.py,
+  COLOR_VALUE_MAPPINGS et VALUE_MAPPINGS de prefix_css_vars.py);
+- les valeurs des tokens --tc-* de :root (token_resolver.py): couleurs
+  hexadécimales, rgb()/rgba(), tailles en rem et en px.
+Les couleurs hexadécimales sont comparées sans casse (#FFF = #fff = #ffffff).
+Une valeur partagée par plusieurs tokens propose celui dont le nom correspond
+à la propriété de la ligne (font-size -> --tc-font-size-*, padding -> spacing...).
+
+Ne sont pas signalés: les définitions de propriétés personnalisées (--x: ...),
+les fallbacks de var(), les commentaires CSS, les valeurs 0/1px/2px et les
+graisses de police sans unité (trop ambiguës hors CSS).
+
+Usage:
+    python tools/css/hard_coded_values.py [--path=src] [--output=hard_coded_values_report.md]
+        [--json=rapport.json] [--no-tokens] [--limit=N]
+"""
+
+import os
+import re
+import sys
+import json
+import bisect
+import argparse
+import importlib.util
+from pathlib import Path
+from datetime import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional
+
+from aho_corasick import AhoCorasick
+from file_watcher import EXCLUDED_DIRS
+
+CSS_DIR = Path(__file__).resolve().parent
+SUFFIXES = ('.css', '.js', '.jsx')
+DEFAULT_REPORT = "hard_coded_values_report.md"
+
+# Caractères qui prolongent un littéral (identifiant, nombre, tiret): bornes d'une occurrence
+BOUNDARY_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-.")
+# Valeurs acceptables en dur (bordures fines, zéros)
+IGNORED_VALUES = {'0', '0px', '1px', '2px', '0rem'}
+
+TOKEN_LITERAL = re.compile(r'^(?:#[0-9a-f]{3,8}|rgba?\([^()]*\)|\d*\.?\d+(?:px|rem))$', re.I)
+VAR_NAME = re.compile(r'var\((--[\w-]+)')
+PROPERTY_BEFORE = re.compile(r'([a-zA-Z-]+)\s*:\s*[^:;{}]*$')
+COMMENT = re.compile(r'/\*.*?(?:\*/|\Z)', re.S)
+# Minuscules ASCII seulement: str.lower() peut allonger le texte ('İ' -> 'i̇')
+# et décaler les positions trouvées par rapport au texte original
+ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# Propriété de la ligne -> fragments de nom de token à privilégier
+PROPERTY_HINTS = (
+    ('font-size', ('font-size',)),
+    ('radius', ('radius',)),
+    ('shadow', ('shadow',)),
+    ('padding', ('spacing',)),
+    ('margin', ('spacing',)),
+    ('gap', ('spacing',)),
+    ('background', ('bg', 'background')),
+    ('border', ('border',)),
+    ('color', ('color', 'text')),
+    ('width', ('width', 'breakpoint', 'size')),
+    ('height', ('height', 'size')),
+)
+
+
+def _load_script(path: Path):
+    """Importe un script de tools/css (les noms avec tirets ne sont pas importables directement)"""
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def category_of(literal: str) -> str:
+    lowered = literal.lower()
+    if 'shadow' in lowered:
+        return 'ombres'
+    if lowered.startswith(('#', 'rgb')) or lowered.isalpha():
+        return 'couleurs'
+    if lowered.endswith('rem'):
+        return 'tailles (rem)'
+    if lowered.endswith('px'):
+        return 'espacements (px)'
+    return 'autres'
+
+
+def _variants(literal: str) -> List[str]:
+    """Graphies équivalentes d'un littéral (#fff/#ffffff, espaces après les virgules)"""
+    literal = literal.strip()
+    if literal.startswith('#'):
+        literal = literal.lower()
+        variants = [literal]
+        digits = literal[1:]
+        if len(digits) == 3:
+            variants.append('#' + "".join(digit * 2 for digit in digits))
+        elif len(digits) == 6 and all(digits[i] == digits[i + 1] for i in (0, 2, 4)):
+            variants.append('#' + digits[0::2])
+        return variants
+    if literal.lower().startswith('rgb'):
+        compact = re.sub(r'\s*,\s*', ',', literal.lower())
+        return [compact, compact.replace(',', ', ')]
+    return [literal]
+
+
+class HardCodedValueScanner:
+    """Table littéral -> tokens suggérés, compilée en un automate unique"""
+
+    def __init__(self):
+        # littéral (graphie cherchée) -> {'value', 'category', 'tokens': [...], 'sources': [...]}
+        self.entries: Dict[str, Dict] = {}
+        self._automaton: Optional[AhoCorasick] = None
+        self.stats = Counter()
+
+    def add(self, literal: str, token: str, source: str):
+        """Ajoute un littéral (et ses graphies équivalentes) avec son token suggéré"""
+        if literal.strip() in IGNORED_VALUES:
+            return
+        for variant in _variants(literal):
+            entry = self.entries.setdefault(variant, {
+                'value': literal.strip(), 'category': category_of(literal), 'tokens': [], 'sources': []
+            })
+            if token not in entry['tokens']:
+                entry['tokens'].append(token)
+            if source not in entry['sources']:
+                entry['sources'].append(source)
+        self._automaton = None
+
+    def add_mapping(self, mapping: Dict[str, str], source: str):
+        """Ajoute une table {littéral: 'var(--tc-x...)'} d'un correcteur"""
+        for literal, replacement in mapping.items():
+            found = VAR_NAME.search(replacement)
+            if found:
+                self.add(literal, found.group(1), source)
+
+    def add_fixer_tables(self):
+        """Tables de couleurs, tailles et espacements des correcteurs CSS"""
+        inconsistencies = _load_script(CSS_DIR / "fix-css-inconsistencies.py")
+        self.add_mapping(inconsistencies.COLOR_MAPPINGS, 'fix-css-inconsistencies.py')
+        prefix = _load_script(CSS_DIR / "prefix_css_vars.py")
+        self.add_mapping(prefix.COLOR_VALUE_MAPPINGS, 'prefix_css_vars.py')
+        # VALUE_MAPPINGS est écrit en regex: on n'en garde que les littéraux avec unité
+        literals = {}
+        for pattern, replacement in prefix.VALUE_MAPPINGS.items():
+            literal = pattern.replace('(?!\\w)', '').replace('\\', '')
+            if not literal.isdigit():
+                literals[literal] = replacement
+        self.add_mapping(literals, 'prefix_css_vars.py')
+
+    def add_design_tokens(self, project_root: str) -> int:
+        """Valeurs littérales des tokens --tc-* de :root; retourne le nombre de tokens retenus"""
+        from token_resolver import TokenResolver
+        resolver = TokenResolver.open(project_root)
+        added = 0
+        # Noms courts d'abord: --tc-white passe devant --tc-card-bg-hover
+        for name in sorted(resolver.names(), key=lambda name: (len(name), name)):
+            value = resolver.value(name)
+            if name.startswith('--tc-') and value and TOKEN_LITERAL.match(value.strip()):
+                self.add(value, name, 'tokens :root')
+                added += 1
+        return added
+
+    @property
+    def automaton(self) -> AhoCorasick:
+        if self._automaton is None:
+            self._automaton = AhoCorasick(self.entries)
+        return self._automaton
+
+    def _suggest(self, entry: Dict, prefix: str) -> str:
+        tokens = entry['tokens']
+        if len(tokens) > 1:
+            found = PROPERTY_BEFORE.search(prefix)
+            if found:
+                prop = found.group(1).lower()
+                for key, fragments in PROPERTY_HINTS:
+                    if key in prop:
+                        for token in tokens:
+                            if any(fragment in token for fragment in fragments):
+                                return token
+                        break
+        return tokens[0]
+
+    def scan_text(self, text: str, relative: str, is_css: bool) -> List[Dict]:
+        """Occurrences d'un fichier, triées, sans chevauchement (la plus longue à position égale)"""
+        automaton = self.automaton
+        literals = automaton.literals
+        lowered = text.translate(ASCII_LOWER)
+        candidates = []
+        for start, end, index in automaton.iter_matches(lowered):
+            if start > 0 and lowered[start - 1] in BOUNDARY_CHARS and literals[index][0] in BOUNDARY_CHARS:
+                continue
+            if end < len(lowered) and lowered[end] in BOUNDARY_CHARS and literals[index][-1] in BOUNDARY_CHARS:
+                continue
+            candidates.append((start, -end, index))
+        if not candidates:
+            return []
+
+        comments = [found.span() for found in COMMENT.finditer(text)] if is_css and '/*' in text else []
+        comment_starts = [span[0] for span in comments]
+        line_starts = [0] + [position + 1 for position, char in enumerate(text) if char == '\n']
+
+        matches = []
+        covered = 0
+        for start, negative_end, index in sorted(candidates):
+            end = -negative_end
+            if start < covered:
+                continue
+            covered = end
+            if comments:
+                position = bisect.bisect_right(comment_starts, start) - 1
+                if position >= 0 and comments[position][0] <= start < comments[position][1]:
+                    self.stats['in_comments'] += 1
+                    continue
+            line_index = bisect.bisect_right(line_starts, start) - 1
+            line_start = line_starts[line_index]
+            prefix = text[line_start:start]
+            if prefix.lstrip().startswith('--'):
+                self.stats['in_definitions'] += 1
+                continue
+            if prefix.rfind('var(') > prefix.rfind(')'):
+                self.stats['in_fallbacks'] += 1
+                continue
+            entry = self.entries[literals[index]]
+            matches.append({
+                'file': relative,
+                'line': line_index + 1,
+                'column': start - line_start + 1,
+                'value': text[start:end],
+                'category': entry['category'],
+                'token': self._suggest(entry, prefix),
+                'alternatives': len(entry['tokens']) - 1,
+            })
+        return matches
+
+    def scan(self, base_path: str) -> Iterator[Dict]:
+        """Parcourt une fois l'arborescence et lit chaque fichier une fois"""
+        for dirpath, dirnames, filenames in os.walk(base_path):
+            dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+            for name in sorted(filenames):
+                if not name.endswith(SUFFIXES):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    text = path.read_text(encoding='utf-8')
+                except (OSError, UnicodeDecodeError):
+                    self.stats['unreadable'] += 1
+                    continue
+                self.stats['files'] += 1
+                self.stats['bytes'] += len(text)
+                yield from self.scan_text(text, os.path.relpath(path), name.endswith('.css'))
+
+
+def markdown_report(matches: List[Dict], scanner: HardCodedValueScanner, limit: Optional[int]) -> str:
+    by_category = defaultdict(list)
+    for match in matches:
+        by_category[match['category']].append(match)
+
+    lines = [
+        "# Rapport sur les valeurs CSS codées en dur",
+        "",
+        f"## Date d'analyse: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+        "",
+        "Ce rapport identifie les valeurs codées en dur qui devraient être remplacées par des variables",
+        "avec le préfixe `--tc-`.",
+        "",
+        f"- Fichiers analysés: {scanner.stats['files']} ({scanner.stats['bytes']} caractères)",
+        f"- Littéraux recherchés: {len(scanner.automaton)}",
+        f"- Occurrences: {len(matches)}",
+        "",
+        "## Synthèse",
+        "",
+        "| Catégorie | Occurrences | Fichiers |",
+        "|-----------|-------------|----------|",
+    ]
+    for category, items in sorted(by_category.items()):
+        lines.append(f"| {category} | {len(items)} | {len({item['file'] for item in items})} |")
+
+    values = Counter((match['value'].lower(), match['token']) for match in matches)
+    lines += ["", "## Valeurs les plus fréquentes", "", "| Valeur | Token suggéré | Occurrences |",
+              "|--------|---------------|-------------|"]
+    for (value, token), count in values.most_common(limit or 30):
+        lines.append(f"| `{value}` | `{token}` | {count} |")
+
+    for category, items in sorted(by_category.items()):
+        lines += ["", f"## {category[0].upper()}{category[1:]}", "",
+                  "| Fichier | Ligne | Colonne | Valeur | Token suggéré |",
+                  "|---------|-------|---------|--------|---------------|"]
+        for item in items[:limit] if limit else items:
+            alternatives = f" (+{item['alternatives']})" if item['alternatives'] else ""
+            lines.append(f"| {item['file']} | {item['line']} | {item['column']} | `{item['value']}` "
+                         f"| `{item['token']}`{alternatives} |")
+        if limit and len(items) > limit:
+            lines.append(f"| … | | | | {len(items) - limit} autres |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Détecte les valeurs codées en dur (couleurs, rem, px, rgba) en une passe')
+    parser.add_argument('--path', default='src', help='Répertoire à analyser (défaut: src)')
+    parser.add_argument('--output', default=DEFAULT_REPORT, help=f'Rapport Markdown (défaut: {DEFAULT_REPORT})')
+    parser.add_argument('--json', metavar='FICHIER', help='Écrit aussi les occurrences en JSON')
+    parser.add_argument('--no-tokens', action='store_true',
+                        help='N\'utilise que les tables des correcteurs (pas les valeurs des tokens de :root)')
+    parser.add_argument('--limit', type=int, help='Lignes de détail par catégorie dans le rapport Markdown')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.path):
+        print(f"Erreur: Le chemin {args.path} n'existe pas")
+        return 1
+
+    print("=== Détection des valeurs CSS codées en dur ===")
+    scanner = HardCodedValueScanner()
+    scanner.add_fixer_tables()
+    if not args.no_tokens:
+        print(f"🎨 {scanner.add_design_tokens(os.getcwd())} tokens --tc-* à valeur littérale")
+    print(f"🔤 {len(scanner.automaton)} littéraux compilés en un automate")
+
+    matches = list(scanner.scan(args.path))
+    print(f"📄 {scanner.stats['files']} fichiers analysés")
+    for category, count in sorted(Counter(match['category'] for match in matches).items()):
+        print(f"   • {category}: {count}")
+    print(f"ℹ️  Ignorés: {scanner.stats['in_definitions']} dans des définitions, "
+          f"{scanner.stats['in_fallbacks']} en fallback de var(), {scanner.stats['in_comments']} en commentaire")
+
+    Path(args.output).write_text(markdown_report(matches, scanner, args.limit), encoding='utf-8')
+    print(f"📝 Rapport généré: {args.output}")
+    if args.json:
+        report = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'path': args.path,
+            'files': scanner.stats['files'],
+            'literals': len(scanner.automaton),
+            'matches': matches,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"📊 Rapport JSON sauvegardé: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Moteur de remplacement multi-littéraux en une seule passe
+Compile une table {littéral: remplacement} en une alternance unique, triée
+du plus long au plus court, bornée par des limites de jeton. Le contenu est
+parcouru une seule fois de gauche à droite: '#fff' ne peut plus écraser le
+préfixe de '#ffffff' ou de '#fff5e6', et les remplacements ne sont jamais
+réanalysés. Le nombre exact d'occurrences est retourné par littéral.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+# Caractères qui prolongent un jeton CSS/JS (identifiant, hexadécimal, tiret)
+TOKEN_CHARS = r'[\w-]'
+
+
+class LiteralMatcher:
+    def __init__(self, mapping: Dict[str, str], token_chars: str = TOKEN_CHARS, ignore_case: bool = False):
+        self.mapping = dict(mapping)
+        self.ignore_case = ignore_case
+        self._lookup = {key.lower(): value for key, value in self.mapping.items()} if ignore_case else self.mapping
+
+        # Plus long d'abord: à position égale, l'alternance retient le littéral le plus long
+        literals = sorted(self.mapping, key=lambda literal: (-len(literal), literal))
+        alternation = '|'.join(re.escape(literal) for literal in literals) or r'(?!)'
+        flags = re.IGNORECASE if ignore_case else 0
+        self.pattern = re.compile(
+            rf'(?<!{token_chars})(?:{alternation})(?!{token_chars})' if token_chars else f'(?:{alternation})',
+            flags
+        )
+
+    def _key(self, literal: str) -> str:
+        return literal.lower() if self.ignore_case else literal
+
+    def sub(self, content: str, replacement: Optional[Callable[[str, str], str]] = None) -> Tuple[str, Counter]:
+        """Remplace tous les littéraux en une passe et retourne (contenu, occurrences par littéral)"""
+        counts = Counter()
+        lookup = self._lookup
+
+        def substitute(match):
+            literal = match.group(0)
+            key = self._key(literal)
+            counts[key] += 1
+            target = lookup[key]
+            return replacement(literal, target) if replacement else target
+
+        return self.pattern.sub(substitute, content), counts
+
+    def count(self, content: str) -> Counter:
+        """Compte les occurrences de chaque littéral sans modifier le contenu"""
+        return Counter(self._key(match.group(0)) for match in self.pattern.finditer(content))
+
+    def finditer(self, content: str):
+        """Itère sur les occurrences (objets match) dans l'ordre du contenu"""
+        return self.pattern.finditer(content)
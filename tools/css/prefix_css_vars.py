@@ -5,6 +5,19 @@ import re
 import sys
 import datetime
 import time
+import argparse
+from pathlib import Path
+from collections import Counter
+
+from literal_matcher import LiteralMatcher
+from css_tokenizer import DEFINITION, REFERENCE, custom_properties, rename_custom_properties, tokenize
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import resolve_scope, split_scope_argv
+from write_journal import WriteJournal, run_rollback, split_rollback_argv
+from phase_timer import PhaseTimer, add_profile_argument
+
+PROFILE_DIR = Path("tools") / "css" / ".cache" / "profile" / "prefix_css_vars"
 
 def add_standard_header(content, filename):
     """Ajoute un en-tête standardisé au fichier CSS"""
@@ -26,73 +39,133 @@ def add_standard_header(content, filename):
     else:
         return header + content
 
-def convert_hardcoded_values(content):
-    """Convertit les valeurs codées en dur en variables CSS avec fallbacks"""
-    # Dictionnaire de correspondance entre valeurs codées en dur et variables CSS
-    mappings = {
-        # Couleurs
-        r'#eee(?!\w)': 'var(--tc-color-border, #eee)',
-        r'#ddd(?!\w)': 'var(--tc-color-border-medium, #ddd)',
-        r'#dee2e6(?!\w)': 'var(--tc-color-border-light, #dee2e6)',
-        r'#f8f9fa(?!\w)': 'var(--tc-bg-light, #f8f9fa)',
-        r'white(?!\w)': 'var(--tc-bg-default, white)',
-        r'#555(?!\w)': 'var(--tc-color-text-secondary, #555)',
-        r'#666(?!\w)': 'var(--tc-color-text-secondary, #666)',
-        r'#6c757d(?!\w)': 'var(--tc-color-text-secondary, #6c757d)',
-        r'#0d6efd(?!\w)': 'var(--tc-color-primary, #0d6efd)',
-        r'#d1e7dd(?!\w)': 'var(--tc-color-success-light, #d1e7dd)',
-        r'#0f5132(?!\w)': 'var(--tc-color-success-dark, #0f5132)',
-        r'#dc3545(?!\w)': 'var(--tc-color-error)',
-        r'rgba\(220, 53, 69, 0\.1\)(?!\w)': 'var(--tc-color-error-light, rgba(220, 53, 69, 0.1))',
-        r'#333(?!\w)': 'var(--tc-color-text-primary, #333)',
-        r'#4285f4(?!\w)': 'var(--tc-color-info, #4285f4)',
-        r'#34a853(?!\w)': 'var(--tc-color-success, #34a853)',
-        r'#fbbc04(?!\w)': 'var(--tc-color-warning, #fbbc04)',
-        
-        # Typographie
-        r'0\.75rem(?!\w)': 'var(--tc-font-size-xs)',
-        r'0\.8rem(?!\w)': 'var(--tc-font-size-xs)',
-        r'0\.85rem(?!\w)': 'var(--tc-font-size-sm)',
-        r'0\.9rem(?!\w)': 'var(--tc-font-size-sm)',
-        r'1rem(?!\w)': 'var(--tc-font-size-md)',
-        r'1\.1rem(?!\w)': 'var(--tc-font-size-lg)',
-        r'1\.125rem(?!\w)': 'var(--tc-font-size-lg)',
-        r'1\.25rem(?!\w)': 'var(--tc-font-size-xl)',
-        r'1\.5rem(?!\w)': 'var(--tc-font-size-2xl)',
-        r'500(?!\w)': 'var(--tc-font-weight-medium)',
-        r'600(?!\w)': 'var(--tc-font-weight-semibold)',
-        r'700(?!\w)': 'var(--tc-font-weight-bold)',
-        r'400(?!\w)': 'var(--tc-font-weight-normal)',
-        
-        # Espacements
-        r'0\.25rem(?!\w)': 'var(--tc-spacing-1)',
-        r'0\.5rem(?!\w)': 'var(--tc-spacing-2)',
-        r'0\.75rem(?!\w)': 'var(--tc-spacing-2)',
-        r'1rem(?!\w)': 'var(--tc-spacing-3)',
-        r'1\.5rem(?!\w)': 'var(--tc-spacing-4)',
-        r'2rem(?!\w)': 'var(--tc-spacing-8)',
-        
-        # Bordures et ombres
-        r'border-radius: 4px': 'border-radius: var(--tc-radius-sm)',
-        r'border-radius: 8px': 'border-radius: var(--tc-radius-md)',
-        r'border-radius: 0\.25rem': 'border-radius: var(--tc-radius-sm)',
-        r'box-shadow: 0 1px 3px rgba\(0,0,0,0\.1\)': 'box-shadow: var(--tc-shadow-sm)',
-        r'box-shadow: 0 -2px 10px rgba\(0, 0, 0, 0\.1\)': 'box-shadow: var(--tc-shadow-lg, 0 -2px 10px rgba(0, 0, 0, 0.1))'
-    }
+# Couleurs codées en dur et leur variable CSS (avec fallback)
+COLOR_VALUE_MAPPINGS = {
+    '#eee': 'var(--tc-color-border, #eee)',
+    '#ddd': 'var(--tc-color-border-medium, #ddd)',
+    '#dee2e6': 'var(--tc-color-border-light, #dee2e6)',
+    '#f8f9fa': 'var(--tc-bg-light, #f8f9fa)',
+    'white': 'var(--tc-bg-default, white)',
+    '#555': 'var(--tc-color-text-secondary, #555)',
+    '#666': 'var(--tc-color-text-secondary, #666)',
+    '#6c757d': 'var(--tc-color-text-secondary, #6c757d)',
+    '#0d6efd': 'var(--tc-color-primary, #0d6efd)',
+    '#d1e7dd': 'var(--tc-color-success-light, #d1e7dd)',
+    '#0f5132': 'var(--tc-color-success-dark, #0f5132)',
+    '#dc3545': 'var(--tc-color-error)',
+    'rgba(220, 53, 69, 0.1)': 'var(--tc-color-error-light, rgba(220, 53, 69, 0.1))',
+    '#333': 'var(--tc-color-text-primary, #333)',
+    '#4285f4': 'var(--tc-color-info, #4285f4)',
+    '#34a853': 'var(--tc-color-success, #34a853)',
+    '#fbbc04': 'var(--tc-color-warning, #fbbc04)',
+}
+
+# Compilée une seule fois: une passe, plus long littéral d'abord, bornes de jeton
+COLOR_VALUE_MATCHER = LiteralMatcher(COLOR_VALUE_MAPPINGS)
+
+# Valeurs de typographie, d'espacement et de bordure (appliquées dans l'ordre)
+VALUE_MAPPINGS = {
+    # Typographie
+    r'0\.75rem(?!\w)': 'var(--tc-font-size-xs)',
+    r'0\.8rem(?!\w)': 'var(--tc-font-size-xs)',
+    r'0\.85rem(?!\w)': 'var(--tc-font-size-sm)',
+    r'0\.9rem(?!\w)': 'var(--tc-font-size-sm)',
+    r'1rem(?!\w)': 'var(--tc-font-size-md)',
+    r'1\.1rem(?!\w)': 'var(--tc-font-size-lg)',
+    r'1\.125rem(?!\w)': 'var(--tc-font-size-lg)',
+    r'1\.25rem(?!\w)': 'var(--tc-font-size-xl)',
+    r'1\.5rem(?!\w)': 'var(--tc-font-size-2xl)',
+    r'500(?!\w)': 'var(--tc-font-weight-medium)',
+    r'600(?!\w)': 'var(--tc-font-weight-semibold)',
+    r'700(?!\w)': 'var(--tc-font-weight-bold)',
+    r'400(?!\w)': 'var(--tc-font-weight-normal)',
+    
+    # Espacements
+    r'0\.25rem(?!\w)': 'var(--tc-spacing-1)',
+    r'0\.5rem(?!\w)': 'var(--tc-spacing-2)',
+    r'0\.75rem(?!\w)': 'var(--tc-spacing-2)',
+    r'1rem(?!\w)': 'var(--tc-spacing-3)',
+    r'1\.5rem(?!\w)': 'var(--tc-spacing-4)',
+    r'2rem(?!\w)': 'var(--tc-spacing-8)',
+    
+    # Bordures et ombres
+    r'border-radius: 4px': 'border-radius: var(--tc-radius-sm)',
+    r'border-radius: 8px': 'border-radius: var(--tc-radius-md)',
+    r'border-radius: 0\.25rem': 'border-radius: var(--tc-radius-sm)',
+    r'box-shadow: 0 1px 3px rgba\(0,0,0,0\.1\)': 'box-shadow: var(--tc-shadow-sm)',
+    r'box-shadow: 0 -2px 10px rgba\(0, 0, 0, 0\.1\)': 'box-shadow: var(--tc-shadow-lg, 0 -2px 10px rgba(0, 0, 0, 0.1))'
+}
+
+def replace_hardcoded_values(content, path=None):
+    """Convertit les valeurs codées en dur et retourne (contenu, remplacements par valeur)"""
+    # Couleurs: une seule passe sur le contenu
+    content, counts = COLOR_VALUE_MATCHER.sub(content)
     
-    # Application des remplacements
-    for pattern, replacement in mappings.items():
-        content = re.sub(pattern, replacement, content)
+    # Application des autres remplacements
+    for pattern, replacement in VALUE_MAPPINGS.items():
+        content, replaced = re.subn(pattern, replacement, content)
+        if replaced:
+            counts[pattern] += replaced
         
-    return content
+    return content, counts
+
+def convert_hardcoded_values(content):
+    """Convertit les valeurs codées en dur en variables CSS avec fallbacks"""
+    return replace_hardcoded_values(content)[0]
+
+# Variables d'autres espaces de noms, jamais préfixées (Bootstrap: var(--bs-*))
+EXCLUDED_PREFIXES = ('bs-',)
 
-def fix_double_prefix(content):
-    """Corrige le problème des doubles préfixes var(--tc-tc-xyz)"""
-    # Recherche et remplace les doubles préfixes
-    return re.sub(r'var\(--tc-tc-', r'var(--tc-', content)
+def tc_prefixed_name(name):
+    """--xyz et --tc-tc-xyz deviennent --tc-xyz (None si déjà correct ou exclu)"""
+    base = name[2:]
+    if base.startswith(EXCLUDED_PREFIXES):
+        return None
+    while base.startswith('tc-'):
+        base = base[3:]
+    prefixed = f"--tc-{base}"
+    return None if prefixed == name else prefixed
 
-def prefix_css_vars_enhanced(file_path):
-    """Version améliorée qui ajoute aussi un en-tête et convertit les valeurs codées en dur"""
+def prefix_references(content, path=None):
+    """Préfixe les références var() (doubles préfixes corrigés), hors commentaires, chaînes et url()
+
+    Les variables définies dans le fichier même (--column-width, --tab-color...)
+    sont locales: leurs références ne sont pas renommées, la définition ne
+    l'étant pas.
+    """
+    if '--' not in content:
+        return content, Counter()
+    local = {token.text for token, role in custom_properties(tokenize(content)) if role == DEFINITION}
+
+    def rename(name):
+        return None if name in local else tc_prefixed_name(name)
+
+    return rename_custom_properties(content, rename, roles=(REFERENCE,))
+
+def apply_standard_header(content, path):
+    """Étape d'en-tête: (contenu, Counter) à partir du nom de fichier"""
+    updated = add_standard_header(content, str(path))
+    return updated, Counter({'header': 1} if updated != content else {})
+
+# Étapes exposées au pipeline (css_pipeline.py); aucune n'est dans l'ordre par défaut:
+# 'prefix' suppose que chaque --x référencé a son équivalent --tc-x défini
+PIPELINE_STAGES = [
+    {'name': 'prefix', 'suffixes': ('.css',), 'transform': prefix_references,
+     'description': 'var(--x) -> var(--tc-x), doubles préfixes corrigés'},
+    {'name': 'values', 'suffixes': ('.css',), 'transform': replace_hardcoded_values,
+     'description': 'Couleurs, typographie, espacements codés en dur -> var(--tc-*)'},
+    {'name': 'header', 'suffixes': ('.css',), 'transform': apply_standard_header,
+     'description': 'En-tête standardisé du guide de style'},
+]
+
+def prefix_css_vars_enhanced(file_path, journal=None, timer=None):
+    """Version améliorée qui ajoute aussi un en-tête et convertit les valeurs codées en dur
+
+    Le fichier n'est réécrit (atomiquement, via le journal) que si son
+    contenu change. timer cumule les phases read, prefix, values, header
+    et write.
+    """
+    timer = timer or PhaseTimer()
     print(f"Traitement de {file_path}...")
     
     # Vérification que le fichier existe
@@ -102,53 +175,42 @@ def prefix_css_vars_enhanced(file_path):
     
     # Lire le contenu du fichier
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with timer.phase('read'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
     except Exception as e:
         print(f"⚠️ Erreur lors de la lecture du fichier {file_path}: {e}")
         return False
     
-    # Créer une sauvegarde
-    try:
-        with open(f"{file_path}.bak", 'w', encoding='utf-8') as f:
-            f.write(content)
-    except Exception as e:
-        print(f"⚠️ Erreur lors de la création de la sauvegarde pour {file_path}: {e}")
-        return False
+    original_content = content
     
-    # 1. Préfixer les variables CSS existantes
-    search_pattern = r'var\(--([a-zA-Z0-9-]+)(?!-tc)'
-    replacement_pattern = r'var(--tc-\1'
-    content = re.sub(search_pattern, replacement_pattern, content)
+    # 1. Préfixer les références var() existantes (doubles préfixes corrigés au passage),
+    #    hors commentaires, chaînes et url()
+    with timer.phase('prefix'):
+        content, _ = prefix_references(content)
     
     # 2. Convertir les valeurs codées en dur
-    content = convert_hardcoded_values(content)
+    with timer.phase('values'):
+        content = convert_hardcoded_values(content)
     
-    # 3. Corriger les doubles préfixes éventuels
-    content = fix_double_prefix(content)
-    
-    # 4. Ajouter l'en-tête standardisé
+    # 3. Ajouter l'en-tête standardisé
     if file_path.endswith('.css') or file_path.endswith('.module.css'):
-        content = add_standard_header(content, file_path)
+        with timer.phase('header'):
+            content = add_standard_header(content, file_path)
     
-    # Écrire le contenu modifié
+    # Écrire le contenu modifié (temporaire + os.replace: le fichier d'origine reste intact en cas d'échec)
+    journal = journal or WriteJournal('prefix_css_vars')
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with timer.phase('write'):
+            changed = journal.write(file_path, content, original=original_content)
     except Exception as e:
         print(f"⚠️ Erreur lors de l'écriture du fichier {file_path}: {e}")
-        # Tentative de restauration de la sauvegarde
-        try:
-            with open(f"{file_path}.bak", 'r', encoding='utf-8') as f:
-                original_content = f.read()
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(original_content)
-            print(f"La sauvegarde de {file_path} a été restaurée.")
-        except Exception as restore_error:
-            print(f"⚠️ Erreur lors de la restauration de la sauvegarde: {restore_error}")
         return False
     
-    print(f"✅ Fichier {file_path} traité avec succès")
+    if changed:
+        print(f"✅ Fichier {file_path} traité avec succès")
+    else:
+        print(f"ℹ️ Aucune modification nécessaire pour {file_path}")
     return True
 
 def extract_paths_from_inventory(inventory_path):
@@ -179,20 +241,22 @@ def extract_paths_from_inventory(inventory_path):
     
     return file_paths, done_paths
 
-def process_specific_files(file_paths):
+def process_specific_files(file_paths, journal=None, timer=None):
     """Traite uniquement les fichiers spécifiés"""
     successful = []
     for file_path in file_paths:
         if os.path.exists(file_path) and os.path.isfile(file_path):
-            if prefix_css_vars_enhanced(file_path):
+            if prefix_css_vars_enhanced(file_path, journal, timer):
                 successful.append(file_path)
         else:
             print(f"⚠️ Fichier non trouvé: {file_path}")
     return successful
 
-def process_inventory_files(inventory_path, skip_confirmation=False):
+def process_inventory_files(inventory_path, skip_confirmation=False, scope=None, journal=None, timer=None):
     """Traite tous les fichiers CSS mobiles listés dans l'inventaire qui ne sont pas encore cochés"""
     file_paths, done_paths = extract_paths_from_inventory(inventory_path)
+    if scope is not None:
+        file_paths = scope.filter(file_paths)
     
     if not file_paths:
         print("Aucun fichier à traiter ou erreur lors de l'extraction des chemins.")
@@ -215,7 +279,7 @@ def process_inventory_files(inventory_path, skip_confirmation=False):
     for i, file_path in enumerate(file_paths):
         print(f"\nTraitement du fichier {i+1}/{len(file_paths)}: {file_path}")
         
-        if prefix_css_vars_enhanced(file_path):
+        if prefix_css_vars_enhanced(file_path, journal, timer):
             successful_files.append(file_path)
         else:
             failed_files.append(file_path)
@@ -233,16 +297,35 @@ def process_inventory_files(inventory_path, skip_confirmation=False):
     return successful_files, failed_files
 
 if __name__ == "__main__":
+    since, staged, argv = split_scope_argv(sys.argv[1:])
+    rollback_id, argv = split_rollback_argv(argv)
+    if rollback_id:
+        sys.exit(run_rollback(rollback_id))
+    profile_parser = add_profile_argument(argparse.ArgumentParser(add_help=False), PROFILE_DIR)
+    options, argv = profile_parser.parse_known_args(argv)
+    timer = PhaseTimer(options.profile)
+    scope = resolve_scope(os.getcwd(), since, staged)
+    if scope is not None:
+        print(scope.summary())
+    journal = WriteJournal('prefix_css_vars')
+    
     # Si l'option --inventory est utilisée, traiter tous les fichiers de l'inventaire
-    if "--inventory" in sys.argv:
+    if "--inventory" in argv:
         inventory_path = "/Users/meltinrecordz/Documents/TourCraft/code/app-booking-2/docs/css/INVENTAIRE_REFACTORISATION_COMPOSANTS_MOBILES.md"
-        skip_confirmation = "--force" in sys.argv
-        successful_files, failed_files = process_inventory_files(inventory_path, skip_confirmation)
+        skip_confirmation = "--force" in argv
+        successful_files, failed_files = process_inventory_files(inventory_path, skip_confirmation, scope, journal,
+                                                                 timer)
     
     # Si des arguments de fichiers spécifiques sont fournis
-    elif len(sys.argv) > 1 and sys.argv[1] != "--help":
-        files_to_process = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
-        process_specific_files(files_to_process)
+    elif argv and argv[0] != "--help":
+        files_to_process = [arg for arg in argv if not arg.startswith("--")]
+        if scope is not None:
+            files_to_process = scope.filter(files_to_process)
+        process_specific_files(files_to_process, journal, timer)
+    
+    # Périmètre git seul: les *.module.css modifiés de src/
+    elif scope is not None:
+        process_specific_files([str(path) for path in scope.files_under("src", ('.module.css',))], journal, timer)
     
     # Afficher l'aide
     else:
@@ -253,9 +336,23 @@ Usage:
 Options:
     --inventory          Traite tous les fichiers listés dans l'inventaire qui ne sont pas encore refactorisés
     --force              Ne demande pas de confirmation avant de traiter les fichiers
+    --since REF          Ne traite que les fichiers modifiés depuis REF (git)
+    --staged             Ne traite que les fichiers indexés (pre-commit)
+    --rollback RUN_ID    Annule les écritures d'une exécution précédente
+    --profile[=DIR]      Profile chaque phase (read, prefix, values, header, write) dans DIR
     --help               Affiche cette aide
 
 Exemples:
     python prefix_css_vars.py --inventory --force
     python prefix_css_vars.py chemin/vers/fichier1.css chemin/vers/fichier2.css
-        """)
\ No newline at end of file
+    python prefix_css_vars.py --staged
+    python prefix_css_vars.py --rollback 20250505-143012-prefix_css_vars-3f2a
+        """)
+    
+    if timer.phases:
+        print("\n" + timer.summary_table("TEMPS PAR ÉTAPE (cumulé sur les fichiers)"))
+        timer.write_profiles()
+    
+    summary = journal.summary()
+    if summary:
+        print(summary)
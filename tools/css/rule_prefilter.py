@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Préfiltre littéral des familles de règles des correcteurs CSS
+La plupart des fichiers ne contiennent aucun déclencheur: pas de '#', pas
+de 'var(--tc-color-', pas de '@media'... Chaque famille de règles (table de
+couleurs, motifs malformés, points de rupture...) déclare les littéraux dont
+au moins un est nécessaire pour qu'une de ses règles s'applique. Une
+recherche de sous-chaîne (str.__contains__, sans regex) décide si la famille
+peut agir; sinon toutes ses passes regex sont sautées.
+
+Une famille est un dict {'triggers': (littéraux...), 'rules': nombre de
+passes regex de la famille, 'ignore_case': bool}; les autres clés sont
+ignorées (les étapes de css_pipeline.py servent directement de familles).
+Les compteurs (fichiers vérifiés, familles sautées, passes évitées) se
+fusionnent entre processus comme ceux de PhaseTimer.
+"""
+
+from typing import Dict, Optional
+
+
+class RulePrefilter:
+    """Décide par recherche littérale quelles familles de règles peuvent s'appliquer"""
+
+    def __init__(self, families: Dict[str, Dict]):
+        self.families = {
+            name: {
+                'triggers': tuple(family['triggers']),
+                'rules': family.get('rules', 1),
+                'ignore_case': family.get('ignore_case', False),
+            }
+            for name, family in families.items() if family.get('triggers')
+        }
+        # nom de famille -> {'checked', 'skipped'}
+        self.stats: Dict[str, Dict[str, int]] = {name: {'checked': 0, 'skipped': 0} for name in self.families}
+
+    def may_fire(self, name: str, content: str) -> bool:
+        """True si au moins un déclencheur de la famille est présent (toujours True pour une famille inconnue)"""
+        family = self.families.get(name)
+        if family is None:
+            return True
+        haystack = content.lower() if family['ignore_case'] else content
+        stats = self.stats[name]
+        stats['checked'] += 1
+        if any(trigger in haystack for trigger in family['triggers']):
+            return True
+        stats['skipped'] += 1
+        return False
+
+    @property
+    def rules_avoided(self) -> int:
+        return sum(stats['skipped'] * self.families[name]['rules'] for name, stats in self.stats.items())
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        """Compteurs sérialisables (retour des processus de travail)"""
+        return {name: dict(stats) for name, stats in self.stats.items()}
+
+    def merge(self, stats: Dict[str, Dict[str, int]]):
+        """Ajoute les compteurs d'un autre préfiltre (processus de travail)"""
+        for name, counters in stats.items():
+            if name in self.stats:
+                for key, value in counters.items():
+                    self.stats[name][key] += value
+
+    def summary_table(self, title: Optional[str] = None) -> str:
+        """Tableau: fichiers vérifiés, sautés et passes regex évitées par famille"""
+        lines = [title or "🚦 PRÉFILTRE DES RÈGLES",
+                 f"{'Famille':<18}{'Vérifiés':>10}{'Sautés':>10}{'Passes évitées':>16}"]
+        for name, stats in self.stats.items():
+            avoided = stats['skipped'] * self.families[name]['rules']
+            lines.append(f"{name:<18}{stats['checked']:>10}{stats['skipped']:>10}{avoided:>16}")
+        lines.append(f"{'Total':<38}{self.rules_avoided:>16}")
+        return "\n".join(lines)
@@ -5,47 +5,85 @@ import re
 import sys
 import glob
 import time
+import argparse
+from pathlib import Path
 from datetime import datetime
+from collections import Counter
 
-def standardize_breakpoints(content):
+from file_watcher import watch
+from rule_prefilter import RulePrefilter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from git_scope import resolve_scope, split_scope_argv
+from write_journal import WriteJournal, run_rollback, split_rollback_argv
+from phase_timer import PhaseTimer, add_profile_argument
+
+PROFILE_DIR = Path("tools") / "css" / ".cache" / "profile" / "standardize_breakpoints"
+
+# Définition des points de rupture standards selon variables.css
+BREAKPOINT_MAPPING = {
+    r'max-width:\s*576px': 'max-width: var(--tc-breakpoint-xs, 576px)',
+    r'max-width:\s*600px': 'max-width: var(--tc-breakpoint-xs, 576px)', # Non-standard -> standard
+    r'max-width:\s*768px': 'max-width: var(--tc-breakpoint-sm, 768px)',
+    r'max-width:\s*800px': 'max-width: var(--tc-breakpoint-sm, 768px)', # Non-standard -> standard
+    r'max-width:\s*900px': 'max-width: var(--tc-breakpoint-md, 992px)', # Non-standard -> standard
+    r'max-width:\s*992px': 'max-width: var(--tc-breakpoint-md, 992px)',
+    r'max-width:\s*1200px': 'max-width: var(--tc-breakpoint-lg, 1200px)',
+    r'max-width:\s*1400px': 'max-width: var(--tc-breakpoint-xl, 1400px)',
+    
+    r'min-width:\s*576px': 'min-width: var(--tc-breakpoint-xs, 576px)',
+    r'min-width:\s*600px': 'min-width: var(--tc-breakpoint-xs, 576px)', # Non-standard -> standard
+    r'min-width:\s*768px': 'min-width: var(--tc-breakpoint-sm, 768px)',
+    r'min-width:\s*800px': 'min-width: var(--tc-breakpoint-sm, 768px)', # Non-standard -> standard
+    r'min-width:\s*900px': 'min-width: var(--tc-breakpoint-md, 992px)', # Non-standard -> standard
+    r'min-width:\s*992px': 'min-width: var(--tc-breakpoint-md, 992px)',
+    r'min-width:\s*1200px': 'min-width: var(--tc-breakpoint-lg, 1200px)',
+    r'min-width:\s*1400px': 'min-width: var(--tc-breakpoint-xl, 1400px)'
+}
+
+# Media queries compilées une seule fois: (motif d'origine, regex, remplacement)
+BREAKPOINT_RULES = [
+    (pattern, re.compile(r'(@media[^{]*?)(' + pattern + r')([^{]*?{)', re.IGNORECASE), r'\1' + replacement + r'\3')
+    for pattern, replacement in BREAKPOINT_MAPPING.items()
+]
+
+# Familles de règles du préfiltre: une media query contient forcément '@media'
+PREFILTER_FAMILIES = {
+    'breakpoints': {'triggers': ('@media',), 'rules': len(BREAKPOINT_RULES), 'ignore_case': True},
+}
+
+def apply_breakpoints(content, path=None):
+    """Remplace les media queries par les versions standardisées et retourne (contenu, remplacements par motif)"""
+    counts = Counter()
+    for pattern, media_query_pattern, replacement_query in BREAKPOINT_RULES:
+        content, replaced = media_query_pattern.subn(replacement_query, content)
+        if replaced:
+            counts[pattern] += replaced
+    return content, counts
+
+def standardize_breakpoints(content, prefilter=None):
     """
     Standardise les points de rupture (media queries) dans un fichier CSS
     en utilisant les variables CSS standardisées
     """
-    # Définition des points de rupture standards selon variables.css
-    breakpoint_mapping = {
-        r'max-width:\s*576px': 'max-width: var(--tc-breakpoint-xs, 576px)',
-        r'max-width:\s*600px': 'max-width: var(--tc-breakpoint-xs, 576px)', # Non-standard -> standard
-        r'max-width:\s*768px': 'max-width: var(--tc-breakpoint-sm, 768px)',
-        r'max-width:\s*800px': 'max-width: var(--tc-breakpoint-sm, 768px)', # Non-standard -> standard
-        r'max-width:\s*900px': 'max-width: var(--tc-breakpoint-md, 992px)', # Non-standard -> standard
-        r'max-width:\s*992px': 'max-width: var(--tc-breakpoint-md, 992px)',
-        r'max-width:\s*1200px': 'max-width: var(--tc-breakpoint-lg, 1200px)',
-        r'max-width:\s*1400px': 'max-width: var(--tc-breakpoint-xl, 1400px)',
-        
-        r'min-width:\s*576px': 'min-width: var(--tc-breakpoint-xs, 576px)',
-        r'min-width:\s*600px': 'min-width: var(--tc-breakpoint-xs, 576px)', # Non-standard -> standard
-        r'min-width:\s*768px': 'min-width: var(--tc-breakpoint-sm, 768px)',
-        r'min-width:\s*800px': 'min-width: var(--tc-breakpoint-sm, 768px)', # Non-standard -> standard
-        r'min-width:\s*900px': 'min-width: var(--tc-breakpoint-md, 992px)', # Non-standard -> standard
-        r'min-width:\s*992px': 'min-width: var(--tc-breakpoint-md, 992px)',
-        r'min-width:\s*1200px': 'min-width: var(--tc-breakpoint-lg, 1200px)',
-        r'min-width:\s*1400px': 'min-width: var(--tc-breakpoint-xl, 1400px)'
-    }
-    
-    # Remplacer toutes les media queries par les versions standardisées
-    for pattern, replacement in breakpoint_mapping.items():
-        # Utiliser une expression régulière pour trouver les media queries dans différents formats
-        media_query_pattern = r'(@media[^{]*?)(' + pattern + r')([^{]*?{)'
-        replacement_query = r'\1' + replacement + r'\3'
-        
-        # Appliquer le remplacement
-        content = re.sub(media_query_pattern, replacement_query, content, flags=re.IGNORECASE)
-    
-    return content
+    prefilter = prefilter or RulePrefilter(PREFILTER_FAMILIES)
+    if not prefilter.may_fire('breakpoints', content):
+        return content
+    return apply_breakpoints(content)[0]
+
+# Étapes exposées au pipeline (css_pipeline.py)
+PIPELINE_STAGES = [
+    dict(PREFILTER_FAMILIES['breakpoints'], name='breakpoints', suffixes=('.module.css',),
+         transform=apply_breakpoints, description='Media queries -> var(--tc-breakpoint-*)'),
+]
 
-def standardize_file(file_path):
-    """Standardise les points de rupture dans un fichier CSS"""
+def standardize_file(file_path, journal=None, prefilter=None, timer=None):
+    """Standardise les points de rupture dans un fichier CSS
+
+    Le fichier n'est réécrit (atomiquement, via le journal) que si son
+    contenu change. timer cumule les phases read, breakpoints et write.
+    """
+    timer = timer or PhaseTimer()
     print(f"Traitement de {file_path}...")
     
     if not os.path.exists(file_path):
@@ -54,21 +92,19 @@ def standardize_file(file_path):
     
     try:
         # Lire le contenu du fichier
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Créer une sauvegarde
-        backup_path = f"{file_path}.bak"
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with timer.phase('read'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
         
         # Standardiser les points de rupture
-        modified_content = standardize_breakpoints(content)
+        with timer.phase('breakpoints'):
+            modified_content = standardize_breakpoints(content, prefilter)
         
         # Enregistrer les modifications si le contenu a changé
-        if modified_content != content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+        journal = journal or WriteJournal('standardize_breakpoints')
+        with timer.phase('write'):
+            changed = journal.write(file_path, modified_content, original=content)
+        if changed:
             print(f"✅ {file_path} standardisé avec succès")
             return True
         else:
@@ -78,12 +114,13 @@ def standardize_file(file_path):
         print(f"❌ Erreur lors du traitement de {file_path}: {str(e)}")
         return False
 
-def process_directory(directory, file_pattern="**/*.module.css"):
+def process_directory(directory, file_pattern="**/*.module.css", scope=None, journal=None, timer=None):
     """Traite tous les fichiers CSS dans un répertoire et ses sous-répertoires"""
     count_success = 0
     count_error = 0
     count_skipped = 0
     
+    prefilter = RulePrefilter(PREFILTER_FAMILIES)
     start_time = time.time()
     date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -95,6 +132,9 @@ def process_directory(directory, file_pattern="**/*.module.css"):
     
     # Rechercher tous les fichiers correspondant au pattern
     file_paths = glob.glob(os.path.join(directory, file_pattern), recursive=True)
+    if scope is not None:
+        print(scope.summary())
+        file_paths = scope.filter(file_paths)
     total_files = len(file_paths)
     
     print(f"Trouvé {total_files} fichiers à traiter")
@@ -102,7 +142,7 @@ def process_directory(directory, file_pattern="**/*.module.css"):
     for i, file_path in enumerate(file_paths, 1):
         print(f"\n[{i}/{total_files}] Traitement de {file_path}")
         
-        if standardize_file(file_path):
+        if standardize_file(file_path, journal, prefilter, timer):
             count_success += 1
         else:
             count_error += 1
@@ -116,6 +156,7 @@ def process_directory(directory, file_pattern="**/*.module.css"):
     print(f"✅ Succès: {count_success}")
     print(f"❌ Erreurs: {count_error}")
     print(f"⏭️ Ignorés: {count_skipped}")
+    print(f"🚦 Passes regex évitées par le préfiltre: {prefilter.rules_avoided}")
     print("=" * 40)
     
     # Générer un rapport dans un fichier texte
@@ -138,8 +179,16 @@ def process_directory(directory, file_pattern="**/*.module.css"):
 
 def main():
     """Fonction principale"""
+    since, staged, argv = split_scope_argv(sys.argv[1:])
+    rollback_id, argv = split_rollback_argv(argv)
+    if rollback_id:
+        return run_rollback(rollback_id)
+    profile_parser = add_profile_argument(argparse.ArgumentParser(add_help=False), PROFILE_DIR)
+    options, argv = profile_parser.parse_known_args(argv)
+    timer = PhaseTimer(options.profile)
+    
     # Vérifier les arguments
-    if len(sys.argv) == 1 or "--help" in sys.argv:
+    if not argv and not (since or staged) or "--help" in argv:
         print("""
 Usage:
     python standardize_breakpoints.py [options] [chemin]
@@ -149,33 +198,58 @@ Options:
     --mobile     Traite seulement les fichiers CSS mobiles
     --desktop    Traite seulement les fichiers CSS desktop
     --components Traite seulement les fichiers CSS des composants
+    --watch      Surveille les *.module.css et standardise chaque fichier sauvegardé
+    --since REF  Limite le traitement aux fichiers modifiés depuis REF (git)
+    --staged     Limite le traitement aux fichiers indexés (pre-commit)
+    --rollback RUN_ID  Annule les écritures d'une exécution précédente
+    --profile[=DIR]  Profile chaque phase (read, breakpoints, write) dans DIR
     --help       Affiche cette aide
 
 Exemples:
     python standardize_breakpoints.py --all
     python standardize_breakpoints.py --mobile
     python standardize_breakpoints.py src/components/programmateurs
+    python standardize_breakpoints.py --watch src
+    python standardize_breakpoints.py --staged src
+    python standardize_breakpoints.py --rollback 20250505-143012-standardize_breakpoints-3f2a
         """)
         return
     
-    src_dir = "/Users/meltinrecordz/Documents/TourCraft/code/app-booking-2/src"
+    # Comme les autres correcteurs: src/ du répertoire courant (racine du projet)
+    src_dir = "src"
+    scope = resolve_scope(os.getcwd(), since, staged)
+    
+    journal = WriteJournal('standardize_breakpoints')
     
     # Traiter selon les options
-    if "--all" in sys.argv:
-        process_directory(src_dir)
-    elif "--mobile" in sys.argv:
-        process_directory(src_dir, "**/mobile/*.module.css")
-    elif "--desktop" in sys.argv:
-        process_directory(src_dir, "**/desktop/*.module.css")
-    elif "--components" in sys.argv:
-        process_directory(src_dir, "components/**/*.module.css")
+    if "--watch" in argv:
+        paths = [arg for arg in argv if not arg.startswith("--")]
+        watch(paths[0] if paths else src_dir, ('.module.css',),
+              lambda content, path: standardize_breakpoints(content),
+              'Standardisation des points de rupture', journal)
+    elif "--all" in argv:
+        process_directory(src_dir, scope=scope, journal=journal, timer=timer)
+    elif "--mobile" in argv:
+        process_directory(src_dir, "**/mobile/*.module.css", scope, journal, timer)
+    elif "--desktop" in argv:
+        process_directory(src_dir, "**/desktop/*.module.css", scope, journal, timer)
+    elif "--components" in argv:
+        process_directory(src_dir, "components/**/*.module.css", scope, journal, timer)
     else:
         # Traiter un chemin spécifique
-        path = sys.argv[1] if len(sys.argv) > 1 else src_dir
+        path = argv[0] if argv else src_dir
         if os.path.isfile(path):
-            standardize_file(path)
+            if scope is None or scope.contains(path):
+                standardize_file(path, journal, timer=timer)
         else:
-            process_directory(path)
+            process_directory(path, scope=scope, journal=journal, timer=timer)
+    
+    if timer.phases:
+        print("\n" + timer.summary_table("TEMPS PAR ÉTAPE (cumulé sur les fichiers)"))
+        timer.write_profiles()
+    summary = journal.summary()
+    if summary:
+        print(summary)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Résolution des chaînes var() des design tokens
+Rassemble les définitions de chaque portée globale (:root, et les portées de
+thème comme [data-theme="dark"] ou @media (prefers-color-scheme: dark))
+à partir de l'index css_variable_index.py, dans l'ordre de la cascade
+(imports de src/styles/index.css, puis modules des composants), et résout
+chaque var() jusqu'à sa valeur finale. Chaque résolution est mémorisée: une
+fois calculée, une recherche coûte un accès dictionnaire.
+
+Comme dans le navigateur, toutes les propriétés d'un cycle de var() (y
+compris par un fallback) sont invalides: les cycles de chaque portée sont
+détectés d'abord (composantes fortement connexes de graph_engine), avant
+toute mémorisation, si bien que le résultat ne dépend pas de l'ordre des
+requêtes.
+
+Pour chaque propriété: valeur finale, profondeur de la chaîne (nombre de
+var() traversés), chaîne la plus profonde, cycles et références sans
+définition ni fallback. Les chaînes plus profondes que --max-depth sont
+signalées: chaque niveau coûte au recalcul des styles dans le navigateur.
+
+Usage dans un correcteur:
+    resolver = TokenResolver.open(project_root)
+    resolver.value('--tc-color-border')                 # '#dee2e6'
+    resolver.value('--tc-color-border', DARK_SCOPE)     # valeur du thème sombre
+
+En ligne de commande:
+    python tools/css/token_resolver.py [--max-depth=3] [--get=--tc-color-border] [--scope='[data-theme="dark"]']
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from css_variable_index import CSSVariableIndex
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "audit"))
+from graph_engine import CompactGraph
+
+# Portée: (sélecteur, contexte @media/@supports)
+Scope = Tuple[str, str]
+BASE_SCOPE: Scope = (':root', '')
+DEFAULT_ENTRIES = ("src/styles/index.css",)
+DEFAULT_MAX_DEPTH = 3
+
+# Sélecteurs de portée globale: :root/html/body, seuls ou qualifiés par des
+# attributs ([data-theme="dark"]) ou des classes de thème (.dark-theme)
+SCOPE_SELECTOR = re.compile(r'^(?::root|html|body)?(?:\[[^\]]+\]|\.[\w-]*(?:theme|dark|light)[\w-]*)*$', re.I)
+IMPORT_PATTERN = re.compile(r'''@import\s+(?:url\(\s*)?['"]([^'"]+)['"]''')
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
+VAR_PATTERN = re.compile(r'var\(', re.I)
+# Alias d'imports CSS (jsconfig/craco)
+IMPORT_ALIASES = {'@styles/': 'src/styles/', '@/': 'src/'}
+
+
+def stylesheet_order(project_root: Path, entries: Iterable[str] = DEFAULT_ENTRIES) -> List[str]:
+    """Feuilles de style dans l'ordre de la cascade: parcours des @import depuis les points d'entrée"""
+    order, seen = [], set()
+
+    def visit(relative: str):
+        if relative in seen:
+            return
+        seen.add(relative)
+        path = project_root / relative
+        try:
+            content = COMMENT_PATTERN.sub('', path.read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError):
+            return
+        for target in IMPORT_PATTERN.findall(content):
+            for alias, replacement in IMPORT_ALIASES.items():
+                if target.startswith(alias):
+                    target = replacement + target[len(alias):]
+                    break
+            else:
+                target = os.path.normpath(os.path.join(os.path.dirname(relative), target))
+            visit(Path(target).as_posix())
+        order.append(relative)
+
+    for entry in entries:
+        visit(entry)
+    return order
+
+
+def _scopes_of(site: Dict) -> List[Scope]:
+    """Portées globales d'un site de définition (aucune pour un sélecteur de composant)"""
+    scopes = []
+    for selector in site['selector'].split(','):
+        selector = selector.strip()
+        if selector == 'html':
+            selector = ':root'
+        if selector and SCOPE_SELECTOR.match(selector):
+            scopes.append((selector, site['context']))
+    return scopes
+
+
+def _split_var(value: str, start: int) -> Tuple[str, Optional[str], int]:
+    """Découpe var(nom, fallback) ouvert à start: (nom, fallback ou None, fin)"""
+    depth, comma, quote = 1, None, None
+    pos = start
+    while pos < len(value):
+        char = value[pos]
+        if quote:
+            if char == '\\':
+                pos += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                break
+        elif char == ',' and depth == 1 and comma is None:
+            comma = pos
+        pos += 1
+    if comma is None:
+        return value[start:pos].strip(), None, pos + 1
+    return value[start:comma].strip(), value[comma + 1:pos].strip(), pos + 1
+
+
+def _references(value: str) -> List[str]:
+    """Propriétés référencées par une valeur, y compris dans les fallbacks"""
+    return [_split_var(value, match.end())[0] for match in VAR_PATTERN.finditer(value)]
+
+
+class TokenResolver:
+    def __init__(self, scopes: Dict[Scope, Dict[str, Dict]]):
+        # portée -> propriété -> site de définition retenu (le dernier dans la cascade)
+        self.scopes = scopes
+        self._memo: Dict[Tuple[Scope, str], Dict] = {}
+        # portée -> propriétés prises dans un cycle
+        self._cycles: Dict[Scope, Set[str]] = {}
+
+    @classmethod
+    def from_index(cls, index: CSSVariableIndex, entries: Iterable[str] = DEFAULT_ENTRIES) -> "TokenResolver":
+        """Construit les portées à partir de l'index, dans l'ordre de la cascade"""
+        cascade = stylesheet_order(index.project_root, entries)
+        rank = {relative: position for position, relative in enumerate(cascade)}
+        # Feuilles importées d'abord (ordre des @import), puis les autres (modules) par chemin
+        ordered = sorted(index.files, key=lambda relative: (rank.get(relative, len(rank)), relative))
+
+        scopes: Dict[Scope, Dict[str, Dict]] = {}
+        for relative in ordered:
+            for site in index.files[relative]['definitions']:
+                if 'value' not in site:
+                    continue
+                for scope in _scopes_of(site):
+                    scopes.setdefault(scope, {})[site['name']] = dict(site, file=relative)
+        return cls(scopes)
+
+    @classmethod
+    def open(cls, project_root: str, roots: Iterable[str] = ("src",)) -> "TokenResolver":
+        """Met à jour l'index des variables (incrémental) et construit le résolveur"""
+        index = CSSVariableIndex.open(project_root)
+        index.update(roots)
+        index.save()
+        return cls.from_index(index)
+
+    def definition(self, name: str, scope: Scope = BASE_SCOPE) -> Optional[Dict]:
+        """Définition visible dans la portée (sinon celle de :root, dont elle hérite)"""
+        site = self.scopes.get(scope, {}).get(name)
+        if site is None and scope != BASE_SCOPE:
+            site = self.scopes.get(BASE_SCOPE, {}).get(name)
+        return site
+
+    def cycle_members(self, scope: Scope = BASE_SCOPE) -> Set[str]:
+        """Propriétés de la portée prises dans un cycle de var() (calculées une fois par portée)"""
+        members = self._cycles.get(scope)
+        if members is None:
+            names = self.names(scope)
+            edges = {name: [reference for reference in _references(self.definition(name, scope)['value'])
+                            if self.definition(reference, scope) is not None]
+                     for name in names}
+            members = set()
+            for cycle in CompactGraph(names, edges).cycles():
+                members.update(cycle)
+            self._cycles[scope] = members
+        return members
+
+    def resolve(self, name: str, scope: Scope = BASE_SCOPE) -> Optional[Dict]:
+        """Résolution mémorisée de la propriété (None si elle n'est définie nulle part)
+
+        {'value': valeur finale ou None si invalide, 'depth': var() traversés,
+         'chain': chaîne la plus profonde, 'cycle': bool, 'missing': références
+         sans définition ni fallback, 'definition': site retenu}
+        """
+        key = (scope, name)
+        resolution = self._memo.get(key)
+        if resolution is not None:
+            return resolution
+        site = self.definition(name, scope)
+        if site is None:
+            return None
+        if name in self.cycle_members(scope):
+            # Cycle: toutes les propriétés de la boucle sont invalides (guaranteed-invalid)
+            resolution = {'value': None, 'depth': 0, 'chain': [name], 'cycle': True, 'missing': [], 'definition': site}
+        else:
+            # Hors cycle, la récursion sur les var() se termine toujours
+            value, depth, chain, cycle, missing = self._substitute(site['value'], scope)
+            resolution = {'value': value, 'depth': depth, 'chain': [name] + chain, 'cycle': cycle,
+                          'missing': missing, 'definition': site}
+        self._memo[key] = resolution
+        return resolution
+
+    def _substitute(self, value: str, scope: Scope) -> Tuple[Optional[str], int, List[str], bool, List[str]]:
+        """Remplace les var() d'une valeur: (valeur, profondeur, chaîne, cycle, manquantes)"""
+        pieces, depth, chain, cycle, missing = [], 0, [], False, []
+        valid = True
+        pos = 0
+        for match in VAR_PATTERN.finditer(value):
+            if match.start() < pos:
+                continue    # var() imbriqué dans un fallback déjà traité
+            pieces.append(value[pos:match.start()])
+            name, fallback, pos = _split_var(value, match.end())
+            resolution = self.resolve(name, scope)
+            if resolution is not None and resolution['cycle']:
+                cycle = True
+            if resolution is not None and resolution['value'] is not None:
+                pieces.append(resolution['value'])
+                if resolution['depth'] + 1 > depth:
+                    depth, chain = resolution['depth'] + 1, resolution['chain']
+                continue
+            if fallback is not None:
+                fallback_value, fallback_depth, fallback_chain, fallback_cycle, fallback_missing = \
+                    self._substitute(fallback, scope)
+                cycle = cycle or fallback_cycle
+                missing.extend(fallback_missing)
+                if fallback_value is not None:
+                    pieces.append(fallback_value)
+                    if fallback_depth + 1 > depth:
+                        depth, chain = fallback_depth + 1, [name] + fallback_chain
+                    continue
+            elif resolution is None:
+                missing.append(name)
+            missing.extend(resolution['missing'] if resolution else [])
+            valid = False
+        pieces.append(value[pos:])
+        return ("".join(pieces) if valid else None), depth, chain, cycle, missing
+
+    def value(self, name: str, scope: Scope = BASE_SCOPE) -> Optional[str]:
+        """Valeur finale de la propriété (None si inconnue ou invalide)"""
+        resolution = self.resolve(name, scope)
+        return resolution['value'] if resolution else None
+
+    def names(self, scope: Scope = BASE_SCOPE) -> List[str]:
+        """Propriétés visibles dans la portée"""
+        names = set(self.scopes.get(scope, {}))
+        if scope != BASE_SCOPE:
+            names |= set(self.scopes.get(BASE_SCOPE, {}))
+        return sorted(names)
+
+    def table(self, scope: Scope = BASE_SCOPE) -> Dict[str, Dict]:
+        """Résolution de toutes les propriétés visibles dans la portée"""
+        return {name: self.resolve(name, scope) for name in self.names(scope)}
+
+
+def _scope_label(scope: Scope) -> str:
+    return scope[0] + (f" @ {scope[1]}" if scope[1] else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Résolution des chaînes var() des design tokens')
+    parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH,
+                        help=f'Profondeur au-delà de laquelle une chaîne est signalée (défaut: {DEFAULT_MAX_DEPTH})')
+    parser.add_argument('--get', metavar='PROPRIÉTÉ', help='Affiche la résolution d\'une propriété')
+    parser.add_argument('--scope', default=BASE_SCOPE[0], help='Sélecteur de la portée (défaut: :root)')
+    parser.add_argument('--context', default='', help='Contexte @media de la portée')
+    parser.add_argument('--json', metavar='FICHIER', help='Écrit toutes les résolutions en JSON')
+    parser.add_argument('--limit', type=int, default=20, help='Entrées affichées par catégorie')
+    args = parser.parse_args()
+
+    resolver = TokenResolver.open(os.getcwd())
+    scope = (args.scope, args.context)
+
+    if args.get:
+        resolution = resolver.resolve(args.get, scope)
+        if resolution is None:
+            print(f"❓ {args.get} n'est définie dans aucune portée globale")
+            return 1
+        site = resolution['definition']
+        print(f"🎨 {args.get} ({_scope_label(scope)})")
+        print(f"   valeur     : {resolution['value']}")
+        print(f"   profondeur : {resolution['depth']} ({' → '.join(resolution['chain'])})")
+        print(f"   définie    : {site['file']}:{site['line']} = {site['value']}")
+        if resolution['cycle']:
+            print("   🔁 cycle détecté")
+        if resolution['missing']:
+            print(f"   ❓ références sans définition: {', '.join(resolution['missing'])}")
+        return 0
+
+    report = {}
+    print(f"🎨 {len(resolver.scopes)} portées globales")
+    for scope in sorted(resolver.scopes, key=lambda item: (item != BASE_SCOPE, item)):
+        table = resolver.table(scope)
+        report[_scope_label(scope)] = table
+        depths = Counter(resolution['depth'] for resolution in table.values())
+        deep = sorted((name for name, resolution in table.items() if resolution['depth'] > args.max_depth),
+                      key=lambda name: (-table[name]['depth'], name))
+        cycles = sorted(name for name, resolution in table.items() if resolution['cycle'])
+        invalid = sorted(name for name, resolution in table.items()
+                         if resolution['value'] is None and not resolution['cycle'])
+
+        print(f"\n📐 {_scope_label(scope)}: {len(resolver.scopes[scope])} définitions, {len(table)} visibles")
+        print("   profondeurs: " + ", ".join(f"{depth}: {count}" for depth, count in sorted(depths.items())))
+        if deep:
+            print(f"   ⚠️ {len(deep)} chaîne(s) de plus de {args.max_depth} niveaux")
+            for name in deep[:args.limit]:
+                print(f"      {table[name]['depth']}  {' → '.join(table[name]['chain'])}")
+        if cycles:
+            print(f"   🔁 {len(cycles)} propriété(s) dans un cycle: {', '.join(cycles[:args.limit])}")
+        if invalid:
+            print(f"   ❓ {len(invalid)} propriété(s) sans valeur (références manquantes)")
+            for name in invalid[:args.limit]:
+                print(f"      {name}: {', '.join(table[name]['missing'])}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n📊 Rapport JSON sauvegardé: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())